@@ -3,9 +3,12 @@ from __future__ import annotations
 import asyncio
 import errno
 import json
+import math
 import os
 import re
+import signal
 import stat
+from collections.abc import Awaitable
 from contextlib import suppress
 from datetime import datetime
 from pathlib import Path
@@ -20,8 +23,12 @@ from orch.config.loader import load_plan
 from orch.config.schema import PlanSpec, TaskSpec
 from orch.dag.build import build_adjacency
 from orch.dag.validate import assert_acyclic
+from orch.exec.budget import FairShareBudget
 from orch.exec.cancel import write_cancel_request
-from orch.exec.runner import run_plan
+from orch.exec.daemon import DaemonSubmitError, SubmitHandler, serve_daemon, submit_run
+from orch.exec.loop import LOOP_CHOICES, resolve_loop, run_with_loop
+from orch.exec.remote import RemoteAddress, parse_address, serve_remote_worker
+from orch.exec.runner import SCHEDULE_MODES, run_plan
 from orch.report.render_md import render_markdown
 from orch.report.summarize import build_summary
 from orch.state.lock import run_lock
@@ -37,6 +44,11 @@ app = typer.Typer(help="CLI agent task orchestrator")
 console = Console()
 _RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
 _RUN_ID_MAX_LEN = 128
+_RESOURCE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+# --max-parallel auto parses to this sentinel; the adaptive ceiling scales with CPU count.
+_MAX_PARALLEL_AUTO = 0
+_AUTO_PARALLEL_PER_CPU = 2
+_DAEMON_SOCKET_NAME = "orchd.sock"
 _SYMLINK_HINT_PATTERN = re.compile(
     r"\bsymlink\w*\b|\bsymbolic(?:ally)?(?:[\s_-]+)?link(?:s|ed|ing)?\b",
     re.IGNORECASE,
@@ -44,9 +56,13 @@ _SYMLINK_HINT_PATTERN = re.compile(
 
 
 def _exit_code_for_state(state: RunState) -> int:
-    if state.status == "SUCCESS":
+    return _exit_code_for_status(state.status)
+
+
+def _exit_code_for_status(status: str) -> int:
+    if status == "SUCCESS":
         return 0
-    if state.status == "CANCELED":
+    if status == "CANCELED":
         return 4
     return 3
 
@@ -74,29 +90,112 @@ def _render_runtime_error_detail(exc: BaseException) -> str:
 
 
 def _task_to_plan_dict(task: TaskSpec) -> dict[str, object]:
-    task_data: dict[str, object] = {
-        "id": task.id,
-        "cmd": task.cmd,
+    task_data: dict[str, object] = {"id": task.id}
+    if task.call is None:
+        task_data["cmd"] = task.cmd
+    else:
+        task_data["call"] = task.call
+        task_data["args"] = task.args
+        task_data["kwargs"] = task.kwargs
+    task_data |= {
         "depends_on": task.depends_on,
         "retries": task.retries,
         "retry_backoff_sec": task.retry_backoff_sec,
         "outputs": task.outputs,
     }
+    if task.inputs:
+        task_data["inputs"] = task.inputs
     if task.cwd is not None:
         task_data["cwd"] = task.cwd
     if task.env is not None:
         task_data["env"] = task.env
     if task.timeout_sec is not None:
         task_data["timeout_sec"] = task.timeout_sec
+    if task.hedge_after_sec is not None:
+        task_data["hedge_after_sec"] = task.hedge_after_sec
+    if task.kill_grace_sec is not None:
+        task_data["kill_grace_sec"] = task.kill_grace_sec
+    if task.kill_signals:
+        task_data["kill_signals"] = task.kill_signals
+    if task.cpu_max is not None:
+        task_data["cpu_max"] = task.cpu_max
+    if task.memory_max is not None:
+        task_data["memory_max"] = task.memory_max
+    if task.priority != 0:
+        task_data["priority"] = task.priority
+    if task.estimate_sec is not None:
+        task_data["estimate_sec"] = task.estimate_sec
+    if task.resources:
+        task_data["resources"] = dict(task.resources)
+    if task.pool is not None:
+        task_data["pool"] = task.pool
+    if task.worker is not None:
+        task_data["worker"] = task.worker
+    if task.emits is not None:
+        task_data["emits"] = task.emits
+    if task.stdin_from is not None:
+        task_data["stdin_from"] = task.stdin_from
     return task_data
 
 
+def _plan_task_dicts(plan: PlanSpec) -> list[dict[str, object]]:
+    """Plan tasks for the snapshot, with each matrix written once as its unexpanded template.
+
+    A dependency on every task of a matrix is written back as the template id, so the snapshot
+    of a fan-in task stays one entry long; loading it expands both again.
+    """
+    template_of = {
+        task_id: name for name, matrix in plan.matrices.items() for task_id in matrix.task_ids
+    }
+    written: set[str] = set()
+    task_dicts: list[dict[str, object]] = []
+    for task in plan.tasks:
+        template = template_of.get(task.id)
+        if template is not None:
+            if template not in written:
+                written.add(template)
+                task_dicts.append(dict(plan.matrices[template].raw))
+            continue
+        task_data = _task_to_plan_dict(task)
+        if plan.matrices and task.depends_on:
+            task_data["depends_on"] = _collapse_fan_in(task.depends_on, plan, template_of)
+        task_dicts.append(task_data)
+    return task_dicts
+
+
+def _collapse_fan_in(
+    depends_on: list[str], plan: PlanSpec, template_of: dict[str, str]
+) -> list[str]:
+    deps = set(depends_on)
+    full = {
+        name
+        for name in {template_of[dep] for dep in depends_on if dep in template_of}
+        if deps.issuperset(plan.matrices[name].task_ids)
+    }
+    collapsed: list[str] = []
+    for dep in depends_on:
+        template = template_of.get(dep)
+        if template in full:
+            if template not in collapsed:
+                collapsed.append(template)
+        else:
+            collapsed.append(dep)
+    return collapsed
+
+
 def _write_plan_snapshot(plan: PlanSpec, destination: Path) -> None:
-    plan_data: dict[str, object] = {"tasks": [_task_to_plan_dict(task) for task in plan.tasks]}
+    plan_data: dict[str, object] = {"tasks": _plan_task_dicts(plan)}
     if plan.goal is not None:
         plan_data["goal"] = plan.goal
     if plan.artifacts_dir is not None:
         plan_data["artifacts_dir"] = plan.artifacts_dir
+    if plan.pools:
+        plan_data["pools"] = dict(plan.pools)
+    if plan.workers:
+        plan_data["workers"] = {
+            name: {"cmd": worker.cmd, "count": worker.count}
+            for name, worker in plan.workers.items()
+        }
     payload = yaml.safe_dump(plan_data, sort_keys=False, allow_unicode=True)
     if has_symlink_ancestor(destination):
         raise OSError(f"plan snapshot path must not include symlink: {destination}")
@@ -242,6 +341,221 @@ def _validate_home_or_exit(home: Path) -> None:
         raise typer.Exit(2)
 
 
+def _parse_max_parallel(value: str | int) -> int:
+    if isinstance(value, int):
+        return value
+    if value.strip().lower() == "auto":
+        return _MAX_PARALLEL_AUTO
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise typer.BadParameter(f"{value!r} is not a valid integer or 'auto'.") from exc
+    if parsed < 1:
+        raise typer.BadParameter(f"{parsed} is not in the range x>=1.")
+    return parsed
+
+
+def _resolve_max_parallel(max_parallel: int) -> tuple[int, bool]:
+    if max_parallel == _MAX_PARALLEL_AUTO:
+        return max(1, (os.cpu_count() or 1) * _AUTO_PARALLEL_PER_CPU), True
+    return max_parallel, False
+
+
+def _validate_schedule_or_exit(schedule: str) -> None:
+    if schedule not in SCHEDULE_MODES:
+        console.print(
+            f"[red]Invalid schedule:[/red] {schedule} (expected: {', '.join(SCHEDULE_MODES)})"
+        )
+        raise typer.Exit(2)
+
+
+def _resolve_loop_or_exit(loop: str) -> str:
+    if loop not in LOOP_CHOICES:
+        console.print(f"[red]Invalid loop:[/red] {loop} (expected: {', '.join(LOOP_CHOICES)})")
+        raise typer.Exit(2)
+    try:
+        return resolve_loop(loop)
+    except RuntimeError as exc:
+        console.print(f"[red]Invalid loop:[/red] {_render_runtime_error_detail(exc)}")
+        raise typer.Exit(2) from exc
+
+
+def _parse_capacity_or_exit(raw: str | None) -> dict[str, float] | None:
+    if raw is None:
+        return None
+    capacity: dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.strip().partition("=")
+        try:
+            limit = float(value)
+        except ValueError:
+            limit = math.nan
+        if (
+            not sep
+            or _RESOURCE_NAME_PATTERN.fullmatch(name) is None
+            or name in capacity
+            or not math.isfinite(limit)
+            or limit <= 0
+        ):
+            console.print(f"[red]Invalid capacity:[/red] {raw} (expected: name=number,...)")
+            raise typer.Exit(2)
+        capacity[name] = limit
+    return capacity
+
+
+def _parse_address_or_exit(raw: str) -> RemoteAddress:
+    try:
+        return parse_address(raw)
+    except ValueError as exc:
+        console.print(f"[red]Invalid address:[/red] {raw} (expected: host:port or unix:/path)")
+        raise typer.Exit(2) from exc
+
+
+def _daemon_address_or_exit(home: Path, raw: str | None) -> RemoteAddress:
+    if raw is None:
+        return RemoteAddress(path=str(home / _DAEMON_SOCKET_NAME))
+    return _parse_address_or_exit(raw)
+
+
+def _daemon_capacity(raw: object) -> dict[str, float] | None:
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        raise DaemonSubmitError("Invalid capacity (expected: name=number,...)")
+    capacity: dict[str, float] = {}
+    for name, limit in raw.items():
+        if (
+            not isinstance(name, str)
+            or _RESOURCE_NAME_PATTERN.fullmatch(name) is None
+            or not isinstance(limit, int | float)
+            or isinstance(limit, bool)
+            or not math.isfinite(limit)
+            or limit <= 0
+        ):
+            raise DaemonSubmitError("Invalid capacity (expected: name=number,...)")
+        capacity[name] = float(limit)
+    return capacity
+
+
+def _daemon_workdir(raw: object) -> Path:
+    if not isinstance(raw, str):
+        raise DaemonSubmitError("Invalid workdir (expected: path)")
+    try:
+        resolved = Path(raw).resolve()
+        meta = resolved.lstat()
+    except (OSError, RuntimeError) as exc:
+        raise DaemonSubmitError(f"Invalid workdir: {raw}") from exc
+    if not stat.S_ISDIR(meta.st_mode):
+        raise DaemonSubmitError(f"Invalid workdir: {raw}")
+    return resolved
+
+
+def _daemon_flag(request: dict[str, Any], name: str, default: bool) -> bool:
+    value = request.get(name, default)
+    if not isinstance(value, bool):
+        raise DaemonSubmitError(f"Invalid {name} (expected: true or false)")
+    return value
+
+
+def _make_daemon_handler(home: Path, *, cgroup_delegate: bool = False) -> SubmitHandler:
+    async def _handle(
+        request: dict[str, Any], budget: FairShareBudget
+    ) -> tuple[str, Path, Awaitable[str]]:
+        # The same checks run/resume apply to their options, before anything is written.
+        plan_path = request.get("plan_path")
+        if not isinstance(plan_path, str):
+            raise DaemonSubmitError("submit request must include plan_path")
+        max_parallel = request.get("max_parallel", 4)
+        if not isinstance(max_parallel, int) or isinstance(max_parallel, bool) or max_parallel < 1:
+            raise DaemonSubmitError("Invalid max_parallel (expected: integer >= 1)")
+        schedule = request.get("schedule", "priority")
+        if schedule not in SCHEDULE_MODES:
+            raise DaemonSubmitError(f"Invalid schedule (expected: {', '.join(SCHEDULE_MODES)})")
+        capacity_limits = _daemon_capacity(request.get("capacity"))
+        workdir = _daemon_workdir(request.get("workdir", "."))
+        fail_fast = _daemon_flag(request, "fail_fast", False)
+        adaptive_parallel = _daemon_flag(request, "adaptive_parallel", False)
+        cache = _daemon_flag(request, "cache", True)
+        incremental = _daemon_flag(request, "incremental", False)
+
+        def _load() -> PlanSpec:
+            plan = load_plan(Path(plan_path))
+            dependents, in_degree = build_adjacency(plan)
+            assert_acyclic([task.id for task in plan.tasks], dependents, in_degree)
+            return plan
+
+        try:
+            # Parsing a large plan must not stall the other runs sharing the daemon's loop.
+            plan = await asyncio.to_thread(_load)
+        except PlanError as exc:
+            raise DaemonSubmitError(f"Plan validation error: {_render_plan_error(exc)}") from exc
+        run_id = new_run_id(datetime.now().astimezone())
+        current_run_dir = run_dir(home, run_id)
+        try:
+            ensure_run_layout(current_run_dir)
+            _write_plan_snapshot(plan, current_run_dir / "plan.yaml")
+        except (OSError, RuntimeError) as exc:
+            raise DaemonSubmitError(
+                f"Failed to initialize run: {_render_runtime_error_detail(exc)}"
+            ) from exc
+
+        async def _finish() -> str:
+            state = await run_plan(
+                plan,
+                current_run_dir,
+                max_parallel=max_parallel,
+                fail_fast=fail_fast,
+                workdir=workdir,
+                resume=False,
+                failed_only=False,
+                schedule=schedule,
+                capacity=capacity_limits,
+                adaptive_parallel=adaptive_parallel,
+                budget=budget,
+                cache=cache,
+                incremental=incremental,
+                cgroup_delegate=cgroup_delegate,
+            )
+            with suppress(OSError, RuntimeError):
+                _write_report(state, current_run_dir)
+            return state.status
+
+        return run_id, current_run_dir, _finish()
+
+    return _handle
+
+
+def _submit_to_daemon_or_exit(address: RemoteAddress, request: dict[str, Any], home: Path) -> int:
+    async def _submit() -> int:
+        async for message in submit_run(address, request):
+            kind = message.get("type")
+            if kind == "accepted":
+                console.print(f"run_id: [bold]{message.get('run_id')}[/bold]")
+            elif kind == "finished":
+                status = str(message.get("status"))
+                daemon_run_dir = message.get("run_dir")
+                if isinstance(daemon_run_dir, str):
+                    report_path = Path(daemon_run_dir) / "report"
+                else:
+                    report_path = run_dir(home, str(message.get("run_id"))) / "report"
+                console.print(f"state: [bold]{status}[/bold]")
+                console.print(f"report: {report_path / 'final_report.md'}")
+                return _exit_code_for_status(status)
+            elif kind == "error":
+                console.print(f"[red]Daemon rejected run:[/red] {message.get('message')}")
+                return 2
+        console.print("[red]Daemon closed the connection before the run finished[/red]")
+        return 2
+
+    try:
+        return asyncio.run(_submit())
+    except (OSError, RuntimeError) as exc:
+        console.print(
+            f"[red]Daemon not reachable:[/red] {address} ({_render_runtime_error_detail(exc)})"
+        )
+        raise typer.Exit(2) from exc
+
+
 def _validate_run_id_or_exit(run_id: str) -> None:
     if len(run_id) > _RUN_ID_MAX_LEN or _RUN_ID_PATTERN.fullmatch(run_id) is None:
         console.print(f"[red]Invalid run_id:[/red] {run_id}")
@@ -251,13 +565,38 @@ def _validate_run_id_or_exit(run_id: str) -> None:
 @app.command()
 def run(
     plan_path: Annotated[Path, typer.Argument(exists=True)],
-    max_parallel: Annotated[int, typer.Option("--max-parallel", min=1)] = 4,
+    max_parallel: Annotated[
+        int, typer.Option("--max-parallel", parser=_parse_max_parallel, metavar="INTEGER|auto")
+    ] = 4,
     home: Annotated[Path, typer.Option("--home")] = Path(".orch"),
     workdir: Annotated[Path, typer.Option("--workdir")] = Path("."),
     fail_fast: Annotated[bool, typer.Option("--fail-fast/--no-fail-fast")] = False,
     dry_run: Annotated[bool, typer.Option("--dry-run")] = False,
+    schedule: Annotated[str, typer.Option("--schedule")] = "priority",
+    capacity: Annotated[str | None, typer.Option("--capacity")] = None,
+    listen: Annotated[str | None, typer.Option("--listen")] = None,
+    daemon: Annotated[bool, typer.Option("--daemon")] = False,
+    daemon_address: Annotated[str | None, typer.Option("--daemon-address")] = None,
+    cache: Annotated[bool, typer.Option("--cache/--no-cache")] = True,
+    incremental: Annotated[bool, typer.Option("--incremental")] = False,
+    loop: Annotated[str, typer.Option("--loop")] = "auto",
+    cgroup_delegate: Annotated[bool, typer.Option("--cgroup-delegate")] = False,
 ) -> None:
     _validate_home_or_exit(home)
+    _validate_schedule_or_exit(schedule)
+    event_loop = _resolve_loop_or_exit(loop)
+    capacity_limits = _parse_capacity_or_exit(capacity)
+    if listen is not None:
+        _parse_address_or_exit(listen)
+    if daemon and listen is not None:
+        console.print("[red]--daemon cannot be combined with --listen[/red]")
+        raise typer.Exit(2)
+    if daemon and cgroup_delegate:
+        console.print(
+            "[red]--daemon cannot be combined with --cgroup-delegate (pass it to orch serve)[/red]"
+        )
+        raise typer.Exit(2)
+    parallel_limit, adaptive_parallel = _resolve_max_parallel(max_parallel)
     try:
         plan = load_plan(plan_path)
         dependents, in_degree = build_adjacency(plan)
@@ -276,6 +615,25 @@ def run(
         raise typer.Exit(0)
 
     resolved_workdir = _resolve_workdir_or_exit(workdir)
+    if daemon:
+        try:
+            resolved_plan_path = plan_path.resolve()
+        except (OSError, RuntimeError) as exc:
+            console.print(f"[red]Invalid plan path:[/red] {plan_path}")
+            raise typer.Exit(2) from exc
+        request = {
+            "plan_path": str(resolved_plan_path),
+            "workdir": str(resolved_workdir),
+            "max_parallel": parallel_limit,
+            "adaptive_parallel": adaptive_parallel,
+            "fail_fast": fail_fast,
+            "schedule": schedule,
+            "capacity": capacity_limits,
+            "cache": cache,
+            "incremental": incremental,
+        }
+        address = _daemon_address_or_exit(home, daemon_address)
+        raise typer.Exit(_submit_to_daemon_or_exit(address, request, home))
     run_id = new_run_id(datetime.now().astimezone())
     current_run_dir = run_dir(home, run_id)
     try:
@@ -286,16 +644,24 @@ def run(
         raise typer.Exit(2) from exc
 
     try:
-        state = asyncio.run(
+        state = run_with_loop(
             run_plan(
                 plan,
                 current_run_dir,
-                max_parallel=max_parallel,
+                max_parallel=parallel_limit,
                 fail_fast=fail_fast,
                 workdir=resolved_workdir,
                 resume=False,
                 failed_only=False,
-            )
+                schedule=schedule,
+                capacity=capacity_limits,
+                adaptive_parallel=adaptive_parallel,
+                listen=listen,
+                cache=cache,
+                incremental=incremental,
+                cgroup_delegate=cgroup_delegate,
+            ),
+            event_loop,
         )
     except (OSError, RuntimeError) as exc:
         console.print(f"[red]Run execution failed:[/red] {_render_runtime_error_detail(exc)}")
@@ -317,13 +683,28 @@ def run(
 def resume(
     run_id: Annotated[str, typer.Argument()],
     home: Annotated[Path, typer.Option("--home")] = Path(".orch"),
-    max_parallel: Annotated[int, typer.Option("--max-parallel", min=1)] = 4,
+    max_parallel: Annotated[
+        int, typer.Option("--max-parallel", parser=_parse_max_parallel, metavar="INTEGER|auto")
+    ] = 4,
     workdir: Annotated[Path, typer.Option("--workdir")] = Path("."),
     fail_fast: Annotated[bool, typer.Option("--fail-fast/--no-fail-fast")] = False,
     failed_only: Annotated[bool, typer.Option("--failed-only")] = False,
+    schedule: Annotated[str, typer.Option("--schedule")] = "priority",
+    capacity: Annotated[str | None, typer.Option("--capacity")] = None,
+    listen: Annotated[str | None, typer.Option("--listen")] = None,
+    cache: Annotated[bool, typer.Option("--cache/--no-cache")] = True,
+    incremental: Annotated[bool, typer.Option("--incremental")] = False,
+    loop: Annotated[str, typer.Option("--loop")] = "auto",
+    cgroup_delegate: Annotated[bool, typer.Option("--cgroup-delegate")] = False,
 ) -> None:
     _validate_run_id_or_exit(run_id)
     _validate_home_or_exit(home)
+    _validate_schedule_or_exit(schedule)
+    event_loop = _resolve_loop_or_exit(loop)
+    capacity_limits = _parse_capacity_or_exit(capacity)
+    if listen is not None:
+        _parse_address_or_exit(listen)
+    parallel_limit, adaptive_parallel = _resolve_max_parallel(max_parallel)
     resolved_workdir = _resolve_workdir_or_exit(workdir)
     current_run_dir = run_dir(home, run_id)
     try:
@@ -331,16 +712,24 @@ def resume(
             plan = load_plan(current_run_dir / "plan.yaml")
             dependents, in_degree = build_adjacency(plan)
             assert_acyclic([task.id for task in plan.tasks], dependents, in_degree)
-            state = asyncio.run(
+            state = run_with_loop(
                 run_plan(
                     plan,
                     current_run_dir,
-                    max_parallel=max_parallel,
+                    max_parallel=parallel_limit,
                     fail_fast=fail_fast,
                     workdir=resolved_workdir,
                     resume=True,
                     failed_only=failed_only,
-                )
+                    schedule=schedule,
+                    capacity=capacity_limits,
+                    adaptive_parallel=adaptive_parallel,
+                    listen=listen,
+                    cache=cache,
+                    incremental=incremental,
+                    cgroup_delegate=cgroup_delegate,
+                ),
+                event_loop,
             )
     except (StateError, FileNotFoundError, OSError, RuntimeError) as exc:
         console.print(f"[red]Run not found or broken:[/red] {_render_runtime_error_detail(exc)}")
@@ -486,5 +875,72 @@ def cancel(
     console.print(f"cancel requested: [bold]{run_id}[/bold]")
 
 
+@app.command()
+def serve(
+    home: Annotated[Path, typer.Option("--home")] = Path(".orch"),
+    address: Annotated[str | None, typer.Option("--address")] = None,
+    slots: Annotated[int | None, typer.Option("--slots", min=1)] = None,
+    capacity: Annotated[str | None, typer.Option("--capacity")] = None,
+    cgroup_delegate: Annotated[bool, typer.Option("--cgroup-delegate")] = False,
+) -> None:
+    _validate_home_or_exit(home)
+    capacity_limits = _parse_capacity_or_exit(capacity)
+    daemon_address = _daemon_address_or_exit(home, address)
+    budget = FairShareBudget(slots or os.cpu_count() or 1, capacity_limits)
+    try:
+        home.mkdir(parents=True, exist_ok=True)
+    except (OSError, RuntimeError) as exc:
+        console.print(f"[red]Invalid home:[/red] {home}")
+        raise typer.Exit(2) from exc
+
+    async def _serve() -> None:
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop_event.set)
+        await serve_daemon(
+            daemon_address,
+            budget,
+            _make_daemon_handler(home, cgroup_delegate=cgroup_delegate),
+            stop_event=stop_event,
+            on_ready=lambda: console.print(
+                f"serving on {daemon_address} (slots: {budget.slots})", highlight=False
+            ),
+        )
+
+    try:
+        asyncio.run(_serve())
+    except (OSError, RuntimeError) as exc:
+        console.print(f"[red]Failed to serve:[/red] {_render_runtime_error_detail(exc)}")
+        raise typer.Exit(2) from exc
+
+
+@app.command()
+def worker(
+    connect: Annotated[str, typer.Option("--connect")],
+    slots: Annotated[int, typer.Option("--slots", min=1)] = 4,
+    workdir: Annotated[Path, typer.Option("--workdir")] = Path("."),
+    name: Annotated[str | None, typer.Option("--name")] = None,
+    connect_timeout: Annotated[float, typer.Option("--connect-timeout", min=0)] = 30.0,
+) -> None:
+    address = _parse_address_or_exit(connect)
+    resolved_workdir = _resolve_workdir_or_exit(workdir)
+    try:
+        asyncio.run(
+            serve_remote_worker(
+                address,
+                slots=slots,
+                workdir=resolved_workdir,
+                name=name,
+                connect_timeout_sec=connect_timeout,
+            )
+        )
+    except (OSError, RuntimeError) as exc:
+        console.print(
+            f"[red]Failed to connect:[/red] {address} ({_render_runtime_error_detail(exc)})"
+        )
+        raise typer.Exit(2) from exc
+
+
 if __name__ == "__main__":
     app()
@@ -1,26 +1,35 @@
 from __future__ import annotations
 
 import errno
+import itertools
+import json
 import math
 import os
 import re
 import shlex
+import signal
 import stat
+import string
+from collections.abc import Callable
 from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
 import yaml
 
-from orch.config.schema import PlanSpec, TaskSpec
-from orch.dag.build import build_adjacency
-from orch.dag.validate import assert_acyclic
+from orch.config.schema import MatrixSpec, PlanSpec, TaskSpec, WorkerSpec
+from orch.dag.pipeline import add_pipeline_edges, pipeline_groups
+from orch.dag.validate import assert_acyclic, assert_no_cycle
 from orch.util.errors import PlanError
 from orch.util.path_guard import has_symlink_ancestor
 
 _SAFE_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
 _TASK_ID_MAX_LEN = 128
-_ALLOWED_PLAN_KEYS = {"goal", "artifacts_dir", "tasks"}
+_MEMORY_SIZE_PATTERN = re.compile(r"^([1-9][0-9]*)([KMGT]?)$")
+_MEMORY_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+_CALL_TARGET_PATTERN = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*:[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$")
+_ALLOWED_PLAN_KEYS = {"goal", "artifacts_dir", "tasks", "pools", "workers"}
+_ALLOWED_WORKER_KEYS = {"cmd", "count"}
 _ALLOWED_TASK_KEYS = {
     "id",
     "cmd",
@@ -31,7 +40,26 @@ _ALLOWED_TASK_KEYS = {
     "retries",
     "retry_backoff_sec",
     "outputs",
+    "inputs",
+    "priority",
+    "estimate_sec",
+    "resources",
+    "pool",
+    "call",
+    "args",
+    "kwargs",
+    "worker",
+    "hedge_after_sec",
+    "kill_grace_sec",
+    "kill_signals",
+    "cpu_max",
+    "memory_max",
+    "matrix",
+    "emits",
+    "stdin_from",
 }
+# Task fields whose strings may contain ``{name}`` placeholders for matrix values.
+_MATRIX_TEMPLATED_KEYS = ("id", "cmd", "env", "outputs", "inputs", "depends_on", "stdin_from")
 
 
 def _is_real_number(value: object) -> bool:
@@ -44,6 +72,27 @@ def _is_finite_real_number(value: object) -> bool:
     return math.isfinite(value)
 
 
+def _parse_memory_size(value: object) -> int | None:
+    """Accept a positive byte count or a string like ``512M`` / ``2G`` (binary units)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value > 0 else None
+    if not isinstance(value, str):
+        return None
+    match = _MEMORY_SIZE_PATTERN.match(value.strip().upper())
+    if match is None:
+        return None
+    return int(match.group(1)) * _MEMORY_UNITS[match.group(2)]
+
+
+def _is_signal_name(value: object) -> bool:
+    return (
+        isinstance(value, str)
+        and value.startswith("SIG")
+        and not value.startswith("SIG_")
+        and isinstance(getattr(signal, value, None), signal.Signals)
+    )
+
+
 def _is_non_blank_str(value: object) -> bool:
     return isinstance(value, str) and bool(value.strip()) and "\x00" not in value
 
@@ -78,6 +127,33 @@ def normalize_cmd(cmd: str | list[str]) -> list[str]:
     raise PlanError("cmd must be str or non-empty list[str]")
 
 
+def _call_display_cmd(call: str, args: list[Any], kwargs: dict[str, Any]) -> list[str]:
+    """Command-like description of a ``call:`` task, stored in state and compared on history."""
+    cmd = ["call", call]
+    if args or kwargs:
+        cmd.append(json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=str))
+    return cmd
+
+
+def _parse_call(raw: dict[str, Any]) -> tuple[str | None, list[Any], dict[str, Any]]:
+    call = raw.get("call")
+    call_args = raw.get("args", [])
+    call_kwargs = raw.get("kwargs", {})
+    if call is None:
+        if "args" in raw or "kwargs" in raw:
+            raise PlanError(f"task '{raw['id']}' args/kwargs require call")
+        return None, [], {}
+    if not isinstance(call, str) or _CALL_TARGET_PATTERN.fullmatch(call) is None:
+        raise PlanError(f"task '{raw['id']}' call must look like 'package.module:function'")
+    if not isinstance(call_args, list):
+        raise PlanError(f"task '{raw['id']}' args must be list")
+    if not isinstance(call_kwargs, dict) or not all(
+        isinstance(key, str) and key.isidentifier() for key in call_kwargs
+    ):
+        raise PlanError(f"task '{raw['id']}' kwargs must be dict[identifier, value]")
+    return call, call_args, call_kwargs
+
+
 def _ensure_list_str(name: str, value: Any, *, non_empty_items: bool = False) -> list[str]:
     if value is None:
         return []
@@ -102,8 +178,11 @@ def _parse_task(raw: Any) -> TaskSpec:
     unknown = set(raw.keys()) - _ALLOWED_TASK_KEYS
     if unknown:
         raise PlanError(f"task '{raw['id']}' has unknown fields: {sorted(unknown)}")
-    if "cmd" not in raw:
+    if "cmd" in raw and "call" in raw:
+        raise PlanError(f"task '{raw['id']}' must set only one of cmd or call")
+    if "cmd" not in raw and "call" not in raw:
         raise PlanError(f"task '{raw['id']}' missing cmd")
+    call, call_args, call_kwargs = _parse_call(raw)
 
     retries = raw.get("retries", 0)
     if not isinstance(retries, int) or isinstance(retries, bool) or retries < 0:
@@ -115,6 +194,46 @@ def _parse_task(raw: Any) -> TaskSpec:
             raise PlanError(f"task '{raw['id']}' timeout_sec must be > 0")
         timeout_sec = float(timeout_sec)
 
+    hedge_after_sec = raw.get("hedge_after_sec")
+    if hedge_after_sec is not None:
+        if not _is_finite_real_number(hedge_after_sec) or hedge_after_sec <= 0:
+            raise PlanError(f"task '{raw['id']}' hedge_after_sec must be > 0")
+        if call is not None:
+            raise PlanError(f"task '{raw['id']}' must not set hedge_after_sec with call")
+        hedge_after_sec = float(hedge_after_sec)
+
+    kill_grace_sec = raw.get("kill_grace_sec")
+    if kill_grace_sec is not None:
+        if not _is_finite_real_number(kill_grace_sec) or kill_grace_sec < 0:
+            raise PlanError(f"task '{raw['id']}' kill_grace_sec must be >= 0")
+        kill_grace_sec = float(kill_grace_sec)
+
+    kill_signals = raw.get("kill_signals", [])
+    if not isinstance(kill_signals, list) or not all(_is_signal_name(v) for v in kill_signals):
+        raise PlanError(f"task '{raw['id']}' kill_signals must be list of signal names")
+    if (kill_grace_sec is not None or kill_signals) and call is not None:
+        raise PlanError(f"task '{raw['id']}' must not set kill_grace_sec or kill_signals with call")
+
+    cpu_max = raw.get("cpu_max")
+    if cpu_max is not None:
+        if not _is_finite_real_number(cpu_max) or cpu_max <= 0:
+            raise PlanError(f"task '{raw['id']}' cpu_max must be > 0")
+        cpu_max = float(cpu_max)
+
+    memory_max = raw.get("memory_max")
+    if memory_max is not None:
+        memory_max = _parse_memory_size(memory_max)
+        if memory_max is None:
+            raise PlanError(f"task '{raw['id']}' memory_max must be bytes > 0 or size like 512M")
+    if (cpu_max is not None or memory_max is not None) and call is not None:
+        raise PlanError(f"task '{raw['id']}' must not set cpu_max or memory_max with call")
+
+    estimate_sec = raw.get("estimate_sec")
+    if estimate_sec is not None:
+        if not _is_finite_real_number(estimate_sec) or estimate_sec < 0:
+            raise PlanError(f"task '{raw['id']}' estimate_sec must be >= 0")
+        estimate_sec = float(estimate_sec)
+
     raw_backoff = raw.get("retry_backoff_sec", [])
     if not isinstance(raw_backoff, list) or not all(
         _is_finite_real_number(v) and v >= 0 for v in raw_backoff
@@ -124,13 +243,44 @@ def _parse_task(raw: Any) -> TaskSpec:
     if len(retry_backoff) > retries:
         raise PlanError(f"task '{raw['id']}' retry_backoff_sec length must be <= retries")
 
+    priority = raw.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise PlanError(f"task '{raw['id']}' priority must be int")
+
+    raw_resources = raw.get("resources", {})
+    if not isinstance(raw_resources, dict) or not all(
+        _is_safe_id(k) and _is_finite_real_number(v) and v >= 0 for k, v in raw_resources.items()
+    ):
+        raise PlanError(f"task '{raw['id']}' resources must be dict[name, number>=0]")
+    resources = {k: float(v) for k, v in raw_resources.items()}
+
     depends_on = _ensure_list_str("depends_on", raw.get("depends_on", []), non_empty_items=True)
     outputs = _ensure_list_str("outputs", raw.get("outputs", []), non_empty_items=True)
+    inputs = _ensure_list_str("inputs", raw.get("inputs", []), non_empty_items=True)
 
     cwd = raw.get("cwd")
     if cwd is not None and not _is_non_blank_str(cwd):
         raise PlanError(f"task '{raw['id']}' cwd must be non-empty string")
 
+    pool = raw.get("pool")
+    if pool is not None and not _is_safe_id(pool):
+        raise PlanError(f"task '{raw['id']}' pool must match ^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+    worker = raw.get("worker")
+    if worker is not None:
+        if not _is_safe_id(worker):
+            raise PlanError(f"task '{raw['id']}' worker must match ^[A-Za-z0-9][A-Za-z0-9._-]*$")
+        if call is not None:
+            raise PlanError(f"task '{raw['id']}' must set only one of call or worker")
+        if hedge_after_sec is not None:
+            raise PlanError(f"task '{raw['id']}' must not set hedge_after_sec with worker")
+        if kill_grace_sec is not None or kill_signals:
+            raise PlanError(
+                f"task '{raw['id']}' must not set kill_grace_sec or kill_signals with worker"
+            )
+        if cpu_max is not None or memory_max is not None:
+            raise PlanError(f"task '{raw['id']}' must not set cpu_max or memory_max with worker")
+
     env = raw.get("env")
     if env is not None and (
         not isinstance(env, dict)
@@ -138,9 +288,27 @@ def _parse_task(raw: Any) -> TaskSpec:
     ):
         raise PlanError(f"task '{raw['id']}' env must be dict[str, str]")
 
+    emits = raw.get("emits")
+    if emits is not None and not (_is_non_blank_str(emits) and _is_str_without_nul(emits)):
+        raise PlanError(f"task '{raw['id']}' emits must be non-empty path string")
+
+    stdin_from = raw.get("stdin_from")
+    if stdin_from is not None:
+        if not _is_safe_id(stdin_from):
+            raise PlanError(
+                f"task '{raw['id']}' stdin_from must match ^[A-Za-z0-9][A-Za-z0-9._-]*$"
+            )
+        if call is not None or worker is not None:
+            raise PlanError(f"task '{raw['id']}' must not set stdin_from with call or worker")
+        _reject_pipeline_fields(raw["id"], retries, hedge_after_sec, inputs)
+
     return TaskSpec(
         id=raw["id"],
-        cmd=normalize_cmd(raw["cmd"]),
+        cmd=(
+            normalize_cmd(raw["cmd"])
+            if call is None
+            else _call_display_cmd(call, call_args, call_kwargs)
+        ),
         depends_on=depends_on,
         cwd=cwd,
         env=env,
@@ -148,9 +316,232 @@ def _parse_task(raw: Any) -> TaskSpec:
         retries=retries,
         retry_backoff_sec=retry_backoff,
         outputs=outputs,
+        inputs=inputs,
+        priority=priority,
+        estimate_sec=estimate_sec,
+        resources=resources,
+        pool=pool,
+        call=call,
+        args=call_args,
+        kwargs=call_kwargs,
+        worker=worker,
+        hedge_after_sec=hedge_after_sec,
+        kill_grace_sec=kill_grace_sec,
+        kill_signals=kill_signals,
+        cpu_max=cpu_max,
+        memory_max=memory_max,
+        emits=emits,
+        stdin_from=stdin_from,
     )
 
 
+def _reject_pipeline_fields(
+    task_id: str, retries: int, hedge_after_sec: float | None, inputs: list[str]
+) -> None:
+    # Both ends of a pipe run exactly once, together: a retry, hedge or cache hit on one side
+    # would leave the other without its stream.
+    if retries or hedge_after_sec is not None or inputs:
+        raise PlanError(
+            f"task '{task_id}' must not set retries, hedge_after_sec or inputs with stdin_from"
+        )
+
+
+def _compile_matrix_template(template: str, keys: list[str], label: str) -> tuple[str, set[str]]:
+    """Rewrite ``{name}`` placeholders as positional fields so rendering is one ``str.format``."""
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as exc:
+        raise PlanError(f"task '{label}' has invalid matrix template {template!r}: {exc}") from exc
+    parts: list[str] = []
+    fields: set[str] = set()
+    for literal, field_name, format_spec, conversion in parsed:
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field_name is None:
+            continue
+        if field_name not in keys or format_spec or conversion:
+            raise PlanError(
+                f"task '{label}' template {template!r} must only use {{name}} of matrix keys"
+            )
+        parts.append(f"{{{keys.index(field_name)}}}")
+        fields.add(field_name)
+    return "".join(parts), fields
+
+
+def _parse_matrix(raw: dict[str, Any]) -> tuple[list[str], list[list[str]]]:
+    label = raw["id"]
+    matrix = raw["matrix"]
+    if (
+        not isinstance(matrix, dict)
+        or not matrix
+        or not all(isinstance(key, str) and key.isidentifier() for key in matrix)
+    ):
+        raise PlanError(f"task '{label}' matrix must be non-empty dict[identifier, list]")
+    keys = list(matrix)
+    axes: list[list[str]] = []
+    for key in keys:
+        values = matrix[key]
+        if (
+            not isinstance(values, list)
+            or not values
+            or not all(
+                (isinstance(v, int) and not isinstance(v, bool)) or _is_non_blank_str(v)
+                for v in values
+            )
+        ):
+            raise PlanError(f"task '{label}' matrix.{key} must be non-empty list[str | int]")
+        rendered = [str(v) for v in values]
+        if len(set(rendered)) != len(rendered):
+            raise PlanError(f"task '{label}' matrix.{key} has duplicate values")
+        axes.append(rendered)
+    return keys, axes
+
+
+def _expand_matrix(raw: Any) -> list[TaskSpec]:
+    """Expand a task with ``matrix:`` into one TaskSpec per combination of matrix values.
+
+    The first combination goes through ``_parse_task`` so every shared field is validated once;
+    the rest only re-render and re-check the templated fields, which keeps large matrices cheap.
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get("id"), str):
+        raise PlanError("task.id is required and must be non-empty string")
+    label = raw["id"]
+    if "call" in raw:
+        raise PlanError(f"task '{label}' must not set matrix with call")
+    if "emits" in raw:
+        raise PlanError(f"task '{label}' must not set matrix with emits")
+    keys, axes = _parse_matrix(raw)
+
+    templates = {key: value for key, value in raw.items() if key != "matrix"}
+    if isinstance(templates.get("cmd"), str):
+        templates["cmd"] = normalize_cmd(templates["cmd"])
+    for name in ("cmd", "outputs", "inputs", "depends_on"):
+        templates[name] = _ensure_list_str(name, templates.get(name, []), non_empty_items=True)
+    env_template = templates.get("env")
+    if env_template is not None and (
+        not isinstance(env_template, dict)
+        or not all(isinstance(v, str) for v in env_template.values())
+    ):
+        raise PlanError(f"task '{label}' env must be dict[str, str]")
+
+    def _list_renderer(name: str) -> Callable[[tuple[str, ...]], list[str]]:
+        items = [_compile_matrix_template(item, keys, label) for item in templates[name]]
+        literals = [template.format() if not fields else template for template, fields in items]
+        slots = [(i, template) for i, (template, fields) in enumerate(items) if fields]
+        if not slots:
+            return lambda combo: list(literals)
+
+        def _render_list(combo: tuple[str, ...]) -> list[str]:
+            rendered = list(literals)
+            for i, template in slots:
+                rendered[i] = template.format(*combo)
+            return rendered
+
+        return _render_list
+
+    id_t, id_fields = _compile_matrix_template(label, keys, label)
+    if id_fields != set(keys):
+        raise PlanError(f"task '{label}' id must reference every matrix key")
+    render_cmd, render_outputs, render_inputs, render_deps = (
+        _list_renderer(name) for name in ("cmd", "outputs", "inputs", "depends_on")
+    )
+    env_t = (
+        None
+        if env_template is None
+        else {k: _compile_matrix_template(v, keys, label)[0] for k, v in env_template.items()}
+    )
+    stdin_template = templates.get("stdin_from")
+    stdin_t = (
+        _compile_matrix_template(stdin_template, keys, label)[0]
+        if isinstance(stdin_template, str)
+        else None
+    )
+
+    def _render(combo: tuple[str, ...]) -> dict[str, Any]:
+        return {
+            "id": id_t.format(*combo),
+            "cmd": render_cmd(combo),
+            "outputs": render_outputs(combo),
+            "inputs": render_inputs(combo),
+            "depends_on": render_deps(combo),
+            "env": None if env_t is None else {k: v.format(*combo) for k, v in env_t.items()},
+            "stdin_from": stdin_template if stdin_t is None else stdin_t.format(*combo),
+        }
+
+    combos = itertools.product(*axes)
+    base = _parse_task({**templates, **_render(next(combos))})
+    # Matrix values are non-blank and NUL-free, so a template that passed _parse_task renders to
+    # valid strings for every combination; only the ids still need checking, and not even those
+    # when every value is itself a safe id and the longest values still fit.
+    check_ids = not all(_is_safe_id(value) for axis in axes for value in axis) or (
+        len(id_t.format(*(max(axis, key=len) for axis in axes))) > _TASK_ID_MAX_LEN
+    )
+    # Containers are copied per task so that no two tasks share a mutable list or dict.
+    backoff, resources, kill_signals = base.retry_backoff_sec, base.resources, base.kill_signals
+    cwd, timeout_sec, retries, priority = base.cwd, base.timeout_sec, base.retries, base.priority
+    estimate_sec, pool, worker = base.estimate_sec, base.pool, base.worker
+    hedge_after_sec, kill_grace_sec = base.hedge_after_sec, base.kill_grace_sec
+    cpu_max, memory_max = base.cpu_max, base.memory_max
+    expanded = [base]
+    for combo in combos:
+        task_id = id_t.format(*combo)
+        if check_ids and (len(task_id) > _TASK_ID_MAX_LEN or not _is_safe_id(task_id)):
+            raise PlanError(f"task '{label}' expands to invalid task.id: {task_id!r}")
+        expanded.append(
+            TaskSpec(
+                id=task_id,
+                cmd=render_cmd(combo),
+                depends_on=render_deps(combo),
+                cwd=cwd,
+                env=None if env_t is None else {k: v.format(*combo) for k, v in env_t.items()},
+                timeout_sec=timeout_sec,
+                retries=retries,
+                retry_backoff_sec=backoff.copy(),
+                outputs=render_outputs(combo),
+                inputs=render_inputs(combo),
+                priority=priority,
+                estimate_sec=estimate_sec,
+                resources=resources.copy(),
+                pool=pool,
+                worker=worker,
+                hedge_after_sec=hedge_after_sec,
+                kill_grace_sec=kill_grace_sec,
+                kill_signals=kill_signals.copy(),
+                cpu_max=cpu_max,
+                memory_max=memory_max,
+                stdin_from=None if stdin_t is None else stdin_t.format(*combo),
+            )
+        )
+    return expanded
+
+
+def _apply_fan_in(tasks: list[TaskSpec], groups: dict[str, list[str]]) -> None:
+    """Replace a dependency on a matrix task's template id with every task it expanded to."""
+    for task in tasks:
+        if not any(dep in groups for dep in task.depends_on):
+            continue
+        depends_on: list[str] = []
+        for dep in task.depends_on:
+            depends_on.extend(groups.get(dep, [dep]))
+        task.depends_on = list(dict.fromkeys(depends_on))
+
+
+def _parse_workers(raw_workers: Any) -> dict[str, WorkerSpec]:
+    if not isinstance(raw_workers, dict) or not all(_is_safe_id(name) for name in raw_workers):
+        raise PlanError("plan.workers must be dict[name, worker]")
+    workers: dict[str, WorkerSpec] = {}
+    for name, raw in raw_workers.items():
+        if not isinstance(raw, dict) or "cmd" not in raw:
+            raise PlanError(f"worker '{name}' must be mapping with cmd")
+        unknown = set(raw.keys()) - _ALLOWED_WORKER_KEYS
+        if unknown:
+            raise PlanError(f"worker '{name}' has unknown fields: {sorted(unknown)}")
+        count = raw.get("count", 1)
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            raise PlanError(f"worker '{name}' count must be int >= 1")
+        workers[name] = WorkerSpec(cmd=normalize_cmd(raw["cmd"]), count=count)
+    return workers
+
+
 def validate_plan(plan: PlanSpec) -> None:
     if not plan.tasks:
         raise PlanError("plan.tasks must contain at least one task")
@@ -164,35 +555,153 @@ def validate_plan(plan: PlanSpec) -> None:
 
     known = set(ids)
     for task in plan.tasks:
+        _validate_task_references(task, known, plan)
+    spec_by_id = {task.id: task for task in plan.tasks}
+    groups = _validate_pipelines(plan.tasks, spec_by_id)
+
+    # The same ordering add_pipeline_edges imposes, expressed as extra depends_on edges.
+    depends_on = {task.id: task.depends_on for task in plan.tasks}
+    for head, chain in groups.items():
+        gate = {dep for member in chain[1:] for dep in spec_by_id[member].depends_on}
+        depends_on[head] = [*depends_on[head], *(gate - set(chain))]
+        for member in chain[1:]:
+            depends_on[member] = [*depends_on[member], head]
+    assert_no_cycle(depends_on)
+
+
+def _validate_pipelines(
+    tasks: list[TaskSpec], spec_by_id: dict[str, TaskSpec]
+) -> dict[str, list[str]]:
+    """Check ``stdin_from`` links and return the chains they form."""
+    streamed_to: dict[str, str] = {}
+    for task in tasks:
+        if task.stdin_from is None:
+            continue
+        producer = spec_by_id.get(task.stdin_from)
+        if producer is None:
+            raise PlanError(f"task '{task.id}' streams from unknown task: {task.stdin_from}")
+        if producer.id == task.id:
+            raise PlanError(f"task '{task.id}' must not stream from itself")
+        if producer.id in streamed_to:
+            raise PlanError(f"task '{producer.id}' must not stream to more than one task")
+        if producer.call is not None or producer.worker is not None:
+            raise PlanError(f"task '{producer.id}' streams to '{task.id}' so must set cmd")
+        if producer.retries or producer.hedge_after_sec is not None or producer.inputs:
+            raise PlanError(
+                f"task '{producer.id}' streams to '{task.id}' so must not set retries, "
+                "hedge_after_sec or inputs"
+            )
+        streamed_to[producer.id] = task.id
+    groups = pipeline_groups(tasks)
+    if sum(len(chain) - 1 for chain in groups.values()) != len(streamed_to):
+        raise PlanError("stdin_from links form a cycle")
+    for chain in groups.values():
+        members = set(chain)
+        for member in chain:
+            if not members.isdisjoint(spec_by_id[member].depends_on):
+                raise PlanError(
+                    f"task '{member}' must not depend on a task in its own stdin_from chain"
+                )
+    return groups
+
+
+def _validate_task_references(task: TaskSpec, known: set[str], plan: PlanSpec) -> None:
+    # Length guards keep this cheap for the many single-dep/single-output tasks of a large matrix.
+    if task.depends_on:
         unknown = [dep for dep in task.depends_on if dep not in known]
         if unknown:
             raise PlanError(f"task '{task.id}' has unknown dependencies: {unknown}")
         if task.id in task.depends_on:
             raise PlanError(f"task '{task.id}' must not depend on itself")
-        if len(set(task.depends_on)) != len(task.depends_on):
+        if len(task.depends_on) > 1 and len(set(task.depends_on)) != len(task.depends_on):
             raise PlanError(f"task '{task.id}' has duplicate dependencies")
-        if len({output.casefold() for output in task.outputs}) != len(task.outputs):
-            raise PlanError(f"task '{task.id}' has duplicate outputs")
-
-    dependents, in_degree = build_adjacency(plan)
-    assert_acyclic(ids, dependents, in_degree)
-
-
-def load_plan(path: Path) -> PlanSpec:
+    if len(task.outputs) > 1 and len({output.casefold() for output in task.outputs}) != len(
+        task.outputs
+    ):
+        raise PlanError(f"task '{task.id}' has duplicate outputs")
+    if len(task.inputs) > 1 and len({pattern.casefold() for pattern in task.inputs}) != len(
+        task.inputs
+    ):
+        raise PlanError(f"task '{task.id}' has duplicate inputs")
+    if task.pool is not None and task.pool not in plan.pools:
+        raise PlanError(f"task '{task.id}' uses unknown pool: {task.pool}")
+    if task.worker is not None and task.worker not in plan.workers:
+        raise PlanError(f"task '{task.id}' uses unknown worker: {task.worker}")
+
+
+def _parse_task_list(raw_tasks: list[Any]) -> tuple[list[TaskSpec], dict[str, MatrixSpec]]:
+    tasks: list[TaskSpec] = []
+    matrices: dict[str, MatrixSpec] = {}
+    for raw_task in raw_tasks:
+        if isinstance(raw_task, dict) and "matrix" in raw_task:
+            expanded = _expand_matrix(raw_task)
+            matrices[raw_task["id"]] = MatrixSpec(
+                raw=raw_task, task_ids=[task.id for task in expanded]
+            )
+            tasks.extend(expanded)
+        else:
+            tasks.append(_parse_task(raw_task))
+    if matrices:
+        _apply_fan_in(tasks, {name: matrix.task_ids for name, matrix in matrices.items()})
+    return tasks, matrices
+
+
+def parse_emitted_tasks(raw_tasks: Any, plan: PlanSpec, emitter: str) -> list[TaskSpec]:
+    """Validate tasks emitted at runtime by ``emitter`` against the live plan.
+
+    They use the same fields as plan tasks and each one depends on ``emitter``. Ids must be new,
+    and dependencies may only name existing tasks or other emitted ones. Nothing in the plan
+    can depend on the new tasks, so only they need the acyclicity check.
+    """
+    if not isinstance(raw_tasks, list):
+        raise PlanError(f"tasks emitted by '{emitter}' must be a list")
+    tasks, _ = _parse_task_list(raw_tasks)
+    for task in tasks:
+        if emitter not in task.depends_on:
+            task.depends_on = [emitter, *task.depends_on]
+
+    new_ids = [task.id for task in tasks]
+    existing = {task.id.casefold() for task in plan.tasks}
+    folded_new = [task_id.casefold() for task_id in new_ids]
+    if len(set(folded_new)) != len(folded_new) or not existing.isdisjoint(folded_new):
+        raise PlanError(f"tasks emitted by '{emitter}' must have new unique ids")
+    known = {task.id for task in plan.tasks} | set(new_ids)
+    for task in tasks:
+        _validate_task_references(task, known, plan)
+
+    batch = set(new_ids)
+    spec_by_id = {task.id: task for task in tasks}
+    for task in tasks:
+        if task.stdin_from is not None and task.stdin_from not in batch:
+            raise PlanError(f"task '{task.id}' must stream from a task emitted with it")
+    groups = _validate_pipelines(tasks, spec_by_id)
+    dependents: dict[str, list[str]] = {task_id: [] for task_id in new_ids}
+    in_degree: dict[str, int] = {}
+    for task in tasks:
+        local = [dep for dep in task.depends_on if dep in batch]
+        in_degree[task.id] = len(local)
+        for dep in local:
+            dependents[dep].append(task.id)
+    add_pipeline_edges(groups, spec_by_id, dependents, in_degree)
+    assert_acyclic(new_ids, dependents, in_degree)
+    return tasks
+
+
+def _read_yaml_file(path: Path, label: str) -> Any:
     if has_symlink_ancestor(path):
-        raise PlanError(f"plan file path must not include symlink: {path}")
+        raise PlanError(f"{label} path must not include symlink: {path}")
     try:
         meta = path.lstat()
     except FileNotFoundError:
         meta = None
     except (OSError, RuntimeError) as exc:
-        raise PlanError(f"failed to read plan file: {path}") from exc
+        raise PlanError(f"failed to read {label}: {path}") from exc
 
     if meta is not None:
         if stat.S_ISLNK(meta.st_mode):
-            raise PlanError(f"plan file must not be symlink: {path}")
+            raise PlanError(f"{label} must not be symlink: {path}")
         if not stat.S_ISREG(meta.st_mode):
-            raise PlanError(f"failed to read plan file: {path}")
+            raise PlanError(f"failed to read {label}: {path}")
 
     open_flags = os.O_RDONLY
     if hasattr(os, "O_NONBLOCK"):
@@ -204,20 +713,20 @@ def load_plan(path: Path) -> PlanSpec:
         fd = os.open(str(path), open_flags)
         opened_meta = os.fstat(fd)
         if not stat.S_ISREG(opened_meta.st_mode):
-            raise PlanError(f"failed to read plan file: {path}")
+            raise PlanError(f"failed to read {label}: {path}")
         with os.fdopen(fd, "r", encoding="utf-8") as f:
             fd = None
             content = f.read()
     except FileNotFoundError as exc:
-        raise PlanError(f"plan file not found: {path}") from exc
+        raise PlanError(f"{label} not found: {path}") from exc
     except UnicodeError as exc:
-        raise PlanError(f"failed to decode plan file as utf-8: {path}") from exc
+        raise PlanError(f"failed to decode {label} as utf-8: {path}") from exc
     except RuntimeError as exc:
-        raise PlanError(f"failed to read plan file: {path}") from exc
+        raise PlanError(f"failed to read {label}: {path}") from exc
     except OSError as exc:
         if exc.errno == errno.ELOOP:
-            raise PlanError(f"plan file must not be symlink: {path}") from exc
-        raise PlanError(f"failed to read plan file: {path}") from exc
+            raise PlanError(f"{label} must not be symlink: {path}") from exc
+        raise PlanError(f"failed to read {label}: {path}") from exc
     finally:
         if fd is not None:
             with suppress(OSError, RuntimeError):
@@ -227,7 +736,11 @@ def load_plan(path: Path) -> PlanSpec:
         raw = yaml.safe_load(content)
     except yaml.YAMLError as exc:
         raise PlanError(f"failed to parse yaml: {exc}") from exc
+    return raw
+
 
+def load_plan(path: Path) -> PlanSpec:
+    raw = _read_yaml_file(path, "plan file")
     if not isinstance(raw, dict):
         raise PlanError("plan root must be a mapping")
     if any(not isinstance(key, str) for key in raw):
@@ -248,11 +761,50 @@ def load_plan(path: Path) -> PlanSpec:
     if artifacts_dir is not None and not _is_non_blank_str(artifacts_dir):
         raise PlanError("plan.artifacts_dir must be non-empty string when provided")
 
-    tasks = [_parse_task(task) for task in raw_tasks]
+    pools = raw.get("pools", {})
+    if not isinstance(pools, dict) or not all(
+        _is_safe_id(name) and isinstance(limit, int) and not isinstance(limit, bool) and limit >= 1
+        for name, limit in pools.items()
+    ):
+        raise PlanError("plan.pools must be dict[name, int>=1]")
+
+    workers = _parse_workers(raw.get("workers", {}))
+
+    tasks, matrices = _parse_task_list(raw_tasks)
     plan = PlanSpec(
         goal=goal,
         artifacts_dir=artifacts_dir,
         tasks=tasks,
+        pools=pools,
+        workers=workers,
+        matrices=matrices,
     )
     validate_plan(plan)
     return plan
+
+
+def load_emitted_tasks(
+    path: Path, plan: PlanSpec, emitter: str
+) -> tuple[list[Any], list[TaskSpec]]:
+    """Read the manifest ``emitter`` wrote at ``path`` and validate its tasks.
+
+    The manifest is YAML or JSON holding either a list of tasks or a mapping with ``tasks``.
+    Returns the raw task list (to record for resume) and the parsed tasks; a missing manifest
+    means nothing was emitted.
+    """
+    try:
+        raw = _read_yaml_file(path, "emitted tasks file")
+    except PlanError as exc:
+        if isinstance(exc.__cause__, FileNotFoundError):
+            return [], []
+        raise
+    if isinstance(raw, dict):
+        unknown = set(raw.keys()) - {"tasks"}
+        if unknown:
+            raise PlanError(f"emitted tasks file contains unknown fields: {sorted(unknown)}")
+        raw = raw.get("tasks")
+    if raw is None:
+        return [], []
+    if not isinstance(raw, list):
+        raise PlanError("emitted tasks file must hold a list of tasks")
+    return raw, parse_emitted_tasks(raw, plan, emitter)
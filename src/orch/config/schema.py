@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Any
 
 
 @dataclass(slots=True)
@@ -14,6 +15,35 @@ class TaskSpec:
     retries: int = 0
     retry_backoff_sec: list[float] = field(default_factory=list)
     outputs: list[str] = field(default_factory=list)
+    inputs: list[str] = field(default_factory=list)
+    priority: int = 0
+    estimate_sec: float | None = None
+    resources: dict[str, float] = field(default_factory=dict)
+    pool: str | None = None
+    call: str | None = None
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    worker: str | None = None
+    hedge_after_sec: float | None = None
+    kill_grace_sec: float | None = None
+    kill_signals: list[str] = field(default_factory=list)
+    cpu_max: float | None = None
+    memory_max: int | None = None
+    emits: str | None = None
+    stdin_from: str | None = None
+
+
+@dataclass(slots=True)
+class WorkerSpec:
+    cmd: list[str]
+    count: int = 1
+
+
+@dataclass(slots=True)
+class MatrixSpec:
+    # The task mapping as written in the plan, including its ``matrix`` block.
+    raw: dict[str, Any]
+    task_ids: list[str]
 
 
 @dataclass(slots=True)
@@ -21,3 +51,7 @@ class PlanSpec:
     goal: str | None
     artifacts_dir: str | None
     tasks: list[TaskSpec]
+    pools: dict[str, int] = field(default_factory=dict)
+    workers: dict[str, WorkerSpec] = field(default_factory=dict)
+    # Matrix tasks by template id; plan snapshots store these instead of their expansion.
+    matrices: dict[str, MatrixSpec] = field(default_factory=dict)
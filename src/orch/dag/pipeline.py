@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from orch.config.schema import TaskSpec
+
+
+def pipeline_groups(tasks: Iterable[TaskSpec]) -> dict[str, list[str]]:
+    """Return each ``stdin_from`` chain keyed by its first producer, in stream order.
+
+    Every producer must feed at most one consumer. Members of a cycle have no first producer
+    and are left out, which is how validation detects one.
+    """
+    consumer_of = {task.stdin_from: task.id for task in tasks if task.stdin_from is not None}
+    consumers = set(consumer_of.values())
+    groups: dict[str, list[str]] = {}
+    for producer in consumer_of:
+        if producer in consumers:
+            continue
+        chain = [producer]
+        while chain[-1] in consumer_of:
+            chain.append(consumer_of[chain[-1]])
+        groups[producer] = chain
+    return groups
+
+
+def add_pipeline_edges(
+    groups: dict[str, list[str]],
+    spec_by_id: dict[str, TaskSpec],
+    dependents: dict[str, list[str]],
+    in_degree: dict[str, int],
+) -> None:
+    """Add the ordering a pipeline imposes to an adjacency built from ``depends_on``.
+
+    A chain starts as one unit, so its first task also waits for the dependencies of every
+    later member, and the later members come after it.
+    """
+    for head, chain in groups.items():
+        members = set(chain)
+        own = set(spec_by_id[head].depends_on)
+        gate = {dep for member in chain[1:] for dep in spec_by_id[member].depends_on}
+        for dep in sorted(gate - own - members):
+            dependents.setdefault(dep, []).append(head)
+            in_degree[head] += 1
+        for member in chain[1:]:
+            dependents.setdefault(head, []).append(member)
+            in_degree[member] += 1
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+
+def upward_ranks(
+    order: list[str], dependents: Mapping[str, list[str]], cost: Mapping[str, float]
+) -> dict[str, float]:
+    """Return each task's cost plus the longest cost path through its dependents.
+
+    ``order`` must be a topological order such as the one returned by ``assert_acyclic``.
+    """
+    ranks: dict[str, float] = {}
+    for task_id in reversed(order):
+        downstream = max((ranks[child] for child in dependents.get(task_id, [])), default=0.0)
+        ranks[task_id] = cost[task_id] + downstream
+    return ranks
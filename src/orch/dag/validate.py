@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import deque
+from collections.abc import Mapping, Sequence
 
 from orch.util.errors import PlanError
 
@@ -22,3 +23,31 @@ def assert_acyclic(
     if len(seen) != len(task_ids):
         raise PlanError("plan contains dependency cycle")
     return seen
+
+
+def assert_no_cycle(depends_on: Mapping[str, Sequence[str]]) -> None:
+    """Raise PlanError on a dependency cycle, walking ``depends_on`` edges directly.
+
+    Unlike ``assert_acyclic`` this needs no dependents lists, so validating a plan with tens
+    of thousands of tasks allocates one dict instead of a list per task.
+    """
+    # 1 while a task is on the current path, 2 once everything it depends on is checked.
+    marks: dict[str, int] = {}
+    for root in depends_on:
+        if root in marks:
+            continue
+        marks[root] = 1
+        stack = [(root, iter(depends_on[root]))]
+        while stack:
+            task_id, deps = stack[-1]
+            for dep in deps:
+                mark = marks.get(dep)
+                if mark is None:
+                    marks[dep] = 1
+                    stack.append((dep, iter(depends_on[dep])))
+                    break
+                if mark == 1:
+                    raise PlanError("plan contains dependency cycle")
+            else:
+                marks[task_id] = 2
+                stack.pop()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class _Waiter:
+    run_key: str
+    demand: dict[str, float]
+    slots: int
+    seq: int
+    future: asyncio.Future[None] = field(repr=False)
+
+
+class FairShareBudget:
+    """Global task slots and resources shared by every run hosted in one process.
+
+    Whenever capacity frees up, the waiting run holding the fewest slots is served first, so a
+    run with a thousand ready tasks cannot starve a run that just started.
+    """
+
+    def __init__(self, slots: int, capacity: dict[str, float] | None = None) -> None:
+        if slots < 1:
+            raise ValueError("slots must be >= 1")
+        self.slots = slots
+        self.capacity = dict(capacity or {})
+        self.in_use: dict[str, float] = {}
+        self.held: dict[str, int] = {}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    @property
+    def used_slots(self) -> int:
+        return sum(self.held.values())
+
+    def _fits(self, demand: dict[str, float], slots: int) -> bool:
+        if self.used_slots + slots > self.slots and self.used_slots > 0:
+            return False
+        if self.used_slots == 0:
+            # Like the runner's capacity check, an oversized task may run alone.
+            return True
+        return all(
+            self.in_use.get(name, 0.0) + demand.get(name, 0.0) <= limit
+            for name, limit in self.capacity.items()
+        )
+
+    def _grant(self, run_key: str, demand: dict[str, float], slots: int) -> None:
+        self.held[run_key] = self.held.get(run_key, 0) + slots
+        for name, amount in demand.items():
+            self.in_use[name] = self.in_use.get(name, 0.0) + amount
+
+    def _dispatch(self) -> None:
+        while True:
+            self._waiters = [waiter for waiter in self._waiters if not waiter.future.done()]
+            candidates = [
+                waiter for waiter in self._waiters if self._fits(waiter.demand, waiter.slots)
+            ]
+            if not candidates:
+                return
+            chosen = min(candidates, key=lambda w: (self.held.get(w.run_key, 0), w.seq))
+            self._waiters.remove(chosen)
+            self._grant(chosen.run_key, chosen.demand, chosen.slots)
+            chosen.future.set_result(None)
+
+    async def acquire(self, run_key: str, demand: dict[str, float], slots: int = 1) -> None:
+        """Wait for ``slots`` slots and ``demand``; a stdin_from chain takes one per member."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(_Waiter(run_key, dict(demand), slots, next(self._seq), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick the caller gave up; hand the slot back.
+                self.release(run_key, demand, slots)
+            raise
+
+    def release(self, run_key: str, demand: dict[str, float], slots: int = 1) -> None:
+        remaining = self.held.get(run_key, 0) - slots
+        if remaining > 0:
+            self.held[run_key] = remaining
+        else:
+            self.held.pop(run_key, None)
+        for name, amount in demand.items():
+            if name in self.in_use:
+                self.in_use[name] -= amount
+        self._dispatch()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import uuid
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+from orch.config.schema import TaskSpec
+from orch.util.path_guard import has_symlink_ancestor, is_symlink_path
+
+# Bump when the key payload or entry layout changes so old entries are never reused.
+CACHE_FORMAT_VERSION = 1
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    key: str
+    root: Path
+    outputs: list[str]
+
+
+def _open_regular_file(path: Path) -> int | None:
+    flags = os.O_RDONLY
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    fd: int | None = None
+    try:
+        fd = os.open(str(path), flags)
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+            return None
+    except (OSError, RuntimeError):
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+        return None
+    return fd
+
+
+def hash_file(path: Path) -> str | None:
+    """sha256 of a regular file's contents, or None if it cannot be read safely."""
+    if has_symlink_ancestor(path) or is_symlink_path(path):
+        return None
+    fd = _open_regular_file(path)
+    if fd is None:
+        return None
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "rb") as f:
+            fd = None
+            while chunk := f.read(_HASH_CHUNK_BYTES):
+                digest.update(chunk)
+    except (OSError, RuntimeError):
+        return None
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+    return digest.hexdigest()
+
+
+def read_file_bytes(path: Path, *, offset: int = 0) -> bytes | None:
+    if has_symlink_ancestor(path) or is_symlink_path(path):
+        return None
+    fd = _open_regular_file(path)
+    if fd is None:
+        return None
+    try:
+        with os.fdopen(fd, "rb") as f:
+            fd = None
+            f.seek(offset)
+            return f.read()
+    except (OSError, RuntimeError):
+        return None
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+
+
+def compute_cache_key(task: TaskSpec, inputs: list[tuple[str, Path]]) -> str | None:
+    """Hash of what determines a task's result; None if any input file is unreadable."""
+    input_digests: list[list[str]] = []
+    for rel, path in sorted(inputs):
+        digest = hash_file(path)
+        if digest is None:
+            return None
+        input_digests.append([rel, digest])
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "cmd": task.cmd,
+        "worker": task.worker,
+        "env": task.env or {},
+        "cwd": task.cwd or ".",
+        "inputs": input_digests,
+        "outputs": task.outputs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def compute_cutoff_fingerprint(task_key: str, upstream: dict[str, dict[str, str]]) -> str:
+    """Hash of a task's own cache key and the output digests of the dependencies it consumes."""
+    payload = {"version": CACHE_FORMAT_VERSION, "task": task_key, "upstream": upstream}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _entry_dir(cache_root: Path, key: str) -> Path:
+    return cache_root / key[:2] / key
+
+
+def lookup_cache(cache_root: Path, key: str) -> CacheEntry | None:
+    root = _entry_dir(cache_root, key)
+    raw = read_file_bytes(root / "meta.json")
+    if raw is None:
+        return None
+    try:
+        meta = json.loads(raw)
+    except ValueError:
+        return None
+    if (
+        not isinstance(meta, dict)
+        or meta.get("version") != CACHE_FORMAT_VERSION
+        or meta.get("key") != key
+        or not isinstance(meta.get("outputs"), list)
+        or not all(isinstance(rel, str) for rel in meta["outputs"])
+    ):
+        return None
+    return CacheEntry(key=key, root=root, outputs=meta["outputs"])
+
+
+def _write_new_file(path: Path, data: bytes) -> None:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    try:
+        fd = os.open(str(path), flags, 0o600)
+    except (OSError, RuntimeError) as exc:
+        raise OSError(f"failed to write cache file: {path}") from exc
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    except (OSError, RuntimeError) as exc:
+        raise OSError(f"failed to write cache file: {path}") from exc
+
+
+def store_cache(
+    cache_root: Path,
+    key: str,
+    *,
+    stdout: bytes,
+    stderr: bytes,
+    outputs: list[tuple[Path, str]],
+) -> bool:
+    """Publish an entry atomically; concurrent writers of the same key keep the first one."""
+    final = _entry_dir(cache_root, key)
+    staging = cache_root / "tmp" / f"{key}.{uuid.uuid4().hex}"
+    if has_symlink_ancestor(staging) or has_symlink_ancestor(final):
+        return False
+    try:
+        (staging / "outputs").mkdir(parents=True)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        _write_new_file(staging / "stdout.log", stdout)
+        _write_new_file(staging / "stderr.log", stderr)
+        for source, rel in outputs:
+            dest = staging / "outputs" / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, dest)
+        meta = {
+            "version": CACHE_FORMAT_VERSION,
+            "key": key,
+            "outputs": sorted(rel for _, rel in outputs),
+        }
+        _write_new_file(staging / "meta.json", json.dumps(meta).encode("utf-8"))
+        os.replace(staging, final)
+    except (OSError, RuntimeError, shutil.Error):
+        with suppress(OSError, RuntimeError, shutil.Error):
+            shutil.rmtree(staging)
+        return False
+    return True
+
+
+def restore_outputs(entry: CacheEntry, cwd: Path) -> bool:
+    """Copy an entry's outputs back under ``cwd``; False if any of them cannot be restored."""
+    for rel in entry.outputs:
+        source = entry.root / "outputs" / rel
+        dest = cwd / rel
+        if has_symlink_ancestor(dest) or is_symlink_path(dest) or is_symlink_path(source):
+            return False
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, dest)
+        except (OSError, RuntimeError, shutil.Error):
+            return False
+    return True
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import sys
+import traceback
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+
+class CallTargetError(Exception):
+    """The ``call:`` target could not be imported or is not callable."""
+
+
+@dataclass(slots=True)
+class CallSpec:
+    target: str
+    args: list[Any]
+    kwargs: dict[str, Any]
+    cwd: str
+    env: dict[str, str] | None
+    stdout_path: str
+    stderr_path: str
+
+
+def _open_log_fd(path: str) -> int:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    try:
+        return os.open(path, flags, 0o600)
+    except (OSError, RuntimeError) as exc:
+        raise CallTargetError(f"failed to open call log: {path}") from exc
+
+
+def _resolve_target(target: str, search_path: list[str]) -> Callable[..., Any]:
+    # Like ``python -m``, modules next to the task cwd are importable.
+    module_name, _, attr_path = target.partition(":")
+    added = [entry for entry in search_path if entry not in sys.path]
+    sys.path[:0] = added
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for attr in attr_path.split("."):
+            obj = getattr(obj, attr)
+    except Exception as exc:
+        raise CallTargetError(f"failed to resolve call target {target}: {exc!r}") from exc
+    finally:
+        for entry in added:
+            with suppress(ValueError):
+                sys.path.remove(entry)
+    if not callable(obj):
+        raise CallTargetError(f"call target is not callable: {target}")
+    return obj  # type: ignore[no-any-return]
+
+
+def _exit_code_from(value: object) -> int:
+    # An int is the exit code and False fails; None and any other return value succeed.
+    if isinstance(value, bool):
+        return 0 if value else 1
+    if isinstance(value, int):
+        return value
+    return 0
+
+
+def invoke_call(spec: CallSpec) -> int:
+    """Run one ``call:`` task inside a pool worker with fds 1/2 redirected to its logs."""
+    out_fd = _open_log_fd(spec.stdout_path)
+    try:
+        err_fd = _open_log_fd(spec.stderr_path)
+    except CallTargetError:
+        with suppress(OSError, RuntimeError):
+            os.close(out_fd)
+        raise
+    saved_env = os.environ.copy()
+    saved_cwd = os.getcwd()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_stdout = os.dup(1)
+    saved_stderr = os.dup(2)
+    try:
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        os.chdir(spec.cwd)
+        if spec.env:
+            os.environ.update(spec.env)
+        func = _resolve_target(spec.target, [spec.cwd])
+        try:
+            return _exit_code_from(func(*spec.args, **spec.kwargs))
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                return _exit_code_from(exc.code)
+            print(exc.code, file=sys.stderr)
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_stdout, 1)
+        os.dup2(saved_stderr, 2)
+        for fd in (saved_stdout, saved_stderr, out_fd, err_fd):
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+        with suppress(OSError, RuntimeError):
+            os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def _call_worker_main(conn: Connection) -> None:
+    """Serve ``invoke_call`` requests one at a time until the runner closes the pipe."""
+    with conn:
+        while True:
+            try:
+                spec = conn.recv()
+            except (EOFError, OSError, RuntimeError):
+                return
+            reply: tuple[str, object]
+            try:
+                reply = ("exit", invoke_call(spec))
+            except CallTargetError as exc:
+                reply = ("target_error", str(exc))
+            except Exception as exc:
+                reply = ("error", repr(exc))
+            conn.send(reply)
+
+
+@dataclass(slots=True, eq=False)
+class _CallWorker:
+    process: BaseProcess
+    conn: Connection
+
+
+class CallPool:
+    """Runner-owned warm worker processes for ``call:`` tasks.
+
+    Each worker runs one call at a time and is reused once the call returns. Stopping a call
+    (timeout or cancel) kills only the worker running it; calls on other workers keep running
+    and a fresh worker is spawned for the next call.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(max_workers)
+        self._idle: list[_CallWorker] = []
+        self._busy: set[_CallWorker] = set()
+        self._killed: list[_CallWorker] = []
+        self._closed = False
+
+    def _spawn(self) -> _CallWorker:
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_call_worker_main, args=(child_conn,))
+        try:
+            process.start()
+        except (OSError, RuntimeError):
+            conn.close()
+            raise
+        finally:
+            child_conn.close()
+        return _CallWorker(process=process, conn=conn)
+
+    def _acquire(self) -> _CallWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+            self._kill(worker)
+        return self._spawn()
+
+    def _kill(self, worker: _CallWorker) -> None:
+        with suppress(OSError, ValueError):
+            worker.process.kill()
+        worker.conn.close()
+        # Reaped by shutdown(), so stopping a call never blocks the event loop.
+        self._killed.append(worker)
+
+    async def _exchange(self, worker: _CallWorker, spec: CallSpec) -> tuple[str, Any]:
+        loop = asyncio.get_running_loop()
+        worker.conn.send(spec)
+        readable: asyncio.Future[None] = loop.create_future()
+
+        def _on_readable() -> None:
+            if not readable.done():
+                readable.set_result(None)
+
+        fd = worker.conn.fileno()
+        loop.add_reader(fd, _on_readable)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+        try:
+            reply: tuple[str, Any] = worker.conn.recv()
+        except EOFError as exc:
+            raise RuntimeError("call worker exited before replying") from exc
+        return reply
+
+    async def run(self, spec: CallSpec) -> int:
+        """Run ``spec`` on a worker; cancelling the coroutine kills that worker alone."""
+        async with self._slots:
+            if self._closed:
+                raise RuntimeError("call pool is shut down")
+            worker = self._acquire()
+            self._busy.add(worker)
+            reply: tuple[str, Any] | None = None
+            try:
+                reply = await self._exchange(worker, spec)
+            finally:
+                self._busy.discard(worker)
+                if reply is None or self._closed:
+                    self._kill(worker)
+                else:
+                    self._idle.append(worker)
+        kind, value = reply
+        if kind == "target_error":
+            raise CallTargetError(value)
+        if kind == "error":
+            raise RuntimeError(value)
+        return int(value)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            # Closing the pipe ends the worker's request loop.
+            worker.conn.close()
+            worker.process.join(timeout=5.0)
+            if worker.process.is_alive():
+                self._kill(worker)
+        for worker in list(self._busy):
+            self._kill(worker)
+        killed, self._killed = self._killed, []
+        for worker in killed:
+            worker.process.join(timeout=5.0)
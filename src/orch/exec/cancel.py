@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import errno
 import os
 import stat
@@ -32,6 +33,17 @@ def cancel_requested(run_dir: Path) -> bool:
     return stat.S_ISREG(meta.st_mode)
 
 
+async def watch_cancel_request(
+    run_dir: Path, event: asyncio.Event, *, poll_interval: float = 0.1
+) -> None:
+    """Set event once a cancel request appears (one watcher per run, not per task)."""
+    while not event.is_set():
+        if cancel_requested(run_dir):
+            event.set()
+            return
+        await asyncio.sleep(poll_interval)
+
+
 def write_cancel_request(run_dir: Path) -> None:
     path = run_dir / "cancel.request"
     if has_symlink_ancestor(path):
@@ -5,21 +5,23 @@ import os
 import stat
 from contextlib import suppress
 from pathlib import Path
+from typing import BinaryIO
 
+from orch.exec.pipe import TaskPipe
 from orch.util.path_guard import has_symlink_ancestor, is_symlink_path
 
+_READ_SIZE = 64 * 1024
 
-async def stream_to_file(stream: asyncio.StreamReader | None, file_path: Path) -> None:
-    if stream is None:
-        return
+
+def _open_log(file_path: Path) -> BinaryIO | None:
     if has_symlink_ancestor(file_path):
-        return
+        return None
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
     except (OSError, RuntimeError):
-        return
+        return None
     if is_symlink_path(file_path.parent) or is_symlink_path(file_path):
-        return
+        return None
 
     flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
     if hasattr(os, "O_NONBLOCK"):
@@ -32,28 +34,52 @@ async def stream_to_file(stream: asyncio.StreamReader | None, file_path: Path) -
         fd = os.open(str(file_path), flags, 0o600)
         opened_meta = os.fstat(fd)
         if not stat.S_ISREG(opened_meta.st_mode):
-            with suppress(OSError, RuntimeError):
-                os.close(fd)
-            fd = None
-            return
+            return None
+        log = os.fdopen(fd, "ab")
+        fd = None
+        return log
     except (OSError, RuntimeError):
+        return None
+    finally:
         if fd is not None:
             with suppress(OSError, RuntimeError):
                 os.close(fd)
-        return
 
+
+async def stream_to_file(
+    stream: asyncio.StreamReader | None, file_path: Path, tee: TaskPipe | None = None
+) -> None:
+    """Append ``stream`` to ``file_path``; with ``tee``, also forward it to a consumer task.
+
+    Without a usable log file the stream is still forwarded, so the consumer sees all of it.
+    """
     try:
-        assert fd is not None
-        with os.fdopen(fd, "ab") as f:
-            fd = None
+        if stream is None:
+            return
+        log = _open_log(file_path)
+        if log is None and tee is None:
+            return
+        try:
             while True:
-                chunk = await stream.read(4096)
+                chunk = await stream.read(_READ_SIZE)
                 if not chunk:
                     break
-                f.write(chunk)
-                f.flush()
-    except (OSError, RuntimeError):
-        if fd is not None:
-            with suppress(OSError, RuntimeError):
-                os.close(fd)
-        return
+                if log is not None:
+                    try:
+                        log.write(chunk)
+                        log.flush()
+                    except (OSError, RuntimeError):
+                        if tee is None:
+                            return
+                        with suppress(OSError, RuntimeError):
+                            log.close()
+                        log = None
+                if tee is not None:
+                    await tee.write(chunk)
+        finally:
+            if log is not None:
+                with suppress(OSError, RuntimeError):
+                    log.close()
+    finally:
+        if tee is not None:
+            tee.close()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+# Upper bound on the share of wall time spent persisting state during a run.
+STATE_WRITE_SHARE = 0.1
+
+
+class Checkpointer:
+    """Coalesces state writes so their cost stays a bounded share of the run.
+
+    A write is usually one journal append, but now and then it compacts the journal into a
+    full O(tasks) state.json. After a write that took ``d`` seconds the next one waits until
+    ``d / share - d`` has passed, so appends persist almost every transition while the
+    pause after a large compaction keeps its cost a bounded share of the run.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[], None],
+        *,
+        share: float = STATE_WRITE_SHARE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < share <= 1:
+            raise ValueError("share must be in (0, 1]")
+        self._write = write
+        self._share = share
+        self._clock = clock
+        self._dirty = False
+        self._next_at = 0.0
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def mark(self) -> None:
+        self._dirty = True
+
+    def due_at(self) -> float | None:
+        """Clock time at which pending changes should be written, or ``None`` if clean."""
+        return self._next_at if self._dirty else None
+
+    def maybe_flush(self) -> bool:
+        if not self._dirty or self._clock() < self._next_at:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        started = self._clock()
+        self._write()
+        ended = self._clock()
+        self._dirty = False
+        self._next_at = ended + (ended - started) * (1 - self._share) / self._share
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from orch.exec.budget import FairShareBudget
+from orch.exec.remote import (
+    MESSAGE_LIMIT,
+    RemoteAddress,
+    open_connection,
+    read_message,
+    send_message,
+)
+
+# Prepares a submitted run and returns its id and run directory plus an awaitable yielding the
+# final run status.
+SubmitHandler = Callable[
+    [dict[str, Any], FairShareBudget], Awaitable[tuple[str, Path, Awaitable[str]]]
+]
+
+
+class DaemonSubmitError(Exception):
+    """The daemon rejected a submitted run; the message is sent back to the client."""
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    with suppress(OSError, RuntimeError):
+        await writer.drain()
+    with suppress(OSError, RuntimeError):
+        writer.close()
+
+
+async def _is_listening(address: RemoteAddress) -> bool:
+    try:
+        _, writer = await open_connection(address)
+    except (OSError, RuntimeError):
+        return False
+    with suppress(OSError, RuntimeError):
+        writer.close()
+    return True
+
+
+async def serve_daemon(
+    address: RemoteAddress,
+    budget: FairShareBudget,
+    handler: SubmitHandler,
+    *,
+    stop_event: asyncio.Event | None = None,
+    on_ready: Callable[[], None] | None = None,
+) -> None:
+    """Host submitted runs in this event loop until ``stop_event`` is set.
+
+    Runs keep going if their client disconnects; on stop, in-flight runs are awaited.
+    """
+    runs: set[asyncio.Future[str]] = set()
+
+    async def _client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        request = await read_message(reader)
+        if request is None or request.get("type") != "submit":
+            send_message(writer, {"type": "error", "message": "expected a submit request"})
+            await _close(writer)
+            return
+        try:
+            run_id, run_dir, finished = await handler(request, budget)
+        except DaemonSubmitError as exc:
+            send_message(writer, {"type": "error", "message": str(exc)})
+            await _close(writer)
+            return
+        except Exception as exc:
+            # A failure the handler did not anticipate still gets a reply instead of a hang-up.
+            send_message(writer, {"type": "error", "message": f"failed to submit run: {exc!r}"})
+            await _close(writer)
+            return
+        run = asyncio.ensure_future(finished)
+        runs.add(run)
+        run.add_done_callback(runs.discard)
+        # The run lives under the daemon's home, which may differ from the client's --home.
+        send_message(writer, {"type": "accepted", "run_id": run_id, "run_dir": str(run_dir)})
+        with suppress(OSError, RuntimeError):
+            await writer.drain()
+        try:
+            status = await asyncio.shield(run)
+        except Exception as exc:
+            # PlanError, StateError and the like end the run too; the client still hears why.
+            send_message(writer, {"type": "error", "run_id": run_id, "message": str(exc)})
+        else:
+            send_message(
+                writer,
+                {"type": "finished", "run_id": run_id, "run_dir": str(run_dir), "status": status},
+            )
+        await _close(writer)
+
+    if address.path is not None:
+        if await _is_listening(address):
+            # start_unix_server would silently replace the live socket of another daemon.
+            raise OSError(f"daemon already listening on {address}")
+        server = await asyncio.start_unix_server(_client, path=address.path, limit=MESSAGE_LIMIT)
+    else:
+        server = await asyncio.start_server(
+            _client, host=address.host, port=address.port, limit=MESSAGE_LIMIT
+        )
+    if on_ready is not None:
+        on_ready()
+    try:
+        await (stop_event or asyncio.Event()).wait()
+    finally:
+        server.close()
+        await asyncio.gather(*runs, return_exceptions=True)
+        if address.path is not None:
+            with suppress(OSError, RuntimeError):
+                Path(address.path).unlink()
+
+
+async def submit_run(
+    address: RemoteAddress, request: dict[str, Any]
+) -> AsyncIterator[dict[str, Any]]:
+    """Submit a run and yield the daemon's replies until it finishes or is rejected."""
+    reader, writer = await open_connection(address)
+    try:
+        send_message(writer, {"type": "submit", **request})
+        await writer.drain()
+        while True:
+            message = await read_message(reader)
+            if message is None:
+                return
+            yield message
+            if message.get("type") in ("finished", "error"):
+                return
+    finally:
+        with suppress(OSError, RuntimeError):
+            writer.close()
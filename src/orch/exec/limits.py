@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import functools
+import os
+import shutil
+import stat
+import tempfile
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+CGROUP_MOUNT = Path("/sys/fs/cgroup")
+PROC_SELF_CGROUP = Path("/proc/self/cgroup")
+# Leaf the orch process moves itself into so its own cgroup can enable controllers for siblings.
+SUPERVISOR_LEAF = "orch"
+CPU_PERIOD_USEC = 100_000
+CGROUP_REMOVE_ATTEMPTS = 20
+CGROUP_REMOVE_INTERVAL_SEC = 0.05
+LIMITS_SHELL = "/bin/sh"
+# "$1" is the leaf's cgroup.procs (or the RLIMIT_AS soft limit in KiB); the rest is the task.
+_JOIN_CGROUP_SCRIPT = 'echo $$ > "$1" || exit 126; shift; exec "$@"'
+_LIMIT_AS_SCRIPT = 'ulimit -S -v "$1" || exit 126; shift; exec "$@"'
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass(slots=True)
+class ResourceUsage:
+    memory_peak_bytes: int | None
+    cpu_usage_sec: float | None
+
+
+def _read_text(path: Path) -> str | None:
+    flags = os.O_RDONLY
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    fd: int | None = None
+    try:
+        fd = os.open(str(path), flags)
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+        with os.fdopen(fd, "r", encoding="utf-8", errors="replace") as f:
+            fd = None
+            return f.read(4096)
+    except (OSError, RuntimeError):
+        return None
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+
+
+def _write_text(path: Path, text: str) -> bool:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    fd: int | None = None
+    try:
+        fd = os.open(str(path), flags, 0o600)
+        os.write(fd, text.encode("utf-8"))
+    except (OSError, RuntimeError):
+        return False
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+    return True
+
+
+def _own_cgroup_path(text: str | None) -> str | None:
+    """Return the unified-hierarchy path from /proc/self/cgroup (the ``0::`` line)."""
+    if text is None:
+        return None
+    for line in text.splitlines():
+        if line.startswith("0::"):
+            return line[3:].strip() or None
+    return None
+
+
+def _delegation_candidate() -> Path | None:
+    """Return the runner's own cgroup directory if it can hand cpu+memory to children."""
+    if _read_text(CGROUP_MOUNT / "cgroup.controllers") is None:
+        return None
+    own = _own_cgroup_path(_read_text(PROC_SELF_CGROUP))
+    if own is None:
+        return None
+    parent = CGROUP_MOUNT / own.lstrip("/")
+    # Once the runner sits in its supervisor leaf, the delegated subtree is the leaf's parent.
+    if parent.name == SUPERVISOR_LEAF:
+        parent = parent.parent
+    available = (_read_text(parent / "cgroup.controllers") or "").split()
+    if "cpu" not in available or "memory" not in available:
+        return None
+    if not os.access(parent / "cgroup.subtree_control", os.W_OK):
+        return None
+    return parent
+
+
+def _controllers_enabled(parent: Path) -> bool:
+    enabled = (_read_text(parent / "cgroup.subtree_control") or "").split()
+    return "cpu" in enabled and "memory" in enabled
+
+
+@functools.cache
+def delegated_cgroup_parent() -> Path | None:
+    """Return a cgroup v2 directory where per-task leaves with cpu+memory limits can be created.
+
+    This only looks: the runner's cgroup must be writable (systemd ``Delegate=yes``, a container
+    with a private cgroup namespace, ...) and already hand cpu+memory to its children, either
+    because ``enable_cgroup_delegation`` ran or because the operator started orch in an ``orch``
+    leaf of such a cgroup. Otherwise the caller falls back to rlimits.
+    """
+    parent = _delegation_candidate()
+    if parent is None or not _controllers_enabled(parent):
+        return None
+    return parent
+
+
+def enable_cgroup_delegation() -> bool:
+    """Opt in to moving the runner into an ``orch`` leaf and enabling cpu+memory for its cgroup.
+
+    cgroup v2 forbids processes in a cgroup that hands controllers to its children, so the
+    runner has to leave its own cgroup first. The move lasts for the life of the process; if
+    the controllers cannot be enabled the runner moves back and the leaf is removed.
+    """
+    delegated_cgroup_parent.cache_clear()
+    parent = _delegation_candidate()
+    if parent is None:
+        return False
+    if not _controllers_enabled(parent):
+        supervisor = parent / SUPERVISOR_LEAF
+        try:
+            supervisor.mkdir()
+            created = True
+        except FileExistsError:
+            created = False
+        except (OSError, RuntimeError):
+            return False
+        pid = str(os.getpid())
+        moved = _write_text(supervisor / "cgroup.procs", pid)
+        if not moved or not _write_text(parent / "cgroup.subtree_control", "+cpu +memory"):
+            if moved:
+                _write_text(parent / "cgroup.procs", pid)
+            if created:
+                with suppress(OSError, RuntimeError):
+                    supervisor.rmdir()
+            return False
+    delegated_cgroup_parent.cache_clear()
+    return delegated_cgroup_parent() is not None
+
+
+def cpu_max_value(cpus: float) -> str:
+    quota = max(1000, round(cpus * CPU_PERIOD_USEC))
+    return f"{quota} {CPU_PERIOD_USEC}"
+
+
+def create_task_cgroup(
+    parent: Path, task_id: str, *, cpu_max: float | None, memory_max: int | None
+) -> Path | None:
+    """Create a leaf cgroup for one attempt and write its limits; ``None`` if that fails."""
+    try:
+        leaf = Path(tempfile.mkdtemp(prefix=f"{task_id}.", dir=parent))
+    except (OSError, RuntimeError):
+        return None
+    ok = True
+    if cpu_max is not None:
+        ok = _write_text(leaf / "cpu.max", cpu_max_value(cpu_max))
+    if ok and memory_max is not None:
+        ok = _write_text(leaf / "memory.max", str(memory_max))
+    if not ok:
+        with suppress(OSError, RuntimeError):
+            leaf.rmdir()
+        return None
+    return leaf
+
+
+def parse_cpu_stat_usage_sec(text: str | None) -> float | None:
+    if text is None:
+        return None
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[0] == "usage_usec" and fields[1].isdigit():
+            return int(fields[1]) / 1_000_000
+    return None
+
+
+def parse_memory_peak(text: str | None) -> int | None:
+    if text is None:
+        return None
+    value = text.strip()
+    return int(value) if value.isdigit() else None
+
+
+def read_cgroup_usage(leaf: Path) -> ResourceUsage:
+    return ResourceUsage(
+        memory_peak_bytes=parse_memory_peak(_read_text(leaf / "memory.peak")),
+        cpu_usage_sec=parse_cpu_stat_usage_sec(_read_text(leaf / "cpu.stat")),
+    )
+
+
+async def remove_task_cgroup(leaf: Path) -> None:
+    """Remove a leaf once its processes are gone; killed members can take a moment to exit."""
+    for _ in range(CGROUP_REMOVE_ATTEMPTS):
+        try:
+            leaf.rmdir()
+            return
+        except FileNotFoundError:
+            return
+        except (OSError, RuntimeError):
+            await asyncio.sleep(CGROUP_REMOVE_INTERVAL_SEC)
+
+
+def _resolve_executable(name: str, *, cwd: Path, env: dict[str, str]) -> str:
+    # Resolved here so a missing program still fails to start instead of exiting from the shell.
+    if "/" in name:
+        resolved = shutil.which(str(cwd / name))
+    else:
+        resolved = shutil.which(name, path=env.get("PATH", os.defpath))
+    if resolved is None:
+        raise FileNotFoundError(errno.ENOENT, "No such file or directory", name)
+    return resolved
+
+
+def limits_command(
+    cmd: list[str],
+    leaf: Path | None,
+    memory_max: int | None,
+    *,
+    cwd: Path,
+    env: dict[str, str],
+) -> list[str]:
+    """Wrap ``cmd`` so the child applies its limits itself right before exec.
+
+    With a leaf the child joins it first, so nothing it forks escapes the limits. Without one,
+    ``memory_max`` becomes RLIMIT_AS (rounded down to KiB); a CPU rate has no rlimit
+    equivalent. A shell does the work instead of ``preexec_fn``, which is not fork-safe while
+    the runner has threads.
+    """
+    if leaf is not None:
+        executable = _resolve_executable(cmd[0], cwd=cwd, env=env)
+        return [
+            LIMITS_SHELL,
+            "-c",
+            _JOIN_CGROUP_SCRIPT,
+            "orch-limits",
+            str(leaf / "cgroup.procs"),
+            executable,
+            *cmd[1:],
+        ]
+    if memory_max is not None and resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        soft = memory_max if hard == resource.RLIM_INFINITY else min(memory_max, hard)
+        executable = _resolve_executable(cmd[0], cwd=cwd, env=env)
+        return [
+            LIMITS_SHELL,
+            "-c",
+            _LIMIT_AS_SCRIPT,
+            "orch-limits",
+            str(max(1, soft // 1024)),
+            executable,
+            *cmd[1:],
+        ]
+    return cmd
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None  # type: ignore[assignment]
+
+LOOP_CHOICES = ("auto", "asyncio", "uvloop")
+
+_T = TypeVar("_T")
+
+
+def uvloop_available() -> bool:
+    return uvloop is not None
+
+
+def resolve_loop(name: str) -> str:
+    """Return the loop ``name`` selects: ``auto`` is uvloop when installed, else asyncio."""
+    if name not in LOOP_CHOICES:
+        raise ValueError(f"loop must be one of: {', '.join(LOOP_CHOICES)}")
+    if name == "auto":
+        return "uvloop" if uvloop is not None else "asyncio"
+    if name == "uvloop" and uvloop is None:
+        raise RuntimeError("uvloop is not installed (pip install 'orch[uvloop]')")
+    return name
+
+
+def run_with_loop(main: Coroutine[Any, Any, _T], loop: str = "auto") -> _T:
+    """Run ``main`` to completion like ``asyncio.run``, on the event loop ``loop`` selects."""
+    try:
+        resolved = resolve_loop(loop)
+    except (ValueError, RuntimeError):
+        main.close()
+        raise
+    factory = uvloop.new_event_loop if resolved == "uvloop" else None
+    with asyncio.Runner(loop_factory=factory) as runner:
+        return runner.run(main)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+
+
+class TaskPipe:
+    """Carries a producer task's stdout into the stdin of the task with ``stdin_from`` on it.
+
+    The consumer attaches its stdin writer once started (``None`` if it failed to start); the
+    producer's capture writes chunks and closes the pipe at EOF. Writes wait for the consumer to
+    drain, so a slow consumer slows the producer down as in a shell pipeline. Once the consumer
+    stops reading, its share of the stream is dropped and only the producer's log keeps it.
+    """
+
+    def __init__(self) -> None:
+        self._writer: asyncio.Future[asyncio.StreamWriter | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._closed = False
+
+    def attach(self, writer: asyncio.StreamWriter | None) -> None:
+        if self._writer.done():
+            return
+        self._writer.set_result(writer)
+        if self._closed:
+            self._close_writer()
+
+    async def write(self, chunk: bytes) -> None:
+        writer = await self._writer
+        if writer is None or writer.is_closing():
+            return
+        writer.write(chunk)
+        try:
+            await writer.drain()
+        except (OSError, RuntimeError):
+            # The consumer exited or closed its stdin.
+            writer.close()
+
+    def close(self) -> None:
+        """Signal EOF to the consumer; safe to call more than once."""
+        self._closed = True
+        if self._writer.done():
+            self._close_writer()
+
+    def _close_writer(self) -> None:
+        writer = self._writer.result()
+        if writer is not None and not writer.is_closing():
+            with suppress(OSError, RuntimeError):
+                writer.close()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import os
+import stat
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+PSI_CPU_PATH = Path("/proc/pressure/cpu")
+PSI_MEMORY_PATH = Path("/proc/pressure/memory")
+LOADAVG_PATH = Path("/proc/loadavg")
+
+# PSI "some" avg10 percentages and 1-minute loadavg per CPU.
+CPU_PRESSURE_HIGH = 40.0
+CPU_PRESSURE_LOW = 10.0
+MEMORY_PRESSURE_HIGH = 10.0
+MEMORY_PRESSURE_LOW = 2.0
+LOAD_PER_CPU_HIGH = 1.5
+LOAD_PER_CPU_LOW = 1.0
+
+
+@dataclass(slots=True)
+class PressureSample:
+    cpu_some_avg10: float | None
+    memory_some_avg10: float | None
+    loadavg_1m: float | None
+
+
+def _read_proc_text(path: Path) -> str | None:
+    flags = os.O_RDONLY
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    fd: int | None = None
+    try:
+        fd = os.open(str(path), flags)
+        opened_meta = os.fstat(fd)
+        if not stat.S_ISREG(opened_meta.st_mode):
+            return None
+        with os.fdopen(fd, "r", encoding="utf-8", errors="replace") as f:
+            fd = None
+            return f.read(4096)
+    except (OSError, RuntimeError):
+        return None
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+
+
+def _finite_non_negative(raw: str) -> float | None:
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) and value >= 0 else None
+
+
+def parse_psi_some_avg10(text: str | None) -> float | None:
+    """Return the ``some avg10`` percentage from a /proc/pressure/* file."""
+    if text is None:
+        return None
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields or fields[0] != "some":
+            continue
+        for field in fields[1:]:
+            key, _, value = field.partition("=")
+            if key == "avg10":
+                return _finite_non_negative(value)
+    return None
+
+
+def parse_loadavg_1m(text: str | None) -> float | None:
+    if text is None:
+        return None
+    fields = text.split()
+    return _finite_non_negative(fields[0]) if fields else None
+
+
+def read_pressure_sample() -> PressureSample:
+    """Sample host pressure; readings are None where the kernel does not expose them."""
+    return PressureSample(
+        cpu_some_avg10=parse_psi_some_avg10(_read_proc_text(PSI_CPU_PATH)),
+        memory_some_avg10=parse_psi_some_avg10(_read_proc_text(PSI_MEMORY_PATH)),
+        loadavg_1m=parse_loadavg_1m(_read_proc_text(LOADAVG_PATH)),
+    )
+
+
+class AdaptiveLimit:
+    """Admission limit that grows additively with headroom and halves under pressure."""
+
+    def __init__(self, ceiling: int, *, cpu_count: int) -> None:
+        if ceiling < 1:
+            raise ValueError("ceiling must be >= 1")
+        self.ceiling = ceiling
+        self.cpu_count = max(1, cpu_count)
+        self.step = max(1, self.cpu_count // 4)
+        self.limit = 1
+
+    def _overloaded(self, sample: PressureSample) -> bool:
+        return (
+            (sample.cpu_some_avg10 is not None and sample.cpu_some_avg10 >= CPU_PRESSURE_HIGH)
+            or (
+                sample.memory_some_avg10 is not None
+                and sample.memory_some_avg10 >= MEMORY_PRESSURE_HIGH
+            )
+            or (
+                sample.loadavg_1m is not None
+                and sample.loadavg_1m / self.cpu_count >= LOAD_PER_CPU_HIGH
+            )
+        )
+
+    def _has_headroom(self, sample: PressureSample) -> bool:
+        return (
+            (sample.cpu_some_avg10 is None or sample.cpu_some_avg10 < CPU_PRESSURE_LOW)
+            and (sample.memory_some_avg10 is None or sample.memory_some_avg10 < MEMORY_PRESSURE_LOW)
+            and (sample.loadavg_1m is None or sample.loadavg_1m / self.cpu_count < LOAD_PER_CPU_LOW)
+        )
+
+    def update(self, sample: PressureSample) -> int:
+        if self._overloaded(sample):
+            self.limit = max(1, self.limit // 2)
+        elif self._has_headroom(sample):
+            self.limit = min(self.ceiling, self.limit + self.step)
+        return self.limit
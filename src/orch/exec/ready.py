@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Callable, Hashable
+
+_Entry = tuple[int, float, int, str]
+
+
+class ReadyQueue:
+    """Heap of runnable task ids: higher priority, then higher rank, then insertion order.
+
+    Ids are kept in one heap per lane (the task's pool, or ``None``) and resource shape, so a
+    full pool or a demand that does not fit is passed over as a whole by looking at the head
+    of its heap only, instead of popping and re-pushing every task queued behind it.
+    """
+
+    def __init__(self) -> None:
+        self._lanes: dict[tuple[str | None, Hashable], list[_Entry]] = {}
+        self._size = 0
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def push(
+        self,
+        task_id: str,
+        priority: int = 0,
+        rank: float = 0.0,
+        lane: str | None = None,
+        shape: Hashable = (),
+    ) -> None:
+        heap = self._lanes.setdefault((lane, shape), [])
+        heapq.heappush(heap, (-priority, -rank, next(self._seq), task_id))
+        self._size += 1
+
+    def _best_lane(self, lanes: list[list[_Entry]]) -> list[_Entry] | None:
+        best: list[_Entry] | None = None
+        for heap in lanes:
+            if heap and (best is None or heap[0] < best[0]):
+                best = heap
+        return best
+
+    def pop(self) -> str:
+        heap = self._best_lane(list(self._lanes.values()))
+        if heap is None:
+            raise IndexError("pop from an empty ReadyQueue")
+        self._size -= 1
+        return heapq.heappop(heap)[3]
+
+    def pop_first(
+        self,
+        admissible: Callable[[str], bool],
+        lane_open: Callable[[str | None], bool] | None = None,
+    ) -> str | None:
+        """Pop the best-ordered id accepted by ``admissible``; skipped ids keep their place.
+
+        Only the head of each (lane, shape) heap is asked, so ``admissible`` must answer the
+        same for every id pushed with one shape; lanes for which ``lane_open`` returns false
+        are not looked at. A call costs O(lanes x shapes), not O(queued ids).
+        """
+        best: list[_Entry] | None = None
+        for (lane, _), heap in self._lanes.items():
+            if not heap or (best is not None and heap[0] >= best[0]):
+                continue
+            if lane_open is not None and not lane_open(lane):
+                continue
+            if admissible(heap[0][3]):
+                best = heap
+        if best is None:
+            return None
+        self._size -= 1
+        return heapq.heappop(best)[3]
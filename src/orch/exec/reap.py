@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from orch.state.model import AttemptRusage
+
+if TYPE_CHECKING:
+    from resource import struct_rusage
+
+# ru_maxrss is KiB on Linux and bytes on macOS.
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def rusage_for_attempt(attempt: int, usage: struct_rusage) -> AttemptRusage:
+    return AttemptRusage(
+        attempt=attempt,
+        user_sec=usage.ru_utime,
+        system_sec=usage.ru_stime,
+        max_rss_bytes=usage.ru_maxrss * _MAXRSS_UNIT,
+        inblock=usage.ru_inblock,
+        oublock=usage.ru_oublock,
+        nvcsw=usage.ru_nvcsw,
+        nivcsw=usage.ru_nivcsw,
+    )
+
+
+class ReapedProcess:
+    """A child that is reaped with ``os.wait4`` so its resource usage is not lost.
+
+    asyncio's child watcher reaps with ``waitpid`` and discards the rusage, so the wait runs
+    on a dedicated thread here instead (the same model as ``ThreadedChildWatcher``). The
+    interface is the subset of ``asyncio.subprocess.Process`` the runner uses.
+    """
+
+    def __init__(
+        self,
+        popen: subprocess.Popen[bytes],
+        stdout: asyncio.StreamReader,
+        stderr: asyncio.StreamReader,
+        transports: list[asyncio.BaseTransport],
+        stdin: asyncio.StreamWriter | None = None,
+    ) -> None:
+        self._popen = popen
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self._transports = transports
+        self._loop = asyncio.get_running_loop()
+        self._exited: asyncio.Future[int] = self._loop.create_future()
+        self.rusage: struct_rusage | None = None
+        threading.Thread(target=self._reap, name=f"orch-reap-{popen.pid}", daemon=True).start()
+
+    @property
+    def pid(self) -> int:
+        return self._popen.pid
+
+    @property
+    def returncode(self) -> int | None:
+        return self._popen.returncode
+
+    def _reap(self) -> None:
+        try:
+            _, status, usage = os.wait4(self.pid, 0)
+            code = os.waitstatus_to_exitcode(status)
+        except ChildProcessError:
+            usage = None
+            code = 255
+        with suppress(RuntimeError):  # loop already closed
+            self._loop.call_soon_threadsafe(self._set_exit, code, usage)
+
+    def _set_exit(self, code: int, usage: struct_rusage | None) -> None:
+        # Popen.__del__ only queues children without a returncode for a later waitpid.
+        self._popen.returncode = code
+        self.rusage = usage
+        if not self._exited.done():
+            self._exited.set_result(code)
+
+    async def wait(self) -> int:
+        return await asyncio.shield(self._exited)
+
+    def send_signal(self, sig: int) -> None:
+        if self.returncode is None:
+            os.kill(self.pid, sig)
+
+    def close(self) -> None:
+        for transport in self._transports:
+            transport.close()
+
+
+async def _pipe_reader(pipe: object) -> tuple[asyncio.StreamReader, asyncio.BaseTransport]:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    return reader, transport
+
+
+async def _pipe_writer(pipe: object) -> tuple[asyncio.StreamWriter, asyncio.BaseTransport]:
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, pipe)
+    return asyncio.StreamWriter(transport, protocol, None, loop), transport
+
+
+async def spawn_reaped(
+    cmd: list[str],
+    *,
+    cwd: Path,
+    env: dict[str, str],
+    stdin_pipe: bool = False,
+) -> ReapedProcess:
+    """Start ``cmd`` in its own session with stdout/stderr piped into asyncio readers.
+
+    With ``stdin_pipe`` its stdin is an asyncio writer too; otherwise stdin is inherited.
+    """
+    popen = subprocess.Popen(
+        cmd,
+        cwd=str(cwd),
+        env=env,
+        stdin=subprocess.PIPE if stdin_pipe else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        # Its own process group, so timeouts and cancels reach every helper it forks.
+        start_new_session=True,
+    )
+    transports: list[asyncio.BaseTransport] = []
+    try:
+        stdout, out_transport = await _pipe_reader(popen.stdout)
+        transports.append(out_transport)
+        stderr, err_transport = await _pipe_reader(popen.stderr)
+        transports.append(err_transport)
+        stdin: asyncio.StreamWriter | None = None
+        if stdin_pipe:
+            stdin, in_transport = await _pipe_writer(popen.stdin)
+            transports.append(in_transport)
+    except BaseException:
+        for transport in transports:
+            transport.close()
+        popen.kill()
+        popen.wait()
+        raise
+    return ReapedProcess(popen, stdout, stderr, transports, stdin)
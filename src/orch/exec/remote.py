@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import json
+import os
+import socket
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from orch.exec.timeout import (
+    DEFAULT_KILL_GRACE_SEC,
+    DEFAULT_KILL_SIGNALS,
+    ShutdownRecord,
+    kill_process_group,
+    terminate_with_escalation,
+)
+
+# Per-message limit on both ends; output chunks are much smaller than this.
+MESSAGE_LIMIT = 16 * 1024 * 1024
+OUTPUT_CHUNK_BYTES = 32 * 1024
+
+
+class RemoteWorkerLostError(Exception):
+    """The remote worker disconnected before reporting the task's exit status."""
+
+
+@dataclass(slots=True)
+class RemoteAddress:
+    host: str | None = None
+    port: int | None = None
+    path: str | None = None
+
+    def __str__(self) -> str:
+        if self.path is not None:
+            return f"unix:{self.path}"
+        return f"{self.host}:{self.port}"
+
+
+def parse_address(raw: str) -> RemoteAddress:
+    """Parse ``host:port`` or ``unix:/path/to/socket``."""
+    if raw.startswith("unix:"):
+        path = raw[len("unix:") :]
+        if not path:
+            raise ValueError(f"invalid address: {raw}")
+        return RemoteAddress(path=path)
+    host, sep, port_text = raw.rpartition(":")
+    host = host.strip("[]")
+    if not sep or not host or not port_text.isdigit() or not 0 <= int(port_text) <= 65535:
+        raise ValueError(f"invalid address: {raw} (expected host:port or unix:/path)")
+    return RemoteAddress(host=host, port=int(port_text))
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    """Next protocol message, or None once the peer is gone or sends garbage."""
+    try:
+        line = await reader.readline()
+    except (OSError, RuntimeError, ValueError, asyncio.LimitOverrunError):
+        return None
+    if not line:
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def send_message(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    with suppress(OSError, RuntimeError):
+        writer.write(encode_message(message))
+
+
+class RemoteWorker:
+    """Coordinator-side view of one connected ``orch worker``."""
+
+    def __init__(
+        self, name: str, slots: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.name = name
+        self.slots = slots
+        self.free = slots
+        self.connected = True
+        self._reader = reader
+        self._writer = writer
+        self._pending: dict[str, asyncio.Queue[dict[str, Any] | None]] = {}
+
+    async def pump(self) -> None:
+        """Route replies to their requests until the connection drops."""
+        while True:
+            message = await read_message(self._reader)
+            if message is None:
+                break
+            queue = self._pending.get(str(message.get("id")))
+            if queue is not None:
+                queue.put_nowait(message)
+        self.connected = False
+        for queue in self._pending.values():
+            queue.put_nowait(None)
+
+    async def request(
+        self, request_id: str, payload: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Send one task; yield stdout/stderr messages and finally the exit message."""
+        queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self._pending[request_id] = queue
+        try:
+            if not self.connected:
+                raise RemoteWorkerLostError(f"remote worker '{self.name}' disconnected")
+            send_message(self._writer, {"type": "run", "id": request_id, **payload})
+            while True:
+                message = await queue.get()
+                if message is None:
+                    raise RemoteWorkerLostError(f"remote worker '{self.name}' disconnected")
+                yield message
+                if message.get("type") == "exit":
+                    return
+        finally:
+            self._pending.pop(request_id, None)
+
+    def kill(self, request_id: str) -> None:
+        if self.connected:
+            send_message(self._writer, {"type": "kill", "id": request_id})
+
+    def close(self) -> None:
+        with suppress(OSError, RuntimeError):
+            self._writer.close()
+
+
+class Coordinator:
+    """Socket server embedded in run_plan that hands task specs to connected workers."""
+
+    def __init__(self, address: RemoteAddress) -> None:
+        self.address = address
+        self._server: asyncio.AbstractServer | None = None
+        self._workers: list[RemoteWorker] = []
+        self._changed = asyncio.Condition()
+        self._pumps: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        if self.address.path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=self.address.path, limit=MESSAGE_LIMIT
+            )
+            return
+        self._server = await asyncio.start_server(
+            self._handle, host=self.address.host, port=self.address.port, limit=MESSAGE_LIMIT
+        )
+        if self.address.port == 0:
+            # Report the kernel-chosen port so callers can hand it to workers.
+            sockname = self._server.sockets[0].getsockname()
+            self.address = RemoteAddress(host=self.address.host, port=int(sockname[1]))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        hello = await read_message(reader)
+        slots = None if hello is None else hello.get("slots")
+        if (
+            hello is None
+            or hello.get("type") != "hello"
+            or not isinstance(slots, int)
+            or isinstance(slots, bool)
+            or slots < 1
+        ):
+            with suppress(OSError, RuntimeError):
+                writer.close()
+            return
+        worker = RemoteWorker(str(hello.get("name") or "worker"), slots, reader, writer)
+        async with self._changed:
+            self._workers.append(worker)
+            self._changed.notify_all()
+        pump = asyncio.ensure_future(worker.pump())
+        self._pumps.add(pump)
+        try:
+            await pump
+        finally:
+            self._pumps.discard(pump)
+            async with self._changed:
+                self._workers.remove(worker)
+            worker.close()
+
+    @property
+    def connected_slots(self) -> int:
+        return sum(worker.slots for worker in self._workers)
+
+    async def acquire(self) -> RemoteWorker:
+        """Wait for a free slot on any connected worker, preferring the least loaded one."""
+        async with self._changed:
+            while True:
+                free = [worker for worker in self._workers if worker.free > 0]
+                if free:
+                    worker = max(free, key=lambda candidate: candidate.free)
+                    worker.free -= 1
+                    return worker
+                await self._changed.wait()
+
+    async def release(self, worker: RemoteWorker) -> None:
+        async with self._changed:
+            worker.free += 1
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for worker in list(self._workers):
+            worker.close()
+        await asyncio.gather(*self._pumps, return_exceptions=True)
+        if self._server is not None:
+            with suppress(OSError, RuntimeError):
+                await self._server.wait_closed()
+        if self.address.path is not None:
+            with suppress(OSError, RuntimeError):
+                Path(self.address.path).unlink()
+
+
+async def open_connection(
+    address: RemoteAddress,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if address.path is not None:
+        return await asyncio.open_unix_connection(address.path, limit=MESSAGE_LIMIT)
+    return await asyncio.open_connection(address.host, address.port, limit=MESSAGE_LIMIT)
+
+
+async def _pump_output(
+    stream: asyncio.StreamReader | None,
+    writer: asyncio.StreamWriter,
+    request_id: str,
+    kind: str,
+) -> None:
+    if stream is None:
+        return
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = await stream.read(OUTPUT_CHUNK_BYTES)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            send_message(writer, {"type": kind, "id": request_id, "data": text})
+            with suppress(OSError, RuntimeError):
+                await writer.drain()
+        if not chunk:
+            return
+
+
+async def _run_request(
+    message: dict[str, Any],
+    writer: asyncio.StreamWriter,
+    kill_events: dict[str, asyncio.Event],
+    workdir: Path,
+) -> None:
+    request_id = str(message["id"])
+    try:
+        await _run_command(message, request_id, writer, kill_events[request_id], workdir)
+    finally:
+        kill_events.pop(request_id, None)
+
+
+async def _run_command(
+    message: dict[str, Any],
+    request_id: str,
+    writer: asyncio.StreamWriter,
+    kill_event: asyncio.Event,
+    workdir: Path,
+) -> None:
+    env = os.environ.copy()
+    if isinstance(message.get("env"), dict):
+        env.update(message["env"])
+    cwd = workdir if message.get("cwd") is None else workdir / str(message["cwd"])
+    signals = message.get("kill_signals")
+    if not isinstance(signals, list) or not signals or not all(isinstance(v, str) for v in signals):
+        signals = list(DEFAULT_KILL_SIGNALS)
+    grace_sec = message.get("kill_grace_sec")
+    if not isinstance(grace_sec, (int, float)) or isinstance(grace_sec, bool) or grace_sec < 0:
+        grace_sec = DEFAULT_KILL_GRACE_SEC
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *message["cmd"],
+            cwd=str(cwd),
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+    except (OSError, RuntimeError, ValueError, TypeError, KeyError) as exc:
+        send_message(
+            writer,
+            {"type": "stderr", "id": request_id, "data": f"failed to start process: {exc}\n"},
+        )
+        send_message(
+            writer, {"type": "exit", "id": request_id, "exit_code": 127, "start_failed": True}
+        )
+        return
+    pumps = asyncio.gather(
+        _pump_output(proc.stdout, writer, request_id, "stdout"),
+        _pump_output(proc.stderr, writer, request_id, "stderr"),
+        return_exceptions=True,
+    )
+    proc_wait = asyncio.ensure_future(proc.wait())
+    kill_wait = asyncio.ensure_future(kill_event.wait())
+    try:
+        await asyncio.wait({proc_wait, kill_wait}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        kill_process_group(proc)
+        raise
+    finally:
+        kill_wait.cancel()
+    shutdown: ShutdownRecord | None = None
+    if not proc_wait.done():
+        shutdown = await terminate_with_escalation(
+            proc, signals=signals, grace_sec=float(grace_sec), group=True
+        )
+    # Bounded, like the local runner: a detached grandchild may hold the pipes open.
+    await asyncio.wait({pumps}, timeout=float(grace_sec))
+    pumps.cancel()
+    await asyncio.gather(pumps, return_exceptions=True)
+    exit_message: dict[str, Any] = {
+        "type": "exit",
+        "id": request_id,
+        "exit_code": proc.returncode,
+    }
+    if shutdown is not None:
+        exit_message["shutdown_sec"] = shutdown.duration_sec
+        exit_message["shutdown_signal"] = shutdown.signal
+    send_message(writer, exit_message)
+    with suppress(OSError, RuntimeError):
+        await writer.drain()
+
+
+async def serve_remote_worker(
+    address: RemoteAddress,
+    *,
+    slots: int,
+    workdir: Path,
+    name: str | None = None,
+    connect_timeout_sec: float = 30.0,
+) -> None:
+    """Connect to a coordinator and run the tasks it sends until it disconnects."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + connect_timeout_sec
+    while True:
+        try:
+            reader, writer = await open_connection(address)
+            break
+        except (OSError, RuntimeError):
+            # The coordinator may not be listening yet; keep trying until the deadline.
+            if loop.time() >= deadline:
+                raise
+            await asyncio.sleep(0.2)
+    hello = {
+        "type": "hello",
+        "slots": slots,
+        "name": name or f"{socket.gethostname()}:{os.getpid()}",
+    }
+    send_message(writer, hello)
+    kill_events: dict[str, asyncio.Event] = {}
+    running: set[asyncio.Task[None]] = set()
+    try:
+        while True:
+            message = await read_message(reader)
+            if message is None:
+                break
+            request_id = str(message.get("id"))
+            if message.get("type") == "kill":
+                if request_id in kill_events:
+                    kill_events[request_id].set()
+                continue
+            if message.get("type") != "run":
+                continue
+            kill_events[request_id] = asyncio.Event()
+            task = asyncio.create_task(_run_request(message, writer, kill_events, workdir))
+            running.add(task)
+            task.add_done_callback(running.discard)
+    finally:
+        # Losing the coordinator stops everything it handed out.
+        for event in kill_events.values():
+            event.set()
+        await asyncio.gather(*running, return_exceptions=True)
+        with suppress(OSError, RuntimeError):
+            writer.close()
@@ -1,27 +1,91 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import glob as globlib
+import heapq
+import itertools
+import math
 import os
 import re
 import shutil
+import signal
 import stat
+import subprocess
+from collections import deque
+from collections.abc import Hashable
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
+from orch.config.loader import load_emitted_tasks, parse_emitted_tasks
 from orch.config.schema import PlanSpec, TaskSpec
 from orch.dag.build import build_adjacency
-from orch.exec.cancel import cancel_requested, clear_cancel_request
+from orch.dag.pipeline import add_pipeline_edges, pipeline_groups
+from orch.dag.rank import upward_ranks
+from orch.dag.validate import assert_acyclic
+from orch.exec.budget import FairShareBudget
+from orch.exec.cache import (
+    compute_cache_key,
+    compute_cutoff_fingerprint,
+    hash_file,
+    lookup_cache,
+    read_file_bytes,
+    restore_outputs,
+    store_cache,
+)
+from orch.exec.call import CallPool, CallSpec, CallTargetError
+from orch.exec.cancel import cancel_requested, clear_cancel_request, watch_cancel_request
 from orch.exec.capture import stream_to_file
+from orch.exec.checkpoint import Checkpointer
+from orch.exec.limits import (
+    ResourceUsage,
+    create_task_cgroup,
+    delegated_cgroup_parent,
+    enable_cgroup_delegation,
+    limits_command,
+    read_cgroup_usage,
+    remove_task_cgroup,
+)
+from orch.exec.pipe import TaskPipe
+from orch.exec.pressure import AdaptiveLimit, read_pressure_sample
+from orch.exec.ready import ReadyQueue
+from orch.exec.reap import rusage_for_attempt, spawn_reaped
+from orch.exec.remote import Coordinator, RemoteWorkerLostError, parse_address
 from orch.exec.retry import backoff_for_attempt
-from orch.state.model import RunState, TaskState
-from orch.state.store import load_state, save_state_atomic
-from orch.util.errors import StateError
+from orch.exec.timeout import (
+    DEFAULT_KILL_GRACE_SEC,
+    DEFAULT_KILL_SIGNALS,
+    ChildProcess,
+    ShutdownRecord,
+    kill_process_group,
+    terminate_with_escalation,
+)
+from orch.exec.worker import WorkerCrashedError, WorkerPool, WorkerProcess, WorkerStartError
+from orch.state.history import historical_durations, historical_p95, previous_successes
+from orch.state.journal import StateJournal
+from orch.state.model import (
+    MAX_PARALLEL_SAMPLES,
+    AttemptRusage,
+    ParallelSample,
+    PoolStats,
+    RunState,
+    TaskState,
+)
+from orch.state.store import load_state
+from orch.util.errors import PlanError, StateError
 from orch.util.path_guard import has_symlink_ancestor, is_symlink_path
 from orch.util.time import duration_sec, now_iso
 
+SCHEDULE_MODES = ("priority", "critical-path")
+# Cost used for critical-path ranking when a task has no history and no estimate_sec.
+DEFAULT_TASK_COST_SEC = 1.0
+PRESSURE_SAMPLE_INTERVAL_SEC = 1.0
+# A hedge of a task without ``inputs`` copies its whole cwd; larger cwds are not hedged.
+HEDGE_CWD_MAX_BYTES = 256 * 1024 * 1024
+
 
 @dataclass(slots=True)
 class TaskResult:
@@ -32,6 +96,14 @@ class TaskResult:
     started_at: str
     ended_at: str
     duration_sec: float
+    cached: bool = False
+    up_to_date: bool = False
+    hedge_won: bool = False
+    shutdown_sec: float | None = None
+    shutdown_signal: str | None = None
+    memory_peak_bytes: int | None = None
+    cpu_usage_sec: float | None = None
+    rusage: AttemptRusage | None = None
 
 
 def _terminal_status(task: TaskState) -> bool:
@@ -49,11 +121,23 @@ def _should_retry(task: TaskSpec, result: TaskResult, attempt: int) -> bool:
     return result.timed_out or result.exit_code not in (0, None)
 
 
+def _abandon_retry(task_state: TaskState, reason: str) -> None:
+    # The last attempt already ran, so keep its outcome instead of pretending it never started.
+    task_state.skip_reason = reason
+    if reason == "run_canceled" and task_state.exit_code is not None:
+        task_state.status = "CANCELED"
+        task_state.canceled = True
+        task_state.timed_out = False
+    else:
+        task_state.status = "FAILED"
+
+
+def _attempt_header(attempt: int, max_attempts: int) -> str:
+    return f"\n===== attempt {attempt} / {max_attempts} =====\n"
+
+
 def _append_attempt_header(log_path: Path, attempt: int, max_attempts: int) -> None:
-    _append_text_best_effort(
-        log_path,
-        f"\n===== attempt {attempt} / {max_attempts} =====\n",
-    )
+    _append_text_best_effort(log_path, _attempt_header(attempt, max_attempts))
 
 
 def _append_text_best_effort(log_path: Path, text: str) -> None:
@@ -207,24 +291,26 @@ def _iter_unique_artifact_sources(task: TaskSpec, cwd: Path) -> list[tuple[Path,
     return selected
 
 
-def _copy_artifacts(task: TaskSpec, run_dir: Path, cwd: Path) -> list[str]:
+def _copy_artifacts(task: TaskSpec, run_dir: Path, cwd: Path) -> tuple[list[str], dict[str, str]]:
+    """Copy outputs into the run artifacts dir; also return their sha256 by relative path."""
     copied: list[str] = []
+    digests: dict[str, str] = {}
     if not task.outputs:
-        return copied
+        return copied, digests
     artifacts_root = run_dir / "artifacts"
     if has_symlink_ancestor(artifacts_root):
-        return copied
+        return copied, digests
     if is_symlink_path(artifacts_root):
-        return copied
+        return copied, digests
     task_root = artifacts_root / task.id
     if has_symlink_ancestor(task_root):
-        return copied
+        return copied, digests
     if is_symlink_path(task_root):
-        return copied
+        return copied, digests
     try:
         task_root.mkdir(parents=True, exist_ok=True)
     except (OSError, RuntimeError):
-        return copied
+        return copied, digests
     for match, rel in _iter_unique_artifact_sources(task, cwd):
         if not _is_copyable_artifact_source(match):
             continue
@@ -241,7 +327,11 @@ def _copy_artifacts(task: TaskSpec, run_dir: Path, cwd: Path) -> list[str]:
         except (OSError, RuntimeError, shutil.Error):
             continue
         copied.append(str(dest.relative_to(run_dir)))
-    return sorted(copied, key=lambda rel: rel.casefold())
+        # Hashing the fresh copy reads it back from the page cache and keeps copy2's fast path.
+        digest = hash_file(dest)
+        if digest is not None:
+            digests[rel.as_posix()] = digest
+    return sorted(copied, key=lambda rel: rel.casefold()), digests
 
 
 def _copy_to_aggregate_dir(
@@ -292,6 +382,137 @@ def _copy_to_aggregate_dir_best_effort(
         return
 
 
+def _cache_input_files(task: TaskSpec, cwd: Path) -> list[tuple[str, Path]]:
+    files: dict[str, Path] = {}
+    for pattern in task.inputs:
+        for match in _iter_output_matches(pattern, cwd):
+            if _is_copyable_artifact_source(match):
+                files[str(_artifact_relative_path(match, cwd))] = match
+    return list(files.items())
+
+
+def _task_cache_key(task: TaskSpec, cwd: Path) -> str | None:
+    return compute_cache_key(task, _cache_input_files(task, cwd))
+
+
+def _cache_output_files(task: TaskSpec, cwd: Path) -> list[tuple[Path, str]] | None:
+    """Outputs to cache as (source, path relative to cwd); None if any cannot be restored there."""
+    selected: list[tuple[Path, str]] = []
+    for match, rel in _iter_unique_artifact_sources(task, cwd):
+        if cwd / rel != match:
+            # Outputs outside cwd or renamed for case collisions have nowhere to be restored to.
+            return None
+        selected.append((match, rel.as_posix()))
+    return selected
+
+
+def _log_paths(task: TaskSpec, run_dir: Path) -> tuple[Path, Path]:
+    return run_dir / "logs" / f"{task.id}.out.log", run_dir / "logs" / f"{task.id}.err.log"
+
+
+def _attempt_log_offsets(task: TaskSpec, run_dir: Path, attempt: int) -> tuple[int, int]:
+    """Where this attempt's output will start in each log, just past its header."""
+    header_len = len(_attempt_header(attempt, task.retries + 1).encode("utf-8"))
+    offsets: list[int] = []
+    for log_path in _log_paths(task, run_dir):
+        try:
+            size = log_path.lstat().st_size
+        except (OSError, RuntimeError):
+            size = 0
+        offsets.append(size + header_len)
+    return offsets[0], offsets[1]
+
+
+def _restore_from_cache(
+    task: TaskSpec, run_dir: Path, cache_root: Path, key: str, cwd: Path, attempt: int
+) -> bool:
+    entry = lookup_cache(cache_root, key)
+    if entry is None:
+        return False
+    stdout = read_file_bytes(entry.root / "stdout.log")
+    stderr = read_file_bytes(entry.root / "stderr.log")
+    if stdout is None or stderr is None or not restore_outputs(entry, cwd):
+        return False
+    for log_path, data in zip(_log_paths(task, run_dir), (stdout, stderr), strict=True):
+        _append_attempt_header(log_path, attempt, task.retries + 1)
+        _append_text_best_effort(log_path, data.decode("utf-8", errors="replace"))
+    return True
+
+
+def _store_in_cache(
+    task: TaskSpec,
+    run_dir: Path,
+    cache_root: Path,
+    key: str,
+    cwd: Path,
+    log_offsets: tuple[int, int],
+) -> None:
+    outputs = _cache_output_files(task, cwd)
+    out_path, err_path = _log_paths(task, run_dir)
+    stdout = read_file_bytes(out_path, offset=log_offsets[0])
+    stderr = read_file_bytes(err_path, offset=log_offsets[1])
+    if outputs is None or stdout is None or stderr is None:
+        return
+    store_cache(cache_root, key, stdout=stdout, stderr=stderr, outputs=outputs)
+
+
+def _outputs_unchanged(task: TaskSpec, cwd: Path, digests: dict[str, str]) -> bool:
+    current = {
+        rel.as_posix(): hash_file(match) for match, rel in _iter_unique_artifact_sources(task, cwd)
+    }
+    return bool(digests) and current == digests
+
+
+def _cached_result() -> TaskResult:
+    result = _not_started_result(canceled=False)
+    result.exit_code = 0
+    result.cached = True
+    return result
+
+
+def _newest_and_oldest_mtime(patterns: list[str], cwd: Path) -> tuple[int, int] | None:
+    """Newest and oldest mtime (ns) over regular files matched by patterns; None if one is empty."""
+    newest: int | None = None
+    oldest: int | None = None
+    for pattern in patterns:
+        matched = False
+        for match in _iter_output_matches(pattern, cwd):
+            try:
+                meta = match.lstat()
+            except (OSError, RuntimeError):
+                continue
+            if not stat.S_ISREG(meta.st_mode):
+                continue
+            matched = True
+            newest = meta.st_mtime_ns if newest is None else max(newest, meta.st_mtime_ns)
+            oldest = meta.st_mtime_ns if oldest is None else min(oldest, meta.st_mtime_ns)
+        if not matched:
+            return None
+    if newest is None or oldest is None:
+        return None
+    return newest, oldest
+
+
+def _is_up_to_date(task: TaskSpec, cwd: Path) -> bool:
+    """Make-style check by stat alone: every input is older than every output."""
+    if not task.inputs or not task.outputs:
+        return False
+    inputs = _newest_and_oldest_mtime(task.inputs, cwd)
+    if inputs is None:
+        return False
+    outputs = _newest_and_oldest_mtime(task.outputs, cwd)
+    if outputs is None:
+        return False
+    return inputs[0] < outputs[1]
+
+
+def _up_to_date_result() -> TaskResult:
+    result = _not_started_result(canceled=False)
+    result.exit_code = 0
+    result.up_to_date = True
+    return result
+
+
 def _finalize_run_status(state: RunState) -> None:
     statuses = [task.status for task in state.tasks.values()]
     if any(status == "CANCELED" for status in statuses):
@@ -306,9 +527,25 @@ def _finalize_run_status(state: RunState) -> None:
         state.status = "FAILED"
 
 
-def _persist(run_dir: Path, state: RunState) -> None:
+def _persist(state: RunState, journal: StateJournal) -> None:
     state.updated_at = now_iso()
-    save_state_atomic(run_dir, state)
+    journal.compact()
+
+
+def _pending_task_state(task: TaskSpec) -> TaskState:
+    return TaskState(
+        status="PENDING",
+        depends_on=task.depends_on,
+        cmd=task.cmd,
+        cwd=task.cwd,
+        env=task.env,
+        timeout_sec=task.timeout_sec,
+        retries=task.retries,
+        retry_backoff_sec=task.retry_backoff_sec,
+        outputs=task.outputs,
+        stdout_path=f"logs/{task.id}.out.log",
+        stderr_path=f"logs/{task.id}.err.log",
+    )
 
 
 def _initial_state(
@@ -325,22 +562,7 @@ def _initial_state(
         resolved_home = run_dir.parent.parent.resolve()
     except (OSError, RuntimeError) as exc:
         raise OSError(f"failed to resolve home path: {run_dir.parent.parent}") from exc
-    tasks = {
-        task.id: TaskState(
-            status="PENDING",
-            depends_on=task.depends_on,
-            cmd=task.cmd,
-            cwd=task.cwd,
-            env=task.env,
-            timeout_sec=task.timeout_sec,
-            retries=task.retries,
-            retry_backoff_sec=task.retry_backoff_sec,
-            outputs=task.outputs,
-            stdout_path=f"logs/{task.id}.out.log",
-            stderr_path=f"logs/{task.id}.err.log",
-        )
-        for task in plan.tasks
-    }
+    tasks = {task.id: _pending_task_state(task) for task in plan.tasks}
     return RunState(
         run_id=run_id,
         created_at=ts,
@@ -400,6 +622,41 @@ def _reset_for_rerun(task_state: TaskState) -> None:
     task_state.canceled = False
     task_state.skip_reason = None
     task_state.artifact_paths = []
+    task_state.cached = False
+    task_state.up_to_date = False
+    task_state.hedge_won = False
+    task_state.shutdown_sec = None
+    task_state.shutdown_signal = None
+    task_state.memory_peak_bytes = None
+    task_state.cpu_usage_sec = None
+    task_state.rusage = []
+    task_state.output_digests = {}
+    task_state.input_fingerprint = None
+
+
+def _restore_emitted_tasks(plan: PlanSpec, state: RunState) -> None:
+    """Splice tasks emitted earlier in this run back into ``plan`` so it matches the state."""
+    pending = dict(state.emitted_tasks)
+    known = {task.id for task in plan.tasks}
+    while pending:
+        # An emitted task can emit in turn, so its batch waits until its emitter is spliced.
+        emitters = [emitter for emitter in pending if emitter in known]
+        if not emitters:
+            raise StateError("invalid state field: emitted_tasks")
+        for emitter in emitters:
+            try:
+                tasks = parse_emitted_tasks(pending.pop(emitter), plan, emitter)
+            except PlanError as exc:
+                raise StateError("invalid state field: emitted_tasks") from exc
+            plan.tasks.extend(tasks)
+            known.update(task.id for task in tasks)
+
+
+def _clear_emitted_manifest(task: TaskSpec, cwd: Path) -> None:
+    # A manifest left over from an earlier run must not be mistaken for this attempt's.
+    if task.emits is not None:
+        with suppress(OSError, RuntimeError):
+            (cwd / task.emits).unlink(missing_ok=True)
 
 
 def _validate_resume_state_matches_plan(plan: PlanSpec, state: RunState) -> None:
@@ -413,13 +670,132 @@ def _validate_resume_state_matches_plan(plan: PlanSpec, state: RunState) -> None
         raise StateError(f"unknown task state entries: {unknown}")
 
 
+def _kill_grace_sec(task: TaskSpec) -> float:
+    return DEFAULT_KILL_GRACE_SEC if task.kill_grace_sec is None else task.kill_grace_sec
+
+
+async def _terminate_process(proc: ChildProcess, task: TaskSpec) -> ShutdownRecord:
+    return await terminate_with_escalation(
+        proc,
+        signals=task.kill_signals or DEFAULT_KILL_SIGNALS,
+        grace_sec=_kill_grace_sec(task),
+        group=True,
+    )
+
+
+def _task_cgroup(task: TaskSpec) -> Path | None:
+    if task.cpu_max is None and task.memory_max is None:
+        return None
+    parent = delegated_cgroup_parent()
+    if parent is None:
+        return None
+    return create_task_cgroup(parent, task.id, cpu_max=task.cpu_max, memory_max=task.memory_max)
+
+
+async def _drain_streams(streams: list[asyncio.Task[None]], timeout_sec: float) -> None:
+    """Wait up to ``timeout_sec`` for output capture to hit EOF, then stop capturing.
+
+    A detached grandchild can keep a pipe open indefinitely; the slot must not wait on it.
+    """
+    _, pending = await asyncio.wait(streams, timeout=timeout_sec)
+    for stream in pending:
+        stream.cancel()
+    await asyncio.gather(*streams, return_exceptions=True)
+
+
+def _not_started_result(*, canceled: bool) -> TaskResult:
+    now_dt = datetime.now().astimezone()
+    now_text = now_dt.isoformat(timespec="seconds")
+    return TaskResult(
+        exit_code=None,
+        timed_out=False,
+        canceled=canceled,
+        start_failed=False,
+        started_at=now_text,
+        ended_at=now_text,
+        duration_sec=0.0,
+    )
+
+
+async def _acquire_budget(
+    budget: FairShareBudget,
+    run_key: str,
+    demand: dict[str, float],
+    cancel_event: asyncio.Event,
+    slots: int = 1,
+) -> bool:
+    """Wait for ``slots`` shared slots; False if the run is canceled first."""
+    if cancel_event.is_set():
+        return False
+    acquire = asyncio.ensure_future(budget.acquire(run_key, demand, slots))
+    cancel_wait = asyncio.ensure_future(cancel_event.wait())
+    try:
+        await asyncio.wait({acquire, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        cancel_wait.cancel()
+    if acquire.done():
+        return True
+    acquire.cancel()
+    await asyncio.gather(acquire, return_exceptions=True)
+    return False
+
+
+async def _race_cancel_and_timeout(
+    work: asyncio.Future[Any],
+    run_dir: Path,
+    *,
+    cancel_event: asyncio.Event | None,
+    deadline: float | None,
+) -> str:
+    """Wait for work, a cancel request or the deadline; return "done", "canceled" or "timed_out".
+
+    Completed work wins over a cancel that arrives in the same tick, and cancel wins over timeout.
+    """
+    loop = asyncio.get_running_loop()
+    own_cancel_watch: asyncio.Task[None] | None = None
+    if cancel_event is None:
+        cancel_event = asyncio.Event()
+        own_cancel_watch = asyncio.create_task(watch_cancel_request(run_dir, cancel_event))
+    timeout_event = asyncio.Event()
+    timeout_handle: asyncio.TimerHandle | None = None
+    if deadline is not None:
+        timeout_handle = loop.call_at(deadline, timeout_event.set)
+    cancel_wait = asyncio.ensure_future(cancel_event.wait())
+    timeout_wait = asyncio.ensure_future(timeout_event.wait())
+    try:
+        await asyncio.wait({work, cancel_wait, timeout_wait}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if timeout_handle is not None:
+            timeout_handle.cancel()
+        for waiter in (cancel_wait, timeout_wait):
+            waiter.cancel()
+        if own_cancel_watch is not None:
+            own_cancel_watch.cancel()
+    if work.done():
+        return "done"
+    if cancel_event.is_set():
+        return "canceled"
+    return "timed_out"
+
+
 async def run_task(
     task: TaskSpec,
     run_dir: Path,
     *,
     attempt: int,
     default_cwd: Path,
+    cancel_event: asyncio.Event | None = None,
+    stdin: TaskPipe | None = None,
+    stdout: TaskPipe | None = None,
 ) -> TaskResult:
+    """Run ``task.cmd`` as one attempt.
+
+    ``stdin`` feeds the process from a producer task; ``stdout`` also forwards its output to a
+    consumer task besides the log.
+    """
+    loop = asyncio.get_running_loop()
+    started_mono = loop.time()
+    deadline = None if task.timeout_sec is None else started_mono + task.timeout_sec
     started_dt = datetime.now().astimezone()
     started_iso = started_dt.isoformat(timespec="seconds")
     out_path = run_dir / "logs" / f"{task.id}.out.log"
@@ -432,15 +808,21 @@ async def run_task(
     if task.env:
         merged_env.update(task.env)
     cwd = _resolve_task_cwd(task.cwd, default_cwd)
+    leaf = _task_cgroup(task)
     try:
-        proc = await asyncio.create_subprocess_exec(
-            *task.cmd,
-            cwd=str(cwd),
+        proc = await spawn_reaped(
+            limits_command(task.cmd, leaf, task.memory_max, cwd=cwd, env=merged_env),
+            cwd=cwd,
             env=merged_env,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stdin_pipe=stdin is not None,
         )
-    except (OSError, RuntimeError, ValueError) as exc:
+    except (OSError, RuntimeError, ValueError, subprocess.SubprocessError) as exc:
+        if leaf is not None:
+            await remove_task_cgroup(leaf)
+        if stdin is not None:
+            stdin.attach(None)
+        if stdout is not None:
+            stdout.close()
         _append_text_best_effort(err_path, f"failed to start process: {exc}\n")
         ended_dt = datetime.now().astimezone()
         return TaskResult(
@@ -453,41 +835,58 @@ async def run_task(
             duration_sec=duration_sec(started_dt, ended_dt),
         )
 
-    out_stream = asyncio.create_task(stream_to_file(proc.stdout, out_path))
+    if stdin is not None:
+        stdin.attach(proc.stdin)
+    out_stream = asyncio.create_task(stream_to_file(proc.stdout, out_path, stdout))
     err_stream = asyncio.create_task(stream_to_file(proc.stderr, err_path))
     timed_out = False
     canceled = False
     exit_code: int | None = None
+    shutdown: ShutdownRecord | None = None
 
-    while True:
-        if proc.returncode is not None:
-            exit_code = proc.returncode
-            break
-        if cancel_requested(run_dir):
-            canceled = True
-            proc.terminate()
-            try:
-                await asyncio.wait_for(proc.wait(), timeout=1.0)
-            except TimeoutError:
-                proc.kill()
-                await proc.wait()
-            exit_code = proc.returncode
-            break
-        if task.timeout_sec is not None:
-            elapsed = (datetime.now().astimezone() - started_dt).total_seconds()
-            if elapsed > task.timeout_sec:
-                timed_out = True
-                proc.terminate()
-                try:
-                    await asyncio.wait_for(proc.wait(), timeout=1.0)
-                except TimeoutError:
-                    proc.kill()
-                    await proc.wait()
-                exit_code = None
-                break
-        await asyncio.sleep(0.1)
-
-    await asyncio.gather(out_stream, err_stream, return_exceptions=True)
+    proc_wait = asyncio.ensure_future(proc.wait())
+    try:
+        outcome = await _race_cancel_and_timeout(
+            proc_wait,
+            run_dir,
+            cancel_event=cancel_event,
+            deadline=deadline,
+        )
+    except asyncio.CancelledError:
+        # The runner itself is going away (e.g. Ctrl-C); a new session no longer gets the SIGINT.
+        kill_process_group(proc)
+        if stdout is not None:
+            stdout.close()
+        if leaf is not None:
+            # The leaf stays busy until the killed group has exited; wait for that, but briefly.
+            await asyncio.wait({proc_wait}, timeout=_kill_grace_sec(task))
+            await remove_task_cgroup(leaf)
+        raise
+    if outcome == "done":
+        exit_code = proc.returncode
+    elif outcome == "canceled":
+        canceled = True
+        shutdown = await _terminate_process(proc, task)
+        exit_code = proc.returncode
+    else:
+        timed_out = True
+        shutdown = await _terminate_process(proc, task)
+        exit_code = None
+
+    if stdout is not None and outcome == "done":
+        # Output the producer wrote before exiting may still be on its way to a slow consumer;
+        # that is bounded by the task's timeout, not the kill grace.
+        remaining = None if deadline is None else max(0.0, deadline - loop.time())
+        await asyncio.wait([out_stream], timeout=remaining)
+        if not out_stream.done():
+            timed_out = True
+            exit_code = None
+    await _drain_streams([out_stream, err_stream], _kill_grace_sec(task))
+    proc.close()
+    usage = ResourceUsage(memory_peak_bytes=None, cpu_usage_sec=None)
+    if leaf is not None:
+        usage = read_cgroup_usage(leaf)
+        await remove_task_cgroup(leaf)
     ended_dt = datetime.now().astimezone()
     return TaskResult(
         exit_code=exit_code,
@@ -497,9 +896,524 @@ async def run_task(
         started_at=started_iso,
         ended_at=ended_dt.isoformat(timespec="seconds"),
         duration_sec=duration_sec(started_dt, ended_dt),
+        shutdown_sec=None if shutdown is None else shutdown.duration_sec,
+        shutdown_signal=None if shutdown is None else shutdown.signal,
+        memory_peak_bytes=usage.memory_peak_bytes,
+        cpu_usage_sec=usage.cpu_usage_sec,
+        rusage=None if proc.rusage is None else rusage_for_attempt(attempt, proc.rusage),
     )
 
 
+async def run_call_task(
+    task: TaskSpec,
+    run_dir: Path,
+    *,
+    attempt: int,
+    default_cwd: Path,
+    pool: CallPool,
+    cancel_event: asyncio.Event | None = None,
+) -> TaskResult:
+    """Run a ``call:`` task on the runner's process pool with run_task's result semantics."""
+    assert task.call is not None
+    loop = asyncio.get_running_loop()
+    started_mono = loop.time()
+    started_dt = datetime.now().astimezone()
+    started_iso = started_dt.isoformat(timespec="seconds")
+    out_path = run_dir / "logs" / f"{task.id}.out.log"
+    err_path = run_dir / "logs" / f"{task.id}.err.log"
+    max_attempts = task.retries + 1
+    _append_attempt_header(out_path, attempt, max_attempts)
+    _append_attempt_header(err_path, attempt, max_attempts)
+    if has_symlink_ancestor(out_path) or is_symlink_path(out_path) or is_symlink_path(err_path):
+        _append_text_best_effort(err_path, "failed to start call: unsafe log path\n")
+        ended_dt = datetime.now().astimezone()
+        return TaskResult(
+            exit_code=127,
+            timed_out=False,
+            canceled=False,
+            start_failed=True,
+            started_at=started_iso,
+            ended_at=ended_dt.isoformat(timespec="seconds"),
+            duration_sec=duration_sec(started_dt, ended_dt),
+        )
+
+    spec = CallSpec(
+        target=task.call,
+        args=list(task.args),
+        kwargs=dict(task.kwargs),
+        cwd=str(_resolve_task_cwd(task.cwd, default_cwd)),
+        env=task.env,
+        stdout_path=str(out_path),
+        stderr_path=str(err_path),
+    )
+    call_future = asyncio.ensure_future(pool.run(spec))
+    outcome = await _race_cancel_and_timeout(
+        call_future,
+        run_dir,
+        cancel_event=cancel_event,
+        deadline=None if task.timeout_sec is None else started_mono + task.timeout_sec,
+    )
+    exit_code: int | None = None
+    start_failed = False
+    if outcome == "done":
+        try:
+            exit_code = call_future.result()
+        except CallTargetError as exc:
+            _append_text_best_effort(err_path, f"failed to start call: {exc}\n")
+            exit_code = 127
+            start_failed = True
+        except Exception as exc:
+            _append_text_best_effort(err_path, f"call worker failed: {exc!r}\n")
+            exit_code = 70
+    else:
+        # Cancelling the call kills only the worker running it; other calls keep their workers.
+        call_future.cancel()
+        await asyncio.gather(call_future, return_exceptions=True)
+        exit_code = -signal.SIGKILL if outcome == "canceled" else None
+
+    ended_dt = datetime.now().astimezone()
+    return TaskResult(
+        exit_code=exit_code,
+        timed_out=outcome == "timed_out",
+        canceled=outcome == "canceled",
+        start_failed=start_failed,
+        started_at=started_iso,
+        ended_at=ended_dt.isoformat(timespec="seconds"),
+        duration_sec=duration_sec(started_dt, ended_dt),
+    )
+
+
+async def _exchange_with_worker(
+    worker: WorkerProcess,
+    task: TaskSpec,
+    *,
+    attempt: int,
+    cwd: Path,
+    out_path: Path,
+    err_path: Path,
+) -> int:
+    exit_code = 0
+    async for kind, value in worker.request(
+        f"{task.id}#{attempt}", argv=task.cmd, env=task.env, cwd=cwd
+    ):
+        if kind == "exit_code":
+            assert isinstance(value, int)
+            exit_code = value
+        else:
+            assert isinstance(value, str)
+            _append_text_best_effort(out_path if kind == "stdout" else err_path, value)
+    return exit_code
+
+
+async def run_worker_task(
+    task: TaskSpec,
+    run_dir: Path,
+    *,
+    attempt: int,
+    default_cwd: Path,
+    pool: WorkerPool,
+    cancel_event: asyncio.Event | None = None,
+) -> TaskResult:
+    """Send a ``worker:`` task's cmd to a warm worker with run_task's result semantics.
+
+    The timeout covers the request only, not waiting for or starting a worker. A worker that
+    crashes, times out or is canceled mid-request is killed and replaced on the next acquire.
+    """
+    started_dt = datetime.now().astimezone()
+    started_iso = started_dt.isoformat(timespec="seconds")
+    out_path = run_dir / "logs" / f"{task.id}.out.log"
+    err_path = run_dir / "logs" / f"{task.id}.err.log"
+    max_attempts = task.retries + 1
+    _append_attempt_header(out_path, attempt, max_attempts)
+    _append_attempt_header(err_path, attempt, max_attempts)
+
+    def _result(
+        exit_code: int | None, *, outcome: str = "done", start_failed: bool = False
+    ) -> TaskResult:
+        ended_dt = datetime.now().astimezone()
+        return TaskResult(
+            exit_code=exit_code,
+            timed_out=outcome == "timed_out",
+            canceled=outcome == "canceled",
+            start_failed=start_failed,
+            started_at=started_iso,
+            ended_at=ended_dt.isoformat(timespec="seconds"),
+            duration_sec=duration_sec(started_dt, ended_dt),
+        )
+
+    acquire_future = asyncio.ensure_future(pool.acquire())
+    outcome = await _race_cancel_and_timeout(
+        acquire_future, run_dir, cancel_event=cancel_event, deadline=None
+    )
+    if outcome != "done":
+        acquire_future.cancel()
+        await asyncio.gather(acquire_future, return_exceptions=True)
+        if not acquire_future.cancelled() and acquire_future.exception() is None:
+            pool.release(acquire_future.result())
+        return _result(None, outcome=outcome)
+    try:
+        worker = acquire_future.result()
+    except WorkerStartError as exc:
+        _append_text_best_effort(err_path, f"{exc}\n")
+        return _result(127, start_failed=True)
+
+    loop = asyncio.get_running_loop()
+    exchange = asyncio.ensure_future(
+        _exchange_with_worker(
+            worker,
+            task,
+            attempt=attempt,
+            cwd=_resolve_task_cwd(task.cwd, default_cwd),
+            out_path=out_path,
+            err_path=err_path,
+        )
+    )
+    outcome = await _race_cancel_and_timeout(
+        exchange,
+        run_dir,
+        cancel_event=cancel_event,
+        deadline=None if task.timeout_sec is None else loop.time() + task.timeout_sec,
+    )
+    if outcome == "done":
+        try:
+            exit_code = exchange.result()
+        except WorkerCrashedError as exc:
+            _append_text_best_effort(err_path, f"worker '{task.worker}' failed: {exc}\n")
+            await pool.discard(worker)
+            return _result(70)
+        pool.release(worker)
+        return _result(exit_code)
+    exchange.cancel()
+    await asyncio.gather(exchange, return_exceptions=True)
+    await pool.discard(worker)
+    return _result(-signal.SIGKILL if outcome == "canceled" else None, outcome=outcome)
+
+
+async def run_remote_task(
+    task: TaskSpec,
+    run_dir: Path,
+    *,
+    attempt: int,
+    coordinator: Coordinator,
+    cancel_event: asyncio.Event | None = None,
+) -> TaskResult:
+    """Run a cmd task on a worker connected to the coordinator with run_task's result semantics.
+
+    Output streamed back by the worker is written to the usual ``logs/`` files here. The timeout
+    covers waiting for a free worker slot as well as the remote execution, so a run without
+    workers times the task out instead of waiting forever.
+    """
+    started_dt = datetime.now().astimezone()
+    started_iso = started_dt.isoformat(timespec="seconds")
+    out_path = run_dir / "logs" / f"{task.id}.out.log"
+    err_path = run_dir / "logs" / f"{task.id}.err.log"
+    max_attempts = task.retries + 1
+    _append_attempt_header(out_path, attempt, max_attempts)
+    _append_attempt_header(err_path, attempt, max_attempts)
+
+    def _result(
+        exit_code: int | None,
+        *,
+        outcome: str = "done",
+        start_failed: bool = False,
+        shutdown: ShutdownRecord | None = None,
+    ) -> TaskResult:
+        ended_dt = datetime.now().astimezone()
+        return TaskResult(
+            exit_code=exit_code,
+            timed_out=outcome == "timed_out",
+            canceled=outcome == "canceled",
+            start_failed=start_failed,
+            started_at=started_iso,
+            ended_at=ended_dt.isoformat(timespec="seconds"),
+            duration_sec=duration_sec(started_dt, ended_dt),
+            shutdown_sec=None if shutdown is None else shutdown.duration_sec,
+            shutdown_signal=None if shutdown is None else shutdown.signal,
+        )
+
+    loop = asyncio.get_running_loop()
+    deadline = None if task.timeout_sec is None else loop.time() + task.timeout_sec
+    acquire_future = asyncio.ensure_future(coordinator.acquire())
+    outcome = await _race_cancel_and_timeout(
+        acquire_future, run_dir, cancel_event=cancel_event, deadline=deadline
+    )
+    if outcome != "done":
+        acquire_future.cancel()
+        await asyncio.gather(acquire_future, return_exceptions=True)
+        if not acquire_future.cancelled() and acquire_future.exception() is None:
+            await coordinator.release(acquire_future.result())
+        if outcome == "timed_out":
+            _append_text_best_effort(
+                err_path, f"no remote worker slot became free within {task.timeout_sec}s\n"
+            )
+        return _result(None, outcome=outcome)
+    worker = acquire_future.result()
+    request_id = f"{task.id}#{attempt}"
+
+    async def _exchange() -> tuple[int | None, bool, ShutdownRecord | None]:
+        payload = {
+            "cmd": task.cmd,
+            "env": task.env,
+            "cwd": task.cwd,
+            "kill_signals": task.kill_signals,
+            "kill_grace_sec": task.kill_grace_sec,
+        }
+        async for message in worker.request(request_id, payload):
+            kind = message.get("type")
+            if kind in ("stdout", "stderr") and isinstance(message.get("data"), str):
+                _append_text_best_effort(
+                    out_path if kind == "stdout" else err_path, message["data"]
+                )
+            elif kind == "exit":
+                exit_code = message.get("exit_code")
+                shutdown_sec = message.get("shutdown_sec")
+                shutdown_signal = message.get("shutdown_signal")
+                shutdown = None
+                if isinstance(shutdown_sec, (int, float)) and isinstance(shutdown_signal, str):
+                    shutdown = ShutdownRecord(float(shutdown_sec), shutdown_signal)
+                return (
+                    exit_code if isinstance(exit_code, int) else None,
+                    message.get("start_failed") is True,
+                    shutdown,
+                )
+        raise RemoteWorkerLostError(f"remote worker '{worker.name}' sent no exit status")
+
+    exchange = asyncio.ensure_future(_exchange())
+    try:
+        outcome = await _race_cancel_and_timeout(
+            exchange,
+            run_dir,
+            cancel_event=cancel_event,
+            deadline=deadline,
+        )
+        if outcome != "done":
+            # The worker terminates the process and still reports its exit status.
+            worker.kill(request_id)
+            await asyncio.wait({exchange})
+        try:
+            exit_code, start_failed, shutdown = exchange.result()
+        except RemoteWorkerLostError as exc:
+            _append_text_best_effort(err_path, f"{exc}\n")
+            return _result(70 if outcome == "done" else None, outcome=outcome)
+    finally:
+        await coordinator.release(worker)
+    if outcome == "timed_out":
+        exit_code = None
+    return _result(exit_code, outcome=outcome, start_failed=start_failed, shutdown=shutdown)
+
+
+def _attempt_succeeded(future: asyncio.Future[TaskResult]) -> bool:
+    if future.cancelled() or future.exception() is not None:
+        return False
+    result = future.result()
+    return result.exit_code == 0 and not result.timed_out and not result.canceled
+
+
+def _tree_size_exceeds(root: Path, exclude: Path, limit: int) -> bool:
+    """Whether the regular files under ``root`` (not following links) add up to over ``limit``."""
+    total = 0
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                meta = entry.stat(follow_symlinks=False)
+                if stat.S_ISDIR(meta.st_mode):
+                    if Path(entry.path) != exclude:
+                        pending.append(Path(entry.path))
+                elif stat.S_ISREG(meta.st_mode):
+                    total += meta.st_size
+                    if total > limit:
+                        return True
+    return False
+
+
+def _prepare_hedge_cwd(task: TaskSpec, cwd: Path, scratch: Path, exclude: Path) -> str | None:
+    """Fill ``scratch`` with the hedge's cwd; return why the hedge is skipped, or None.
+
+    A task with ``inputs`` gets only the files they match. Otherwise the whole cwd is copied,
+    skipping the orch home, unless it exceeds ``HEDGE_CWD_MAX_BYTES``.
+    """
+    if has_symlink_ancestor(scratch) or is_symlink_path(scratch):
+        return "unsafe scratch path"
+
+    def _ignore(directory: str, names: list[str]) -> list[str]:
+        return [name for name in names if Path(directory, name) == exclude]
+
+    try:
+        if task.inputs:
+            scratch.mkdir(parents=True)
+            for rel, match in _cache_input_files(task, cwd):
+                if cwd / rel != match:
+                    continue
+                dest = scratch / rel
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(match, dest)
+        elif _tree_size_exceeds(cwd, exclude, HEDGE_CWD_MAX_BYTES):
+            return f"cwd is larger than {HEDGE_CWD_MAX_BYTES} bytes and the task has no inputs"
+        else:
+            shutil.copytree(cwd, scratch, symlinks=True, ignore=_ignore)
+    except (OSError, RuntimeError, shutil.Error):
+        with suppress(OSError, RuntimeError, shutil.Error):
+            shutil.rmtree(scratch)
+        return "failed to copy the cwd"
+    return None
+
+
+def _promote_hedge_outputs(task: TaskSpec, scratch: Path, cwd: Path) -> None:
+    for match, rel in _iter_unique_artifact_sources(task, scratch):
+        if scratch / rel != match:
+            continue
+        dest = cwd / rel
+        if has_symlink_ancestor(dest) or is_symlink_path(dest):
+            continue
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(match, dest)
+        except (OSError, RuntimeError, shutil.Error):
+            continue
+
+
+def _merge_hedge_logs(task: TaskSpec, run_dir: Path, hedge_root: Path, attempt: int) -> None:
+    """Append the hedge's logs to the task logs under their own attempt header."""
+    max_attempts = task.retries + 1
+    own_header = _attempt_header(attempt, max_attempts).encode("utf-8")
+    for log_path, hedge_log in zip(
+        _log_paths(task, run_dir), _log_paths(task, hedge_root), strict=True
+    ):
+        data = read_file_bytes(hedge_log, offset=len(own_header))
+        _append_text_best_effort(
+            log_path,
+            f"\n===== attempt {attempt} (hedge) / {max_attempts} =====\n"
+            + (data or b"").decode("utf-8", errors="replace"),
+        )
+
+
+async def run_hedged_task(
+    task: TaskSpec,
+    run_dir: Path,
+    *,
+    attempt: int,
+    default_cwd: Path,
+    hedge_after_sec: float,
+    cancel_event: asyncio.Event,
+) -> TaskResult:
+    """Run a cmd task and, if it is still running after ``hedge_after_sec``, race a duplicate.
+
+    The duplicate runs in a scratch copy of the task cwd (only its ``inputs`` if declared);
+    the first successful attempt wins, the other is terminated, and a winning hedge's outputs
+    are copied back into the cwd. The scratch copy is removed once the race is decided.
+    """
+    primary_stop = asyncio.Event()
+    hedge_stop = asyncio.Event()
+
+    async def _relay_cancel() -> None:
+        await cancel_event.wait()
+        primary_stop.set()
+        hedge_stop.set()
+
+    relay = asyncio.create_task(_relay_cancel())
+    primary = asyncio.ensure_future(
+        run_task(task, run_dir, attempt=attempt, default_cwd=default_cwd, cancel_event=primary_stop)
+    )
+    hedge: asyncio.Future[TaskResult] | None = None
+    hedge_root = run_dir / "hedge" / f"{task.id}.{attempt}"
+    hedge_prepared = False
+    try:
+        await asyncio.wait({primary}, timeout=hedge_after_sec)
+        if primary.done():
+            return primary.result()
+        cwd = _resolve_task_cwd(task.cwd, default_cwd)
+        # The home normally lives under the workdir; never copy it into its own run dir.
+        try:
+            exclude = run_dir.parent.parent.resolve()
+        except (OSError, RuntimeError):
+            return await primary
+        hedge_prepared = True
+        skipped = await asyncio.to_thread(
+            _prepare_hedge_cwd, task, cwd, hedge_root / "cwd", exclude
+        )
+        if skipped is not None:
+            result = await primary
+            _append_text_best_effort(_log_paths(task, run_dir)[1], f"hedge skipped: {skipped}\n")
+            return result
+        hedge = asyncio.ensure_future(
+            run_task(
+                replace(task, cwd=str(hedge_root / "cwd")),
+                hedge_root,
+                attempt=attempt,
+                default_cwd=default_cwd,
+                cancel_event=hedge_stop,
+            )
+        )
+        pending: set[asyncio.Future[TaskResult]] = {primary, hedge}
+        winner: asyncio.Future[TaskResult] | None = None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # The primary wins ties so its outputs stay in place.
+            winner = next(
+                (fut for fut in (primary, hedge) if fut in done and _attempt_succeeded(fut)), None
+            )
+        (hedge_stop if winner is primary else primary_stop).set()
+        await asyncio.wait({primary, hedge})
+        _merge_hedge_logs(task, run_dir, hedge_root, attempt)
+        if winner is hedge:
+            await asyncio.to_thread(_promote_hedge_outputs, task, hedge_root / "cwd", cwd)
+        if winner is not hedge:
+            return await primary
+        result = hedge.result()
+        result.hedge_won = True
+        if primary.exception() is None:
+            # Report the task as one attempt that started with the primary.
+            result.started_at = primary.result().started_at
+            result.duration_sec = primary.result().duration_sec
+        return result
+    finally:
+        relay.cancel()
+        primary_stop.set()
+        hedge_stop.set()
+        await asyncio.gather(
+            relay, primary, *([] if hedge is None else [hedge]), return_exceptions=True
+        )
+        if hedge_prepared:
+            with suppress(OSError, RuntimeError, shutil.Error):
+                await asyncio.to_thread(shutil.rmtree, hedge_root)
+
+
+def _critical_path_ranks(
+    plan: PlanSpec,
+    run_dir: Path,
+    dependents: dict[str, list[str]],
+    in_degree: dict[str, int],
+) -> dict[str, float]:
+    history = historical_durations(run_dir.parent, plan.tasks, exclude_run_id=run_dir.name)
+    cost: dict[str, float] = {}
+    for task in plan.tasks:
+        if task.id in history:
+            cost[task.id] = history[task.id]
+        elif task.estimate_sec is not None:
+            cost[task.id] = task.estimate_sec
+        else:
+            cost[task.id] = DEFAULT_TASK_COST_SEC
+    order = assert_acyclic([task.id for task in plan.tasks], dependents, in_degree)
+    return upward_ranks(order, dependents, cost)
+
+
+def _fits_capacity(
+    demand: dict[str, float], in_use: dict[str, float], capacity: dict[str, float]
+) -> bool:
+    return all(
+        in_use.get(name, 0.0) + demand.get(name, 0.0) <= limit for name, limit in capacity.items()
+    )
+
+
+def _demand_shape(
+    demand: dict[str, float], capacity: dict[str, float]
+) -> tuple[tuple[str, float], ...]:
+    """The part of ``demand`` that ``--capacity`` limits; equal shapes fit or not together."""
+    return tuple(sorted((name, amount) for name, amount in demand.items() if name in capacity))
+
+
 async def run_plan(
     plan: PlanSpec,
     run_dir: Path,
@@ -509,9 +1423,24 @@ async def run_plan(
     workdir: Path,
     resume: bool,
     failed_only: bool,
+    schedule: str = "priority",
+    capacity: dict[str, float] | None = None,
+    adaptive_parallel: bool = False,
+    listen: str | None = None,
+    budget: FairShareBudget | None = None,
+    cache: bool = True,
+    incremental: bool = False,
+    cgroup_delegate: bool = False,
 ) -> RunState:
     if max_parallel < 1:
         raise ValueError("max_parallel must be >= 1")
+    coordinator = None if listen is None else Coordinator(parse_address(listen))
+    if schedule not in SCHEDULE_MODES:
+        raise ValueError(f"schedule must be one of: {', '.join(SCHEDULE_MODES)}")
+    capacity = dict(capacity or {})
+    for name, limit in capacity.items():
+        if not math.isfinite(limit) or limit <= 0:
+            raise ValueError(f"capacity {name} must be > 0")
     try:
         resolved_workdir = workdir.resolve()
     except (OSError, RuntimeError) as exc:
@@ -522,14 +1451,49 @@ async def run_plan(
         raise OSError(f"failed to access workdir: {resolved_workdir}") from exc
     if not stat.S_ISDIR(workdir_meta.st_mode):
         raise OSError(f"workdir must be directory: {resolved_workdir}")
+    if cgroup_delegate:
+        # Moves this process into an ``orch`` leaf; if that fails, limits fall back to rlimits.
+        enable_cgroup_delegation()
 
-    dependents, _ = build_adjacency(plan)
+    # Emitted tasks are appended to the plan, so work on a copy of the caller's task list.
+    plan = replace(plan, tasks=list(plan.tasks))
+    resumed: RunState | None = None
+    if resume:
+        clear_cancel_request(run_dir)
+        resumed = load_state(run_dir)
+        _restore_emitted_tasks(plan, resumed)
+
+    dependents, in_degree = build_adjacency(plan)
     spec_by_id = {task.id: task for task in plan.tasks}
+    # stdin_from chains keyed by their first task; the later members start together with it.
+    pipelines = pipeline_groups(plan.tasks)
+    add_pipeline_edges(pipelines, spec_by_id, dependents, in_degree)
+    riders = {member for chain in pipelines.values() for member in chain[1:]}
+    ranks: dict[str, float] = {}
+    if schedule == "critical-path":
+        # History reads block; keep them off the loop, which a daemon shares between runs.
+        ranks = await asyncio.to_thread(_critical_path_ranks, plan, run_dir, dependents, in_degree)
     aggregate_root = _resolve_artifacts_dir(plan.artifacts_dir, resolved_workdir)
+    # Shared by every run under the same home, next to runs/.
+    cache_root = run_dir.parent.parent / "cache" if cache else None
+    # Early cutoff (only with --incremental or resume) compares against the last successful
+    # run of each task in other runs; those are loaded on first use.
+    cutoff = incremental or resume
+    previous: dict[str, TaskState] | None = None
+    previous_lock = asyncio.Lock()
+    fingerprints: dict[str, str] = {}
+    # A hedge starts at hedge_after_sec, or earlier once history shows that is past the p95.
+    hedge_after: dict[str, float] = {}
+    if any(task.hedge_after_sec is not None for task in plan.tasks):
+        p95 = await asyncio.to_thread(
+            historical_p95, run_dir.parent, plan.tasks, exclude_run_id=run_dir.name
+        )
+        for task in plan.tasks:
+            if task.hedge_after_sec is not None:
+                hedge_after[task.id] = min(task.hedge_after_sec, p95.get(task.id, math.inf))
 
-    if resume:
-        clear_cancel_request(run_dir)
-        state = load_state(run_dir)
+    if resumed is not None:
+        state = resumed
         _validate_resume_state_matches_plan(plan, state)
         _prepare_resume_state(state)
         state.status = "RUNNING"
@@ -537,6 +1501,9 @@ async def run_plan(
         state.fail_fast = fail_fast
         state.workdir = str(resolved_workdir)
         rerun = _rerun_set(plan, state, failed_only=failed_only, dependents=dependents)
+        for chain in pipelines.values():
+            if not rerun.isdisjoint(chain):
+                rerun.update(chain)
         for task_id in rerun:
             _reset_for_rerun(state.tasks[task_id])
     else:
@@ -548,94 +1515,553 @@ async def run_plan(
             workdir=resolved_workdir,
         )
 
-    _persist(run_dir, state)
+    for name, limit in plan.pools.items():
+        pool_stats = state.pools.get(name)
+        if pool_stats is None:
+            state.pools[name] = PoolStats(limit=limit)
+        else:
+            pool_stats.limit = limit
+
+    journal = StateJournal(run_dir, state)
+    _persist(state, journal)
+
+    def _gate(task: TaskSpec) -> list[str]:
+        # A pipeline starts once the dependencies of all of its members are done.
+        chain = pipelines.get(task.id)
+        if chain is None:
+            return task.depends_on
+        return list(dict.fromkeys(dep for member in chain for dep in spec_by_id[member].depends_on))
 
     rerunnable = {task.id for task in plan.tasks if state.tasks[task.id].status == "PENDING"}
     active = set(rerunnable)
     dep_remaining: dict[str, int] = {}
-    for task in plan.tasks:
-        if task.id not in active:
-            continue
-        dep_remaining[task.id] = sum(1 for dep in task.depends_on if dep in active)
+    # Tasks with a dependency that ended in anything but SUCCESS; dispatch skips them.
+    blocked: set[str] = set()
 
-    ready = [task_id for task_id, dep_count in dep_remaining.items() if dep_count == 0]
+    def _track(task: TaskSpec) -> None:
+        gate = _gate(task)
+        dep_remaining[task.id] = sum(1 for dep in gate if dep in active)
+        if any(dep not in active and state.tasks[dep].status != "SUCCESS" for dep in gate):
+            blocked.add(task.id)
+
+    for task in plan.tasks:
+        if task.id in active:
+            _track(task)
+
+    ready = ReadyQueue()
+    pool_running = dict.fromkeys(plan.pools, 0)
+    pool_queued = dict.fromkeys(plan.pools, 0)
+    # A chain is admitted as a whole: its members' summed resources and pool counts must fit.
+    chain_demand: dict[str, dict[str, float]] = {}
+    chain_pools: dict[str, dict[str, int]] = {}
+    for head, chain in pipelines.items():
+        demand: dict[str, float] = {}
+        pool_counts: dict[str, int] = {}
+        for member in chain:
+            member_spec = spec_by_id[member]
+            for name, amount in member_spec.resources.items():
+                demand[name] = demand.get(name, 0.0) + amount
+            if member_spec.pool is not None:
+                pool_counts[member_spec.pool] = pool_counts.get(member_spec.pool, 0) + 1
+        chain_demand[head] = demand
+        chain_pools[head] = pool_counts
+
+    def _make_ready(task_id: str) -> None:
+        if task_id in riders:
+            return
+        task = spec_by_id[task_id]
+        shape: Hashable = _demand_shape(chain_demand.get(task_id, task.resources), capacity)
+        if task_id in pipelines:
+            shape = (shape, len(pipelines[task_id]), tuple(sorted(chain_pools[task_id].items())))
+        ready.push(task_id, task.priority, ranks.get(task_id, 0.0), lane=task.pool, shape=shape)
+        if task.pool is not None:
+            pool_queued[task.pool] += 1
+            pool_stats = state.pools[task.pool]
+            pool_stats.peak_queued = max(pool_stats.peak_queued, pool_queued[task.pool])
+
+    def _settle(task_id: str) -> None:
+        # Called once the task's final status is set; releases the dependents waiting on it.
+        active.discard(task_id)
+        changed.add(task_id)
+        succeeded = state.tasks[task_id].status == "SUCCESS"
+        for child in dependents.get(task_id, []):
+            if child in dep_remaining:
+                if not succeeded:
+                    blocked.add(child)
+                dep_remaining[child] -= 1
+                if dep_remaining[child] == 0 and child in active:
+                    _make_ready(child)
+
+    for task_id, dep_count in dep_remaining.items():
+        if dep_count == 0:
+            _make_ready(task_id)
     running: dict[str, asyncio.Task[TaskResult]] = {}
+    # Ids of running tasks whose future is done, in completion order.
+    finished: deque[str] = deque()
+    wakeup = asyncio.Event()
+
+    def _on_finished(task_id: str, _: asyncio.Future[TaskResult]) -> None:
+        finished.append(task_id)
+        wakeup.set()
+
     sem = asyncio.Semaphore(max_parallel)
+    # With adaptive_parallel, max_parallel is the ceiling and admit_limit tracks host pressure.
+    adaptive = (
+        AdaptiveLimit(max_parallel, cpu_count=os.cpu_count() or 1) if adaptive_parallel else None
+    )
+    admit_limit = adaptive.limit if adaptive is not None else max_parallel
     cancel_mode = False
     fail_fast_mode = False
+    cancel_event = asyncio.Event()
+    if cancel_requested(run_dir):
+        cancel_event.set()
+    cancel_watch = asyncio.create_task(watch_cancel_request(run_dir, cancel_event))
+    cancel_wait = asyncio.ensure_future(cancel_event.wait())
+    cancel_wait.add_done_callback(lambda _: wakeup.set())
+    loop = asyncio.get_running_loop()
+    # Tasks modified since the last checkpoint; only these go into the next journal record.
+    changed: set[str] = set()
+
+    def _write_state() -> None:
+        state.updated_at = now_iso()
+        journal.append(changed)
+        changed.clear()
+
+    checkpoint = Checkpointer(_write_state, clock=loop.time)
+    retry_queue: list[tuple[float, str]] = []
+    parked: set[str] = set()
+    in_use: dict[str, float] = {}
+    call_pool: CallPool | None = None
+
+    def _call_pool() -> CallPool:
+        nonlocal call_pool
+        if call_pool is None:
+            call_pool = CallPool(max_parallel)
+        return call_pool
+
+    worker_pools: dict[str, WorkerPool] = {}
+
+    def _worker_pool(name: str) -> WorkerPool:
+        if name not in worker_pools:
+            worker_spec = plan.workers[name]
+            worker_pools[name] = WorkerPool(
+                name,
+                worker_spec.cmd,
+                worker_spec.count,
+                cwd=resolved_workdir,
+                log_dir=run_dir / "logs",
+            )
+        return worker_pools[name]
+
+    # Pipes between the members of running pipelines, by consumer and by producer id.
+    pipe_in: dict[str, TaskPipe] = {}
+    pipe_out: dict[str, TaskPipe] = {}
+
+    async def _dispatch(spec: TaskSpec, attempt: int) -> TaskResult:
+        if spec.id in pipe_in or spec.id in pipe_out:
+            # Pipelines always run locally: both ends need this process to move the stream.
+            return await run_task(
+                spec,
+                run_dir,
+                attempt=attempt,
+                default_cwd=resolved_workdir,
+                cancel_event=cancel_event,
+                stdin=pipe_in.get(spec.id),
+                stdout=pipe_out.get(spec.id),
+            )
+        if spec.call is not None:
+            return await run_call_task(
+                spec,
+                run_dir,
+                attempt=attempt,
+                default_cwd=resolved_workdir,
+                pool=_call_pool(),
+                cancel_event=cancel_event,
+            )
+        if spec.worker is not None:
+            return await run_worker_task(
+                spec,
+                run_dir,
+                attempt=attempt,
+                default_cwd=resolved_workdir,
+                pool=_worker_pool(spec.worker),
+                cancel_event=cancel_event,
+            )
+        if coordinator is not None:
+            return await run_remote_task(
+                spec,
+                run_dir,
+                attempt=attempt,
+                coordinator=coordinator,
+                cancel_event=cancel_event,
+            )
+        if spec.id in hedge_after:
+            return await run_hedged_task(
+                spec,
+                run_dir,
+                attempt=attempt,
+                default_cwd=resolved_workdir,
+                hedge_after_sec=hedge_after[spec.id],
+                cancel_event=cancel_event,
+            )
+        return await run_task(
+            spec,
+            run_dir,
+            attempt=attempt,
+            default_cwd=resolved_workdir,
+            cancel_event=cancel_event,
+        )
 
-    while active or running:
-        if cancel_requested(run_dir):
-            cancel_mode = True
+    def _emit(task: TaskSpec, manifest: Path) -> str | None:
+        """Splice the tasks ``task`` wrote to ``manifest`` into the run; return an error if any."""
+        try:
+            raw_tasks, new_tasks = load_emitted_tasks(manifest, plan, task.id)
+        except PlanError as exc:
+            return str(exc)
+        if not new_tasks:
+            return None
+        state.emitted_tasks[task.id] = raw_tasks
+        for spec in new_tasks:
+            plan.tasks.append(spec)
+            spec_by_id[spec.id] = spec
+            dependents[spec.id] = []
+            in_degree[spec.id] = len(spec.depends_on)
+            state.tasks[spec.id] = _pending_task_state(spec)
+            changed.add(spec.id)
+            active.add(spec.id)
+            if spec.hedge_after_sec is not None:
+                hedge_after[spec.id] = spec.hedge_after_sec
+        # The emitter is still active here, so every new task waits for its _settle.
+        for spec in new_tasks:
+            for dep in spec.depends_on:
+                dependents[dep].append(spec.id)
+        new_pipelines = pipeline_groups(new_tasks)
+        add_pipeline_edges(new_pipelines, spec_by_id, dependents, in_degree)
+        pipelines.update(new_pipelines)
+        riders.update(member for chain in new_pipelines.values() for member in chain[1:])
+        for spec in new_tasks:
+            _track(spec)
+        return None
 
-        if cancel_mode:
-            for task_id in list(active):
-                if task_id in running:
-                    continue
-                task_state = state.tasks[task_id]
-                task_state.status = "CANCELED"
-                task_state.canceled = True
-                task_state.skip_reason = "run_canceled"
-                task_state.ended_at = now_iso()
-                active.remove(task_id)
-                for child in dependents.get(task_id, []):
-                    if child in dep_remaining:
-                        dep_remaining[child] -= 1
-                        if dep_remaining[child] == 0 and child in active:
-                            ready.append(child)
-            _persist(run_dir, state)
-
-        while ready and len(running) < max_parallel and not cancel_mode:
-            task_id = ready.pop(0)
-            if task_id not in active or task_id in running:
-                continue
-            task = spec_by_id[task_id]
-            task_state = state.tasks[task_id]
-            dep_states = [state.tasks[dep].status for dep in task.depends_on]
-            if any(dep_status != "SUCCESS" for dep_status in dep_states):
-                task_state.status = "SKIPPED"
-                task_state.skip_reason = "dependency_not_success"
-                task_state.ended_at = now_iso()
-                active.remove(task_id)
-                for child in dependents.get(task_id, []):
-                    if child in dep_remaining:
-                        dep_remaining[child] -= 1
-                        if dep_remaining[child] == 0 and child in active:
-                            ready.append(child)
-                _persist(run_dir, state)
-                continue
-            if fail_fast_mode:
-                task_state.status = "SKIPPED"
-                task_state.skip_reason = "fail_fast"
-                task_state.ended_at = now_iso()
-                active.remove(task_id)
-                _persist(run_dir, state)
-                continue
+    def _upstream_digests(spec: TaskSpec) -> dict[str, dict[str, str]] | None:
+        # Without recorded outputs for every dependency there is nothing to compare against.
+        if not spec.depends_on:
+            return None
+        upstream = {dep: state.tasks[dep].output_digests for dep in spec.depends_on}
+        if not all(upstream.values()):
+            return None
+        return upstream
+
+    async def _previous_success(task_id: str) -> TaskState | None:
+        nonlocal previous
+        async with previous_lock:
+            if previous is None:
+                previous = await asyncio.to_thread(
+                    previous_successes, run_dir.parent, plan.tasks, exclude_run_id=run_dir.name
+                )
+        return previous.get(task_id)
+
+    async def _execute(spec: TaskSpec, attempt: int) -> TaskResult:
+        task_cwd = _resolve_task_cwd(spec.cwd, resolved_workdir)
+        if spec.id in pipe_in or spec.id in pipe_out:
+            # A pipeline member cannot be skipped while its peers read or write the stream.
+            _clear_emitted_manifest(spec, task_cwd)
+            return await _dispatch(spec, attempt)
+        if incremental and await asyncio.to_thread(_is_up_to_date, spec, task_cwd):
+            return _up_to_date_result()
+        upstream = _upstream_digests(spec) if cutoff else None
+        # Only tasks that declare inputs are cacheable; anything else may read arbitrary state.
+        cacheable = cache_root is not None and bool(spec.inputs)
+        key: str | None = None
+        if upstream is not None or cacheable:
+            # One digest of the inputs serves as the cache key and the cutoff fingerprint's base.
+            key = await asyncio.to_thread(_task_cache_key, spec, task_cwd)
+        if upstream is not None and key is not None:
+            fingerprint = compute_cutoff_fingerprint(key, upstream)
+            fingerprints[spec.id] = fingerprint
+            prior = await _previous_success(spec.id)
+            if (
+                prior is not None
+                and prior.input_fingerprint == fingerprint
+                and await asyncio.to_thread(
+                    _outputs_unchanged, spec, task_cwd, prior.output_digests
+                )
+            ):
+                return _up_to_date_result()
+        _clear_emitted_manifest(spec, task_cwd)
+        if cache_root is None or not cacheable:
+            return await _dispatch(spec, attempt)
+        if key is not None and await asyncio.to_thread(
+            _restore_from_cache, spec, run_dir, cache_root, key, task_cwd, attempt
+        ):
+            state.cache.hits += 1
+            return _cached_result()
+        state.cache.misses += 1
+        log_offsets = _attempt_log_offsets(spec, run_dir, attempt)
+        result = await _dispatch(spec, attempt)
+        if key is not None and result.exit_code == 0 and not result.timed_out:
+            await asyncio.to_thread(
+                _store_in_cache, spec, run_dir, cache_root, key, task_cwd, log_offsets
+            )
+        return result
+
+    async def _run_with_sem(spec: TaskSpec, attempt: int) -> TaskResult:
+        async with sem:
+            if budget is None:
+                return await _execute(spec, attempt)
+            if not await _acquire_budget(budget, run_dir.name, spec.resources, cancel_event):
+                return _not_started_result(canceled=True)
+            try:
+                return await _execute(spec, attempt)
+            finally:
+                budget.release(run_dir.name, spec.resources)
 
-            async def _run_with_sem(spec: TaskSpec, attempt: int) -> TaskResult:
-                async with sem:
-                    return await run_task(
-                        spec,
-                        run_dir,
-                        attempt=attempt,
-                        default_cwd=resolved_workdir,
+    async def _admit_pipeline(head: str) -> bool:
+        """Take the chain's run slot and shared budget; False if the run is canceled first."""
+        await sem.acquire()
+        try:
+            if budget is None or await _acquire_budget(
+                budget,
+                run_dir.name,
+                chain_demand[head],
+                cancel_event,
+                slots=len(pipelines[head]),
+            ):
+                return True
+        except BaseException:
+            sem.release()
+            raise
+        sem.release()
+        return False
+
+    def _release_pipeline(head: str, admitted: asyncio.Future[bool]) -> None:
+        if admitted.cancelled() or admitted.exception() is not None or not admitted.result():
+            return
+        sem.release()
+        if budget is not None:
+            budget.release(run_dir.name, chain_demand[head], len(pipelines[head]))
+
+    async def _run_piped(
+        spec: TaskSpec,
+        attempt: int,
+        producer_run: asyncio.Task[TaskResult] | None,
+        head: str,
+        admitted: asyncio.Future[bool],
+        pending: set[str],
+    ) -> TaskResult:
+        """Run one pipeline member once the whole chain is admitted.
+
+        A consumer reports only after its producer, so the producer's status is final when
+        the consumer's is decided. The chain's slot and budget are held until its last member
+        ends.
+        """
+        try:
+            if await asyncio.shield(admitted):
+                result = await _execute(spec, attempt)
+            else:
+                result = _not_started_result(canceled=True)
+        finally:
+            # Whatever happened, release the peers blocked on this member's ends of the pipes.
+            if spec.id in pipe_in:
+                pipe_in[spec.id].attach(None)
+            if spec.id in pipe_out:
+                pipe_out[spec.id].close()
+            pending.discard(spec.id)
+            if not pending:
+                if not admitted.done():
+                    admitted.cancel()
+                admitted.add_done_callback(functools.partial(_release_pipeline, head))
+        if producer_run is not None:
+            await asyncio.wait([producer_run])
+        return result
+
+    def _start(task_id: str) -> int:
+        """Mark ``task_id`` RUNNING and claim its resources; return the attempt number."""
+        task = spec_by_id[task_id]
+        task_state = state.tasks[task_id]
+        task_state.status = "RUNNING"
+        task_state.started_at = now_iso()
+        task_state.ended_at = None
+        task_state.duration_sec = None
+        task_state.exit_code = None
+        task_state.timed_out = False
+        task_state.canceled = False
+        task_state.skip_reason = None
+        task_state.cached = False
+        task_state.up_to_date = False
+        task_state.hedge_won = False
+        task_state.shutdown_sec = None
+        task_state.shutdown_signal = None
+        task_state.memory_peak_bytes = None
+        task_state.cpu_usage_sec = None
+        task_state.output_digests = {}
+        task_state.input_fingerprint = None
+        fingerprints.pop(task_id, None)
+        task_state.attempts += 1
+        changed.add(task_id)
+        for name, amount in task.resources.items():
+            if name in capacity:
+                in_use[name] = in_use.get(name, 0.0) + amount
+        if task.pool is not None:
+            pool_running[task.pool] += 1
+            pool_stats = state.pools[task.pool]
+            pool_stats.peak_running = max(pool_stats.peak_running, pool_running[task.pool])
+        return task_state.attempts
+
+    def _track_run(task_id: str, run: asyncio.Task[TaskResult]) -> None:
+        running[task_id] = run
+        run.add_done_callback(functools.partial(_on_finished, task_id))
+
+    def _start_pipeline(chain: list[str]) -> None:
+        producer_run: asyncio.Task[TaskResult] | None = None
+        for producer, consumer in itertools.pairwise(chain):
+            pipe_out[producer] = pipe_in[consumer] = TaskPipe()
+        admitted = asyncio.ensure_future(_admit_pipeline(chain[0]))
+        pending = set(chain)
+        for task_id in chain:
+            attempt = _start(task_id)
+            run = asyncio.create_task(
+                _run_piped(spec_by_id[task_id], attempt, producer_run, chain[0], admitted, pending)
+            )
+            _track_run(task_id, run)
+            producer_run = run
+
+    next_sample_at = loop.time()
+
+    def _admissible(task_id: str) -> bool:
+        if task_id not in active or task_id in running or task_id in blocked or fail_fast_mode:
+            return True
+        if not running:
+            # Admit a task alone even if it asks for more than the whole capacity.
+            return True
+        if task_id in pipelines:
+            # Riders start with the head, so the whole chain must fit the limits now.
+            if len(running) + len(pipelines[task_id]) > admit_limit:
+                return False
+            if any(
+                pool_running[pool] + count > plan.pools[pool]
+                for pool, count in chain_pools[task_id].items()
+            ):
+                return False
+            return _fits_capacity(chain_demand[task_id], in_use, capacity)
+        return _fits_capacity(spec_by_id[task_id].resources, in_use, capacity)
+
+    def _lane_open(pool: str | None) -> bool:
+        # A full pool holds back everything queued in it until one of its tasks finishes.
+        if pool is None or fail_fast_mode or not running:
+            return True
+        return pool_running[pool] < plan.pools[pool]
+
+    def _release(task_id: str) -> None:
+        task = spec_by_id[task_id]
+        for name, amount in task.resources.items():
+            if name in in_use:
+                in_use[name] -= amount
+        if task.pool is not None:
+            pool_running[task.pool] -= 1
+
+    try:
+        if coordinator is not None:
+            await coordinator.start()
+        while active or running:
+            if cancel_event.is_set():
+                cancel_mode = True
+
+            if cancel_mode:
+                for task_id in list(active):
+                    if task_id in running:
+                        continue
+                    task_state = state.tasks[task_id]
+                    if task_state.attempts > 0:
+                        parked.discard(task_id)
+                        _abandon_retry(task_state, "run_canceled")
+                    else:
+                        task_state.status = "CANCELED"
+                        task_state.canceled = True
+                        task_state.skip_reason = "run_canceled"
+                        task_state.ended_at = now_iso()
+                    _settle(task_id)
+                checkpoint.mark()
+
+            released = False
+            while retry_queue and retry_queue[0][0] <= loop.time():
+                _, task_id = heapq.heappop(retry_queue)
+                if task_id not in parked:
+                    continue
+                parked.remove(task_id)
+                state.tasks[task_id].status = "PENDING"
+                changed.add(task_id)
+                _make_ready(task_id)
+                released = True
+            if released:
+                checkpoint.mark()
+
+            if adaptive is not None and loop.time() >= next_sample_at:
+                next_sample_at = loop.time() + PRESSURE_SAMPLE_INTERVAL_SEC
+                sample = read_pressure_sample()
+                previous_limit = admit_limit
+                admit_limit = adaptive.update(sample)
+                state.parallel_samples.append(
+                    ParallelSample(
+                        at=now_iso(),
+                        limit=admit_limit,
+                        running=len(running),
+                        cpu_some_avg10=sample.cpu_some_avg10,
+                        memory_some_avg10=sample.memory_some_avg10,
+                        loadavg_1m=sample.loadavg_1m,
                     )
+                )
+                del state.parallel_samples[:-MAX_PARALLEL_SAMPLES]
+                if admit_limit != previous_limit:
+                    checkpoint.mark()
+
+            # Lowering admit_limit only holds back new starts; running tasks are never killed.
+            while ready and len(running) < admit_limit and not cancel_mode:
+                # First fit in queue order: smaller tasks backfill while a large one waits.
+                popped = ready.pop_first(_admissible, _lane_open)
+                if popped is None:
+                    break
+                task_id = popped
+                popped_pool = spec_by_id[task_id].pool
+                if popped_pool is not None:
+                    pool_queued[popped_pool] -= 1
+                if task_id not in active or task_id in running:
+                    continue
+                task = spec_by_id[task_id]
+                # A pipeline is started or skipped as a whole.
+                members = pipelines.get(task_id, [task_id])
+                if task_id in blocked:
+                    for member in members:
+                        member_state = state.tasks[member]
+                        member_state.status = "SKIPPED"
+                        member_state.skip_reason = "dependency_not_success"
+                        member_state.ended_at = now_iso()
+                        _settle(member)
+                    checkpoint.mark()
+                    continue
+                if fail_fast_mode:
+                    for member in members:
+                        member_state = state.tasks[member]
+                        if member_state.attempts > 0:
+                            _abandon_retry(member_state, "fail_fast")
+                        else:
+                            member_state.status = "SKIPPED"
+                            member_state.skip_reason = "fail_fast"
+                            member_state.ended_at = now_iso()
+                        active.remove(member)
+                        changed.add(member)
+                    checkpoint.mark()
+                    continue
 
-            task_state.status = "RUNNING"
-            task_state.started_at = now_iso()
-            task_state.ended_at = None
-            task_state.duration_sec = None
-            task_state.exit_code = None
-            task_state.timed_out = False
-            task_state.canceled = False
-            task_state.skip_reason = None
-            task_state.attempts += 1
-            attempt = task_state.attempts
-            _persist(run_dir, state)
-            running[task_id] = asyncio.create_task(_run_with_sem(task, attempt))
+                if task_id in pipelines:
+                    _start_pipeline(pipelines[task_id])
+                else:
+                    attempt = _start(task_id)
+                    _track_run(task_id, asyncio.create_task(_run_with_sem(task, attempt)))
+                checkpoint.mark()
 
-        if not running:
-            if not ready:
+            if not running and not parked:
+                # Dispatch drains ``ready`` unless canceling, so nothing left can make progress.
                 if active:
                     for task_id in list(active):
                         task_state = state.tasks[task_id]
@@ -643,106 +2069,170 @@ async def run_plan(
                         task_state.skip_reason = "unresolvable_dependencies"
                         task_state.ended_at = now_iso()
                         active.remove(task_id)
-                    _persist(run_dir, state)
+                        changed.add(task_id)
+                    checkpoint.mark()
                 break
-            await asyncio.sleep(0.05)
-            continue
 
-        done, _ = await asyncio.wait(running.values(), return_when=asyncio.FIRST_COMPLETED)
-        done_by_id = {task_id: fut for task_id, fut in running.items() if fut in done}
-
-        for task_id, fut in done_by_id.items():
-            del running[task_id]
-            task = spec_by_id[task_id]
-            task_state = state.tasks[task_id]
-            try:
-                result = fut.result()
-            except Exception as exc:
-                ended_dt = datetime.now().astimezone()
-                started_iso = task_state.started_at or ended_dt.isoformat(timespec="seconds")
+            checkpoint.maybe_flush()
+            wake_at: float | None = retry_queue[0][0] if retry_queue and parked else None
+            if adaptive is not None and ready:
+                wake_at = next_sample_at if wake_at is None else min(wake_at, next_sample_at)
+            flush_at = checkpoint.due_at()
+            if flush_at is not None:
+                wake_at = flush_at if wake_at is None else min(wake_at, flush_at)
+            wait_timeout = None if wake_at is None else max(0.0, wake_at - loop.time())
+            if not finished and (cancel_mode or not cancel_event.is_set()):
+                wakeup.clear()
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), timeout=wait_timeout)
+
+            while finished:
+                task_id = finished.popleft()
+                fut = running.pop(task_id)
+                _release(task_id)
+                pipe_in.pop(task_id, None)
+                pipe_out.pop(task_id, None)
+                task = spec_by_id[task_id]
+                task_state = state.tasks[task_id]
                 try:
-                    started_dt = datetime.fromisoformat(started_iso)
-                    elapsed = duration_sec(started_dt, ended_dt)
-                except ValueError:
-                    elapsed = 0.0
-                if task_state.stderr_path is not None:
-                    _append_text_best_effort(
-                        run_dir / task_state.stderr_path,
-                        f"runner exception: {exc}\n",
+                    result = fut.result()
+                except Exception as exc:
+                    ended_dt = datetime.now().astimezone()
+                    started_iso = task_state.started_at or ended_dt.isoformat(timespec="seconds")
+                    try:
+                        started_dt = datetime.fromisoformat(started_iso)
+                        elapsed = duration_sec(started_dt, ended_dt)
+                    except ValueError:
+                        elapsed = 0.0
+                    if task_state.stderr_path is not None:
+                        _append_text_best_effort(
+                            run_dir / task_state.stderr_path,
+                            f"runner exception: {exc}\n",
+                        )
+                    task_state.skip_reason = "runner_exception"
+                    result = TaskResult(
+                        exit_code=70,
+                        timed_out=False,
+                        canceled=False,
+                        start_failed=True,
+                        started_at=started_iso,
+                        ended_at=ended_dt.isoformat(timespec="seconds"),
+                        duration_sec=elapsed,
                     )
-                task_state.skip_reason = "runner_exception"
-                result = TaskResult(
-                    exit_code=70,
-                    timed_out=False,
-                    canceled=False,
-                    start_failed=True,
-                    started_at=started_iso,
-                    ended_at=ended_dt.isoformat(timespec="seconds"),
-                    duration_sec=elapsed,
-                )
-            task_state.ended_at = result.ended_at
-            task_state.duration_sec = result.duration_sec
-            task_state.exit_code = result.exit_code
-            task_state.timed_out = result.timed_out
-            task_state.canceled = result.canceled
-            task_cwd = _resolve_task_cwd(task.cwd, resolved_workdir)
-
-            if _should_retry(task, result, task_state.attempts):
-                delay = backoff_for_attempt(task_state.attempts - 1, task.retry_backoff_sec)
-                task_state.status = "READY"
-                _persist(run_dir, state)
-                await asyncio.sleep(delay)
-                task_state.status = "PENDING"
-                ready.append(task_id)
-                _persist(run_dir, state)
-                continue
+                task_state.ended_at = result.ended_at
+                task_state.duration_sec = result.duration_sec
+                task_state.exit_code = result.exit_code
+                task_state.timed_out = result.timed_out
+                task_state.canceled = result.canceled
+                task_state.cached = result.cached
+                task_state.up_to_date = result.up_to_date
+                task_state.hedge_won = result.hedge_won
+                task_state.shutdown_sec = result.shutdown_sec
+                task_state.shutdown_signal = result.shutdown_signal
+                task_state.memory_peak_bytes = result.memory_peak_bytes
+                task_state.cpu_usage_sec = result.cpu_usage_sec
+                if result.rusage is not None:
+                    task_state.rusage.append(result.rusage)
+                task_cwd = _resolve_task_cwd(task.cwd, resolved_workdir)
+
+                if _should_retry(task, result, task_state.attempts):
+                    delay = backoff_for_attempt(task_state.attempts - 1, task.retry_backoff_sec)
+                    task_state.status = "READY"
+                    heapq.heappush(retry_queue, (loop.time() + delay, task_id))
+                    parked.add(task_id)
+                    changed.add(task_id)
+                    checkpoint.mark()
+                    continue
 
-            if result.canceled:
-                task_state.status = "CANCELED"
-                task_state.skip_reason = "run_canceled"
-                cancel_mode = True
-            else:
-                task_state.artifact_paths = _copy_artifacts(task, run_dir, task_cwd)
-                if aggregate_root is not None:
-                    _copy_to_aggregate_dir_best_effort(
-                        task,
-                        task_cwd,
-                        aggregate_root=aggregate_root,
-                    )
-                if result.exit_code == 0 and not result.timed_out:
-                    task_state.status = "SUCCESS"
+                if result.canceled:
+                    task_state.status = "CANCELED"
+                    task_state.skip_reason = "run_canceled"
+                    cancel_mode = True
                 else:
-                    task_state.status = "FAILED"
-                    if result.start_failed and task_state.skip_reason is None:
-                        task_state.skip_reason = "process_start_failed"
-                    if fail_fast:
-                        fail_fast_mode = True
-
-            if task_id in active:
-                active.remove(task_id)
-            for child in dependents.get(task_id, []):
-                if child in dep_remaining:
-                    dep_remaining[child] -= 1
-                    if dep_remaining[child] == 0 and child in active:
-                        ready.append(child)
-
-            if fail_fast_mode:
-                for pending_id in list(active):
-                    if pending_id in running:
-                        continue
-                    pending_state = state.tasks[pending_id]
-                    pending_state.status = "SKIPPED"
-                    pending_state.skip_reason = "fail_fast"
-                    pending_state.ended_at = now_iso()
-                    active.remove(pending_id)
-                    for child in dependents.get(pending_id, []):
-                        if child in dep_remaining:
-                            dep_remaining[child] -= 1
-                            if dep_remaining[child] == 0 and child in active:
-                                ready.append(child)
-
-            _persist(run_dir, state)
+                    task_state.artifact_paths, output_digests = _copy_artifacts(
+                        task, run_dir, task_cwd
+                    )
+                    if aggregate_root is not None:
+                        _copy_to_aggregate_dir_best_effort(
+                            task,
+                            task_cwd,
+                            aggregate_root=aggregate_root,
+                        )
+                    succeeded = result.exit_code == 0 and not result.timed_out
+                    # Like pipefail: a consumer fed by a failed producer saw a cut-short stream.
+                    producer_failed = (
+                        task.stdin_from is not None
+                        and state.tasks[task.stdin_from].status != "SUCCESS"
+                    )
+                    emit_error = (
+                        _emit(task, task_cwd / task.emits)
+                        if task.emits is not None and succeeded and not producer_failed
+                        else None
+                    )
+                    if succeeded and producer_failed:
+                        task_state.status = "FAILED"
+                        task_state.exit_code = None
+                        task_state.skip_reason = "stdin_producer_failed"
+                        if fail_fast:
+                            fail_fast_mode = True
+                    elif emit_error is not None:
+                        task_state.status = "FAILED"
+                        task_state.exit_code = None
+                        task_state.skip_reason = "invalid_emitted_tasks"
+                        if task_state.stderr_path is not None:
+                            _append_text_best_effort(
+                                run_dir / task_state.stderr_path,
+                                f"invalid emitted tasks: {emit_error}\n",
+                            )
+                        if fail_fast:
+                            fail_fast_mode = True
+                    elif result.exit_code == 0 and not result.timed_out:
+                        task_state.status = "SUCCESS"
+                        task_state.output_digests = output_digests
+                        task_state.input_fingerprint = fingerprints.pop(task_id, None)
+                    else:
+                        task_state.status = "FAILED"
+                        if result.start_failed and task_state.skip_reason is None:
+                            task_state.skip_reason = "process_start_failed"
+                        if fail_fast:
+                            fail_fast_mode = True
+
+                _settle(task_id)
+
+                if fail_fast_mode:
+                    for pending_id in list(active):
+                        if pending_id in running:
+                            continue
+                        pending_state = state.tasks[pending_id]
+                        if pending_state.attempts > 0:
+                            parked.discard(pending_id)
+                            _abandon_retry(pending_state, "fail_fast")
+                        else:
+                            pending_state.status = "SKIPPED"
+                            pending_state.skip_reason = "fail_fast"
+                            pending_state.ended_at = now_iso()
+                        _settle(pending_id)
+
+                checkpoint.mark()
+    except BaseException:
+        # Keep the transitions made since the last write so a resume sees them.
+        if checkpoint.dirty:
+            with suppress(OSError, RuntimeError):
+                checkpoint.flush()
+        raise
+    finally:
+        cancel_watch.cancel()
+        cancel_wait.cancel()
+        await asyncio.gather(cancel_watch, cancel_wait, return_exceptions=True)
+        if call_pool is not None:
+            await asyncio.to_thread(call_pool.shutdown)
+        await asyncio.gather(
+            *(worker_pool.close() for worker_pool in worker_pools.values()),
+            return_exceptions=True,
+        )
+        if coordinator is not None:
+            await coordinator.close()
 
     _finalize_run_status(state)
-    _persist(run_dir, state)
+    _persist(state, journal)
     return state
@@ -1,10 +1,100 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import signal
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Protocol
+
+DEFAULT_KILL_GRACE_SEC = 1.0
+DEFAULT_KILL_SIGNALS = ("SIGTERM", "SIGKILL")
+
+
+@dataclass(slots=True)
+class ShutdownRecord:
+    duration_sec: float
+    signal: str
+
+
+class ChildProcess(Protocol):
+    """What the helpers here need from ``asyncio.subprocess.Process`` or ``ReapedProcess``."""
+
+    @property
+    def pid(self) -> int: ...
+
+    @property
+    def returncode(self) -> int | None: ...
+
+    def send_signal(self, sig: int, /) -> None: ...
+
+    async def wait(self) -> int: ...
+
+
+def resolve_signal(name: str) -> signal.Signals | None:
+    """Map a name like ``SIGTERM`` to a signal available on this platform."""
+    if not name.startswith("SIG") or name.startswith("SIG_"):
+        return None
+    value = getattr(signal, name, None)
+    return value if isinstance(value, signal.Signals) else None
+
+
+def _send(proc: ChildProcess, sig: signal.Signals, *, group: bool) -> None:
+    with suppress(ProcessLookupError, PermissionError):
+        if group and hasattr(os, "killpg"):
+            os.killpg(proc.pid, sig)
+        else:
+            proc.send_signal(sig)
+
+
+def kill_process_group(proc: ChildProcess) -> None:
+    """SIGKILL everything left in the group led by ``proc`` (started with a new session)."""
+    _send(proc, signal.SIGKILL, group=True)
+
+
+async def terminate_with_escalation(
+    proc: ChildProcess,
+    *,
+    signals: list[str] | tuple[str, ...] = DEFAULT_KILL_SIGNALS,
+    grace_sec: float = DEFAULT_KILL_GRACE_SEC,
+    group: bool = False,
+) -> ShutdownRecord:
+    """Send each signal in turn, waiting up to ``grace_sec`` after each for the process to exit.
+
+    SIGKILL is sent last if the listed signals did not stop it, so this always returns with the
+    process reaped. With ``group`` the signals go to the process group ``proc`` leads, and any
+    members still alive once it exits are killed. The record holds the time from the first
+    signal to exit and the last signal that was sent.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    proc_wait = asyncio.ensure_future(proc.wait())
+    sent = "SIGKILL"
+    try:
+        for name in signals:
+            sig = resolve_signal(name)
+            if sig is None:
+                continue
+            sent = name
+            _send(proc, sig, group=group)
+            if sig == signal.SIGKILL:
+                break
+            await asyncio.wait({proc_wait}, timeout=grace_sec)
+            if proc_wait.done():
+                return ShutdownRecord(duration_sec=loop.time() - started, signal=sent)
+        if not proc_wait.done():
+            sent = "SIGKILL"
+            _send(proc, signal.SIGKILL, group=group)
+        await proc_wait
+        return ShutdownRecord(duration_sec=loop.time() - started, signal=sent)
+    finally:
+        if group:
+            # Helpers that outlive the leader would otherwise hold its stdout/stderr pipes open.
+            kill_process_group(proc)
 
 
 async def wait_with_timeout(
-    proc: asyncio.subprocess.Process, timeout_sec: float | None
+    proc: ChildProcess, timeout_sec: float | None
 ) -> tuple[bool, int | None]:
     if timeout_sec is None:
         return False, await proc.wait()
@@ -12,10 +102,5 @@ async def wait_with_timeout(
         code = await asyncio.wait_for(proc.wait(), timeout=timeout_sec)
         return False, code
     except TimeoutError:
-        proc.terminate()
-        try:
-            await asyncio.wait_for(proc.wait(), timeout=1.0)
-        except TimeoutError:
-            proc.kill()
-            await proc.wait()
+        await terminate_with_escalation(proc)
         return True, None
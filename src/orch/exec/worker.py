@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from pathlib import Path
+
+from orch.exec.capture import stream_to_file
+
+# Per-line limit for worker replies; a single stdout chunk may be large.
+WORKER_LINE_LIMIT = 16 * 1024 * 1024
+
+
+class WorkerStartError(Exception):
+    """The worker command could not be started."""
+
+
+class WorkerCrashedError(Exception):
+    """The worker process exited or broke the protocol before finishing a request."""
+
+
+class WorkerProcess:
+    """One long-lived worker speaking the JSON-lines request/reply protocol."""
+
+    def __init__(self, proc: asyncio.subprocess.Process, stderr_drain: asyncio.Task[None]) -> None:
+        self.proc = proc
+        self._stderr_drain = stderr_drain
+
+    @classmethod
+    async def start(cls, cmd: list[str], *, cwd: Path, stderr_log: Path) -> WorkerProcess:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(cwd),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=WORKER_LINE_LIMIT,
+            )
+        except (OSError, RuntimeError, ValueError) as exc:
+            raise WorkerStartError(f"failed to start worker: {exc}") from exc
+        return cls(proc, asyncio.create_task(stream_to_file(proc.stderr, stderr_log)))
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def request(
+        self, request_id: str, *, argv: list[str], env: dict[str, str] | None, cwd: Path
+    ) -> AsyncIterator[tuple[str, str | int]]:
+        """Send one request and yield ("stdout" | "stderr", text) chunks, then ("exit_code", n)."""
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        payload = {"id": request_id, "argv": argv, "env": env, "cwd": str(cwd)}
+        try:
+            self.proc.stdin.write((json.dumps(payload) + "\n").encode("utf-8"))
+            await self.proc.stdin.drain()
+        except (OSError, RuntimeError) as exc:
+            raise WorkerCrashedError(f"failed to send request to worker: {exc}") from exc
+        while True:
+            try:
+                line = await self.proc.stdout.readline()
+            except (ValueError, asyncio.LimitOverrunError) as exc:
+                raise WorkerCrashedError("worker reply exceeds line limit") from exc
+            if not line:
+                raise WorkerCrashedError("worker exited before finishing the request")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                # Stray non-protocol output is kept as task stdout rather than dropped.
+                yield "stdout", line.decode("utf-8", errors="replace")
+                continue
+            if not isinstance(message, dict) or message.get("id") != request_id:
+                raise WorkerCrashedError(f"unexpected worker reply: {line[:200]!r}")
+            for stream in ("stdout", "stderr"):
+                chunk = message.get(stream)
+                if isinstance(chunk, str):
+                    yield stream, chunk
+            if "exit_code" in message:
+                exit_code = message["exit_code"]
+                if not isinstance(exit_code, int) or isinstance(exit_code, bool):
+                    raise WorkerCrashedError(f"invalid worker exit_code: {exit_code!r}")
+                yield "exit_code", exit_code
+                return
+
+    async def stop(self, *, grace_sec: float = 1.0) -> None:
+        if self.proc.stdin is not None:
+            with suppress(OSError, RuntimeError):
+                self.proc.stdin.close()
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout=grace_sec)
+        except TimeoutError:
+            await self.kill()
+        await asyncio.gather(self._stderr_drain, return_exceptions=True)
+
+    async def kill(self) -> None:
+        with suppress(ProcessLookupError):
+            self.proc.kill()
+        await self.proc.wait()
+        await asyncio.gather(self._stderr_drain, return_exceptions=True)
+
+
+class WorkerPool:
+    """Up to ``count`` warm workers for one ``workers:`` entry, started on demand."""
+
+    def __init__(self, name: str, cmd: list[str], count: int, *, cwd: Path, log_dir: Path) -> None:
+        self.name = name
+        self._cmd = cmd
+        self._cwd = cwd
+        self._log_dir = log_dir
+        self._idle: list[WorkerProcess] = []
+        self._slots = asyncio.Semaphore(count)
+        self._started = 0
+        self._all: set[WorkerProcess] = set()
+
+    async def acquire(self) -> WorkerProcess:
+        await self._slots.acquire()
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                return worker
+            await self.discard(worker, release_slot=False)
+        self._started += 1
+        stderr_log = self._log_dir / f"worker.{self.name}.{self._started}.err.log"
+        try:
+            worker = await WorkerProcess.start(self._cmd, cwd=self._cwd, stderr_log=stderr_log)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._all.add(worker)
+        return worker
+
+    def release(self, worker: WorkerProcess) -> None:
+        self._idle.append(worker)
+        self._slots.release()
+
+    async def discard(self, worker: WorkerProcess, *, release_slot: bool = True) -> None:
+        """Kill a crashed or timed-out worker; the next acquire starts a fresh one."""
+        self._all.discard(worker)
+        await worker.kill()
+        if release_slot:
+            self._slots.release()
+
+    async def close(self) -> None:
+        workers = list(self._all)
+        self._all.clear()
+        self._idle.clear()
+        await asyncio.gather(*(worker.stop() for worker in workers), return_exceptions=True)
@@ -7,6 +7,21 @@ def _bool_mark(value: bool) -> str:
     return "yes" if value else "no"
 
 
+def _rusage_cells(usage: dict[str, Any] | None) -> str:
+    """Last attempt's rusage as table cells; ``-`` when no local process was reaped."""
+    if not usage:
+        return " | ".join(["-"] * 5)
+    return " | ".join(
+        [
+            f"{usage['user_sec']:.2f}",
+            f"{usage['system_sec']:.2f}",
+            f"{usage['max_rss_bytes'] / (1024 * 1024):.1f}",
+            f"{usage['inblock']}/{usage['oublock']}",
+            f"{usage['nvcsw']}/{usage['nivcsw']}",
+        ]
+    )
+
+
 def render_markdown(summary: dict[str, Any]) -> str:
     run = summary["run"]
     tasks = summary["tasks"]
@@ -29,15 +44,46 @@ def render_markdown(summary: dict[str, Any]) -> str:
     lines.append("")
     lines.append("## Task Results")
     lines.append("")
-    lines.append("| id | status | attempts | duration_sec | exit_code | timed_out | logs |")
-    lines.append("|---|---:|---:|---:|---:|---:|---|")
+    lines.append(
+        "| id | status | attempts | duration_sec | exit_code | timed_out | "
+        "user_sec | sys_sec | max_rss_mb | blk_in/out | ctxsw vol/invol | logs |"
+    )
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---|")
     for row in tasks:
         logs = f"`{row['stdout_path']}` / `{row['stderr_path']}`"
         lines.append(
             f"| {row['id']} | {row['status']} | {row['attempts']} | "
-            f"{row['duration_sec']} | {row['exit_code']} | {row['timed_out']} | {logs} |"
+            f"{row['duration_sec']} | {row['exit_code']} | {row['timed_out']} | "
+            f"{_rusage_cells(row.get('rusage'))} | {logs} |"
         )
     lines.append("")
+    pools = summary.get("pools") or []
+    if pools:
+        lines.append("## Pools")
+        lines.append("")
+        lines.append("| pool | limit | peak_running | peak_queued |")
+        lines.append("|---|---:|---:|---:|")
+        for row in pools:
+            lines.append(
+                f"| {row['name']} | {row['limit']} | {row['peak_running']} | {row['peak_queued']} |"
+            )
+        lines.append("")
+    cache = summary.get("cache") or {}
+    if cache.get("hits") or cache.get("misses"):
+        lines.append("## Cache")
+        lines.append("")
+        lines.append(f"- hits: {cache['hits']}")
+        lines.append(f"- misses: {cache['misses']}")
+        cached_tasks = ", ".join(f"`{task_id}`" for task_id in cache["cached_tasks"])
+        lines.append(f"- restored from cache: {cached_tasks or '(none)'}")
+        lines.append("")
+    up_to_date_tasks = summary.get("up_to_date_tasks") or []
+    if up_to_date_tasks:
+        lines.append("## Up To Date")
+        lines.append("")
+        for task_id in up_to_date_tasks:
+            lines.append(f"- `{task_id}`")
+        lines.append("")
     lines.append("## Failed / Skipped / Canceled Details")
     lines.append("")
     if problems:
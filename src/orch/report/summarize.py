@@ -20,6 +20,7 @@ def build_summary(state: RunState, run_dir: Path) -> dict[str, object]:
                 "duration_sec": task.duration_sec,
                 "exit_code": task.exit_code,
                 "timed_out": task.timed_out,
+                "rusage": task.rusage[-1].to_dict() if task.rusage else None,
                 "stdout_path": task.stdout_path,
                 "stderr_path": task.stderr_path,
             }
@@ -54,4 +55,10 @@ def build_summary(state: RunState, run_dir: Path) -> dict[str, object]:
         "tasks": tasks_rows,
         "problems": problem_rows,
         "artifacts": artifact_rows,
+        "pools": [{"name": name, **pool.to_dict()} for name, pool in state.pools.items()],
+        "cache": {
+            **state.cache.to_dict(),
+            "cached_tasks": [task_id for task_id, task in state.tasks.items() if task.cached],
+        },
+        "up_to_date_tasks": [task_id for task_id, task in state.tasks.items() if task.up_to_date],
     }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+import stat
+from collections.abc import Iterable
+from pathlib import Path
+
+from orch.config.schema import TaskSpec
+from orch.state.model import TaskState
+from orch.state.store import load_state
+from orch.util.errors import StateError
+from orch.util.path_guard import has_symlink_ancestor, is_symlink_path
+
+
+def _recent_run_dirs(runs_root: Path, *, exclude_run_id: str | None, max_runs: int) -> list[Path]:
+    if has_symlink_ancestor(runs_root) or is_symlink_path(runs_root):
+        return []
+    try:
+        root_meta = runs_root.lstat()
+        if not stat.S_ISDIR(root_meta.st_mode):
+            return []
+        candidates = [path for path in runs_root.iterdir() if path.name != exclude_run_id]
+    except (OSError, RuntimeError):
+        return []
+    # run ids start with a sortable timestamp, so name order is chronological.
+    return sorted(candidates, key=lambda path: path.name, reverse=True)[:max_runs]
+
+
+def _successful_durations(
+    runs_root: Path,
+    tasks: Iterable[TaskSpec],
+    *,
+    exclude_run_id: str | None,
+    max_runs: int,
+) -> dict[str, list[float]]:
+    cmd_by_id = {task.id: task.cmd for task in tasks}
+    samples: dict[str, list[float]] = {}
+    for candidate in _recent_run_dirs(runs_root, exclude_run_id=exclude_run_id, max_runs=max_runs):
+        try:
+            state = load_state(candidate)
+        except (StateError, OSError, RuntimeError):
+            continue
+        for task_id, task_state in state.tasks.items():
+            if task_state.status != "SUCCESS" or task_state.duration_sec is None:
+                continue
+            if cmd_by_id.get(task_id) != task_state.cmd:
+                continue
+            samples.setdefault(task_id, []).append(task_state.duration_sec)
+    return samples
+
+
+def historical_durations(
+    runs_root: Path,
+    tasks: Iterable[TaskSpec],
+    *,
+    exclude_run_id: str | None = None,
+    max_runs: int = 20,
+) -> dict[str, float]:
+    """Average successful duration per task over recent runs that used the same cmd."""
+    samples = _successful_durations(
+        runs_root, tasks, exclude_run_id=exclude_run_id, max_runs=max_runs
+    )
+    return {task_id: sum(values) / len(values) for task_id, values in samples.items()}
+
+
+def historical_p95(
+    runs_root: Path,
+    tasks: Iterable[TaskSpec],
+    *,
+    exclude_run_id: str | None = None,
+    max_runs: int = 20,
+    min_samples: int = 5,
+) -> dict[str, float]:
+    """Nearest-rank 95th percentile of successful durations, for tasks with enough samples."""
+    samples = _successful_durations(
+        runs_root, tasks, exclude_run_id=exclude_run_id, max_runs=max_runs
+    )
+    p95: dict[str, float] = {}
+    for task_id, values in samples.items():
+        if len(values) < min_samples:
+            continue
+        ordered = sorted(values)
+        p95[task_id] = ordered[math.ceil(0.95 * len(ordered)) - 1]
+    return p95
+
+
+def previous_successes(
+    runs_root: Path,
+    tasks: Iterable[TaskSpec],
+    *,
+    exclude_run_id: str | None = None,
+    max_runs: int = 20,
+) -> dict[str, TaskState]:
+    """Most recent successful state per task with the same cmd and a recorded input fingerprint.
+
+    Runs are read newest first and the scan stops once every task has a match.
+    """
+    cmd_by_id = {task.id: task.cmd for task in tasks}
+    found: dict[str, TaskState] = {}
+    for candidate in _recent_run_dirs(runs_root, exclude_run_id=exclude_run_id, max_runs=max_runs):
+        if len(found) == len(cmd_by_id):
+            break
+        try:
+            state = load_state(candidate)
+        except (StateError, OSError, RuntimeError):
+            continue
+        for task_id, task_state in state.tasks.items():
+            if task_id in found or task_state.status != "SUCCESS":
+                continue
+            if task_state.input_fingerprint is None or cmd_by_id.get(task_id) != task_state.cmd:
+                continue
+            found[task_id] = task_state
+    return found
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from orch.state.model import ParallelSample, RunState
+from orch.state.store import append_state_journal, remove_state_journal, save_state_atomic
+
+# The journal is folded into state.json once it is larger than the snapshot itself ...
+COMPACT_RATIO = 1.0
+# ... but not before it reaches this size, so small runs keep appending until they finish.
+MIN_COMPACT_BYTES = 1024 * 1024
+
+
+class StateJournal:
+    """Persists a run as state.json plus an append-only state.journal of per-task deltas.
+
+    ``append`` writes the given tasks and any run-level field that changed as one line with a
+    single fsync, so a transition costs its own size instead of a rewrite of every task.
+    Adaptive-parallelism samples are journaled as the ones added since the last write.
+    ``compact`` rewrites state.json and drops the journal. Compacting only once the journal
+    outgrows the snapshot keeps the total bytes written within about twice the deltas, and
+    bounds what ``load_state`` has to replay.
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        state: RunState,
+        *,
+        compact_ratio: float = COMPACT_RATIO,
+        min_compact_bytes: int = MIN_COMPACT_BYTES,
+    ) -> None:
+        if compact_ratio <= 0:
+            raise ValueError("compact_ratio must be > 0")
+        self._run_dir = run_dir
+        self._state = state
+        self._compact_ratio = compact_ratio
+        self._min_compact_bytes = min_compact_bytes
+        self._seq = state.journal_seq
+        self._snapshot_bytes = 0
+        self._journal_bytes = 0
+        # A failed append may leave a partial line behind, so the next write compacts.
+        self._broken = False
+        self._written_run = self._run_fields()
+        self._written_emitted = dict(state.emitted_tasks)
+        self._last_sample = self._newest_sample()
+
+    def _newest_sample(self) -> ParallelSample | None:
+        samples = self._state.parallel_samples
+        return samples[-1] if samples else None
+
+    def _samples_added(self) -> list[ParallelSample]:
+        samples = self._state.parallel_samples
+        # The runner appends new samples and trims the oldest, so scan back to the last one
+        # written; everything after it is new.
+        for index in range(len(samples) - 1, -1, -1):
+            if samples[index] is self._last_sample:
+                return samples[index + 1 :]
+        return samples
+
+    def _run_fields(self) -> dict[str, Any]:
+        state = self._state
+        return {
+            "pools": {name: pool.to_dict() for name, pool in state.pools.items()},
+            "cache": state.cache.to_dict(),
+        }
+
+    def compact(self) -> None:
+        state = self._state
+        state.journal_seq = self._seq
+        self._snapshot_bytes = save_state_atomic(self._run_dir, state)
+        try:
+            remove_state_journal(self._run_dir)
+        except (OSError, RuntimeError):
+            # The old journal may end in a torn line; compact again before the next append.
+            self._broken = True
+            raise
+        self._journal_bytes = 0
+        self._broken = False
+        self._written_run = self._run_fields()
+        self._written_emitted = dict(state.emitted_tasks)
+        self._last_sample = self._newest_sample()
+
+    def append(self, task_ids: Iterable[str]) -> None:
+        threshold = max(self._min_compact_bytes, self._snapshot_bytes * self._compact_ratio)
+        if self._broken or self._journal_bytes >= threshold:
+            self.compact()
+            return
+        state = self._state
+        run_fields = self._run_fields()
+        run: dict[str, Any] = {
+            key: value for key, value in run_fields.items() if value != self._written_run[key]
+        }
+        emitted = {
+            emitter: raw_tasks
+            for emitter, raw_tasks in state.emitted_tasks.items()
+            if self._written_emitted.get(emitter) is not raw_tasks
+        }
+        if emitted:
+            run["emitted_tasks"] = emitted
+        samples_added = self._samples_added()
+        if samples_added:
+            run["parallel_samples_added"] = [sample.to_dict() for sample in samples_added]
+        tasks = {task_id: state.tasks[task_id].to_dict() for task_id in task_ids}
+        if not tasks and not run:
+            return
+        run["updated_at"] = state.updated_at
+        record: dict[str, object] = {"seq": self._seq + 1, "run": run, "tasks": tasks}
+        try:
+            written = append_state_journal(self._run_dir, record)
+        except (OSError, RuntimeError):
+            self._broken = True
+            raise
+        self._seq += 1
+        self._journal_bytes += written
+        self._written_run = run_fields
+        self._written_emitted.update(emitted)
+        self._last_sample = self._newest_sample()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass, field
-from typing import Literal, cast
+from typing import Any, Literal, cast
 
 RunStatus = Literal["PENDING", "RUNNING", "SUCCESS", "FAILED", "CANCELED"]
 TaskStatus = Literal["PENDING", "READY", "RUNNING", "SUCCESS", "FAILED", "SKIPPED", "CANCELED"]
@@ -16,6 +16,8 @@ TASK_STATUS_VALUES: set[str] = {
     "SKIPPED",
     "CANCELED",
 }
+# Oldest adaptive-parallelism samples are dropped beyond this many per run.
+MAX_PARALLEL_SAMPLES = 1000
 
 
 def _as_str(value: object, default: str = "") -> str:
@@ -88,6 +90,49 @@ def _parse_run_status(value: object) -> RunStatus:
     return cast(RunStatus, status)
 
 
+@dataclass(slots=True)
+class AttemptRusage:
+    attempt: int
+    user_sec: float
+    system_sec: float
+    max_rss_bytes: int
+    inblock: int
+    oublock: int
+    nvcsw: int
+    nivcsw: int
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "attempt": self.attempt,
+            "user_sec": self.user_sec,
+            "system_sec": self.system_sec,
+            "max_rss_bytes": self.max_rss_bytes,
+            "inblock": self.inblock,
+            "oublock": self.oublock,
+            "nvcsw": self.nvcsw,
+            "nivcsw": self.nivcsw,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> AttemptRusage:
+        return cls(
+            attempt=_as_int(data.get("attempt"), 1),
+            user_sec=_as_optional_float(data.get("user_sec")) or 0.0,
+            system_sec=_as_optional_float(data.get("system_sec")) or 0.0,
+            max_rss_bytes=_as_int(data.get("max_rss_bytes")),
+            inblock=_as_int(data.get("inblock")),
+            oublock=_as_int(data.get("oublock")),
+            nvcsw=_as_int(data.get("nvcsw")),
+            nivcsw=_as_int(data.get("nivcsw")),
+        )
+
+
+def _as_rusage_list(value: object) -> list[AttemptRusage]:
+    if not isinstance(value, list):
+        return []
+    return [AttemptRusage.from_dict(item) for item in value if isinstance(item, dict)]
+
+
 @dataclass(slots=True)
 class TaskState:
     status: TaskStatus
@@ -110,9 +155,19 @@ class TaskState:
     stdout_path: str | None = None
     stderr_path: str | None = None
     artifact_paths: list[str] = field(default_factory=list)
+    cached: bool = False
+    up_to_date: bool = False
+    hedge_won: bool = False
+    shutdown_sec: float | None = None
+    shutdown_signal: str | None = None
+    memory_peak_bytes: int | None = None
+    cpu_usage_sec: float | None = None
+    rusage: list[AttemptRusage] = field(default_factory=list)
+    output_digests: dict[str, str] = field(default_factory=dict)
+    input_fingerprint: str | None = None
 
     def to_dict(self) -> dict[str, object]:
-        return {
+        data: dict[str, object] = {
             "status": self.status,
             "depends_on": self.depends_on,
             "cmd": self.cmd,
@@ -134,6 +189,26 @@ class TaskState:
             "stderr_path": self.stderr_path,
             "artifact_paths": self.artifact_paths,
         }
+        if self.cached:
+            data["cached"] = True
+        if self.up_to_date:
+            data["up_to_date"] = True
+        if self.hedge_won:
+            data["hedge_won"] = True
+        if self.shutdown_sec is not None:
+            data["shutdown_sec"] = self.shutdown_sec
+            data["shutdown_signal"] = self.shutdown_signal
+        if self.memory_peak_bytes is not None:
+            data["memory_peak_bytes"] = self.memory_peak_bytes
+        if self.cpu_usage_sec is not None:
+            data["cpu_usage_sec"] = self.cpu_usage_sec
+        if self.rusage:
+            data["rusage"] = [usage.to_dict() for usage in self.rusage]
+        if self.output_digests:
+            data["output_digests"] = self.output_digests
+        if self.input_fingerprint is not None:
+            data["input_fingerprint"] = self.input_fingerprint
+        return data
 
     @classmethod
     def from_dict(cls, data: dict[str, object]) -> TaskState:
@@ -158,6 +233,82 @@ class TaskState:
             stdout_path=_as_optional_str(data.get("stdout_path")),
             stderr_path=_as_optional_str(data.get("stderr_path")),
             artifact_paths=_as_list_str(data.get("artifact_paths")),
+            cached=_as_bool(data.get("cached")),
+            up_to_date=_as_bool(data.get("up_to_date")),
+            hedge_won=_as_bool(data.get("hedge_won")),
+            shutdown_sec=_as_optional_float(data.get("shutdown_sec")),
+            shutdown_signal=_as_optional_str(data.get("shutdown_signal")),
+            memory_peak_bytes=_as_optional_int(data.get("memory_peak_bytes")),
+            cpu_usage_sec=_as_optional_float(data.get("cpu_usage_sec")),
+            rusage=_as_rusage_list(data.get("rusage")),
+            output_digests=_as_env_map(data.get("output_digests")) or {},
+            input_fingerprint=_as_optional_str(data.get("input_fingerprint")),
+        )
+
+
+@dataclass(slots=True)
+class PoolStats:
+    limit: int
+    peak_running: int = 0
+    peak_queued: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "limit": self.limit,
+            "peak_running": self.peak_running,
+            "peak_queued": self.peak_queued,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> PoolStats:
+        return cls(
+            limit=_as_int(data.get("limit"), 1),
+            peak_running=_as_int(data.get("peak_running")),
+            peak_queued=_as_int(data.get("peak_queued")),
+        )
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> CacheStats:
+        return cls(hits=_as_int(data.get("hits")), misses=_as_int(data.get("misses")))
+
+
+@dataclass(slots=True)
+class ParallelSample:
+    at: str
+    limit: int
+    running: int
+    cpu_some_avg10: float | None
+    memory_some_avg10: float | None
+    loadavg_1m: float | None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "at": self.at,
+            "limit": self.limit,
+            "running": self.running,
+            "cpu_some_avg10": self.cpu_some_avg10,
+            "memory_some_avg10": self.memory_some_avg10,
+            "loadavg_1m": self.loadavg_1m,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> ParallelSample:
+        return cls(
+            at=_as_str(data.get("at")),
+            limit=_as_int(data.get("limit"), 1),
+            running=_as_int(data.get("running")),
+            cpu_some_avg10=_as_optional_float(data.get("cpu_some_avg10")),
+            memory_some_avg10=_as_optional_float(data.get("memory_some_avg10")),
+            loadavg_1m=_as_optional_float(data.get("loadavg_1m")),
         )
 
 
@@ -174,9 +325,16 @@ class RunState:
     max_parallel: int
     fail_fast: bool
     tasks: dict[str, TaskState]
+    pools: dict[str, PoolStats] = field(default_factory=dict)
+    parallel_samples: list[ParallelSample] = field(default_factory=list)
+    cache: CacheStats = field(default_factory=CacheStats)
+    # Raw task lists emitted at runtime, by emitter id; resume splices them back into the plan.
+    emitted_tasks: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    # Sequence number of the last state.journal record folded into this snapshot.
+    journal_seq: int = 0
 
     def to_dict(self) -> dict[str, object]:
-        return {
+        data: dict[str, object] = {
             "run_id": self.run_id,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
@@ -189,6 +347,17 @@ class RunState:
             "fail_fast": self.fail_fast,
             "tasks": {task_id: task.to_dict() for task_id, task in self.tasks.items()},
         }
+        if self.pools:
+            data["pools"] = {name: pool.to_dict() for name, pool in self.pools.items()}
+        if self.parallel_samples:
+            data["parallel_samples"] = [sample.to_dict() for sample in self.parallel_samples]
+        if self.cache.hits or self.cache.misses:
+            data["cache"] = self.cache.to_dict()
+        if self.emitted_tasks:
+            data["emitted_tasks"] = self.emitted_tasks
+        if self.journal_seq:
+            data["journal_seq"] = self.journal_seq
+        return data
 
     @classmethod
     def from_dict(cls, data: dict[str, object]) -> RunState:
@@ -198,6 +367,26 @@ class RunState:
             for task_id, task_data in raw_tasks.items():
                 if isinstance(task_id, str) and isinstance(task_data, dict):
                     tasks[task_id] = TaskState.from_dict(task_data)
+        raw_pools = data.get("pools")
+        pools: dict[str, PoolStats] = {}
+        if isinstance(raw_pools, dict):
+            for name, pool_data in raw_pools.items():
+                if isinstance(name, str) and isinstance(pool_data, dict):
+                    pools[name] = PoolStats.from_dict(pool_data)
+        raw_samples = data.get("parallel_samples")
+        parallel_samples: list[ParallelSample] = []
+        if isinstance(raw_samples, list):
+            for sample_data in raw_samples:
+                if isinstance(sample_data, dict):
+                    parallel_samples.append(ParallelSample.from_dict(sample_data))
+        raw_cache = data.get("cache")
+        cache = CacheStats.from_dict(raw_cache) if isinstance(raw_cache, dict) else CacheStats()
+        raw_emitted = data.get("emitted_tasks")
+        emitted_tasks: dict[str, list[dict[str, Any]]] = {}
+        if isinstance(raw_emitted, dict):
+            for emitter, raw_list in raw_emitted.items():
+                if isinstance(emitter, str) and isinstance(raw_list, list):
+                    emitted_tasks[emitter] = [item for item in raw_list if isinstance(item, dict)]
         return cls(
             run_id=_as_str(data.get("run_id")),
             created_at=_as_str(data.get("created_at")),
@@ -210,4 +399,9 @@ class RunState:
             max_parallel=_as_int(data.get("max_parallel")),
             fail_fast=_as_bool(data.get("fail_fast")),
             tasks=tasks,
+            pools=pools,
+            parallel_samples=parallel_samples,
+            cache=cache,
+            emitted_tasks=emitted_tasks,
+            journal_seq=_as_int(data.get("journal_seq")),
         )
@@ -10,13 +10,19 @@ from contextlib import suppress
 from datetime import datetime
 from pathlib import Path
 
-from orch.state.model import RUN_STATUS_VALUES, TASK_STATUS_VALUES, RunState
+from orch.state.model import (
+    MAX_PARALLEL_SAMPLES,
+    RUN_STATUS_VALUES,
+    TASK_STATUS_VALUES,
+    RunState,
+)
 from orch.util.errors import StateError
 from orch.util.path_guard import has_symlink_ancestor, is_symlink_path
 
 _SAFE_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
 _TASK_ID_MAX_LEN = 128
 _RUN_ID_MAX_LEN = 128
+_SHA256_HEX_RE = re.compile(r"^[0-9a-f]{64}$")
 _ALLOWED_RUN_KEYS = {
     "run_id",
     "created_at",
@@ -29,6 +35,11 @@ _ALLOWED_RUN_KEYS = {
     "max_parallel",
     "fail_fast",
     "tasks",
+    "pools",
+    "parallel_samples",
+    "cache",
+    "emitted_tasks",
+    "journal_seq",
 }
 _ALLOWED_TASK_KEYS = {
     "status",
@@ -51,6 +62,16 @@ _ALLOWED_TASK_KEYS = {
     "stdout_path",
     "stderr_path",
     "artifact_paths",
+    "cached",
+    "up_to_date",
+    "hedge_won",
+    "shutdown_sec",
+    "shutdown_signal",
+    "memory_peak_bytes",
+    "cpu_usage_sec",
+    "rusage",
+    "output_digests",
+    "input_fingerprint",
 }
 
 
@@ -115,6 +136,127 @@ def _is_non_blank_str_without_nul(value: object) -> bool:
     return isinstance(value, str) and bool(value.strip()) and "\x00" not in value
 
 
+def _is_valid_pools(value: object) -> bool:
+    if not isinstance(value, dict):
+        return False
+    for name, pool in value.items():
+        if not isinstance(name, str) or _SAFE_ID_PATTERN.fullmatch(name) is None:
+            return False
+        if not isinstance(pool, dict) or set(pool.keys()) != {
+            "limit",
+            "peak_running",
+            "peak_queued",
+        }:
+            return False
+        limit = pool["limit"]
+        if not _is_non_negative_int(limit) or limit < 1:
+            return False
+        if not _is_non_negative_int(pool["peak_running"]):
+            return False
+        if not _is_non_negative_int(pool["peak_queued"]):
+            return False
+    return True
+
+
+def _is_optional_non_negative_finite_number(value: object) -> bool:
+    return value is None or (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+        and value >= 0
+    )
+
+
+def _is_valid_emitted_tasks(value: object, tasks: dict[str, object]) -> bool:
+    # Only a task that succeeded emits; its tasks are checked by the loader when resumed.
+    if not isinstance(value, dict):
+        return False
+    for emitter, raw_tasks in value.items():
+        emitter_data = tasks.get(emitter)
+        if not isinstance(emitter_data, dict) or emitter_data.get("status") != "SUCCESS":
+            return False
+        if not isinstance(raw_tasks, list) or not raw_tasks:
+            return False
+        if not all(isinstance(item, dict) for item in raw_tasks):
+            return False
+    return True
+
+
+def _is_valid_parallel_samples(value: object) -> bool:
+    if not isinstance(value, list):
+        return False
+    for sample in value:
+        if not isinstance(sample, dict) or set(sample.keys()) != {
+            "at",
+            "limit",
+            "running",
+            "cpu_some_avg10",
+            "memory_some_avg10",
+            "loadavg_1m",
+        }:
+            return False
+        if not _is_iso_datetime(sample["at"]):
+            return False
+        limit = sample["limit"]
+        if not _is_non_negative_int(limit) or limit < 1:
+            return False
+        if not _is_non_negative_int(sample["running"]):
+            return False
+        for key in ("cpu_some_avg10", "memory_some_avg10", "loadavg_1m"):
+            if not _is_optional_non_negative_finite_number(sample[key]):
+                return False
+    return True
+
+
+_RUSAGE_KEYS = {
+    "attempt",
+    "user_sec",
+    "system_sec",
+    "max_rss_bytes",
+    "inblock",
+    "oublock",
+    "nvcsw",
+    "nivcsw",
+}
+
+
+def _is_valid_rusage(value: object) -> bool:
+    if not isinstance(value, list) or not value:
+        return False
+    for usage in value:
+        if not isinstance(usage, dict) or set(usage.keys()) != _RUSAGE_KEYS:
+            return False
+        attempt = usage["attempt"]
+        if not _is_non_negative_int(attempt) or attempt < 1:
+            return False
+        for key in ("user_sec", "system_sec"):
+            if usage[key] is None or not _is_optional_non_negative_finite_number(usage[key]):
+                return False
+        for key in ("max_rss_bytes", "inblock", "oublock", "nvcsw", "nivcsw"):
+            if not _is_non_negative_int(usage[key]):
+                return False
+    return True
+
+
+def _is_valid_cache_stats(value: object) -> bool:
+    if not isinstance(value, dict) or set(value.keys()) != {"hits", "misses"}:
+        return False
+    return _is_non_negative_int(value["hits"]) and _is_non_negative_int(value["misses"])
+
+
+def _is_sha256_hex(value: object) -> bool:
+    return isinstance(value, str) and _SHA256_HEX_RE.fullmatch(value) is not None
+
+
+def _is_valid_output_digests(value: object) -> bool:
+    if not isinstance(value, dict) or not value:
+        return False
+    return all(
+        _is_non_blank_str_without_nul(rel) and _is_sha256_hex(digest)
+        for rel, digest in value.items()
+    )
+
+
 def _validate_state_shape(raw: dict[str, object], run_dir: Path) -> None:
     if any(not isinstance(key, str) for key in raw):
         raise StateError("invalid state field: root")
@@ -209,6 +351,15 @@ def _validate_state_shape(raw: dict[str, object], run_dir: Path) -> None:
     if not isinstance(raw.get("fail_fast"), bool):
         raise StateError("invalid state field: fail_fast")
 
+    if "pools" in raw and not _is_valid_pools(raw["pools"]):
+        raise StateError("invalid state field: pools")
+    if "parallel_samples" in raw and not _is_valid_parallel_samples(raw["parallel_samples"]):
+        raise StateError("invalid state field: parallel_samples")
+    if "cache" in raw and not _is_valid_cache_stats(raw["cache"]):
+        raise StateError("invalid state field: cache")
+    if "journal_seq" in raw and not _is_non_negative_int(raw["journal_seq"]):
+        raise StateError("invalid state field: journal_seq")
+
     tasks = raw.get("tasks")
     if not isinstance(tasks, dict) or not tasks:
         raise StateError("invalid state field: tasks")
@@ -567,7 +718,46 @@ def _validate_state_shape(raw: dict[str, object], run_dir: Path) -> None:
                 raise StateError("invalid state field: tasks")
         if task_status in {"PENDING", "READY", "RUNNING", "SKIPPED", "CANCELED"} and artifact_paths:
             raise StateError("invalid state field: tasks")
+        for flag in ("cached", "up_to_date", "hedge_won"):
+            if flag in task_data:
+                value = task_data[flag]
+                if not isinstance(value, bool) or (value and task_status != "SUCCESS"):
+                    raise StateError("invalid state field: tasks")
+        if ("shutdown_sec" in task_data) != ("shutdown_signal" in task_data):
+            raise StateError("invalid state field: tasks")
+        if "shutdown_sec" in task_data and (
+            not _is_optional_non_negative_finite_number(task_data["shutdown_sec"])
+            or task_data["shutdown_sec"] is None
+            or not _is_non_blank_str_without_nul(task_data["shutdown_signal"])
+            or task_status in {"PENDING", "SUCCESS", "SKIPPED"}
+        ):
+            raise StateError("invalid state field: tasks")
+        if "memory_peak_bytes" in task_data and (
+            not _is_non_negative_int(task_data["memory_peak_bytes"])
+            or task_status in {"PENDING", "SKIPPED"}
+        ):
+            raise StateError("invalid state field: tasks")
+        if "cpu_usage_sec" in task_data and (
+            not _is_optional_non_negative_finite_number(task_data["cpu_usage_sec"])
+            or task_data["cpu_usage_sec"] is None
+            or task_status in {"PENDING", "SKIPPED"}
+        ):
+            raise StateError("invalid state field: tasks")
+        if "rusage" in task_data and (
+            not _is_valid_rusage(task_data["rusage"]) or task_status in {"PENDING", "SKIPPED"}
+        ):
+            raise StateError("invalid state field: tasks")
+        if "output_digests" in task_data and (
+            task_status != "SUCCESS" or not _is_valid_output_digests(task_data["output_digests"])
+        ):
+            raise StateError("invalid state field: tasks")
+        if "input_fingerprint" in task_data and (
+            task_status != "SUCCESS" or not _is_sha256_hex(task_data["input_fingerprint"])
+        ):
+            raise StateError("invalid state field: tasks")
 
+    if "emitted_tasks" in raw and not _is_valid_emitted_tasks(raw["emitted_tasks"], tasks):
+        raise StateError("invalid state field: emitted_tasks")
     if status == "SUCCESS" and any(task_status != "SUCCESS" for task_status in task_statuses):
         raise StateError("invalid state field: status")
     if status == "CANCELED" and not any(task_status == "CANCELED" for task_status in task_statuses):
@@ -588,7 +778,118 @@ def _validate_state_shape(raw: dict[str, object], run_dir: Path) -> None:
         raise StateError("invalid state field: status")
 
 
-def load_state(run_dir: Path) -> RunState:
+# Run-level fields a journal record may carry; everything else only changes in state.json.
+_JOURNAL_RUN_KEYS = {"updated_at", "pools", "cache", "emitted_tasks", "parallel_samples_added"}
+
+
+def _read_state_journal(run_dir: Path) -> list[dict[str, object]]:
+    journal_path = run_dir / "state.journal"
+    if has_symlink_ancestor(journal_path):
+        raise StateError(f"state journal path must not include symlink: {journal_path}")
+    flags = os.O_RDONLY
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    fd: int | None = None
+    try:
+        fd = os.open(str(journal_path), flags)
+        opened_meta = os.fstat(fd)
+        if not stat.S_ISREG(opened_meta.st_mode):
+            raise StateError(f"failed to read state journal: {journal_path}")
+        with os.fdopen(fd, "rb") as f:
+            fd = None
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    except RuntimeError as exc:
+        raise StateError(f"failed to read state journal: {journal_path}") from exc
+    except OSError as exc:
+        if exc.errno == errno.ELOOP:
+            raise StateError(f"state journal must not be symlink: {journal_path}") from exc
+        raise StateError(f"failed to read state journal: {journal_path}") from exc
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+    # Every append ends with a newline, so text after the last one is a write cut short by a
+    # crash; it was never acknowledged and is dropped.
+    records: list[dict[str, object]] = []
+    for line in data.split(b"\n")[:-1]:
+        try:
+            record = json.loads(line.decode("utf-8"))
+        except (UnicodeError, json.JSONDecodeError) as exc:
+            raise StateError(f"invalid state journal: {journal_path}") from exc
+        if not isinstance(record, dict):
+            raise StateError(f"invalid state journal: {journal_path}")
+        records.append(record)
+    return records
+
+
+def _replay_state_journal(
+    raw: dict[str, object], records: list[dict[str, object]], run_dir: Path
+) -> bool:
+    """Apply journal records newer than the snapshot to ``raw`` in place.
+
+    Replay stops at the first gap in ``seq`` and returns False. A reader racing a compaction
+    can pair the old state.json with the journal started after it; the records it did apply
+    are still a consistent prefix of the run.
+    """
+    journal_path = run_dir / "state.journal"
+    seq = raw.get("journal_seq", 0)
+    if not _is_non_negative_int(seq):
+        raise StateError("invalid state field: journal_seq")
+    assert isinstance(seq, int)
+    tasks = raw.get("tasks")
+    if not isinstance(tasks, dict):
+        raise StateError("invalid state field: tasks")
+    complete = True
+    for record in records:
+        record_seq = record.get("seq")
+        if not _is_non_negative_int(record_seq):
+            raise StateError(f"invalid state journal: {journal_path}")
+        assert isinstance(record_seq, int)
+        # Records up to journal_seq were folded into state.json by a compaction that stopped
+        # before it removed the journal.
+        if record_seq <= seq:
+            continue
+        if record_seq != seq + 1:
+            complete = False
+            break
+        record_tasks = record.get("tasks", {})
+        record_run = record.get("run", {})
+        if (
+            set(record) - {"seq", "tasks", "run"}
+            or not isinstance(record_tasks, dict)
+            or not isinstance(record_run, dict)
+            or set(record_run) - _JOURNAL_RUN_KEYS
+        ):
+            raise StateError(f"invalid state journal: {journal_path}")
+        emitted = record_run.get("emitted_tasks", {})
+        samples_added = record_run.get("parallel_samples_added", [])
+        if not isinstance(emitted, dict) or not isinstance(samples_added, list):
+            raise StateError(f"invalid state journal: {journal_path}")
+        for key, value in record_run.items():
+            if key not in ("emitted_tasks", "parallel_samples_added"):
+                raw[key] = value
+        if samples_added:
+            samples = raw.get("parallel_samples", [])
+            if not isinstance(samples, list):
+                raise StateError("invalid state field: parallel_samples")
+            raw["parallel_samples"] = (samples + samples_added)[-MAX_PARALLEL_SAMPLES:]
+        if emitted:
+            current = raw.setdefault("emitted_tasks", {})
+            if not isinstance(current, dict):
+                raise StateError("invalid state field: emitted_tasks")
+            current.update(emitted)
+        tasks.update(record_tasks)
+        seq = record_seq
+    if seq:
+        raw["journal_seq"] = seq
+    return complete
+
+
+def _read_state_file(run_dir: Path) -> dict[str, object]:
     state_path = run_dir / "state.json"
     if has_symlink_ancestor(state_path):
         raise StateError(f"state file path must not include symlink: {state_path}")
@@ -636,11 +937,22 @@ def load_state(run_dir: Path) -> RunState:
                 os.close(fd)
     if not isinstance(raw, dict):
         raise StateError("state root must be object")
+    return raw
+
+
+def load_state(run_dir: Path) -> RunState:
+    raw = _read_state_file(run_dir)
+    if not _replay_state_journal(raw, _read_state_journal(run_dir), run_dir):
+        # A run compacted between the two reads; its new state.json covers the gap.
+        raw = _read_state_file(run_dir)
+        if not _replay_state_journal(raw, _read_state_journal(run_dir), run_dir):
+            raise StateError(f"invalid state journal (missing seq): {run_dir / 'state.journal'}")
     _validate_state_shape(raw, run_dir)
     return RunState.from_dict(raw)
 
 
-def save_state_atomic(run_dir: Path, state: RunState) -> None:
+def save_state_atomic(run_dir: Path, state: RunState) -> int:
+    """Replace state.json with ``state``; return the number of bytes written."""
     state_path = run_dir / "state.json"
     tmp_path = run_dir / "state.json.tmp"
     if has_symlink_ancestor(state_path) or has_symlink_ancestor(tmp_path):
@@ -655,7 +967,8 @@ def save_state_atomic(run_dir: Path, state: RunState) -> None:
         raise OSError(f"failed to prepare state file path: {state_path}") from exc
     if state_meta is not None and not stat.S_ISREG(state_meta.st_mode):
         raise OSError(f"state file path must be regular file: {state_path}")
-    payload = json.dumps(state.to_dict(), ensure_ascii=False, indent=2, sort_keys=True)
+    # Compact output keeps the C encoder; indent=2 falls back to the pure-Python one.
+    payload = json.dumps(state.to_dict(), ensure_ascii=False, separators=(",", ":"), sort_keys=True)
     flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
     if hasattr(os, "O_NONBLOCK"):
         flags |= os.O_NONBLOCK
@@ -726,3 +1039,55 @@ def save_state_atomic(run_dir: Path, state: RunState) -> None:
             raise OSError(f"failed to replace state file: {state_path}") from exc
         raise
     _fsync_directory(run_dir)
+    return len(payload.encode("utf-8")) + 1
+
+
+def append_state_journal(run_dir: Path, record: dict[str, object]) -> int:
+    """Append one record to state.journal and fsync it; return the number of bytes written."""
+    journal_path = run_dir / "state.journal"
+    if has_symlink_ancestor(journal_path):
+        raise OSError(f"state journal path must not include symlink: {journal_path}")
+    payload = (
+        json.dumps(record, ensure_ascii=False, separators=(",", ":"), sort_keys=True) + "\n"
+    ).encode("utf-8")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    if hasattr(os, "O_NONBLOCK"):
+        flags |= os.O_NONBLOCK
+    if hasattr(os, "O_NOFOLLOW"):
+        flags |= os.O_NOFOLLOW
+    fd: int | None = None
+    try:
+        fd = os.open(str(journal_path), flags, 0o600)
+        opened_meta = os.fstat(fd)
+        if not stat.S_ISREG(opened_meta.st_mode):
+            raise OSError(f"state journal path must be regular file: {journal_path}")
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    except RuntimeError as exc:
+        raise OSError(f"failed to append state journal: {journal_path}") from exc
+    except OSError as exc:
+        if exc.errno == errno.ELOOP:
+            raise OSError(f"state journal path must not be symlink: {journal_path}") from exc
+        if exc.errno == errno.ENXIO:
+            raise OSError(f"state journal path must be regular file: {journal_path}") from exc
+        raise
+    finally:
+        if fd is not None:
+            with suppress(OSError, RuntimeError):
+                os.close(fd)
+    return len(payload)
+
+
+def remove_state_journal(run_dir: Path) -> None:
+    """Delete the journal folded into state.json; raise OSError if it could not be removed.
+
+    A journal left behind may end in a torn line, so the caller must not append to it.
+    """
+    journal_path = run_dir / "state.journal"
+    try:
+        journal_path.unlink(missing_ok=True)
+    except (OSError, RuntimeError) as exc:
+        raise OSError(f"failed to remove state journal: {journal_path}") from exc
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_bench_module() -> object:
+    module_path = Path(__file__).resolve().parents[1] / "tools" / "bench_loop.py"
+    spec = importlib.util.spec_from_file_location("bench_loop_tool_module", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_bench_loop_reports_spawn_rate_and_capture_throughput(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    module = _load_bench_module()
+    exit_code = module.main(  # type: ignore[attr-defined]
+        [
+            "--loops",
+            "asyncio",
+            "--spawns",
+            "8",
+            "--concurrency",
+            "4",
+            "--capture-mib",
+            "2",
+            "--json",
+        ]
+    )
+    assert exit_code == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["loop"] for row in rows] == ["asyncio"]
+    assert rows[0]["spawns_per_sec"] > 0
+    assert rows[0]["capture_mib_per_sec"] > 0
+
+
+def test_bench_loop_rejects_invalid_sizes() -> None:
+    module = _load_bench_module()
+    assert module.main(["--spawns", "0"]) == 2  # type: ignore[attr-defined]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_bench_module() -> object:
+    module_path = Path(__file__).resolve().parents[1] / "tools" / "bench_scheduler.py"
+    spec = importlib.util.spec_from_file_location("bench_scheduler_tool_module", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_bench_scheduler_reports_throughput_per_size(capsys: pytest.CaptureFixture[str]) -> None:
+    from orch.exec import runner
+
+    module = _load_bench_module()
+    original_run_task = runner.run_task
+    exit_code = module.main(  # type: ignore[attr-defined]
+        ["--tasks", "50", "120", "--width", "10", "--max-parallel", "4", "--json"]
+    )
+    assert exit_code == 0
+    assert runner.run_task is original_run_task
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["tasks"] for row in rows] == [50, 120]
+    for row in rows:
+        assert row["status"] == "SUCCESS"
+        assert row["tasks_per_sec"] > 0
+        assert row["overhead_us_per_task"] > 0
+
+
+def test_bench_scheduler_runs_under_capacity(capsys: pytest.CaptureFixture[str]) -> None:
+    module = _load_bench_module()
+    exit_code = module.main(  # type: ignore[attr-defined]
+        ["--tasks", "80", "--width", "0", "--max-parallel", "8", "--capacity", "4", "--json"]
+    )
+    assert exit_code == 0
+    row = json.loads(capsys.readouterr().out)
+    assert row["capacity"] == 4.0
+    assert row["status"] == "SUCCESS"
+
+
+def test_bench_scheduler_rejects_invalid_sizes() -> None:
+    module = _load_bench_module()
+    assert module.main(["--tasks", "0"]) == 2  # type: ignore[attr-defined]
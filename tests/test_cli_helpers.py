@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from contextlib import contextmanager
 from pathlib import Path
@@ -9,16 +10,23 @@ import typer
 
 import orch.cli as cli_module
 from orch.cli import (
+    _make_daemon_handler,
     _mentions_symlink,
+    _parse_capacity_or_exit,
+    _parse_max_parallel,
     _render_plan_error,
     _render_runtime_error_detail,
+    _resolve_loop_or_exit,
+    _resolve_max_parallel,
     _resolve_workdir_or_exit,
     _validate_home_or_exit,
     _write_plan_snapshot,
     _write_report,
 )
 from orch.config.loader import load_plan
-from orch.config.schema import PlanSpec, TaskSpec
+from orch.config.schema import PlanSpec, TaskSpec, WorkerSpec
+from orch.exec.budget import FairShareBudget
+from orch.exec.daemon import DaemonSubmitError
 from orch.state.model import RunState
 from orch.util.errors import PlanError, RunConflictError
 
@@ -135,6 +143,140 @@ def test_write_plan_snapshot_roundtrips_to_valid_plan(tmp_path: Path) -> None:
     assert loaded == plan
 
 
+def test_write_plan_snapshot_roundtrips_task_scheduling_fields(tmp_path: Path) -> None:
+    plan = PlanSpec(
+        goal=None,
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="urgent",
+                cmd=["python3", "-c", "print('u')"],
+                priority=3,
+                estimate_sec=12.5,
+                resources={"cpu": 4.0, "mem_mb": 2048.0},
+                pool="agent",
+            ),
+            TaskSpec(id="plain", cmd=["python3", "-c", "print('p')"]),
+            TaskSpec(
+                id="helper",
+                cmd=["call", "tools.helpers:run", '{"args": [1], "kwargs": {"fast": true}}'],
+                call="tools.helpers:run",
+                args=[1],
+                kwargs={"fast": True},
+            ),
+            TaskSpec(id="warm", cmd=["fake_agent", "build"], worker="agent"),
+        ],
+        pools={"agent": 2},
+        workers={"agent": WorkerSpec(cmd=["python3", "tools/fake_agent.py", "worker"], count=2)},
+    )
+
+    snapshot_path = tmp_path / "plan.yaml"
+    _write_plan_snapshot(plan, snapshot_path)
+    plain_section = snapshot_path.read_text(encoding="utf-8").split("plain", 1)[1]
+    plain_section = plain_section.split("helper", 1)[0]
+    assert "priority" not in plain_section
+    assert "resources" not in plain_section
+    assert load_plan(snapshot_path) == plan
+
+
+@pytest.mark.parametrize(
+    ("field", "value", "message"),
+    [
+        ("max_parallel", "4", "Invalid max_parallel"),
+        ("max_parallel", 0, "Invalid max_parallel"),
+        ("max_parallel", True, "Invalid max_parallel"),
+        ("schedule", "fastest", "Invalid schedule"),
+        ("workdir", 7, "Invalid workdir"),
+        ("workdir", "missing", "Invalid workdir"),
+        ("capacity", {"gpu": -1}, "Invalid capacity"),
+        ("capacity", ["gpu"], "Invalid capacity"),
+        ("fail_fast", "yes", "Invalid fail_fast"),
+        ("plan_path", None, "must include plan_path"),
+        ("plan_path", "cyclic.yaml", "Plan validation error"),
+    ],
+)
+def test_daemon_handler_rejects_invalid_requests_before_creating_a_run(
+    tmp_path: Path, field: str, value: object, message: str
+) -> None:
+    (tmp_path / "plan.yaml").write_text('tasks:\n  - id: a\n    cmd: ["true"]\n', encoding="utf-8")
+    (tmp_path / "cyclic.yaml").write_text(
+        "tasks:\n"
+        '  - id: a\n    cmd: ["true"]\n    depends_on: [b]\n'
+        '  - id: b\n    cmd: ["true"]\n    depends_on: [a]\n',
+        encoding="utf-8",
+    )
+    request: dict[str, object] = {
+        "plan_path": str(tmp_path / "plan.yaml"),
+        "workdir": str(tmp_path),
+    }
+    if isinstance(value, str) and field in ("plan_path", "workdir"):
+        value = str(tmp_path / value)
+    request[field] = value
+    home = tmp_path / ".orch"
+    handler = _make_daemon_handler(home)
+
+    with pytest.raises(DaemonSubmitError, match=message):
+        asyncio.run(handler(request, FairShareBudget(1)))
+    assert not (home / "runs").exists()
+
+
+def test_write_plan_snapshot_keeps_matrix_unexpanded(tmp_path: Path) -> None:
+    plan_path = tmp_path / "source.yaml"
+    values = ", ".join(str(i) for i in range(500))
+    plan_path.write_text(
+        f"""
+tasks:
+  - id: "shard-{{a}}-{{b}}"
+    matrix:
+      a: [{values}]
+      b: [{", ".join(str(i) for i in range(100))}]
+    cmd: ["python3", "-c", "print('{{a}} {{b}}')"]
+  - id: merge
+    cmd: "echo merge"
+    depends_on: ["shard-{{a}}-{{b}}", "shard-0-0"]
+""".strip(),
+        encoding="utf-8",
+    )
+    plan = load_plan(plan_path)
+
+    snapshot_path = tmp_path / "plan.yaml"
+    _write_plan_snapshot(plan, snapshot_path)
+    assert snapshot_path.stat().st_size < 16 * 1024
+    loaded = load_plan(snapshot_path)
+    assert len(loaded.tasks) == 50_001
+    assert loaded == plan
+
+
+def test_parse_capacity_or_exit_accepts_named_limits() -> None:
+    assert _parse_capacity_or_exit(None) is None
+    assert _parse_capacity_or_exit("cpu=16, mem_mb=64000,gpu=0.5") == {
+        "cpu": 16.0,
+        "mem_mb": 64000.0,
+        "gpu": 0.5,
+    }
+
+
+@pytest.mark.parametrize("raw", ["", "cpu", "cpu=", "cpu=0", "cpu=-1", "cpu=nan", "cpu=1,cpu=2"])
+def test_parse_capacity_or_exit_rejects_invalid_spec(raw: str) -> None:
+    with pytest.raises(typer.Exit) as exc_info:
+        _parse_capacity_or_exit(raw)
+    assert exc_info.value.exit_code == 2
+
+
+def test_resolve_loop_or_exit_falls_back_to_asyncio_without_uvloop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from orch.exec import loop as loop_module
+
+    monkeypatch.setattr(loop_module, "uvloop", None)
+    assert _resolve_loop_or_exit("auto") == "asyncio"
+    assert _resolve_loop_or_exit("asyncio") == "asyncio"
+    for choice in ("uvloop", "trio"):
+        with pytest.raises(typer.Exit) as exc_info:
+            _resolve_loop_or_exit(choice)
+        assert exc_info.value.exit_code == 2
+
+
 def test_render_plan_error_sanitizes_symlink_detail() -> None:
     err = PlanError("plan file path must not include symlink: /tmp/plan.yaml")
     assert _render_plan_error(err) == "invalid plan path"
@@ -8092,3 +8234,17 @@ def test_cli_resume_keeps_symbolically_linkingly_double_hyphen_report_warning(
     assert "failed to write report" in captured.out
     assert "symbolically--linkingly issue" in captured.out
     assert "invalid run path" not in captured.out
+
+
+def test_parse_max_parallel_accepts_auto_and_positive_ints(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _parse_max_parallel(4) == 4
+    assert _parse_max_parallel("3") == 3
+    assert _resolve_max_parallel(_parse_max_parallel("3")) == (3, False)
+    monkeypatch.setattr(cli_module.os, "cpu_count", lambda: 6)
+    assert _resolve_max_parallel(_parse_max_parallel("auto")) == (12, True)
+
+
+@pytest.mark.parametrize("raw", ["0", "-2", "many"])
+def test_parse_max_parallel_rejects_invalid_values(raw: str) -> None:
+    with pytest.raises(typer.BadParameter):
+        _parse_max_parallel(raw)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 import re
+import socket
 import subprocess
 import sys
 import time
@@ -19574,3 +19575,256 @@ def test_cli_logs_falls_back_to_unlocked_read_when_lock_conflicted(tmp_path: Pat
     )
     assert logs_proc.returncode == 0
     assert "from-log" in logs_proc.stdout
+
+
+def test_cli_run_listen_executes_tasks_on_loopback_workers(tmp_path: Path) -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    plan_path = tmp_path / "plan.yaml"
+    home = tmp_path / ".orch_cli"
+    _write_plan(
+        plan_path,
+        """
+        tasks:
+          - id: a
+            cmd: ["python3", "-c", "print('from a')"]
+          - id: b
+            cmd: ["python3", "-c", "print('from b')"]
+          - id: c
+            cmd: ["python3", "-c", "print('from c')"]
+            depends_on: ["a", "b"]
+        """,
+    )
+    address = f"127.0.0.1:{port}"
+    coordinator = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "orch.cli",
+            "run",
+            str(plan_path),
+            "--home",
+            str(home),
+            "--workdir",
+            str(tmp_path),
+            "--listen",
+            address,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    workers = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "orch.cli",
+                "worker",
+                "--connect",
+                address,
+                "--slots",
+                "1",
+                "--connect-timeout",
+                "5",
+            ],
+            cwd=tmp_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        for _ in range(2)
+    ]
+    output, _ = coordinator.communicate(timeout=60)
+    # One worker may finish every task before the other connects; that one then gives up
+    # after --connect-timeout, so only the coordinator's outcome is asserted.
+    for worker in workers:
+        try:
+            worker.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.communicate()
+    assert coordinator.returncode == 0, output
+    run_id = _extract_run_id(_strip_ansi(output))
+    logs_dir = home / "runs" / run_id / "logs"
+    for task_id in ("a", "b", "c"):
+        assert f"from {task_id}" in (logs_dir / f"{task_id}.out.log").read_text(encoding="utf-8")
+
+
+def test_cli_worker_rejects_invalid_connect_address(tmp_path: Path) -> None:
+    proc = subprocess.run(
+        [sys.executable, "-m", "orch.cli", "worker", "--connect", "no-port"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert proc.returncode == 2
+    assert "Invalid address" in _strip_ansi(proc.stdout + proc.stderr)
+
+
+def test_cli_serve_hosts_daemon_runs_under_shared_slots(tmp_path: Path) -> None:
+    home = tmp_path / ".orch_cli"
+    plan_path = tmp_path / "plan.yaml"
+    _write_plan(
+        plan_path,
+        """
+        tasks:
+          - id: a
+            cmd: ["python3", "-c", "import time; time.sleep(0.2); print('a')"]
+          - id: b
+            cmd: ["python3", "-c", "import os; print(os.environ['ORCH_PROBE'])"]
+        """,
+    )
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "orch.cli", "serve", "--home", str(home), "--slots", "1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env={**os.environ, "ORCH_PROBE": "from-daemon"},
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not (home / "orchd.sock").exists():
+            assert daemon.poll() is None
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        clients = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "orch.cli",
+                    "run",
+                    str(plan_path),
+                    "--home",
+                    str(tmp_path / "client_home"),
+                    "--workdir",
+                    str(tmp_path),
+                    "--daemon",
+                    "--daemon-address",
+                    f"unix:{home / 'orchd.sock'}",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                env={**os.environ, "ORCH_PROBE": "from-client"},
+            )
+            for _ in range(2)
+        ]
+        outputs = [client.communicate(timeout=60)[0] for client in clients]
+    finally:
+        daemon.terminate()
+        daemon.communicate(timeout=30)
+    assert [client.returncode for client in clients] == [0, 0], outputs
+    run_ids = {_extract_run_id(_strip_ansi(output)) for output in outputs}
+    assert len(run_ids) == 2
+    for run_id in run_ids:
+        state = json.loads((home / "runs" / run_id / "state.json").read_text(encoding="utf-8"))
+        assert state["status"] == "SUCCESS"
+        assert (home / "runs" / run_id / "report" / "final_report.md").exists()
+        # Tasks see the daemon's environment, not the submitting client's.
+        b_log = (home / "runs" / run_id / "logs" / "b.out.log").read_text(encoding="utf-8")
+        assert "from-daemon" in b_log
+    for output in outputs:
+        # The report path points into the daemon's home even if the client's --home differs.
+        assert str(home / "runs") in " ".join(_strip_ansi(output).split())
+    assert daemon.returncode == 0
+    assert not (home / "orchd.sock").exists()
+
+
+def test_cli_run_daemon_reports_unreachable_daemon(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    _write_plan(
+        plan_path,
+        """
+        tasks:
+          - id: a
+            cmd: ["python3", "-c", "print('a')"]
+        """,
+    )
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "orch.cli",
+            "run",
+            str(plan_path),
+            "--home",
+            str(tmp_path / ".orch_cli"),
+            "--daemon",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert proc.returncode == 2
+    assert "Daemon not reachable" in _strip_ansi(proc.stdout + proc.stderr)
+
+
+def test_cli_resume_reexpands_matrix_from_compact_plan_snapshot(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan_matrix_resume.yaml"
+    home = tmp_path / ".orch_cli"
+    _write_plan(
+        plan_path,
+        """
+        tasks:
+          - id: "job-{n}"
+            matrix:
+              n: [1, 2, 3]
+            cmd: ["sh", "-c", "test -e gate || test {n} != 2"]
+          - id: report
+            cmd: ["python3", "-c", "print('report')"]
+            depends_on: ["job-{n}"]
+        """,
+    )
+    run_proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "orch.cli",
+            "run",
+            str(plan_path),
+            "--home",
+            str(home),
+            "--workdir",
+            str(tmp_path),
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert run_proc.returncode == 3
+    run_id = _extract_run_id(run_proc.stdout)
+    snapshot = (home / "runs" / run_id / "plan.yaml").read_text(encoding="utf-8")
+    assert "matrix:" in snapshot
+    assert "job-1" not in snapshot
+    assert "job-{n}" in snapshot.split("report", 1)[1]
+
+    (tmp_path / "gate").write_text("ok", encoding="utf-8")
+    resume_proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "orch.cli",
+            "resume",
+            run_id,
+            "--home",
+            str(home),
+            "--workdir",
+            str(tmp_path),
+            "--failed-only",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert resume_proc.returncode == 0, resume_proc.stdout + resume_proc.stderr
+    state = json.loads((home / "runs" / run_id / "state.json").read_text(encoding="utf-8"))
+    assert {task_id: task["attempts"] for task_id, task in state["tasks"].items()} == {
+        "job-1": 1,
+        "job-2": 2,
+        "job-3": 1,
+        "report": 1,
+    }
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from orch.config.schema import PlanSpec, TaskSpec
 from orch.dag.build import build_adjacency
+from orch.dag.pipeline import add_pipeline_edges, pipeline_groups
+from orch.dag.rank import upward_ranks
 from orch.dag.validate import assert_acyclic
 
 
@@ -41,3 +43,42 @@ def test_assert_acyclic_keeps_input_in_degree_unchanged() -> None:
     assert idx["a"] < idx["b"]
     assert idx["a"] < idx["c"]
     assert in_degree == original
+
+
+def test_upward_ranks_follow_longest_downstream_cost_path() -> None:
+    plan = PlanSpec(
+        goal=None,
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="root", cmd=["echo", "root"]),
+            TaskSpec(id="slow", cmd=["echo", "slow"], depends_on=["root"]),
+            TaskSpec(id="fast", cmd=["echo", "fast"], depends_on=["root"]),
+            TaskSpec(id="leaf", cmd=["echo", "leaf"], depends_on=["slow", "fast"]),
+        ],
+    )
+    dependents, in_degree = build_adjacency(plan)
+    order = assert_acyclic([task.id for task in plan.tasks], dependents, in_degree)
+
+    ranks = upward_ranks(order, dependents, {"root": 1.0, "slow": 5.0, "fast": 2.0, "leaf": 0.5})
+    assert ranks == {"leaf": 0.5, "fast": 2.5, "slow": 5.5, "root": 6.5}
+
+
+def test_pipeline_edges_gate_chain_head_on_every_member_dependency() -> None:
+    plan = PlanSpec(
+        goal=None,
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="seed", cmd=["true"]),
+            TaskSpec(id="extract", cmd=["seq", "3"]),
+            TaskSpec(id="transform", cmd=["cat"], stdin_from="extract"),
+            TaskSpec(id="load", cmd=["cat"], stdin_from="transform", depends_on=["seed"]),
+        ],
+    )
+
+    groups = pipeline_groups(plan.tasks)
+    assert groups == {"extract": ["extract", "transform", "load"]}
+    dependents, in_degree = build_adjacency(plan)
+    add_pipeline_edges(groups, {task.id: task for task in plan.tasks}, dependents, in_degree)
+    assert dependents["seed"] == ["load", "extract"]
+    assert dependents["extract"] == ["transform", "load"]
+    assert in_degree == {"seed": 0, "extract": 1, "transform": 1, "load": 2}
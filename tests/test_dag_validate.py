@@ -4,7 +4,7 @@ import pytest
 
 from orch.config.schema import PlanSpec, TaskSpec
 from orch.dag.build import build_adjacency
-from orch.dag.validate import assert_acyclic
+from orch.dag.validate import assert_acyclic, assert_no_cycle
 from orch.util.errors import PlanError
 
 
@@ -36,3 +36,11 @@ def test_assert_acyclic_detects_cycle() -> None:
     dependents, in_degree = build_adjacency(plan)
     with pytest.raises(PlanError):
         assert_acyclic([task.id for task in plan.tasks], dependents, in_degree)
+
+
+def test_assert_no_cycle_follows_depends_on_edges() -> None:
+    assert_no_cycle({"a": [], "b": ["a"], "c": ["a", "b"]})
+    with pytest.raises(PlanError, match="cycle"):
+        assert_no_cycle({"a": ["c"], "b": ["a"], "c": ["b"], "d": []})
+    with pytest.raises(PlanError, match="cycle"):
+        assert_no_cycle({"a": ["a"]})
@@ -3,14 +3,44 @@ from __future__ import annotations
 import asyncio
 import errno
 import os
+import signal
 import sys
+from collections.abc import Awaitable
 from pathlib import Path
 
 import pytest
 
+from orch.config.schema import TaskSpec
+from orch.exec import limits as limits_module
+from orch.exec.budget import FairShareBudget
 from orch.exec.cancel import cancel_requested, clear_cancel_request, write_cancel_request
 from orch.exec.capture import stream_to_file
-from orch.exec.timeout import wait_with_timeout
+from orch.exec.checkpoint import Checkpointer
+from orch.exec.daemon import serve_daemon, submit_run
+from orch.exec.limits import (
+    cpu_max_value,
+    create_task_cgroup,
+    delegated_cgroup_parent,
+    enable_cgroup_delegation,
+    limits_command,
+    parse_cpu_stat_usage_sec,
+    parse_memory_peak,
+    read_cgroup_usage,
+)
+from orch.exec.loop import run_with_loop, uvloop_available
+from orch.exec.pipe import TaskPipe
+from orch.exec.pressure import (
+    AdaptiveLimit,
+    PressureSample,
+    parse_loadavg_1m,
+    parse_psi_some_avg10,
+)
+from orch.exec.ready import ReadyQueue
+from orch.exec.reap import spawn_reaped
+from orch.exec.remote import RemoteAddress
+from orch.exec.runner import TaskResult, run_task
+from orch.exec.timeout import terminate_with_escalation, wait_with_timeout
+from orch.util.errors import StateError
 
 
 @pytest.mark.asyncio
@@ -34,6 +64,285 @@ async def test_wait_with_timeout_times_out_and_terminates_process() -> None:
     assert proc.returncode is not None
 
 
+@pytest.mark.asyncio
+async def test_terminate_with_escalation_stops_at_first_signal_that_works() -> None:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        "import signal, sys, time\n"
+        "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(10)",
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert proc.stdout is not None
+    await proc.stdout.readline()
+    record = await terminate_with_escalation(
+        proc, signals=["SIGTERM", "SIGINT", "SIGKILL"], grace_sec=0.2
+    )
+    assert record.signal == "SIGINT"
+    assert 0.2 <= record.duration_sec < 5
+    assert proc.returncode is not None
+
+
+@pytest.mark.asyncio
+async def test_terminate_with_escalation_falls_back_to_sigkill() -> None:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        "import signal, time\n"
+        "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(10)",
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert proc.stdout is not None
+    await proc.stdout.readline()
+    record = await terminate_with_escalation(proc, signals=["SIGTERM"], grace_sec=0.1)
+    assert record.signal == "SIGKILL"
+    assert proc.returncode == -signal.SIGKILL
+
+
+@pytest.mark.asyncio
+async def test_terminate_with_escalation_group_kills_grandchildren() -> None:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+        "print(child.pid, flush=True)\n"
+        "time.sleep(30)",
+        stdout=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    assert proc.stdout is not None
+    grandchild = int((await proc.stdout.readline()).decode().strip())
+    await terminate_with_escalation(proc, signals=["SIGTERM"], grace_sec=1.0, group=True)
+    assert proc.returncode is not None
+    for _ in range(50):
+        try:
+            os.kill(grandchild, 0)
+        except ProcessLookupError:
+            break
+        await asyncio.sleep(0.05)
+    else:
+        pytest.fail("grandchild survived a group termination")
+
+
+def test_cgroup_usage_parsers_read_peak_and_cpu_seconds(tmp_path: Path) -> None:
+    assert parse_cpu_stat_usage_sec("usage_usec 2500000\nuser_usec 2000000\n") == 2.5
+    assert parse_cpu_stat_usage_sec("user_usec 1\n") is None
+    assert parse_memory_peak("1048576\n") == 1048576
+    assert parse_memory_peak("max\n") is None
+    assert cpu_max_value(1.5) == "150000 100000"
+    assert cpu_max_value(0.001) == "1000 100000"
+
+    leaf = create_task_cgroup(tmp_path, "build", cpu_max=0.5, memory_max=1024)
+    assert leaf is not None and leaf.parent == tmp_path and leaf.name.startswith("build.")
+    assert (leaf / "cpu.max").read_text(encoding="utf-8") == "50000 100000"
+    assert (leaf / "memory.max").read_text(encoding="utf-8") == "1024"
+    (leaf / "memory.peak").write_text("4096\n", encoding="utf-8")
+    (leaf / "cpu.stat").write_text("usage_usec 750000\n", encoding="utf-8")
+    usage = read_cgroup_usage(leaf)
+    assert usage.memory_peak_bytes == 4096
+    assert usage.cpu_usage_sec == 0.75
+
+
+@pytest.mark.asyncio
+async def test_limits_command_falls_back_to_address_space_rlimit(tmp_path: Path) -> None:
+    cmd = [
+        sys.executable,
+        "-c",
+        "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])",
+    ]
+    env = dict(os.environ)
+    assert limits_command(cmd, None, None, cwd=tmp_path, env=env) == cmd
+    limit = 4 * 1024**3
+    proc = await spawn_reaped(
+        limits_command(cmd, None, limit, cwd=tmp_path, env=env), cwd=tmp_path, env=env
+    )
+    out = await proc.stdout.read()
+    assert await proc.wait() == 0
+    proc.close()
+    assert int(out.decode().strip()) == limit
+
+
+@pytest.mark.asyncio
+async def test_limits_command_joins_leaf_before_exec(tmp_path: Path) -> None:
+    leaf = tmp_path / "leaf"
+    leaf.mkdir()
+    env = dict(os.environ)
+    cmd = limits_command(
+        [sys.executable, "-c", "import os; print(os.getpid())"], leaf, None, cwd=tmp_path, env=env
+    )
+    proc = await spawn_reaped(cmd, cwd=tmp_path, env=env)
+    out = await proc.stdout.read()
+    assert await proc.wait() == 0
+    proc.close()
+    # The shell wrote its own pid and then exec'd the task in the same process.
+    assert (leaf / "cgroup.procs").read_text(encoding="utf-8").strip() == out.decode().strip()
+    with pytest.raises(FileNotFoundError):
+        limits_command(["orch-no-such-program"], leaf, None, cwd=tmp_path, env=env)
+
+
+def _fake_cgroup_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    mount = tmp_path / "cgroup"
+    service = mount / "svc"
+    service.mkdir(parents=True)
+    (mount / "cgroup.controllers").write_text("cpu memory\n", encoding="utf-8")
+    (service / "cgroup.controllers").write_text("cpu memory\n", encoding="utf-8")
+    (service / "cgroup.subtree_control").write_text("\n", encoding="utf-8")
+    (service / "cgroup.procs").write_text("", encoding="utf-8")
+    proc_cgroup = tmp_path / "proc_self_cgroup"
+    proc_cgroup.write_text("0::/svc\n", encoding="utf-8")
+    monkeypatch.setattr(limits_module, "CGROUP_MOUNT", mount)
+    monkeypatch.setattr(limits_module, "PROC_SELF_CGROUP", proc_cgroup)
+    delegated_cgroup_parent.cache_clear()
+    return service
+
+
+def test_cgroup_delegation_is_opt_in_and_moves_back_on_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service = _fake_cgroup_tree(tmp_path, monkeypatch)
+    write_text = limits_module._write_text
+
+    def _write(path: Path, text: str) -> bool:
+        if path.name == "cgroup.subtree_control":
+            return False
+        if path.parent.name == "orch":
+            # cgroupfs control files are not directory entries that block rmdir.
+            return True
+        return write_text(path, text)
+
+    monkeypatch.setattr(limits_module, "_write_text", _write)
+    try:
+        # Looking up the parent never moves the runner or touches the tree.
+        assert delegated_cgroup_parent() is None
+        assert not (service / "orch").exists()
+
+        assert enable_cgroup_delegation() is False
+        assert (service / "cgroup.procs").read_text(encoding="utf-8") == str(os.getpid())
+        assert not (service / "orch").exists()
+    finally:
+        delegated_cgroup_parent.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_spawn_reaped_keeps_exit_code_output_and_rusage(tmp_path: Path) -> None:
+    proc = await spawn_reaped(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "data = bytearray(32 * 1024 * 1024)\n"
+            "sum(range(2_000_000))\n"
+            "print('out'); print('err', file=sys.stderr); sys.exit(3)",
+        ],
+        cwd=tmp_path,
+        env=dict(os.environ),
+    )
+    out = await proc.stdout.read()
+    err = await proc.stderr.read()
+    assert await proc.wait() == 3
+    proc.close()
+    assert proc.returncode == 3
+    assert out == b"out\n" and err == b"err\n"
+    assert proc.rusage is not None
+    assert proc.rusage.ru_utime + proc.rusage.ru_stime > 0
+    assert proc.rusage.ru_maxrss * 1024 >= 32 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_stream_to_file_tees_into_consumer_stdin_until_eof(tmp_path: Path) -> None:
+    pipe = TaskPipe()
+    producer = await spawn_reaped(
+        [sys.executable, "-c", "for i in range(20000): print(i)"], cwd=tmp_path, env={}
+    )
+    consumer = await spawn_reaped(
+        [sys.executable, "-c", "import sys; print(len(sys.stdin.read().split()))"],
+        cwd=tmp_path,
+        env={},
+        stdin_pipe=True,
+    )
+    # The producer may write before the consumer is attached; writes wait for it.
+    tee = asyncio.create_task(stream_to_file(producer.stdout, tmp_path / "producer.log", pipe))
+    pipe.attach(consumer.stdin)
+    await tee
+    assert await consumer.stdout.read() == b"20000\n"
+    assert await producer.wait() == 0 and await consumer.wait() == 0
+    producer.close()
+    consumer.close()
+    assert (tmp_path / "producer.log").read_text().split()[-1] == "19999"
+    # A consumer that never started still lets the producer run to the end.
+    late = TaskPipe()
+    late.close()
+    late.attach(None)
+    await late.write(b"dropped")
+
+
+@pytest.mark.parametrize(
+    "loop",
+    [
+        "asyncio",
+        pytest.param(
+            "uvloop", marks=pytest.mark.skipif(not uvloop_available(), reason="needs uvloop")
+        ),
+    ],
+)
+def test_run_task_spawn_timeout_cancel_and_pipe_paths_on_each_loop(
+    tmp_path: Path, loop: str
+) -> None:
+    async def _exercise() -> list[TaskResult]:
+        ok = await run_task(
+            TaskSpec(id="ok", cmd=[sys.executable, "-c", "print('x' * 100000)"]),
+            tmp_path,
+            attempt=1,
+            default_cwd=tmp_path,
+        )
+        slow = await run_task(
+            TaskSpec(id="slow", cmd=["sleep", "30"], timeout_sec=0.2, kill_grace_sec=1),
+            tmp_path,
+            attempt=1,
+            default_cwd=tmp_path,
+        )
+        cancel_event = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.2, cancel_event.set)
+        canceled = await run_task(
+            TaskSpec(id="canceled", cmd=["sleep", "30"]),
+            tmp_path,
+            attempt=1,
+            default_cwd=tmp_path,
+            cancel_event=cancel_event,
+        )
+        pipe = TaskPipe()
+        piped = await asyncio.gather(
+            run_task(
+                TaskSpec(id="producer", cmd=["seq", "1", "5000"]),
+                tmp_path,
+                attempt=1,
+                default_cwd=tmp_path,
+                stdout=pipe,
+            ),
+            run_task(
+                TaskSpec(id="consumer", cmd=["wc", "-l"]),
+                tmp_path,
+                attempt=1,
+                default_cwd=tmp_path,
+                stdin=pipe,
+            ),
+        )
+        return [ok, slow, canceled, *piped]
+
+    ok, slow, canceled, producer, consumer = run_with_loop(_exercise(), loop)
+    assert ok.exit_code == 0 and ok.rusage is not None
+    assert "x" * 100000 in (tmp_path / "logs" / "ok.out.log").read_text()
+    assert slow.timed_out and slow.shutdown_signal == "SIGTERM"
+    assert canceled.canceled and not canceled.timed_out
+    assert producer.exit_code == 0 and consumer.exit_code == 0
+    assert (tmp_path / "logs" / "consumer.out.log").read_text().split()[-1] == "5000"
+
+
 @pytest.mark.asyncio
 async def test_stream_to_file_writes_all_stream_data(tmp_path: Path) -> None:
     file_path = tmp_path / "capture.log"
@@ -1499,3 +1808,204 @@ def test_clear_cancel_request_fails_closed_ancestor_runtime_without_unlink(
     clear_cancel_request(run_dir)
     assert unlink_called is False
     assert cancel_path.exists()
+
+
+def test_ready_queue_pops_highest_priority_first_and_keeps_fifo_ties() -> None:
+    queue = ReadyQueue()
+    queue.push("a")
+    queue.push("b", 5)
+    queue.push("c")
+    queue.push("d", 5)
+    queue.push("e", -1)
+    assert len(queue) == 5
+    assert [queue.pop() for _ in range(5)] == ["b", "d", "a", "c", "e"]
+    assert not queue
+
+
+def test_ready_queue_pop_first_skips_inadmissible_ids_without_reordering() -> None:
+    queue = ReadyQueue()
+    queue.push("big", 5, shape=(("cpu", 8.0),))
+    queue.push("small")
+    queue.push("tiny")
+    assert queue.pop_first(lambda task_id: task_id != "big") == "small"
+    assert queue.pop_first(lambda task_id: False) is None
+    assert [queue.pop() for _ in range(len(queue))] == ["big", "tiny"]
+
+
+def test_ready_queue_pop_first_asks_only_the_head_of_each_shape() -> None:
+    queue = ReadyQueue()
+    for index in range(50_000):
+        queue.push(f"big{index}", 5, shape=(("cpu", 8.0),))
+    queue.push("small")
+    seen: list[str] = []
+
+    def _admissible(task_id: str) -> bool:
+        seen.append(task_id)
+        return not task_id.startswith("big")
+
+    assert queue.pop_first(_admissible) == "small"
+    assert seen == ["big0", "small"]
+    assert queue.pop_first(_admissible) is None
+    assert len(queue) == 50_000
+
+
+def test_ready_queue_pop_first_passes_over_closed_lanes() -> None:
+    queue = ReadyQueue()
+    queue.push("pooled-a", 5, lane="gpu")
+    queue.push("pooled-b", 5, lane="gpu")
+    queue.push("free")
+    seen: list[str] = []
+
+    def _admissible(task_id: str) -> bool:
+        seen.append(task_id)
+        return True
+
+    assert queue.pop_first(_admissible, lambda lane: lane != "gpu") == "free"
+    assert seen == ["free"]
+    assert queue.pop_first(_admissible, lambda lane: lane != "gpu") is None
+    assert len(queue) == 2
+    assert [queue.pop() for _ in range(len(queue))] == ["pooled-a", "pooled-b"]
+
+
+def test_checkpointer_defers_writes_in_proportion_to_their_cost() -> None:
+    now = [0.0]
+    writes: list[float] = []
+
+    def _write() -> None:
+        writes.append(now[0])
+        now[0] += 0.5
+
+    checkpoint = Checkpointer(_write, share=0.2, clock=lambda: now[0])
+    assert checkpoint.due_at() is None
+    assert checkpoint.maybe_flush() is False
+    checkpoint.mark()
+    assert checkpoint.maybe_flush() is True
+    assert writes == [0.0]
+    assert not checkpoint.dirty
+    # The write took 0.5s, so at a 20% share the next one waits another 2s.
+    checkpoint.mark()
+    assert checkpoint.due_at() == pytest.approx(2.5)
+    now[0] = 2.0
+    assert checkpoint.maybe_flush() is False
+    now[0] = 2.5
+    assert checkpoint.maybe_flush() is True
+    assert writes == [0.0, 2.5]
+    with pytest.raises(ValueError):
+        Checkpointer(_write, share=0)
+
+
+def test_parse_psi_and_loadavg_extract_short_window_values() -> None:
+    psi = (
+        "some avg10=21.62 avg60=69.27 avg300=64.13 total=426375844\n"
+        "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    )
+    assert parse_psi_some_avg10(psi) == 21.62
+    assert parse_psi_some_avg10("full avg10=3.00\n") is None
+    assert parse_psi_some_avg10("some avg10=nan\n") is None
+    assert parse_psi_some_avg10(None) is None
+    assert parse_loadavg_1m("2.20 1.94 1.20 3/78 13698\n") == 2.2
+    assert parse_loadavg_1m("") is None
+
+
+def test_adaptive_limit_ramps_with_headroom_and_halves_under_pressure() -> None:
+    calm = PressureSample(cpu_some_avg10=1.0, memory_some_avg10=0.0, loadavg_1m=1.0)
+    busy = PressureSample(cpu_some_avg10=25.0, memory_some_avg10=0.0, loadavg_1m=4.0)
+    memory_stall = PressureSample(cpu_some_avg10=1.0, memory_some_avg10=30.0, loadavg_1m=1.0)
+    limit = AdaptiveLimit(10, cpu_count=8)
+    assert limit.limit == 1
+    assert [limit.update(calm) for _ in range(6)] == [3, 5, 7, 9, 10, 10]
+    assert limit.update(busy) == 10
+    assert limit.update(memory_stall) == 5
+    assert limit.update(memory_stall) == 2
+    assert limit.update(memory_stall) == 1
+    assert limit.update(memory_stall) == 1
+    unknown = PressureSample(cpu_some_avg10=None, memory_some_avg10=None, loadavg_1m=None)
+    assert limit.update(unknown) == 3
+
+
+@pytest.mark.asyncio
+async def test_fair_share_budget_serves_run_holding_fewest_slots_first() -> None:
+    budget = FairShareBudget(2)
+    await budget.acquire("busy", {})
+    await budget.acquire("busy", {})
+    granted: list[str] = []
+
+    async def _wait(run_key: str) -> None:
+        await budget.acquire(run_key, {})
+        granted.append(run_key)
+
+    waiters = [asyncio.create_task(_wait(key)) for key in ("busy", "busy", "fresh")]
+    await asyncio.sleep(0)
+    budget.release("busy", {})
+    await asyncio.sleep(0)
+    assert granted == ["fresh"]
+    budget.release("busy", {})
+    await asyncio.sleep(0)
+    assert granted == ["fresh", "busy"]
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    assert budget.held == {"fresh": 1, "busy": 1}
+
+
+@pytest.mark.asyncio
+async def test_fair_share_budget_limits_resources_and_admits_oversized_alone() -> None:
+    budget = FairShareBudget(4, {"cpu": 4.0})
+    await budget.acquire("a", {"cpu": 3.0})
+    blocked = asyncio.create_task(budget.acquire("b", {"cpu": 2.0}))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    budget.release("a", {"cpu": 3.0})
+    await asyncio.wait_for(blocked, timeout=1)
+    budget.release("b", {"cpu": 2.0})
+    await asyncio.wait_for(budget.acquire("c", {"cpu": 16.0}), timeout=1)
+    assert budget.in_use["cpu"] == 16.0
+
+
+@pytest.mark.asyncio
+async def test_fair_share_budget_grants_multi_slot_demand_as_a_whole() -> None:
+    budget = FairShareBudget(3)
+    await budget.acquire("a", {})
+    chain = asyncio.create_task(budget.acquire("b", {}, slots=3))
+    await asyncio.sleep(0)
+    assert not chain.done()
+    budget.release("a", {})
+    await asyncio.wait_for(chain, timeout=1)
+    assert budget.held == {"b": 3}
+    budget.release("b", {}, slots=3)
+    assert budget.used_slots == 0
+
+
+@pytest.mark.asyncio
+async def test_serve_daemon_replies_with_any_error_from_handler_or_run(tmp_path: Path) -> None:
+    address = RemoteAddress(path=str(tmp_path / "orchd.sock"))
+    stop_event = asyncio.Event()
+    ready = asyncio.Event()
+
+    async def _broken_run() -> str:
+        raise StateError("state file not found")
+
+    async def _handle(
+        request: dict[str, object], budget: FairShareBudget
+    ) -> tuple[str, Path, Awaitable[str]]:
+        if request.get("plan_path") == "explode":
+            raise KeyError("plan_path")
+        return "run_1", tmp_path / "runs" / "run_1", _broken_run()
+
+    server = asyncio.create_task(
+        serve_daemon(
+            address, FairShareBudget(1), _handle, stop_event=stop_event, on_ready=ready.set
+        )
+    )
+    await asyncio.wait_for(ready.wait(), timeout=10)
+    try:
+        rejected = [message async for message in submit_run(address, {"plan_path": "explode"})]
+        failed = [message async for message in submit_run(address, {"plan_path": "plan.yaml"})]
+    finally:
+        stop_event.set()
+        await server
+    assert [message["type"] for message in rejected] == ["error"]
+    assert "KeyError" in rejected[0]["message"]
+    assert [message["type"] for message in failed] == ["accepted", "error"]
+    assert failed[0]["run_dir"] == str(tmp_path / "runs" / "run_1")
+    assert failed[1]["message"] == "state file not found"
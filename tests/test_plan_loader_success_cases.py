@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 
 from orch.config.loader import load_plan
@@ -21,6 +22,12 @@ tasks:
     retries: 2
     retry_backoff_sec: [0.1, 0.2]
     outputs: ["dist/**", "report.json"]
+    inputs: ["src/**/*.py", "pyproject.toml"]
+    hedge_after_sec: 45
+    kill_grace_sec: 10
+    kill_signals: ["SIGINT", "SIGTERM", "SIGKILL"]
+    cpu_max: 1.5
+    memory_max: "512M"
 """.strip(),
         encoding="utf-8",
     )
@@ -37,6 +44,12 @@ tasks:
     assert task.retries == 2
     assert task.retry_backoff_sec == [0.1, 0.2]
     assert task.outputs == ["dist/**", "report.json"]
+    assert task.inputs == ["src/**/*.py", "pyproject.toml"]
+    assert task.hedge_after_sec == 45.0
+    assert task.kill_grace_sec == 10.0
+    assert task.kill_signals == ["SIGINT", "SIGTERM", "SIGKILL"]
+    assert task.cpu_max == 1.5
+    assert task.memory_max == 512 * 1024 * 1024
 
 
 def test_load_plan_normalizes_quoted_string_cmd(tmp_path: Path) -> None:
@@ -52,3 +65,248 @@ tasks:
 
     plan = load_plan(plan_path)
     assert plan.tasks[0].cmd == ["python3", "-c", "print('hello world')"]
+
+
+def test_load_plan_parses_task_priority_with_zero_default(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+tasks:
+  - id: urgent
+    cmd: ["python3", "-c", "print('u')"]
+    priority: 5
+  - id: later
+    cmd: ["python3", "-c", "print('l')"]
+    priority: -1
+  - id: plain
+    cmd: ["python3", "-c", "print('p')"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    assert [task.priority for task in plan.tasks] == [5, -1, 0]
+
+
+def test_load_plan_parses_task_estimate_sec_as_float(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+tasks:
+  - id: estimated
+    cmd: ["python3", "-c", "print('e')"]
+    estimate_sec: 30
+  - id: plain
+    cmd: ["python3", "-c", "print('p')"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    assert [task.estimate_sec for task in plan.tasks] == [30.0, None]
+    assert isinstance(plan.tasks[0].estimate_sec, float)
+
+
+def test_load_plan_parses_task_resources_as_floats(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+tasks:
+  - id: build
+    cmd: ["python3", "-c", "print('b')"]
+    resources: {cpu: 8, mem_mb: 4096.5, licenses: 1}
+  - id: lint
+    cmd: ["python3", "-c", "print('l')"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    assert plan.tasks[0].resources == {"cpu": 8.0, "mem_mb": 4096.5, "licenses": 1.0}
+    assert plan.tasks[1].resources == {}
+
+
+def test_load_plan_parses_pools_and_task_pool(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+pools: {agent: 3, local: 12}
+tasks:
+  - id: review
+    cmd: ["python3", "-c", "print('r')"]
+    pool: agent
+  - id: build
+    cmd: ["python3", "-c", "print('b')"]
+    pool: local
+  - id: free
+    cmd: ["python3", "-c", "print('f')"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    assert plan.pools == {"agent": 3, "local": 12}
+    assert [task.pool for task in plan.tasks] == ["agent", "local", None]
+
+
+def test_load_plan_parses_call_task_with_display_cmd(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+tasks:
+  - id: helper
+    call: "tools.helpers:summarize"
+    args: ["report.json", 3]
+    kwargs: {verbose: true}
+  - id: bare
+    call: "tools.helpers:Runner.main"
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    helper, bare = plan.tasks
+    assert helper.call == "tools.helpers:summarize"
+    assert helper.args == ["report.json", 3]
+    assert helper.kwargs == {"verbose": True}
+    assert helper.cmd == [
+        "call",
+        "tools.helpers:summarize",
+        '{"args": ["report.json", 3], "kwargs": {"verbose": true}}',
+    ]
+    assert bare.cmd == ["call", "tools.helpers:Runner.main"]
+    assert (bare.args, bare.kwargs) == ([], {})
+
+
+def test_load_plan_parses_workers_and_task_worker(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+workers:
+  agent: {cmd: "python3 tools/fake_agent.py worker", count: 2}
+  lint: {cmd: ["lint-server"]}
+tasks:
+  - id: review
+    cmd: "fake_agent build --sleep 1"
+    worker: agent
+  - id: plain
+    cmd: ["python3", "-c", "print('p')"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    assert plan.workers["agent"].cmd == ["python3", "tools/fake_agent.py", "worker"]
+    assert plan.workers["agent"].count == 2
+    assert plan.workers["lint"].count == 1
+    assert plan.tasks[0].worker == "agent"
+    assert plan.tasks[0].cmd == ["fake_agent", "build", "--sleep", "1"]
+    assert plan.tasks[1].worker is None
+
+
+def test_load_plan_expands_matrix_with_templates_and_fan_in(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+tasks:
+  - id: "build-{mod}"
+    matrix:
+      mod: [core, cli]
+    cmd: "make {mod}"
+  - id: "test-{mod}-py{py}"
+    matrix:
+      mod: [core, cli]
+      py: [311, "3.12"]
+    cmd: ["pytest", "tests/{mod}", "-k", "{{literal}}"]
+    depends_on: ["build-{mod}"]
+    env: {PYVER: "{py}", FIXED: "x"}
+    outputs: ["reports/{mod}-{py}.xml"]
+    retries: 1
+  - id: report
+    cmd: "echo done"
+    depends_on: ["test-{mod}-py{py}", "build-core"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    plan = load_plan(plan_path)
+    ids = [task.id for task in plan.tasks]
+    assert ids == [
+        "build-core",
+        "build-cli",
+        "test-core-py311",
+        "test-core-py3.12",
+        "test-cli-py311",
+        "test-cli-py3.12",
+        "report",
+    ]
+    assert plan.tasks[0].cmd == ["make", "core"]
+    test_cli = plan.tasks[5]
+    assert test_cli.cmd == ["pytest", "tests/cli", "-k", "{literal}"]
+    assert test_cli.depends_on == ["build-cli"]
+    assert test_cli.env == {"PYVER": "3.12", "FIXED": "x"}
+    assert test_cli.outputs == ["reports/cli-3.12.xml"]
+    assert test_cli.retries == 1
+    assert plan.tasks[-1].depends_on == [*ids[2:6], "build-core"]
+
+
+def test_load_plan_expands_large_matrix(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    shards = ", ".join(str(i) for i in range(500))
+    plan_path.write_text(
+        f"""
+tasks:
+  - id: "shard-{{a}}-{{b}}"
+    matrix:
+      a: [{shards}]
+      b: [{", ".join(str(i) for i in range(100))}]
+    cmd: ["python3", "-c", "print('{{a}} {{b}}')"]
+    outputs: ["out/{{a}}/{{b}}.txt"]
+  - id: merge
+    cmd: "echo merge"
+    depends_on: ["shard-{{a}}-{{b}}"]
+""".strip(),
+        encoding="utf-8",
+    )
+
+    started = time.process_time()
+    plan = load_plan(plan_path)
+    # About 0.6s of CPU on a single slow vCPU; the bound leaves room for slower CI hosts.
+    assert time.process_time() - started < 2.5
+    assert len(plan.tasks) == 50_001
+    assert plan.tasks[-2].id == "shard-499-99"
+    assert plan.tasks[-2].outputs == ["out/499/99.txt"]
+    assert len(plan.tasks[-1].depends_on) == 50_000
+
+
+def test_load_plan_matrix_tasks_do_not_share_mutable_fields(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(
+        """
+tasks:
+  - id: "job-{n}"
+    matrix:
+      n: [1, 2, 3]
+    cmd: ["run", "fixed"]
+    retries: 1
+    retry_backoff_sec: [1]
+    resources: {cpu: 1}
+    kill_signals: [SIGINT]
+    env: {FIXED: "x"}
+""".strip(),
+        encoding="utf-8",
+    )
+
+    first, second, third = load_plan(plan_path).tasks
+    second.cmd.append("extra")
+    second.retry_backoff_sec.append(2.0)
+    second.resources["mem"] = 1.0
+    second.kill_signals.append("SIGKILL")
+    assert second.env is not None
+    second.env["FIXED"] = "y"
+    for task in (first, third):
+        assert task.cmd == ["run", "fixed"]
+        assert task.retry_backoff_sec == [1.0]
+        assert task.resources == {"cpu": 1.0}
+        assert task.kill_signals == ["SIGINT"]
+        assert task.env == {"FIXED": "x"}
@@ -4,7 +4,8 @@ from pathlib import Path
 
 import pytest
 
-from orch.config.loader import load_plan
+from orch.config.loader import load_emitted_tasks, load_plan, parse_emitted_tasks
+from orch.config.schema import PlanSpec, TaskSpec
 from orch.util.errors import PlanError
 
 
@@ -586,6 +587,137 @@ def test_load_plan_rejects_case_insensitive_duplicate_outputs(tmp_path: Path) ->
         load_plan(plan)
 
 
+@pytest.mark.parametrize(
+    ("inputs", "message"),
+    [
+        ('"src/**"', "inputs must be list"),
+        ('[""]', "inputs must not contain empty strings"),
+        ('["src/**", "SRC/**"]', "duplicate inputs"),
+    ],
+)
+def test_load_plan_rejects_invalid_inputs(tmp_path: Path, inputs: str, message: str) -> None:
+    plan = tmp_path / "plan_inputs.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: a
+            cmd: ["python3", "-c", "print('a')"]
+            inputs: {inputs}
+        """,
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("extra", "message"),
+    [
+        ('cmd: ["python3"]\n            hedge_after_sec: 0', "hedge_after_sec must be > 0"),
+        ('cmd: ["python3"]\n            hedge_after_sec: .inf', "hedge_after_sec must be > 0"),
+        ('call: "pkg.mod:fn"\n            hedge_after_sec: 5', "hedge_after_sec with call"),
+    ],
+)
+def test_load_plan_rejects_invalid_hedge_after_sec(
+    tmp_path: Path, extra: str, message: str
+) -> None:
+    plan = tmp_path / "plan_hedge.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: a
+            {extra}
+        """,
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("extra", "message"),
+    [
+        ('cmd: ["python3"]\n            kill_grace_sec: -1', "kill_grace_sec must be >= 0"),
+        ('cmd: ["python3"]\n            kill_signals: "SIGTERM"', "kill_signals must be list"),
+        ('cmd: ["python3"]\n            kill_signals: ["TERM"]', "kill_signals must be list"),
+        ('cmd: ["python3"]\n            kill_signals: ["SIG_IGN"]', "kill_signals must be list"),
+        ('call: "pkg.mod:fn"\n            kill_grace_sec: 5', "kill_signals with call"),
+    ],
+)
+def test_load_plan_rejects_invalid_kill_policy(tmp_path: Path, extra: str, message: str) -> None:
+    plan = tmp_path / "plan_kill.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: a
+            {extra}
+        """,
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("extra", "message"),
+    [
+        ('cmd: ["python3"]\n            cpu_max: 0', "cpu_max must be > 0"),
+        ('cmd: ["python3"]\n            cpu_max: true', "cpu_max must be > 0"),
+        ('cmd: ["python3"]\n            memory_max: 0', "memory_max must be bytes > 0"),
+        ('cmd: ["python3"]\n            memory_max: "1.5G"', "memory_max must be bytes > 0"),
+        ('cmd: ["python3"]\n            memory_max: "512X"', "memory_max must be bytes > 0"),
+        ('call: "pkg.mod:fn"\n            cpu_max: 1', "memory_max with call"),
+    ],
+)
+def test_load_plan_rejects_invalid_resource_limits(
+    tmp_path: Path, extra: str, message: str
+) -> None:
+    plan = tmp_path / "plan_limits.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: a
+            {extra}
+        """,
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("task", "message"),
+    [
+        (
+            'id: "a-{x}"\n            matrix: []\n            cmd: "true"',
+            "matrix must be non-empty",
+        ),
+        ('id: "a-{x}"\n            matrix: {x: []}\n            cmd: "true"', "matrix.x must be"),
+        ('id: "a-{x}"\n            matrix: {x: [true]}\n            cmd: "true"', "matrix.x must"),
+        ('id: "a-{x}"\n            matrix: {x: [1, "1"]}\n            cmd: "true"', "duplicate"),
+        ('id: "a"\n            matrix: {x: [1, 2]}\n            cmd: "true"', "every matrix key"),
+        ('id: "a-{x}"\n            matrix: {x: [1]}\n            cmd: "echo {y}"', "matrix keys"),
+        ('id: "a-{x}"\n            matrix: {x: [1]}\n            cmd: "echo {x!r}"', "matrix keys"),
+        (
+            'id: "a-{x}"\n            matrix: {x: [1, "b/c"]}\n            cmd: "true"',
+            "invalid task.id",
+        ),
+        ('id: "a-{x}"\n            matrix: {x: [1]}\n            call: "pkg.mod:fn"', "with call"),
+    ],
+)
+def test_load_plan_rejects_invalid_matrix(tmp_path: Path, task: str, message: str) -> None:
+    plan = tmp_path / "plan_matrix.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - {task}
+        """,
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
 def test_load_plan_rejects_empty_string_items_in_depends_on_and_outputs(tmp_path: Path) -> None:
     plan_dep = tmp_path / "plan_dep.yaml"
     _write(
@@ -638,3 +770,330 @@ def test_load_plan_rejects_empty_string_items_in_depends_on_and_outputs(tmp_path
     )
     with pytest.raises(PlanError):
         load_plan(plan_out_ws)
+
+
+@pytest.mark.parametrize("priority", ['"high"', "1.5", "true", "null"])
+def test_load_plan_rejects_non_int_priority(tmp_path: Path, priority: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: t1
+            cmd: ["python3", "-c", "print('x')"]
+            priority: {priority}
+        """,
+    )
+    with pytest.raises(PlanError, match="priority must be int"):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize("estimate", ['"long"', "-1", ".nan", ".inf", "true"])
+def test_load_plan_rejects_invalid_estimate_sec(tmp_path: Path, estimate: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: t1
+            cmd: ["python3", "-c", "print('x')"]
+            estimate_sec: {estimate}
+        """,
+    )
+    with pytest.raises(PlanError, match="estimate_sec must be >= 0"):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    "resources",
+    ["[1, 2]", "{cpu: -1}", "{cpu: .inf}", "{cpu: true}", '{"bad name": 1}', "{cpu: x}"],
+)
+def test_load_plan_rejects_invalid_resources(tmp_path: Path, resources: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+        tasks:
+          - id: t1
+            cmd: ["python3", "-c", "print('x')"]
+            resources: {resources}
+        """,
+    )
+    with pytest.raises(PlanError, match="resources must be dict"):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    "pools", ["[1]", "{agent: 0}", "{agent: 1.5}", "{agent: true}", '{"a b": 1}']
+)
+def test_load_plan_rejects_invalid_pools(tmp_path: Path, pools: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+pools: {pools}
+tasks:
+  - id: t1
+    cmd: ["python3", "-c", "print('x')"]
+""",
+    )
+    with pytest.raises(PlanError, match="plan.pools must be dict"):
+        load_plan(plan)
+
+
+def test_load_plan_rejects_task_with_unknown_pool(tmp_path: Path) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        """
+pools: {agent: 1}
+tasks:
+  - id: t1
+    cmd: ["python3", "-c", "print('x')"]
+    pool: local
+""",
+    )
+    with pytest.raises(PlanError, match="task 't1' uses unknown pool: local"):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize("pool", ["1", '""', '"bad pool"'])
+def test_load_plan_rejects_invalid_task_pool(tmp_path: Path, pool: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+pools: {{agent: 1}}
+tasks:
+  - id: t1
+    cmd: ["python3", "-c", "print('x')"]
+    pool: {pool}
+""",
+    )
+    with pytest.raises(PlanError, match="pool must match"):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        ('cmd: ["echo"]\n    call: "pkg.mod:func"', "only one of cmd or call"),
+        ('call: "pkg.mod"', "call must look like"),
+        ('call: "pkg-mod:func"', "call must look like"),
+        ("call: 1", "call must look like"),
+        ('call: "pkg.mod:func"\n    args: {a: 1}', "args must be list"),
+        ('call: "pkg.mod:func"\n    kwargs: [1]', "kwargs must be dict"),
+        ('call: "pkg.mod:func"\n    kwargs: {"not valid": 1}', "kwargs must be dict"),
+        ('cmd: ["echo"]\n    args: [1]', "args/kwargs require call"),
+    ],
+)
+def test_load_plan_rejects_invalid_call_task(tmp_path: Path, fields: str, message: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+tasks:
+  - id: t1
+    {fields}
+""",
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("workers", "message"),
+    [
+        ("[1]", "plan.workers must be dict"),
+        ('{"a b": {cmd: x}}', "plan.workers must be dict"),
+        ("{agent: x}", "worker 'agent' must be mapping with cmd"),
+        ("{agent: {count: 1}}", "worker 'agent' must be mapping with cmd"),
+        ("{agent: {cmd: x, count: 0}}", "worker 'agent' count must be int >= 1"),
+        ("{agent: {cmd: x, count: true}}", "worker 'agent' count must be int >= 1"),
+        ("{agent: {cmd: x, env: {}}}", "worker 'agent' has unknown fields"),
+    ],
+)
+def test_load_plan_rejects_invalid_workers(tmp_path: Path, workers: str, message: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+workers: {workers}
+tasks:
+  - id: t1
+    cmd: ["python3", "-c", "print('x')"]
+""",
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        ('cmd: ["fake_agent"]\n    worker: lint', "task 't1' uses unknown worker: lint"),
+        ('cmd: ["fake_agent"]\n    worker: "bad worker"', "worker must match"),
+        ('call: "pkg.mod:func"\n    worker: agent', "only one of call or worker"),
+    ],
+)
+def test_load_plan_rejects_invalid_task_worker(tmp_path: Path, fields: str, message: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        f"""
+workers: {{agent: {{cmd: agent-server}}}}
+tasks:
+  - id: t1
+    {fields}
+""",
+    )
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+def test_load_plan_rejects_invalid_emits(tmp_path: Path) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(plan, 'tasks:\n  - id: t1\n    cmd: ["true"]\n    emits: ""')
+    with pytest.raises(PlanError, match="task 't1' emits must be non-empty path string"):
+        load_plan(plan)
+    _write(plan, 'tasks:\n  - id: t-{n}\n    matrix: {n: [1, 2]}\n    cmd: ["true"]\n    emits: x')
+    with pytest.raises(PlanError, match="must not set matrix with emits"):
+        load_plan(plan)
+
+
+@pytest.mark.parametrize(
+    ("tasks", "message"),
+    [
+        ("- {id: c, cmd: cat, stdin_from: nope}", "task 'c' streams from unknown task: nope"),
+        ("- {id: c, cmd: cat, stdin_from: c}", "task 'c' must not stream from itself"),
+        ('- {id: c, cmd: cat, stdin_from: "bad id"}', "stdin_from must match"),
+        (
+            "- {id: p, cmd: seq 3}\n- {id: c, cmd: cat, stdin_from: p, retries: 1}",
+            "task 'c' must not set retries, hedge_after_sec or inputs with stdin_from",
+        ),
+        (
+            "- {id: p, cmd: seq 3, inputs: [a.txt]}\n- {id: c, cmd: cat, stdin_from: p}",
+            "task 'p' streams to 'c' so must not set retries",
+        ),
+        (
+            '- {id: p, call: "pkg.mod:func"}\n- {id: c, cmd: cat, stdin_from: p}',
+            "task 'p' streams to 'c' so must set cmd",
+        ),
+        (
+            '- {id: p, cmd: seq 3}\n- {id: c, call: "pkg.mod:func", stdin_from: p}',
+            "must not set stdin_from with call or worker",
+        ),
+        (
+            "- {id: p, cmd: seq 3}\n- {id: a, cmd: cat, stdin_from: p}\n"
+            "- {id: b, cmd: cat, stdin_from: p}",
+            "task 'p' must not stream to more than one task",
+        ),
+        (
+            "- {id: a, cmd: cat, stdin_from: b}\n- {id: b, cmd: cat, stdin_from: a}",
+            "stdin_from links form a cycle",
+        ),
+        (
+            "- {id: p, cmd: seq 3}\n- {id: c, cmd: cat, stdin_from: p, depends_on: [p]}",
+            "task 'c' must not depend on a task in its own stdin_from chain",
+        ),
+        (
+            # The pipeline would wait for "mid", which waits for the pipeline's producer.
+            "- {id: p, cmd: seq 3}\n- {id: mid, cmd: 'true', depends_on: [p]}\n"
+            "- {id: c, cmd: cat, stdin_from: p, depends_on: [mid]}",
+            "dependency cycle",
+        ),
+    ],
+)
+def test_load_plan_rejects_invalid_stdin_from(tmp_path: Path, tasks: str, message: str) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(plan, "tasks:\n" + "\n".join(f"  {line}" for line in tasks.splitlines()))
+    with pytest.raises(PlanError, match=message):
+        load_plan(plan)
+
+
+def test_load_plan_renders_stdin_from_per_matrix_combination(tmp_path: Path) -> None:
+    plan = tmp_path / "plan.yaml"
+    _write(
+        plan,
+        """
+tasks:
+  - {id: "extract-{shard}", matrix: {shard: [1, 2]}, cmd: "dump {shard}"}
+  - {id: "load-{shard}", matrix: {shard: [1, 2]}, cmd: cat, stdin_from: "extract-{shard}"}
+""",
+    )
+    tasks = load_plan(plan).tasks
+    assert [(task.id, task.stdin_from) for task in tasks] == [
+        ("extract-1", None),
+        ("extract-2", None),
+        ("load-1", "extract-1"),
+        ("load-2", "extract-2"),
+    ]
+
+
+def _live_plan() -> PlanSpec:
+    return PlanSpec(
+        goal=None,
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="inspect", cmd=["true"], emits="tasks.json"),
+            TaskSpec(id="lint", cmd=["true"]),
+        ],
+        pools={"gpu": 1},
+    )
+
+
+def test_parse_emitted_tasks_adds_emitter_dependency_and_expands_matrix() -> None:
+    tasks = parse_emitted_tasks(
+        [
+            {"id": "fix-{n}", "matrix": {"n": [1, 2]}, "cmd": "fix {n}", "pool": "gpu"},
+            {"id": "collect", "cmd": ["true"], "depends_on": ["fix-{n}", "lint"]},
+        ],
+        _live_plan(),
+        "inspect",
+    )
+    assert [(task.id, task.depends_on) for task in tasks] == [
+        ("fix-1", ["inspect"]),
+        ("fix-2", ["inspect"]),
+        ("collect", ["inspect", "fix-1", "fix-2", "lint"]),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("raw", "message"),
+    [
+        ({"id": "x", "cmd": "true"}, "tasks emitted by 'inspect' must be a list"),
+        ([{"id": "LINT", "cmd": "true"}], "must have new unique ids"),
+        ([{"id": "a", "cmd": "true"}, {"id": "a", "cmd": "true"}], "must have new unique ids"),
+        ([{"id": "a", "cmd": "true", "depends_on": ["nope"]}], "unknown dependencies"),
+        ([{"id": "a", "cmd": "true", "pool": "cpu"}], "uses unknown pool: cpu"),
+        ([{"id": "a", "cmd": "true", "bogus": 1}], "unknown fields"),
+        (
+            [
+                {"id": "a", "cmd": "true", "depends_on": ["b"]},
+                {"id": "b", "cmd": "true", "depends_on": ["a"]},
+            ],
+            "dependency cycle",
+        ),
+        (
+            [{"id": "a", "cmd": "cat", "stdin_from": "lint"}],
+            "task 'a' must stream from a task emitted with it",
+        ),
+    ],
+)
+def test_parse_emitted_tasks_rejects_invalid_batches(raw: object, message: str) -> None:
+    with pytest.raises(PlanError, match=message):
+        parse_emitted_tasks(raw, _live_plan(), "inspect")
+
+
+def test_load_emitted_tasks_reads_yaml_or_json_manifest(tmp_path: Path) -> None:
+    manifest = tmp_path / "tasks.json"
+    assert load_emitted_tasks(manifest, _live_plan(), "inspect") == ([], [])
+    manifest.write_text('{"tasks": [{"id": "fix", "cmd": "true"}]}', encoding="utf-8")
+    raw, tasks = load_emitted_tasks(manifest, _live_plan(), "inspect")
+    assert raw == [{"id": "fix", "cmd": "true"}]
+    assert [task.id for task in tasks] == ["fix"]
+    _write(manifest, "tasks: []")
+    assert load_emitted_tasks(manifest, _live_plan(), "inspect") == ([], [])
+    _write(manifest, "extra: 1")
+    with pytest.raises(PlanError, match="unknown fields"):
+        load_emitted_tasks(manifest, _live_plan(), "inspect")
@@ -4,7 +4,7 @@ from pathlib import Path
 
 from orch.report.render_md import render_markdown
 from orch.report.summarize import build_summary
-from orch.state.model import RunState, TaskState
+from orch.state.model import AttemptRusage, CacheStats, PoolStats, RunState, TaskState
 
 
 def _make_state() -> RunState:
@@ -130,3 +130,65 @@ def test_render_markdown_shows_empty_sections_for_success_run(tmp_path: Path) ->
     assert "status: **SUCCESS**" in markdown
     assert "No failed/skipped/canceled tasks." in markdown
     assert "\n- (none)\n" in markdown
+    assert "## Pools" not in markdown
+    assert "## Cache" not in markdown
+
+
+def test_render_markdown_includes_pool_metrics_when_pools_declared(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    (run_dir / "logs").mkdir(parents=True)
+    state = _make_success_state()
+    state.pools = {"agent": PoolStats(limit=3, peak_running=3, peak_queued=7)}
+    summary = build_summary(state, run_dir)
+
+    assert summary["pools"] == [{"name": "agent", "limit": 3, "peak_running": 3, "peak_queued": 7}]
+    markdown = render_markdown(summary)
+    assert "## Pools" in markdown
+    assert "| agent | 3 | 3 | 7 |" in markdown
+
+
+def test_render_markdown_includes_cache_counts(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    (run_dir / "logs").mkdir(parents=True)
+    state = _make_success_state()
+    state.cache = CacheStats(hits=1, misses=2)
+    next(iter(state.tasks.values())).cached = True
+    summary = build_summary(state, run_dir)
+
+    assert summary["cache"] == {"hits": 1, "misses": 2, "cached_tasks": ["ok"]}
+    markdown = render_markdown(summary)
+    assert "## Cache" in markdown
+    assert "- hits: 1" in markdown
+    assert "- misses: 2" in markdown
+    assert "- restored from cache: `ok`" in markdown
+
+
+def test_render_markdown_lists_up_to_date_tasks(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    (run_dir / "logs").mkdir(parents=True)
+    state = _make_success_state()
+    next(iter(state.tasks.values())).up_to_date = True
+    summary = build_summary(state, run_dir)
+
+    assert summary["up_to_date_tasks"] == ["ok"]
+    markdown = render_markdown(summary)
+    assert "## Up To Date\n\n- `ok`\n" in markdown
+
+
+def test_render_markdown_shows_last_attempt_rusage_in_task_results(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    (run_dir / "logs").mkdir(parents=True)
+    state = _make_success_state()
+    task = next(iter(state.tasks.values()))
+    task.rusage = [
+        AttemptRusage(1, 9.0, 9.0, 1024, 0, 0, 0, 0),
+        AttemptRusage(2, 1.25, 0.5, 64 * 1024 * 1024, 8, 16, 30, 4),
+    ]
+    summary = build_summary(state, run_dir)
+
+    markdown = render_markdown(summary)
+    assert "| user_sec | sys_sec | max_rss_mb | blk_in/out | ctxsw vol/invol |" in markdown
+    assert "| 1.25 | 0.50 | 64.0 | 8/16 | 30/4 |" in markdown
+
+    task.rusage = []
+    assert "| - | - | - | - | - |" in render_markdown(build_summary(state, run_dir))
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import sys
+import time
 from pathlib import Path
 
 import pytest
@@ -167,3 +170,124 @@ async def test_resume_failed_only_reruns_interrupted_ready_task(tmp_path: Path)
     assert resumed.status == "SUCCESS"
     assert resumed.tasks["flaky"].status == "SUCCESS"
     assert resumed.tasks["flaky"].attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_resume_restores_emitted_tasks_and_reruns_failed_ones(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_resume_emitted"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    gated = "from pathlib import Path; import sys; sys.exit(0 if Path('gate.ok').exists() else 1)"
+    emitted = [
+        {"id": "fix-ok", "cmd": [sys.executable, "-c", "print('ok')"]},
+        {"id": "fix-gated", "cmd": [sys.executable, "-c", gated]},
+    ]
+    write_manifest = (
+        "import json, pathlib; "
+        f"pathlib.Path('tasks.json').write_text(json.dumps({emitted!r}), encoding='utf-8')"
+    )
+    plan = PlanSpec(
+        goal="resume emitted",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="inspect", cmd=[sys.executable, "-c", write_manifest], emits="tasks.json")
+        ],
+    )
+
+    first = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert first.status == "FAILED"
+    assert first.tasks["fix-gated"].status == "FAILED"
+
+    (workdir / "gate.ok").write_text("ok", encoding="utf-8")
+    resumed = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=True,
+        failed_only=True,
+    )
+    assert resumed.status == "SUCCESS"
+    assert resumed.tasks["inspect"].attempts == 1
+    assert resumed.tasks["fix-ok"].attempts == 1
+    assert resumed.tasks["fix-gated"].attempts == 2
+    assert resumed.tasks["fix-gated"].status == "SUCCESS"
+    assert resumed.emitted_tasks == first.emitted_tasks
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_state_journal_after_interrupted_run(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_resume_journal"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    emitted = [{"id": "fix", "cmd": [sys.executable, "-c", "print('fix')"]}]
+    write_manifest = (
+        "import json, pathlib; "
+        f"pathlib.Path('tasks.json').write_text(json.dumps({emitted!r}), encoding='utf-8')"
+    )
+    hold = "import pathlib, time\nwhile not pathlib.Path('go').exists(): time.sleep(0.05)"
+    plan = PlanSpec(
+        goal="resume journal",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="inspect", cmd=[sys.executable, "-c", write_manifest], emits="tasks.json"),
+            TaskSpec(id="hold", cmd=[sys.executable, "-c", hold]),
+        ],
+    )
+
+    first = asyncio.create_task(
+        run_plan(
+            plan,
+            run_dir,
+            max_parallel=2,
+            fail_fast=False,
+            workdir=workdir,
+            resume=False,
+            failed_only=False,
+        )
+    )
+    deadline = time.monotonic() + 20
+    while True:
+        await asyncio.sleep(0.05)
+        state = load_state(run_dir)
+        if "fix" in state.tasks and state.tasks["fix"].status == "SUCCESS":
+            break
+        assert time.monotonic() < deadline, "run did not reach the emitted task"
+    # The transitions so far live in the journal; state.json still holds the initial snapshot.
+    snapshot = json.loads((run_dir / "state.json").read_text(encoding="utf-8"))
+    assert snapshot["tasks"]["inspect"]["status"] == "PENDING"
+    assert (run_dir / "state.journal").stat().st_size > 0
+    assert state.tasks["inspect"].status == "SUCCESS"
+    assert state.tasks["hold"].status == "RUNNING"
+    assert list(state.emitted_tasks) == ["inspect"]
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    (workdir / "go").write_text("ok", encoding="utf-8")
+    resumed = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=2,
+        fail_fast=False,
+        workdir=workdir,
+        resume=True,
+        failed_only=False,
+    )
+    assert resumed.status == "SUCCESS"
+    assert resumed.tasks["inspect"].attempts == 1
+    assert resumed.tasks["fix"].attempts == 1
+    assert resumed.tasks["hold"].attempts == 2
+    assert not (run_dir / "state.journal").exists()
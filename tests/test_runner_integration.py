@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
 import sys
 from pathlib import Path
+from typing import Any
 
 import pytest
 
-from orch.config.schema import PlanSpec, TaskSpec
+from orch.config.schema import PlanSpec, TaskSpec, WorkerSpec
+from orch.exec import cancel as cancel_module
+from orch.exec import remote as remote_module
 from orch.exec import runner as runner_module
+from orch.exec.budget import FairShareBudget
+from orch.exec.pressure import PressureSample
 from orch.exec.runner import run_plan
-from orch.state.store import load_state
+from orch.state.model import RunState
+from orch.state.store import load_state, save_state_atomic
 from orch.util.paths import ensure_run_layout
 
 
@@ -285,6 +294,7 @@ async def test_runner_clears_terminal_fields_before_retry_attempt(
         *,
         attempt: int,
         default_cwd: Path,
+        cancel_event: asyncio.Event | None = None,
     ) -> runner_module.TaskResult:
         nonlocal call_count
         assert task.id == "flaky"
@@ -419,7 +429,7 @@ async def test_runner_handles_subprocess_value_error_as_start_failure(
     async def _raise_value_error(*args: object, **kwargs: object) -> object:
         raise ValueError("illegal environment variable name")
 
-    monkeypatch.setattr(runner_module.asyncio, "create_subprocess_exec", _raise_value_error)
+    monkeypatch.setattr(runner_module, "spawn_reaped", _raise_value_error)
 
     plan = PlanSpec(
         goal="start value error",
@@ -464,7 +474,7 @@ async def test_runner_handles_subprocess_runtime_error_as_start_failure(
     async def _raise_runtime_error(*args: object, **kwargs: object) -> object:
         raise RuntimeError("simulated subprocess runtime failure")
 
-    monkeypatch.setattr(runner_module.asyncio, "create_subprocess_exec", _raise_runtime_error)
+    monkeypatch.setattr(runner_module, "spawn_reaped", _raise_runtime_error)
 
     plan = PlanSpec(
         goal="start runtime error",
@@ -1658,3 +1668,1916 @@ async def test_runner_rejects_non_positive_max_parallel(tmp_path: Path) -> None:
             resume=False,
             failed_only=False,
         )
+
+
+@pytest.mark.asyncio
+async def test_run_plan_uses_single_cancel_watcher_for_parallel_tasks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_single_cancel_watcher"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+
+    original_cancel_requested = cancel_module.cancel_requested
+    calls = 0
+
+    def counting_cancel_requested(path: Path) -> bool:
+        nonlocal calls
+        calls += 1
+        return original_cancel_requested(path)
+
+    monkeypatch.setattr(cancel_module, "cancel_requested", counting_cancel_requested)
+
+    sleep_cmd = [sys.executable, "-c", "import time; time.sleep(0.5)"]
+    plan = PlanSpec(
+        goal="single cancel watcher",
+        artifacts_dir=None,
+        tasks=[TaskSpec(id=f"t{idx}", cmd=sleep_cmd) for idx in range(8)],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=8,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.status == "SUCCESS"
+    # Per-task polling would stat cancel.request ~5 times per task (40+ total).
+    assert 0 < calls < 20
+
+
+@pytest.mark.asyncio
+async def test_run_task_stops_promptly_when_cancel_event_is_set(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_cancel_event"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+
+    cancel_event = asyncio.Event()
+    task = TaskSpec(id="long", cmd=[sys.executable, "-c", "import time; time.sleep(30)"])
+    pending = asyncio.create_task(
+        runner_module.run_task(
+            task, run_dir, attempt=1, default_cwd=workdir, cancel_event=cancel_event
+        )
+    )
+    await asyncio.sleep(0.2)
+    cancel_event.set()
+    result = await asyncio.wait_for(pending, timeout=5)
+    assert result.canceled is True
+    assert result.timed_out is False
+    assert result.exit_code not in (0, None)
+    assert not (run_dir / "cancel.request").exists()
+
+
+@pytest.mark.asyncio
+async def test_retry_backoff_does_not_stall_sibling_tasks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_retry_parked"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+
+    backoff = 2.0
+    fail_once_cmd = [
+        sys.executable,
+        "-c",
+        "import pathlib, sys; p = pathlib.Path('marker'); "
+        "sys.exit(0) if p.exists() else (p.write_text('x'), sys.exit(1))",
+    ]
+    siblings = [f"s{idx}" for idx in range(12)]
+    plan = PlanSpec(
+        goal="parked retry",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="flaky", cmd=fail_once_cmd, retries=1, retry_backoff_sec=[backoff]),
+            *[TaskSpec(id=sid, cmd=[sys.executable, "-c", "print('ok')"]) for sid in siblings],
+        ],
+    )
+
+    loop = asyncio.get_running_loop()
+    original_run_task = runner_module.run_task
+    finished_at: dict[str, float] = {}
+    flaky_attempt_started: dict[int, float] = {}
+    statuses_seen_while_parked: list[str] = []
+
+    async def recording_run_task(
+        task: TaskSpec,
+        run_dir_for_task: Path,
+        *,
+        attempt: int,
+        default_cwd: Path,
+        cancel_event: asyncio.Event | None = None,
+    ) -> runner_module.TaskResult:
+        if task.id == "flaky":
+            flaky_attempt_started[attempt] = loop.time()
+        elif 1 in flaky_attempt_started and 2 not in flaky_attempt_started:
+            statuses_seen_while_parked.append(load_state(run_dir_for_task).tasks["flaky"].status)
+        result = await original_run_task(
+            task,
+            run_dir_for_task,
+            attempt=attempt,
+            default_cwd=default_cwd,
+            cancel_event=cancel_event,
+        )
+        finished_at.setdefault(task.id, loop.time())
+        return result
+
+    monkeypatch.setattr(runner_module, "run_task", recording_run_task)
+
+    start = loop.time()
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=2,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.status == "SUCCESS"
+    assert state.tasks["flaky"].attempts == 2
+    last_sibling = max(finished_at[sid] for sid in siblings)
+    # Siblings keep flowing through the free slot while the retry waits out its backoff.
+    assert last_sibling < flaky_attempt_started[2]
+    assert last_sibling - start < backoff
+    assert flaky_attempt_started[2] - flaky_attempt_started[1] >= backoff
+    assert "READY" in statuses_seen_while_parked
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_finalizes_parked_retry_with_last_attempt_outcome(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_retry_parked_fail_fast"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+
+    plan = PlanSpec(
+        goal="fail fast while retry parked",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="retrying",
+                cmd=[sys.executable, "-c", "import sys; sys.exit(3)"],
+                retries=1,
+                retry_backoff_sec=[5.0],
+            ),
+            TaskSpec(
+                id="fatal",
+                cmd=[sys.executable, "-c", "import sys, time; time.sleep(0.3); sys.exit(1)"],
+            ),
+        ],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=2,
+        fail_fast=True,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.status == "FAILED"
+    assert state.tasks["retrying"].status == "FAILED"
+    assert state.tasks["retrying"].attempts == 1
+    assert state.tasks["retrying"].exit_code == 3
+    assert state.tasks["retrying"].skip_reason == "fail_fast"
+    assert load_state(run_dir).tasks["retrying"].status == "FAILED"
+
+
+@pytest.mark.asyncio
+async def test_runner_starts_ready_tasks_by_priority(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_priority_order"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+
+    def _append_cmd(label: str) -> list[str]:
+        return [
+            sys.executable,
+            "-c",
+            f"open('order.txt', 'a', encoding='utf-8').write('{label}\\n')",
+        ]
+
+    plan = PlanSpec(
+        goal="priority order",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="low", cmd=_append_cmd("low"), priority=-1),
+            TaskSpec(id="first_default", cmd=_append_cmd("first_default")),
+            TaskSpec(id="urgent", cmd=_append_cmd("urgent"), priority=10),
+            TaskSpec(id="second_default", cmd=_append_cmd("second_default")),
+        ],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.status == "SUCCESS"
+    order = (workdir / "order.txt").read_text(encoding="utf-8").split()
+    assert order == ["urgent", "first_default", "second_default", "low"]
+
+
+@pytest.mark.asyncio
+async def test_runner_critical_path_starts_longest_chain_first(tmp_path: Path) -> None:
+    runs_root = tmp_path / ".orch" / "runs"
+    run_dir = runs_root / "run_critical_path"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+
+    def _append_cmd(label: str) -> list[str]:
+        return [
+            sys.executable,
+            "-c",
+            f"open('order.txt', 'a', encoding='utf-8').write('{label}\\n')",
+        ]
+
+    plan = PlanSpec(
+        goal="critical path",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="short", cmd=_append_cmd("short")),
+            TaskSpec(id="estimated", cmd=_append_cmd("estimated"), estimate_sec=3.0),
+            TaskSpec(id="chain_head", cmd=_append_cmd("chain_head")),
+            TaskSpec(id="chain_tail", cmd=_append_cmd("chain_tail"), depends_on=["chain_head"]),
+        ],
+    )
+    history_dir = runs_root / "run_previous"
+    ensure_run_layout(history_dir)
+    previous = await run_plan(
+        PlanSpec(
+            goal="history",
+            artifacts_dir=None,
+            tasks=[task for task in plan.tasks if task.id != "estimated"],
+        ),
+        history_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert previous.status == "SUCCESS"
+    previous.tasks["short"].duration_sec = 0.5
+    previous.tasks["chain_head"].duration_sec = 0.1
+    previous.tasks["chain_tail"].duration_sec = 10.0
+    save_state_atomic(history_dir, previous)
+    (workdir / "order.txt").unlink()
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        schedule="critical-path",
+    )
+    assert state.status == "SUCCESS"
+    order = (workdir / "order.txt").read_text(encoding="utf-8").split()
+    assert order == ["chain_head", "chain_tail", "estimated", "short"]
+
+
+@pytest.mark.asyncio
+async def test_run_plan_rejects_unknown_schedule(tmp_path: Path) -> None:
+    plan = PlanSpec(goal=None, artifacts_dir=None, tasks=[TaskSpec(id="t1", cmd=["echo"])])
+    with pytest.raises(ValueError, match="schedule must be one of"):
+        await run_plan(
+            plan,
+            tmp_path / "run",
+            max_parallel=1,
+            fail_fast=False,
+            workdir=tmp_path,
+            resume=False,
+            failed_only=False,
+            schedule="fifo",
+        )
+
+
+@pytest.mark.asyncio
+async def test_runner_capacity_backfills_small_tasks_without_overcommitting(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_capacity"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    started: list[str] = []
+    cpu_in_use = 0.0
+    peak_cpu = 0.0
+
+    async def _fake_run_task(
+        task: TaskSpec,
+        run_dir_for_task: Path,
+        *,
+        attempt: int,
+        default_cwd: Path,
+        cancel_event: asyncio.Event | None = None,
+    ) -> runner_module.TaskResult:
+        nonlocal cpu_in_use, peak_cpu
+        started.append(task.id)
+        cpu_in_use += task.resources.get("cpu", 0.0)
+        peak_cpu = max(peak_cpu, cpu_in_use)
+        await asyncio.sleep(0.2 if task.id.startswith("big") else 0.05)
+        cpu_in_use -= task.resources.get("cpu", 0.0)
+        return runner_module.TaskResult(
+            exit_code=0,
+            timed_out=False,
+            canceled=False,
+            start_failed=False,
+            started_at="2026-01-01T00:00:00+00:00",
+            ended_at="2026-01-01T00:00:01+00:00",
+            duration_sec=1.0,
+        )
+
+    monkeypatch.setattr(runner_module, "run_task", _fake_run_task)
+    plan = PlanSpec(
+        goal="capacity",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="big_a", cmd=["true"], resources={"cpu": 8.0, "mem_mb": 1000.0}),
+            TaskSpec(id="big_b", cmd=["true"], resources={"cpu": 8.0}),
+            TaskSpec(id="small", cmd=["true"], resources={"cpu": 2.0, "gpu": 1.0}),
+            TaskSpec(id="oversized", cmd=["true"], resources={"cpu": 32.0}),
+        ],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=4,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        capacity={"cpu": 10.0},
+    )
+    assert state.status == "SUCCESS"
+    assert started == ["big_a", "small", "big_b", "oversized"]
+    assert peak_cpu == 32.0
+
+
+@pytest.mark.asyncio
+async def test_run_plan_rejects_non_positive_capacity(tmp_path: Path) -> None:
+    plan = PlanSpec(goal=None, artifacts_dir=None, tasks=[TaskSpec(id="t1", cmd=["echo"])])
+    with pytest.raises(ValueError, match="capacity cpu must be > 0"):
+        await run_plan(
+            plan,
+            tmp_path / "run",
+            max_parallel=1,
+            fail_fast=False,
+            workdir=tmp_path,
+            resume=False,
+            failed_only=False,
+            capacity={"cpu": 0.0},
+        )
+
+
+@pytest.mark.asyncio
+async def test_runner_limits_each_pool_and_records_queue_depth(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_pools"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    in_flight: dict[str, int] = {"agent": 0, "local": 0, "none": 0}
+    peak: dict[str, int] = {"agent": 0, "local": 0, "none": 0}
+
+    async def _fake_run_task(
+        task: TaskSpec,
+        run_dir_for_task: Path,
+        *,
+        attempt: int,
+        default_cwd: Path,
+        cancel_event: asyncio.Event | None = None,
+    ) -> runner_module.TaskResult:
+        pool = task.pool or "none"
+        in_flight[pool] += 1
+        peak[pool] = max(peak[pool], in_flight[pool])
+        await asyncio.sleep(0.05)
+        in_flight[pool] -= 1
+        return runner_module.TaskResult(
+            exit_code=0,
+            timed_out=False,
+            canceled=False,
+            start_failed=False,
+            started_at="2026-01-01T00:00:00+00:00",
+            ended_at="2026-01-01T00:00:01+00:00",
+            duration_sec=1.0,
+        )
+
+    monkeypatch.setattr(runner_module, "run_task", _fake_run_task)
+    plan = PlanSpec(
+        goal="pools",
+        artifacts_dir=None,
+        tasks=[
+            *(TaskSpec(id=f"agent_{idx}", cmd=["true"], pool="agent") for idx in range(3)),
+            *(TaskSpec(id=f"local_{idx}", cmd=["true"], pool="local") for idx in range(5)),
+            *(TaskSpec(id=f"free_{idx}", cmd=["true"]) for idx in range(2)),
+        ],
+        pools={"agent": 1, "local": 2},
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=4,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.status == "SUCCESS"
+    assert peak["agent"] == 1
+    assert peak["local"] == 2
+    assert peak["none"] == 1
+    assert state.pools["agent"].limit == 1
+    assert state.pools["agent"].peak_running == 1
+    assert state.pools["agent"].peak_queued == 3
+    assert state.pools["local"].peak_running == 2
+    assert state.pools["local"].peak_queued == 5
+
+
+@pytest.mark.asyncio
+async def test_runner_adaptive_parallelism_follows_pressure_samples(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_adaptive"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    calm = PressureSample(cpu_some_avg10=0.0, memory_some_avg10=0.0, loadavg_1m=0.5)
+    stalled = PressureSample(cpu_some_avg10=90.0, memory_some_avg10=0.0, loadavg_1m=0.5)
+    samples = iter([calm])
+    in_flight = 0
+    peak = 0
+
+    async def _fake_run_task(
+        task: TaskSpec,
+        run_dir_for_task: Path,
+        *,
+        attempt: int,
+        default_cwd: Path,
+        cancel_event: asyncio.Event | None = None,
+    ) -> runner_module.TaskResult:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return runner_module.TaskResult(
+            exit_code=0,
+            timed_out=False,
+            canceled=False,
+            start_failed=False,
+            started_at="2026-01-01T00:00:00+00:00",
+            ended_at="2026-01-01T00:00:01+00:00",
+            duration_sec=1.0,
+        )
+
+    monkeypatch.setattr(runner_module, "run_task", _fake_run_task)
+    monkeypatch.setattr(runner_module, "read_pressure_sample", lambda: next(samples, stalled))
+    monkeypatch.setattr(runner_module, "PRESSURE_SAMPLE_INTERVAL_SEC", 0.01)
+    monkeypatch.setattr(runner_module.os, "cpu_count", lambda: 4)
+    plan = PlanSpec(
+        goal="adaptive",
+        artifacts_dir=None,
+        tasks=[TaskSpec(id=f"t{idx}", cmd=["true"]) for idx in range(6)],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=8,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        adaptive_parallel=True,
+    )
+    assert state.status == "SUCCESS"
+    assert state.max_parallel == 8
+    assert peak == 2
+    limits = [sample.limit for sample in state.parallel_samples]
+    assert limits[0] == 2
+    assert limits[-1] == 1
+    assert state.parallel_samples[0].loadavg_1m == 0.5
+    assert state.parallel_samples[-1].cpu_some_avg10 == 90.0
+
+
+def _write_call_module(workdir: Path) -> None:
+    (workdir / "orch_call_helpers.py").write_text(
+        """
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+def greet(name, *, punctuation="!"):
+    print(f"hello {name}{punctuation}")
+    os.write(2, b"native stderr\\n")
+    print(os.environ.get("CALL_ENV", "unset"), file=sys.stderr)
+    return 0
+
+
+def fail_with(code):
+    return code
+
+
+def explode():
+    raise RuntimeError("boom from call")
+
+
+def exit_with(code):
+    sys.exit(code)
+
+
+def sleep_then_touch(seconds, name):
+    time.sleep(seconds)
+    Path(name).write_text("done", encoding="utf-8")
+
+
+def record_pid_then_sleep(name, seconds):
+    with open(name, "a", encoding="utf-8") as handle:
+        handle.write(f"{os.getpid()}\\n")
+    time.sleep(seconds)
+
+
+def return_value(kind):
+    return {"mapping": {"ok": True}, "false": False, "text": "done"}[kind]
+""".lstrip(),
+        encoding="utf-8",
+    )
+
+
+@pytest.mark.asyncio
+async def test_runner_call_tasks_capture_logs_and_map_exit_codes(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_call"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    _write_call_module(workdir)
+    plan = PlanSpec(
+        goal="call tasks",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="greet",
+                cmd=["call", "orch_call_helpers:greet"],
+                call="orch_call_helpers:greet",
+                args=["orch"],
+                kwargs={"punctuation": "?"},
+                env={"CALL_ENV": "from-plan"},
+            ),
+            TaskSpec(
+                id="flaky",
+                cmd=["call", "orch_call_helpers:fail_with"],
+                call="orch_call_helpers:fail_with",
+                args=[3],
+                retries=1,
+            ),
+            TaskSpec(
+                id="explode",
+                cmd=["call", "orch_call_helpers:explode"],
+                call="orch_call_helpers:explode",
+            ),
+            TaskSpec(
+                id="exits",
+                cmd=["call", "orch_call_helpers:exit_with"],
+                call="orch_call_helpers:exit_with",
+                args=[0],
+            ),
+            TaskSpec(
+                id="mapping",
+                cmd=["call", "orch_call_helpers:return_value"],
+                call="orch_call_helpers:return_value",
+                args=["mapping"],
+            ),
+            TaskSpec(
+                id="text",
+                cmd=["call", "orch_call_helpers:return_value"],
+                call="orch_call_helpers:return_value",
+                args=["text"],
+            ),
+            TaskSpec(
+                id="false",
+                cmd=["call", "orch_call_helpers:return_value"],
+                call="orch_call_helpers:return_value",
+                args=["false"],
+            ),
+            TaskSpec(
+                id="missing",
+                cmd=["call", "orch_call_helpers:nope"],
+                call="orch_call_helpers:nope",
+                retries=2,
+            ),
+        ],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=2,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.tasks["greet"].status == "SUCCESS"
+    assert "hello orch?" in (run_dir / "logs" / "greet.out.log").read_text(encoding="utf-8")
+    greet_err = (run_dir / "logs" / "greet.err.log").read_text(encoding="utf-8")
+    assert "native stderr" in greet_err
+    assert "from-plan" in greet_err
+    assert "CALL_ENV" not in os.environ
+    assert state.tasks["flaky"].status == "FAILED"
+    assert state.tasks["flaky"].attempts == 2
+    assert state.tasks["flaky"].exit_code == 3
+    assert state.tasks["explode"].exit_code == 1
+    assert "boom from call" in (run_dir / "logs" / "explode.err.log").read_text(encoding="utf-8")
+    assert state.tasks["exits"].status == "SUCCESS"
+    assert state.tasks["mapping"].status == "SUCCESS"
+    assert state.tasks["text"].status == "SUCCESS"
+    assert state.tasks["false"].exit_code == 1
+    assert state.tasks["missing"].status == "FAILED"
+    assert state.tasks["missing"].attempts == 1
+    assert state.tasks["missing"].exit_code == 127
+    assert state.tasks["missing"].skip_reason == "process_start_failed"
+
+
+@pytest.mark.asyncio
+async def test_runner_call_timeout_kills_worker_without_failing_sibling_call(
+    tmp_path: Path,
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_call_timeout"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    _write_call_module(workdir)
+    plan = PlanSpec(
+        goal="call timeout",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="hang",
+                cmd=["call", "orch_call_helpers:sleep_then_touch"],
+                call="orch_call_helpers:sleep_then_touch",
+                args=[30, "hang.txt"],
+                timeout_sec=1.0,
+            ),
+            TaskSpec(
+                id="sibling",
+                cmd=["call", "orch_call_helpers:sleep_then_touch"],
+                call="orch_call_helpers:sleep_then_touch",
+                args=[1.5, "sibling.txt"],
+            ),
+        ],
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=2,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.tasks["hang"].status == "FAILED"
+    assert state.tasks["hang"].timed_out is True
+    assert not (workdir / "hang.txt").exists()
+    assert state.tasks["sibling"].status == "SUCCESS"
+    assert (workdir / "sibling.txt").read_text(encoding="utf-8") == "done"
+
+
+@pytest.mark.asyncio
+async def test_run_call_task_stops_when_cancel_event_is_set(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_call_cancel"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    _write_call_module(workdir)
+    task = TaskSpec(
+        id="hang",
+        cmd=["call", "orch_call_helpers:sleep_then_touch"],
+        call="orch_call_helpers:sleep_then_touch",
+        args=[30, "hang.txt"],
+    )
+    cancel_event = asyncio.Event()
+    pool = runner_module.CallPool(1)
+    try:
+        asyncio.get_running_loop().call_later(0.5, cancel_event.set)
+        result = await runner_module.run_call_task(
+            task,
+            run_dir,
+            attempt=1,
+            default_cwd=workdir,
+            pool=pool,
+            cancel_event=cancel_event,
+        )
+    finally:
+        pool.shutdown()
+    assert result.canceled is True
+    assert result.exit_code not in (0, None)
+    assert result.duration_sec < 10
+
+
+@pytest.mark.asyncio
+async def test_call_pool_timeout_kills_only_its_worker_and_reuses_the_others(
+    tmp_path: Path,
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_call_pool"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    _write_call_module(workdir)
+    hang = TaskSpec(
+        id="hang",
+        cmd=["call", "orch_call_helpers:sleep_then_touch"],
+        call="orch_call_helpers:sleep_then_touch",
+        args=[30, "hang.txt"],
+        timeout_sec=0.5,
+    )
+    sibling = TaskSpec(
+        id="sibling",
+        cmd=["call", "orch_call_helpers:record_pid_then_sleep"],
+        call="orch_call_helpers:record_pid_then_sleep",
+        args=["sibling.pids", 2.0],
+    )
+    pool = runner_module.CallPool(2)
+    try:
+        first_hang, first_sibling = await asyncio.gather(
+            runner_module.run_call_task(hang, run_dir, attempt=1, default_cwd=workdir, pool=pool),
+            runner_module.run_call_task(
+                sibling, run_dir, attempt=1, default_cwd=workdir, pool=pool
+            ),
+        )
+        second_sibling = await runner_module.run_call_task(
+            sibling, run_dir, attempt=1, default_cwd=workdir, pool=pool
+        )
+    finally:
+        pool.shutdown()
+    assert first_hang.timed_out is True
+    assert first_sibling.exit_code == 0
+    assert second_sibling.exit_code == 0
+    pids = (workdir / "sibling.pids").read_text(encoding="utf-8").split()
+    # The sibling ran once per request (never resubmitted) and its warm worker was reused.
+    assert len(pids) == 2
+    assert pids[0] == pids[1]
+
+
+_FAKE_AGENT = Path(__file__).resolve().parents[1] / "tools" / "fake_agent.py"
+
+
+@pytest.mark.asyncio
+async def test_runner_worker_tasks_reuse_warm_worker_and_replace_crashed_one(
+    tmp_path: Path,
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_worker"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    agent = ["fake_agent", "build"]
+    plan = PlanSpec(
+        goal="warm workers",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="first", cmd=[*agent, "--produce", "first.json"], worker="agent"),
+            TaskSpec(id="second", cmd=[*agent, "--fail-always"], worker="agent"),
+            TaskSpec(id="crash", cmd=[*agent, "--crash"], worker="agent"),
+            TaskSpec(id="after", cmd=[*agent, "--produce", "after.json"], worker="agent"),
+        ],
+        workers={"agent": WorkerSpec(cmd=[sys.executable, str(_FAKE_AGENT), "worker"], count=1)},
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    first = json.loads((workdir / "first.json").read_text(encoding="utf-8"))
+    after = json.loads((workdir / "after.json").read_text(encoding="utf-8"))
+    assert state.tasks["first"].status == "SUCCESS"
+    assert '"subcommand": "build"' in (run_dir / "logs" / "first.out.log").read_text(
+        encoding="utf-8"
+    )
+    assert state.tasks["second"].exit_code == 1
+    assert "forced failure" in (run_dir / "logs" / "second.err.log").read_text(encoding="utf-8")
+    assert state.tasks["crash"].status == "FAILED"
+    assert state.tasks["crash"].exit_code == 70
+    assert "worker 'agent' failed" in (run_dir / "logs" / "crash.err.log").read_text(
+        encoding="utf-8"
+    )
+    assert state.tasks["after"].status == "SUCCESS"
+    assert first["pid"] != after["pid"]
+    assert sorted(path.name for path in (run_dir / "logs").glob("worker.*")) == [
+        "worker.agent.1.err.log",
+        "worker.agent.2.err.log",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_runner_worker_timeout_recycles_worker(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_worker_timeout"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="worker timeout",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="hang",
+                cmd=["fake_agent", "test", "--sleep", "30"],
+                worker="agent",
+                timeout_sec=0.5,
+            ),
+            TaskSpec(
+                id="next",
+                cmd=["fake_agent", "test"],
+                worker="agent",
+                depends_on=["hang"],
+            ),
+        ],
+        workers={"agent": WorkerSpec(cmd=[sys.executable, str(_FAKE_AGENT), "worker"])},
+    )
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert state.tasks["hang"].status == "FAILED"
+    assert state.tasks["hang"].timed_out is True
+    assert state.tasks["next"].status == "SKIPPED"
+
+
+@pytest.mark.asyncio
+async def test_runner_listen_dispatches_cmd_tasks_to_connected_workers(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_remote"
+    workdir = tmp_path / "wd"
+    (workdir / "sub").mkdir(parents=True)
+    remote_root = tmp_path / "remote"
+    (remote_root / "sub").mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    address = f"unix:{tmp_path / 'coord.sock'}"
+    plan = PlanSpec(
+        goal="remote",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="hello",
+                cmd=[
+                    sys.executable,
+                    "-c",
+                    "import os, sys; print('out', os.environ['REMOTE_ENV']);"
+                    " print('where', os.getcwd(), file=sys.stderr)",
+                ],
+                cwd="sub",
+                env={"REMOTE_ENV": "from-plan"},
+            ),
+            TaskSpec(
+                id="flaky",
+                cmd=[sys.executable, "-c", "import sys; sys.exit(4)"],
+                retries=1,
+            ),
+            TaskSpec(
+                id="slow",
+                cmd=[sys.executable, "-c", "import time; time.sleep(30)"],
+                timeout_sec=0.5,
+            ),
+            TaskSpec(id="missing", cmd=["orch-no-such-binary-for-test"]),
+        ],
+    )
+    workers = [
+        asyncio.create_task(
+            remote_module.serve_remote_worker(
+                remote_module.parse_address(address),
+                slots=1,
+                workdir=remote_root,
+                name=f"w{index}",
+            )
+        )
+        for index in range(2)
+    ]
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=4,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        listen=address,
+    )
+    await asyncio.wait_for(asyncio.gather(*workers), timeout=5)
+
+    assert state.tasks["hello"].status == "SUCCESS"
+    assert "out from-plan" in (run_dir / "logs" / "hello.out.log").read_text(encoding="utf-8")
+    hello_err = (run_dir / "logs" / "hello.err.log").read_text(encoding="utf-8")
+    assert f"where {remote_root / 'sub'}" in hello_err
+    assert state.tasks["flaky"].attempts == 2
+    assert state.tasks["flaky"].exit_code == 4
+    assert state.tasks["slow"].timed_out is True
+    assert state.tasks["slow"].exit_code is None
+    assert state.tasks["missing"].exit_code == 127
+    assert state.tasks["missing"].skip_reason == "process_start_failed"
+    assert not (tmp_path / "coord.sock").exists()
+
+
+@pytest.mark.asyncio
+async def test_runner_listen_times_out_task_when_no_worker_connects(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_remote_none"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="no workers",
+        artifacts_dir=None,
+        tasks=[TaskSpec(id="lonely", cmd=["true"], timeout_sec=0.3)],
+    )
+    state = await asyncio.wait_for(
+        run_plan(
+            plan,
+            run_dir,
+            max_parallel=1,
+            fail_fast=False,
+            workdir=workdir,
+            resume=False,
+            failed_only=False,
+            listen=f"unix:{tmp_path / 'coord.sock'}",
+        ),
+        timeout=10,
+    )
+    assert state.tasks["lonely"].status == "FAILED"
+    assert state.tasks["lonely"].timed_out is True
+    assert "no remote worker slot" in (run_dir / "logs" / "lonely.err.log").read_text(
+        encoding="utf-8"
+    )
+
+
+@pytest.mark.asyncio
+async def test_runner_listen_fails_tasks_of_disconnected_worker(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_remote_lost"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    address = f"unix:{tmp_path / 'coord.sock'}"
+    plan = PlanSpec(
+        goal="remote lost",
+        artifacts_dir=None,
+        tasks=[TaskSpec(id="hang", cmd=[sys.executable, "-c", "import time; time.sleep(30)"])],
+    )
+
+    async def _connect_then_vanish() -> None:
+        for _ in range(50):
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(tmp_path / "coord.sock"))
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+        writer.write(b'{"type": "hello", "slots": 1}\n')
+        assert b'"type": "run"' in await reader.readline()
+        writer.close()
+
+    vanish = asyncio.create_task(_connect_then_vanish())
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        listen=address,
+    )
+    await vanish
+    assert state.tasks["hang"].status == "FAILED"
+    assert state.tasks["hang"].exit_code == 70
+    assert "disconnected" in (run_dir / "logs" / "hang.err.log").read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_runner_shared_budget_bounds_concurrency_across_runs(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    budget = FairShareBudget(2)
+    running: dict[str, int] = {}
+    peak_total = 0
+    started_by_run: list[str] = []
+
+    async def _fake_run_task(
+        task: TaskSpec,
+        run_dir_for_task: Path,
+        *,
+        attempt: int,
+        default_cwd: Path,
+        cancel_event: asyncio.Event | None = None,
+    ) -> runner_module.TaskResult:
+        nonlocal peak_total
+        key = run_dir_for_task.name
+        started_by_run.append(key)
+        running[key] = running.get(key, 0) + 1
+        peak_total = max(peak_total, sum(running.values()))
+        await asyncio.sleep(0.05)
+        running[key] -= 1
+        now = runner_module.now_iso()
+        return runner_module.TaskResult(
+            exit_code=0,
+            timed_out=False,
+            canceled=False,
+            start_failed=False,
+            started_at=now,
+            ended_at=now,
+            duration_sec=0.05,
+        )
+
+    monkeypatch.setattr(runner_module, "run_task", _fake_run_task)
+
+    async def _run(name: str, count: int) -> RunState:
+        run_dir = tmp_path / ".orch" / "runs" / name
+        ensure_run_layout(run_dir)
+        plan = PlanSpec(
+            goal=name,
+            artifacts_dir=None,
+            tasks=[TaskSpec(id=f"t{i}", cmd=["true"]) for i in range(count)],
+        )
+        return await run_plan(
+            plan,
+            run_dir,
+            max_parallel=4,
+            fail_fast=False,
+            workdir=workdir,
+            resume=False,
+            failed_only=False,
+            budget=budget,
+        )
+
+    big = asyncio.create_task(_run("big", 12))
+    await asyncio.sleep(0.02)
+    small = asyncio.create_task(_run("small", 2))
+    states = await asyncio.gather(big, small)
+    assert [state.status for state in states] == ["SUCCESS", "SUCCESS"]
+    assert peak_total == 2
+    # The late run is served as soon as a slot frees instead of after the big run drains.
+    assert started_by_run.index("small") < 4
+    assert budget.held == {}
+
+
+@pytest.mark.asyncio
+async def test_runner_cache_restores_outputs_and_logs_without_spawning(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    (workdir / "in.txt").write_text("v1", encoding="utf-8")
+    build = (
+        "import pathlib; "
+        "pathlib.Path('out.txt').write_text(pathlib.Path('in.txt').read_text() + '!'); "
+        "print('built')"
+    )
+    plan = PlanSpec(
+        goal="cache",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="build",
+                cmd=[sys.executable, "-c", build],
+                inputs=["in.txt"],
+                outputs=["out.txt"],
+            ),
+            TaskSpec(id="plain", cmd=[sys.executable, "-c", "print('plain')"]),
+        ],
+    )
+
+    async def _run(run_id: str) -> RunState:
+        run_dir = home / "runs" / run_id
+        ensure_run_layout(run_dir)
+        return await run_plan(
+            plan,
+            run_dir,
+            max_parallel=2,
+            fail_fast=False,
+            workdir=workdir,
+            resume=False,
+            failed_only=False,
+        )
+
+    first = await _run("run_first")
+    assert first.tasks["build"].status == "SUCCESS"
+    assert first.tasks["build"].cached is False
+    assert (first.cache.hits, first.cache.misses) == (0, 1)
+
+    (workdir / "out.txt").unlink()
+    second = await _run("run_second")
+    build_state = second.tasks["build"]
+    assert build_state.status == "SUCCESS"
+    assert build_state.cached is True
+    assert build_state.exit_code == 0
+    assert second.tasks["plain"].cached is False
+    assert (second.cache.hits, second.cache.misses) == (1, 0)
+    assert (workdir / "out.txt").read_text(encoding="utf-8") == "v1!"
+    assert build_state.artifact_paths == ["artifacts/build/out.txt"]
+    out_log = (home / "runs" / "run_second" / "logs" / "build.out.log").read_text(encoding="utf-8")
+    assert out_log == "\n===== attempt 1 / 1 =====\nbuilt\n"
+
+    (workdir / "in.txt").write_text("v2", encoding="utf-8")
+    third = await _run("run_third")
+    assert third.tasks["build"].cached is False
+    assert (third.cache.hits, third.cache.misses) == (0, 1)
+    assert (workdir / "out.txt").read_text(encoding="utf-8") == "v2!"
+
+    disabled_dir = home / "runs" / "run_disabled"
+    ensure_run_layout(disabled_dir)
+    disabled = await run_plan(
+        plan,
+        disabled_dir,
+        max_parallel=2,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        cache=False,
+    )
+    assert disabled.tasks["build"].cached is False
+    assert (disabled.cache.hits, disabled.cache.misses) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_runner_incremental_skips_tasks_with_outputs_newer_than_inputs(
+    tmp_path: Path,
+) -> None:
+    home = tmp_path / ".orch"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    (workdir / "in.txt").write_text("v1", encoding="utf-8")
+    build = (
+        "import pathlib; "
+        "pathlib.Path('out.txt').write_text(pathlib.Path('in.txt').read_text() + '!')"
+    )
+    downstream = (
+        "import pathlib; "
+        "pathlib.Path('final.txt').write_text(pathlib.Path('out.txt').read_text() + '?')"
+    )
+    plan = PlanSpec(
+        goal="incremental",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="build",
+                cmd=[sys.executable, "-c", build],
+                inputs=["in.txt"],
+                outputs=["out.txt"],
+            ),
+            TaskSpec(
+                id="package",
+                cmd=[sys.executable, "-c", downstream],
+                depends_on=["build"],
+                inputs=["out.txt"],
+                outputs=["final.txt"],
+            ),
+        ],
+    )
+
+    async def _run(run_id: str) -> RunState:
+        run_dir = home / "runs" / run_id
+        ensure_run_layout(run_dir)
+        return await run_plan(
+            plan,
+            run_dir,
+            max_parallel=2,
+            fail_fast=False,
+            workdir=workdir,
+            resume=False,
+            failed_only=False,
+            cache=False,
+            incremental=True,
+        )
+
+    first = await _run("run_first")
+    assert first.status == "SUCCESS"
+    assert [first.tasks[task_id].up_to_date for task_id in ("build", "package")] == [False, False]
+
+    second = await _run("run_second")
+    assert second.status == "SUCCESS"
+    assert [second.tasks[task_id].up_to_date for task_id in ("build", "package")] == [True, True]
+    assert second.tasks["build"].artifact_paths == ["artifacts/build/out.txt"]
+    out_log = home / "runs" / "run_second" / "logs" / "build.out.log"
+    assert not out_log.exists() or out_log.read_text(encoding="utf-8") == ""
+
+    final_mtime = (workdir / "final.txt").stat().st_mtime_ns
+    (workdir / "in.txt").write_text("v2", encoding="utf-8")
+    os.utime(workdir / "in.txt", ns=(final_mtime + 10**9, final_mtime + 10**9))
+    third = await _run("run_third")
+    assert [third.tasks[task_id].up_to_date for task_id in ("build", "package")] == [False, False]
+    assert (workdir / "final.txt").read_text(encoding="utf-8") == "v2!?"
+
+
+@pytest.mark.asyncio
+async def test_runner_early_cutoff_skips_dependents_when_upstream_outputs_unchanged(
+    tmp_path: Path,
+) -> None:
+    home = tmp_path / ".orch"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    (workdir / "in.txt").write_text("v1", encoding="utf-8")
+    build = (
+        "import pathlib; "
+        "text = pathlib.Path('in.txt').read_text(); "
+        "pathlib.Path('a.txt').write_text('big' if text == 'v3' else 'small')"
+    )
+    downstream = (
+        "import pathlib; "
+        "pathlib.Path('b.txt').write_text(pathlib.Path('a.txt').read_text().upper()); "
+        "log = pathlib.Path('b_runs.txt'); "
+        "log.write_text((log.read_text() if log.exists() else '') + 'x')"
+    )
+    plan = PlanSpec(
+        goal="cutoff",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="a",
+                cmd=[sys.executable, "-c", build],
+                inputs=["in.txt"],
+                outputs=["a.txt"],
+            ),
+            TaskSpec(
+                id="b",
+                cmd=[sys.executable, "-c", downstream],
+                depends_on=["a"],
+                outputs=["b.txt"],
+            ),
+        ],
+    )
+
+    async def _run(run_id: str, *, incremental: bool) -> RunState:
+        run_dir = home / "runs" / run_id
+        ensure_run_layout(run_dir)
+        return await run_plan(
+            plan,
+            run_dir,
+            max_parallel=2,
+            fail_fast=False,
+            workdir=workdir,
+            resume=False,
+            failed_only=False,
+            cache=False,
+            incremental=incremental,
+        )
+
+    first = await _run("run_1", incremental=True)
+    assert first.status == "SUCCESS"
+    digest = first.tasks["a"].output_digests["a.txt"]
+    assert digest == hashlib.sha256(b"small").hexdigest()
+    assert first.tasks["b"].input_fingerprint is not None
+    assert first.tasks["a"].input_fingerprint is None
+
+    (workdir / "in.txt").write_text("v2", encoding="utf-8")
+    second = await _run("run_2", incremental=True)
+    assert second.tasks["a"].up_to_date is False
+    assert second.tasks["b"].status == "SUCCESS"
+    assert second.tasks["b"].up_to_date is True
+    assert second.tasks["b"].input_fingerprint == first.tasks["b"].input_fingerprint
+    assert (workdir / "b_runs.txt").read_text(encoding="utf-8") == "x"
+
+    (workdir / "in.txt").write_text("v3", encoding="utf-8")
+    third = await _run("run_3", incremental=True)
+    assert third.tasks["b"].up_to_date is False
+    assert (workdir / "b.txt").read_text(encoding="utf-8") == "BIG"
+    assert (workdir / "b_runs.txt").read_text(encoding="utf-8") == "xx"
+
+    # Without --incremental or resume nothing is fingerprinted.
+    plain = await _run("run_4", incremental=False)
+    assert plain.tasks["b"].input_fingerprint is None
+
+
+@pytest.mark.asyncio
+async def test_runner_hedges_slow_attempt_and_keeps_both_logs(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_hedge"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    marker = tmp_path / "started_once"
+    script = (
+        "import pathlib, sys, time; "
+        f"marker = pathlib.Path({str(marker)!r}); "
+        "first = not marker.exists(); "
+        "marker.touch(); "
+        "print('slow' if first else 'fast', flush=True); "
+        "time.sleep(30 if first else 0); "
+        "pathlib.Path('out.txt').write_text('done')"
+    )
+    plan = PlanSpec(
+        goal="hedge",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="flaky",
+                cmd=[sys.executable, "-c", script],
+                outputs=["out.txt"],
+                hedge_after_sec=0.5,
+            )
+        ],
+    )
+
+    started = asyncio.get_running_loop().time()
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=tmp_path / "wd",
+        resume=False,
+        failed_only=False,
+    )
+    assert asyncio.get_running_loop().time() - started < 15
+    task = state.tasks["flaky"]
+    assert task.status == "SUCCESS"
+    assert task.hedge_won is True
+    assert task.attempts == 1
+    assert (workdir / "out.txt").read_text(encoding="utf-8") == "done"
+    assert task.artifact_paths == ["artifacts/flaky/out.txt"]
+    out_log = (run_dir / "logs" / "flaky.out.log").read_text(encoding="utf-8")
+    assert out_log == (
+        "\n===== attempt 1 / 1 =====\nslow\n\n===== attempt 1 (hedge) / 1 =====\nfast\n"
+    )
+    assert not (run_dir / "hedge").exists() or not any((run_dir / "hedge").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_runner_hedge_copies_only_declared_inputs(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_hedge_inputs"
+    workdir = tmp_path / "wd"
+    (workdir / "data").mkdir(parents=True)
+    (workdir / "data" / "in.txt").write_text("payload", encoding="utf-8")
+    (workdir / "unrelated.bin").write_bytes(b"x" * 1024)
+    ensure_run_layout(run_dir)
+    marker = tmp_path / "started_once"
+    script = (
+        "import os, pathlib, time; "
+        f"marker = pathlib.Path({str(marker)!r}); "
+        "first = not marker.exists(); "
+        "marker.touch(); "
+        "time.sleep(30 if first else 0); "
+        "print(sorted(os.listdir('.')), pathlib.Path('data/in.txt').read_text(), flush=True)"
+    )
+    plan = PlanSpec(
+        goal="hedge inputs",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="reader",
+                cmd=[sys.executable, "-c", script],
+                inputs=["data/*.txt"],
+                hedge_after_sec=0.3,
+            )
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        cache=False,
+    )
+    assert state.tasks["reader"].hedge_won is True
+    out_log = (run_dir / "logs" / "reader.out.log").read_text(encoding="utf-8")
+    assert "['data'] payload" in out_log
+    assert not any((run_dir / "hedge").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_runner_skips_hedge_when_cwd_copy_is_too_large(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_hedge_large"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    (workdir / "big.bin").write_bytes(b"x" * 1024)
+    ensure_run_layout(run_dir)
+    monkeypatch.setattr(runner_module, "HEDGE_CWD_MAX_BYTES", 512)
+    plan = PlanSpec(
+        goal="hedge too large",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="slow",
+                cmd=[sys.executable, "-c", "import time; time.sleep(1); print('done')"],
+                hedge_after_sec=0.2,
+            )
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    task = state.tasks["slow"]
+    assert task.status == "SUCCESS"
+    assert task.hedge_won is False
+    err_log = (run_dir / "logs" / "slow.err.log").read_text(encoding="utf-8")
+    assert "hedge skipped: cwd is larger than 512 bytes" in err_log
+    assert not (run_dir / "hedge").exists() or not any((run_dir / "hedge").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_runner_timeout_uses_kill_grace_and_records_shutdown(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_kill_grace"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    script = (
+        "import signal, sys, time\n"
+        "def _flush(signum, frame):\n"
+        "    time.sleep(1.2)\n"
+        "    print('flushed', flush=True)\n"
+        "    sys.exit(0)\n"
+        "signal.signal(signal.SIGTERM, _flush)\n"
+        "time.sleep(30)\n"
+    )
+    plan = PlanSpec(
+        goal="kill grace",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="agent",
+                cmd=[sys.executable, "-c", script],
+                timeout_sec=0.5,
+                kill_grace_sec=5,
+                kill_signals=["SIGTERM", "SIGKILL"],
+            )
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    task = state.tasks["agent"]
+    assert task.status == "FAILED"
+    assert task.timed_out is True
+    assert task.shutdown_signal == "SIGTERM"
+    assert task.shutdown_sec is not None and 1.0 <= task.shutdown_sec < 5
+    assert "flushed" in (run_dir / "logs" / "agent.out.log").read_text(encoding="utf-8")
+    assert load_state(run_dir).tasks["agent"].shutdown_sec == task.shutdown_sec
+
+
+@pytest.mark.asyncio
+async def test_runner_timeout_kills_grandchild_holding_stdout(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_group_kill"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="group kill",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="spawner",
+                cmd=["sh", "-c", "sleep 60 & echo started; sleep 60"],
+                timeout_sec=0.5,
+                kill_grace_sec=0.5,
+            )
+        ],
+    )
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    assert loop.time() - started < 10
+    task = state.tasks["spawner"]
+    assert task.status == "FAILED"
+    assert task.timed_out is True
+    assert "started" in (run_dir / "logs" / "spawner.out.log").read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_runner_places_limited_task_in_cgroup_leaf_and_records_usage(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_limits"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    cgroup_parent = tmp_path / "cgroup"
+    cgroup_parent.mkdir()
+    ensure_run_layout(run_dir)
+    removed: list[Path] = []
+
+    create_leaf = runner_module.create_task_cgroup
+
+    def _create(parent: Path, task_id: str, **limits: Any) -> Path | None:
+        leaf = create_leaf(parent, task_id, **limits)
+        if leaf is not None:
+            # cgroupfs provides this file in every new leaf.
+            (leaf / "cgroup.procs").touch()
+        return leaf
+
+    async def _remove(leaf: Path) -> None:
+        removed.append(leaf)
+
+    monkeypatch.setattr(runner_module, "delegated_cgroup_parent", lambda: cgroup_parent)
+    monkeypatch.setattr(runner_module, "create_task_cgroup", _create)
+    monkeypatch.setattr(
+        runner_module,
+        "read_cgroup_usage",
+        lambda leaf: runner_module.ResourceUsage(memory_peak_bytes=2048, cpu_usage_sec=0.5),
+    )
+    monkeypatch.setattr(runner_module, "remove_task_cgroup", _remove)
+    plan = PlanSpec(
+        goal="limits",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="limited", cmd=[sys.executable, "-c", "print('ok')"], memory_max=1 << 30),
+            TaskSpec(id="free", cmd=[sys.executable, "-c", "print('ok')"]),
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    limited = state.tasks["limited"]
+    assert limited.status == "SUCCESS"
+    assert limited.memory_peak_bytes == 2048
+    assert limited.cpu_usage_sec == 0.5
+    assert state.tasks["free"].memory_peak_bytes is None
+    assert len(removed) == 1 and removed[0].name.startswith("limited.")
+    assert (removed[0] / "memory.max").read_text(encoding="utf-8") == str(1 << 30)
+    assert (removed[0] / "cgroup.procs").read_text(encoding="utf-8").strip().isdigit()
+    assert load_state(run_dir).tasks["limited"].memory_peak_bytes == 2048
+
+
+@pytest.mark.asyncio
+async def test_run_task_removes_cgroup_leaf_after_killed_group_exits_on_cancel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_limits_cancel"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    leaf = tmp_path / "cgroup" / "sleeper.leaf"
+    leaf.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    removed: list[bool] = []
+    spawned: list[Any] = []
+    spawn = runner_module.spawn_reaped
+
+    async def _spawn(*args: Any, **kwargs: Any) -> Any:
+        proc = await spawn(*args, **kwargs)
+        spawned.append(proc)
+        return proc
+
+    async def _remove(path: Path) -> None:
+        # The leaf is only removable once every member of the killed group is gone.
+        removed.append(path == leaf and spawned[0].returncode is not None)
+
+    monkeypatch.setattr(runner_module, "_task_cgroup", lambda task: leaf)
+    monkeypatch.setattr(runner_module, "spawn_reaped", _spawn)
+    monkeypatch.setattr(runner_module, "remove_task_cgroup", _remove)
+    task = TaskSpec(
+        id="sleeper",
+        cmd=[sys.executable, "-c", "import time; time.sleep(30)"],
+        memory_max=1 << 30,
+    )
+    attempt = asyncio.ensure_future(
+        runner_module.run_task(task, run_dir, attempt=1, default_cwd=workdir)
+    )
+    while not spawned:
+        await asyncio.sleep(0.05)
+    attempt.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await attempt
+    assert removed == [True]
+
+
+@pytest.mark.asyncio
+async def test_runner_records_rusage_for_every_attempt(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_rusage"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="rusage",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="flaky",
+                cmd=[sys.executable, "-c", "import sys; sys.exit(1)"],
+                retries=1,
+            ),
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+    task = state.tasks["flaky"]
+    assert task.status == "FAILED"
+    assert task.exit_code == 1
+    assert [usage.attempt for usage in task.rusage] == [1, 2]
+    assert all(usage.max_rss_bytes > 0 for usage in task.rusage)
+    assert all(usage.user_sec + usage.system_sec > 0 for usage in task.rusage)
+    assert load_state(run_dir).tasks["flaky"].rusage == task.rusage
+
+
+def _write_manifest_cmd(path: str, tasks: list[dict[str, Any]]) -> list[str]:
+    payload = json.dumps({"tasks": tasks})
+    return [
+        sys.executable,
+        "-c",
+        f"from pathlib import Path; Path({path!r}).write_text({payload!r}, encoding='utf-8')",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_plan_schedules_tasks_emitted_at_runtime(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_emit"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    ok = [sys.executable, "-c", "print('ok')"]
+    # Left over from an earlier run; "quiet" does not write it, so it must not be spliced in.
+    (workdir / "stale.json").write_text('[{"id": "ghost", "cmd": "true"}]', encoding="utf-8")
+    plan = PlanSpec(
+        goal="dynamic dag",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="inspect",
+                cmd=_write_manifest_cmd(
+                    "tasks.json",
+                    [
+                        {"id": "fix-a", "cmd": ok},
+                        {
+                            "id": "fix-b",
+                            "cmd": _write_manifest_cmd("deep.json", [{"id": "deep", "cmd": ok}]),
+                            "emits": "deep.json",
+                        },
+                        {"id": "collect", "cmd": ok, "depends_on": ["fix-a", "fix-b", "lint"]},
+                    ],
+                ),
+                emits="tasks.json",
+            ),
+            TaskSpec(id="lint", cmd=ok),
+            TaskSpec(id="quiet", cmd=ok, emits="stale.json"),
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=2,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+
+    assert state.status == "SUCCESS"
+    assert [task.id for task in plan.tasks] == ["inspect", "lint", "quiet"]
+    assert set(state.tasks) == {"inspect", "lint", "quiet", "fix-a", "fix-b", "collect", "deep"}
+    assert all(task.status == "SUCCESS" for task in state.tasks.values())
+    assert state.tasks["collect"].depends_on == ["inspect", "fix-a", "fix-b", "lint"]
+    assert state.tasks["deep"].depends_on == ["fix-b"]
+    assert _ended_before_start(state, "inspect", "fix-a") and _ended_before_start(
+        state, "fix-b", "deep"
+    )
+    assert set(state.emitted_tasks) == {"inspect", "fix-b"}
+    assert not (workdir / "stale.json").exists()
+    assert load_state(run_dir).emitted_tasks == state.emitted_tasks
+
+
+def _ended_before_start(state: RunState, first: str, then: str) -> bool:
+    ended = state.tasks[first].ended_at
+    started = state.tasks[then].started_at
+    return ended is not None and started is not None and ended <= started
+
+
+@pytest.mark.asyncio
+async def test_run_plan_fails_emitter_with_invalid_manifest(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_emit_invalid"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="dynamic dag",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(
+                id="inspect",
+                cmd=_write_manifest_cmd("tasks.json", [{"id": "after", "cmd": "true"}]),
+                emits="tasks.json",
+            ),
+            TaskSpec(id="after", cmd=["true"], depends_on=["inspect"]),
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+
+    inspect = state.tasks["inspect"]
+    assert inspect.status == "FAILED"
+    assert inspect.skip_reason == "invalid_emitted_tasks"
+    assert inspect.exit_code is None
+    assert state.tasks["after"].status == "SKIPPED"
+    assert not state.emitted_tasks
+    stderr = (run_dir / "logs" / "inspect.err.log").read_text(encoding="utf-8")
+    assert "invalid emitted tasks: tasks emitted by 'inspect' must have new unique ids" in stderr
+    assert load_state(run_dir).tasks["inspect"].status == "FAILED"
+
+
+@pytest.mark.asyncio
+async def test_run_plan_streams_stdout_through_stdin_from_chain(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_pipe"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="pipeline",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="seed", cmd=[sys.executable, "-c", "print('seed')"]),
+            TaskSpec(
+                id="extract",
+                cmd=[sys.executable, "-c", "for i in range(50000): print(i)"],
+            ),
+            TaskSpec(
+                id="transform",
+                stdin_from="extract",
+                cmd=[
+                    sys.executable,
+                    "-c",
+                    "import sys\nfor line in sys.stdin: print(int(line) * 2)",
+                ],
+            ),
+            # Its dependency holds back the whole pipeline, not just this member.
+            TaskSpec(
+                id="summarize",
+                stdin_from="transform",
+                depends_on=["seed"],
+                cmd=[sys.executable, "-c", "import sys; print(sum(int(x) for x in sys.stdin))"],
+            ),
+            TaskSpec(id="report", cmd=["true"], depends_on=["summarize"]),
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=1,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+
+    assert state.status == "SUCCESS"
+    summary = (run_dir / "logs" / "summarize.out.log").read_text(encoding="utf-8")
+    assert summary.splitlines()[-1] == str(2 * sum(range(50000)))
+    extract_log = (run_dir / "logs" / "extract.out.log").read_text(encoding="utf-8")
+    assert extract_log.splitlines()[-1] == "49999"
+    assert _ended_before_start(state, "seed", "extract")
+    assert _ended_before_start(state, "summarize", "report")
+
+
+@pytest.mark.asyncio
+async def test_run_plan_admits_stdin_from_chain_only_when_all_members_fit(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_pipe_admit"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    plan = PlanSpec(
+        goal="pipeline admission",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="solo", cmd=["sleep", "0.3"], pool="p", resources={"cpu": 1.0}),
+            TaskSpec(id="head", cmd=["echo", "x"], pool="p", resources={"cpu": 1.0}),
+            TaskSpec(id="rider", stdin_from="head", cmd=["cat"], pool="p", resources={"cpu": 1.0}),
+        ],
+        pools={"p": 2},
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=4,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+        capacity={"cpu": 2.0},
+    )
+
+    assert state.status == "SUCCESS"
+    assert state.pools["p"].peak_running == 2
+    assert _ended_before_start(state, "solo", "head")
+
+
+@pytest.mark.asyncio
+async def test_run_plan_stdin_from_failure_semantics(tmp_path: Path) -> None:
+    run_dir = tmp_path / ".orch" / "runs" / "run_pipe_fail"
+    workdir = tmp_path / "wd"
+    workdir.mkdir(parents=True)
+    ensure_run_layout(run_dir)
+    many_lines = [sys.executable, "-c", "for i in range(200000): print(i)"]
+    plan = PlanSpec(
+        goal="pipeline failures",
+        artifacts_dir=None,
+        tasks=[
+            TaskSpec(id="bad-producer", cmd=["sh", "-c", "echo a; exit 3"]),
+            TaskSpec(id="fed-by-bad", stdin_from="bad-producer", cmd=["cat"]),
+            TaskSpec(id="after-bad", depends_on=["fed-by-bad"], cmd=["true"]),
+            TaskSpec(id="chatty", cmd=many_lines),
+            TaskSpec(id="early-exit", stdin_from="chatty", cmd=["head", "-n", "1"]),
+            TaskSpec(id="orphaned", cmd=many_lines),
+            TaskSpec(id="missing", stdin_from="orphaned", cmd=[str(workdir / "no-such-bin")]),
+            TaskSpec(id="slow", cmd=["sh", "-c", "echo x; sleep 30"], timeout_sec=0.5),
+            TaskSpec(id="fed-by-slow", stdin_from="slow", cmd=["cat"]),
+        ],
+    )
+
+    state = await run_plan(
+        plan,
+        run_dir,
+        max_parallel=4,
+        fail_fast=False,
+        workdir=workdir,
+        resume=False,
+        failed_only=False,
+    )
+
+    tasks = state.tasks
+    assert tasks["bad-producer"].status == "FAILED"
+    assert tasks["bad-producer"].exit_code == 3
+    assert tasks["fed-by-bad"].status == "FAILED"
+    assert tasks["fed-by-bad"].skip_reason == "stdin_producer_failed"
+    assert tasks["after-bad"].status == "SKIPPED"
+    # A consumer that stops reading early does not fail its producer.
+    assert tasks["chatty"].status == "SUCCESS"
+    assert tasks["early-exit"].status == "SUCCESS"
+    chatty_log = (run_dir / "logs" / "chatty.out.log").read_text(encoding="utf-8")
+    assert chatty_log.splitlines()[-1] == "199999"
+    assert tasks["orphaned"].status == "SUCCESS"
+    assert tasks["missing"].status == "FAILED"
+    assert tasks["missing"].skip_reason == "process_start_failed"
+    assert tasks["slow"].timed_out is True
+    assert tasks["fed-by-slow"].status == "FAILED"
+    assert tasks["fed-by-slow"].skip_reason == "stdin_producer_failed"
+    fed = (run_dir / "logs" / "fed-by-slow.out.log").read_text(encoding="utf-8")
+    assert fed.splitlines()[-1] == "x"
+    assert load_state(run_dir).tasks["fed-by-bad"].status == "FAILED"
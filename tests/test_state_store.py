@@ -7,7 +7,13 @@ from pathlib import Path
 
 import pytest
 
-from orch.state.model import RunState, TaskState
+from orch.config.schema import TaskSpec
+from orch.state import history as history_module
+from orch.state import journal as journal_module
+from orch.state import store as store_module
+from orch.state.history import historical_durations, historical_p95, previous_successes
+from orch.state.journal import StateJournal
+from orch.state.model import CacheStats, ParallelSample, PoolStats, RunState, TaskState
 from orch.state.store import load_state, save_state_atomic
 from orch.util.errors import StateError
 
@@ -2474,3 +2480,631 @@ def test_load_state_rejects_failed_run_status_without_failed_tasks(tmp_path: Pat
 
     with pytest.raises(StateError, match="invalid state field: status"):
         load_state(run_dir)
+
+
+def test_historical_durations_averages_successful_runs_with_same_cmd(tmp_path: Path) -> None:
+    runs_root = tmp_path / "runs"
+    for run_id, duration, cmd in (
+        ("20260101_000000_aaaaaa", 2.0, ["echo", "ok"]),
+        ("20260102_000000_bbbbbb", 4.0, ["echo", "ok"]),
+        ("20260103_000000_cccccc", 100.0, ["echo", "changed"]),
+        ("20260104_000000_dddddd", 50.0, ["echo", "ok"]),
+    ):
+        payload = _minimal_state_payload(run_id=run_id)
+        payload["home"] = str(tmp_path)
+        payload["status"] = "SUCCESS"
+        tasks = payload["tasks"]
+        assert isinstance(tasks, dict)
+        tasks["t1"]["duration_sec"] = duration
+        tasks["t1"]["cmd"] = cmd
+        run_dir = runs_root / run_id
+        run_dir.mkdir(parents=True)
+        (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+    (runs_root / "20260105_000000_eeeeee").mkdir()
+
+    durations = historical_durations(
+        runs_root,
+        [TaskSpec(id="t1", cmd=["echo", "ok"]), TaskSpec(id="t2", cmd=["echo", "new"])],
+        exclude_run_id="20260104_000000_dddddd",
+    )
+    assert durations == {"t1": 3.0}
+
+
+def test_historical_p95_requires_min_samples_and_uses_nearest_rank(tmp_path: Path) -> None:
+    runs_root = tmp_path / "runs"
+    for index, duration in enumerate((1.0, 2.0, 3.0, 4.0, 60.0)):
+        run_id = f"2026010{index + 1}_000000_aaaaaa"
+        payload = _minimal_state_payload(run_id=run_id)
+        payload["home"] = str(tmp_path)
+        payload["status"] = "SUCCESS"
+        tasks = payload["tasks"]
+        assert isinstance(tasks, dict)
+        tasks["t1"]["duration_sec"] = duration
+        tasks["t1"]["cmd"] = ["echo", "ok"]
+        run_dir = runs_root / run_id
+        run_dir.mkdir(parents=True)
+        (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    tasks_specs = [TaskSpec(id="t1", cmd=["echo", "ok"])]
+    assert historical_p95(runs_root, tasks_specs) == {"t1": 60.0}
+    assert historical_p95(runs_root, tasks_specs, min_samples=6) == {}
+
+
+def test_previous_successes_stops_reading_runs_once_every_task_is_found(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runs_root = tmp_path / "runs"
+    for index in range(5):
+        run_id = f"2026010{index + 1}_000000_aaaaaa"
+        payload = _minimal_state_payload(run_id=run_id)
+        payload["home"] = str(tmp_path)
+        payload["status"] = "SUCCESS"
+        tasks = payload["tasks"]
+        assert isinstance(tasks, dict)
+        tasks["t1"]["cmd"] = ["echo", "ok"]
+        tasks["t1"]["input_fingerprint"] = f"{index}" * 64
+        run_dir = runs_root / run_id
+        run_dir.mkdir(parents=True)
+        (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+    loaded: list[str] = []
+
+    def _load(run_dir: Path) -> RunState:
+        loaded.append(run_dir.name)
+        return load_state(run_dir)
+
+    monkeypatch.setattr(history_module, "load_state", _load)
+    found = previous_successes(runs_root, [TaskSpec(id="t1", cmd=["echo", "ok"])])
+
+    assert found["t1"].input_fingerprint == "4" * 64
+    assert loaded == ["20260105_000000_aaaaaa"]
+
+
+def test_historical_durations_returns_empty_for_missing_runs_root(tmp_path: Path) -> None:
+    assert historical_durations(tmp_path / "missing", [TaskSpec(id="t1", cmd=["x"])]) == {}
+
+
+def test_save_and_load_state_roundtrips_pool_stats(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_pools"
+    run_dir.mkdir(parents=True)
+    state = RunState.from_dict(_minimal_state_payload(run_id="run_pools"))
+    state.status = "SUCCESS"
+    state.home = str(home)
+    state.pools = {"agent": PoolStats(limit=3, peak_running=2, peak_queued=5)}
+
+    save_state_atomic(run_dir, state)
+    assert load_state(run_dir).pools == state.pools
+
+
+@pytest.mark.parametrize(
+    "pools",
+    [
+        [],
+        {"agent": {"limit": 0, "peak_running": 0, "peak_queued": 0}},
+        {"agent": {"limit": 1, "peak_running": -1, "peak_queued": 0}},
+        {"agent": {"limit": 1, "peak_running": 0}},
+        {"bad name": {"limit": 1, "peak_running": 0, "peak_queued": 0}},
+    ],
+)
+def test_load_state_rejects_invalid_pools(tmp_path: Path, pools: object) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_pools"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_pools")
+    payload["status"] = "SUCCESS"
+    payload["home"] = str(home)
+    payload["pools"] = pools
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    with pytest.raises(StateError, match="invalid state field: pools"):
+        load_state(run_dir)
+
+
+def test_save_and_load_state_roundtrips_cache_stats_and_cached_flag(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_cache"
+    run_dir.mkdir(parents=True)
+    state = RunState.from_dict(_minimal_state_payload(run_id="run_cache"))
+    state.status = "SUCCESS"
+    state.home = str(home)
+    state.cache = CacheStats(hits=2, misses=1)
+    state.tasks["t1"].cached = True
+    state.tasks["t1"].up_to_date = True
+    state.tasks["t1"].output_digests = {"out.txt": "a" * 64}
+    state.tasks["t1"].input_fingerprint = "b" * 64
+
+    save_state_atomic(run_dir, state)
+    loaded = load_state(run_dir)
+    assert loaded.cache == state.cache
+    assert loaded.tasks["t1"].cached is True
+    assert loaded.tasks["t1"].up_to_date is True
+    assert loaded.tasks["t1"].output_digests == {"out.txt": "a" * 64}
+    assert loaded.tasks["t1"].input_fingerprint == "b" * 64
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("cache", {"hits": -1, "misses": 0}),
+        ("cache", {"hits": 1}),
+        ("cached", "yes"),
+        ("cached_on_failed", True),
+        ("up_to_date", 1),
+        ("hedge_won", "true"),
+        ("output_digests", {"out.txt": "not-a-digest"}),
+        ("output_digests", {}),
+        ("input_fingerprint", "A" * 64),
+    ],
+)
+def test_load_state_rejects_invalid_cache_fields(tmp_path: Path, field: str, value: object) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_cache"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_cache")
+    payload["status"] = "SUCCESS"
+    payload["home"] = str(home)
+    task = payload["tasks"]["t1"]
+    if field == "cache":
+        payload["cache"] = value
+    elif field in {"cached", "up_to_date", "hedge_won", "output_digests", "input_fingerprint"}:
+        task[field] = value
+    else:
+        payload["status"] = "FAILED"
+        task["status"] = "FAILED"
+        task["exit_code"] = 1
+        task["cached"] = value
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    with pytest.raises(StateError, match="invalid state field"):
+        load_state(run_dir)
+
+
+def test_save_and_load_state_roundtrips_shutdown_record(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_shutdown"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_shutdown")
+    payload["status"] = "FAILED"
+    payload["home"] = str(home)
+    task = payload["tasks"]["t1"]
+    task["status"] = "FAILED"
+    task["timed_out"] = True
+    task["exit_code"] = None
+    task["shutdown_sec"] = 1.5
+    task["shutdown_signal"] = "SIGTERM"
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    loaded = load_state(run_dir)
+    assert loaded.tasks["t1"].shutdown_sec == 1.5
+    assert loaded.tasks["t1"].shutdown_signal == "SIGTERM"
+    save_state_atomic(run_dir, loaded)
+    assert load_state(run_dir).tasks["t1"].shutdown_signal == "SIGTERM"
+
+    del task["shutdown_signal"]
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+    with pytest.raises(StateError, match="invalid state field"):
+        load_state(run_dir)
+
+
+def test_save_and_load_state_roundtrips_resource_usage(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_usage"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_usage")
+    payload["status"] = "FAILED"
+    payload["home"] = str(home)
+    task = payload["tasks"]["t1"]
+    task["status"] = "FAILED"
+    task["exit_code"] = 137
+    task["memory_peak_bytes"] = 268435456
+    task["cpu_usage_sec"] = 3.25
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    loaded = load_state(run_dir)
+    assert loaded.tasks["t1"].memory_peak_bytes == 268435456
+    assert loaded.tasks["t1"].cpu_usage_sec == 3.25
+    save_state_atomic(run_dir, loaded)
+    assert load_state(run_dir).tasks["t1"].cpu_usage_sec == 3.25
+
+    task["memory_peak_bytes"] = -1
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+    with pytest.raises(StateError, match="invalid state field"):
+        load_state(run_dir)
+
+
+def test_save_and_load_state_roundtrips_attempt_rusage(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_rusage"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_rusage")
+    payload["status"] = "FAILED"
+    payload["home"] = str(home)
+    task = payload["tasks"]["t1"]
+    task["status"] = "FAILED"
+    task["exit_code"] = 1
+    task["attempts"] = 2
+    task["retries"] = 1
+    usage = {
+        "attempt": 1,
+        "user_sec": 0.5,
+        "system_sec": 0.25,
+        "max_rss_bytes": 10485760,
+        "inblock": 0,
+        "oublock": 8,
+        "nvcsw": 12,
+        "nivcsw": 3,
+    }
+    task["rusage"] = [usage, {**usage, "attempt": 2}]
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    loaded = load_state(run_dir)
+    assert [u.attempt for u in loaded.tasks["t1"].rusage] == [1, 2]
+    assert loaded.tasks["t1"].rusage[0].max_rss_bytes == 10485760
+    save_state_atomic(run_dir, loaded)
+    assert load_state(run_dir).tasks["t1"].rusage == loaded.tasks["t1"].rusage
+
+    task["rusage"] = [{**usage, "attempt": 0}]
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+    with pytest.raises(StateError, match="invalid state field"):
+        load_state(run_dir)
+
+
+def test_save_and_load_state_roundtrips_parallel_samples(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_samples"
+    run_dir.mkdir(parents=True)
+    state = RunState.from_dict(_minimal_state_payload(run_id="run_samples"))
+    state.status = "SUCCESS"
+    state.home = str(home)
+    state.parallel_samples = [
+        ParallelSample(
+            at="2026-01-01T00:00:00+00:00",
+            limit=3,
+            running=2,
+            cpu_some_avg10=12.5,
+            memory_some_avg10=None,
+            loadavg_1m=1.25,
+        )
+    ]
+
+    save_state_atomic(run_dir, state)
+    assert load_state(run_dir).parallel_samples == state.parallel_samples
+
+
+@pytest.mark.parametrize(
+    "sample",
+    [
+        {"at": "not-a-date", "limit": 1, "running": 0},
+        {"at": "2026-01-01T00:00:00+00:00", "limit": 0, "running": 0},
+        {"at": "2026-01-01T00:00:00+00:00", "limit": 1, "running": 0, "loadavg_1m": -1.0},
+        {"at": "2026-01-01T00:00:00+00:00", "limit": 1, "running": 0, "extra": 1},
+    ],
+)
+def test_load_state_rejects_invalid_parallel_samples(
+    tmp_path: Path, sample: dict[str, object]
+) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_samples"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_samples")
+    payload["status"] = "SUCCESS"
+    payload["home"] = str(home)
+    payload["parallel_samples"] = [
+        {"cpu_some_avg10": None, "memory_some_avg10": None, "loadavg_1m": None, **sample}
+    ]
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    with pytest.raises(StateError, match="invalid state field: parallel_samples"):
+        load_state(run_dir)
+
+
+def test_save_and_load_state_roundtrips_emitted_tasks(tmp_path: Path) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_emitted"
+    run_dir.mkdir(parents=True)
+    state = RunState.from_dict(_minimal_state_payload(run_id="run_emitted"))
+    state.status = "SUCCESS"
+    state.home = str(home)
+    state.emitted_tasks = {"t1": [{"id": "fix-a", "cmd": ["echo", "a"]}]}
+
+    save_state_atomic(run_dir, state)
+    assert load_state(run_dir).emitted_tasks == state.emitted_tasks
+
+
+@pytest.mark.parametrize(
+    "emitted",
+    [
+        [],
+        {"missing": [{"id": "x", "cmd": "true"}]},
+        {"t1": []},
+        {"t1": ["not-a-task"]},
+    ],
+)
+def test_load_state_rejects_invalid_emitted_tasks(tmp_path: Path, emitted: object) -> None:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_emitted"
+    run_dir.mkdir(parents=True)
+    payload = _minimal_state_payload(run_id="run_emitted")
+    payload["status"] = "SUCCESS"
+    payload["home"] = str(home)
+    payload["emitted_tasks"] = emitted
+    (run_dir / "state.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    with pytest.raises(StateError, match="invalid state field: emitted_tasks"):
+        load_state(run_dir)
+
+
+def _journal_state(tmp_path: Path) -> tuple[Path, RunState]:
+    home = tmp_path / ".orch"
+    run_dir = home / "runs" / "run_journal"
+    run_dir.mkdir(parents=True)
+    state = RunState.from_dict(_minimal_state_payload(run_id="run_journal"))
+    state.home = str(home)
+    state.tasks["t2"] = TaskState(
+        status="PENDING",
+        depends_on=[],
+        cmd=["echo", "two"],
+        cwd=".",
+        env=None,
+        timeout_sec=None,
+        retries=0,
+        retry_backoff_sec=[],
+        outputs=[],
+        stdout_path="logs/t2.out.log",
+        stderr_path="logs/t2.err.log",
+    )
+    return run_dir, state
+
+
+def _start_t2(state: RunState) -> None:
+    state.tasks["t2"].status = "RUNNING"
+    state.tasks["t2"].attempts = 1
+    state.tasks["t2"].started_at = "2026-01-01T00:00:02+00:00"
+    state.updated_at = "2026-01-01T00:00:02+00:00"
+
+
+def _write_journal(run_dir: Path, *records: object, tail: str = "") -> None:
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    (run_dir / "state.journal").write_text(lines + tail, encoding="utf-8")
+
+
+def test_state_journal_appends_only_changed_tasks_and_load_replays_them(
+    tmp_path: Path,
+) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    journal = StateJournal(run_dir, state)
+    journal.compact()
+    _start_t2(state)
+    state.cache.hits = 1
+
+    journal.append(["t2"])
+    journal.append([])
+
+    records = [
+        json.loads(line)
+        for line in (run_dir / "state.journal").read_text(encoding="utf-8").splitlines()
+    ]
+    assert records == [
+        {
+            "seq": 1,
+            "run": {"cache": {"hits": 1, "misses": 0}, "updated_at": state.updated_at},
+            "tasks": {"t2": state.tasks["t2"].to_dict()},
+        }
+    ]
+    snapshot = json.loads((run_dir / "state.json").read_text(encoding="utf-8"))
+    assert snapshot["tasks"]["t2"]["status"] == "PENDING"
+    loaded = load_state(run_dir)
+    assert loaded.tasks["t2"].status == "RUNNING"
+    assert loaded.cache.hits == 1
+    assert loaded.updated_at == state.updated_at
+    assert loaded.journal_seq == 1
+
+    journal.compact()
+    assert not (run_dir / "state.journal").exists()
+    assert json.loads((run_dir / "state.json").read_text(encoding="utf-8"))["journal_seq"] == 1
+    assert load_state(run_dir).tasks["t2"].status == "RUNNING"
+
+
+def test_state_journal_compacts_once_journal_outgrows_snapshot(tmp_path: Path) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    journal = StateJournal(run_dir, state, compact_ratio=0.01, min_compact_bytes=0)
+    journal.compact()
+    _start_t2(state)
+    journal.append(["t2"])
+    assert (run_dir / "state.journal").exists()
+
+    state.emitted_tasks = {"t1": [{"id": "t2", "cmd": ["echo", "two"]}]}
+    journal.append([])
+
+    assert not (run_dir / "state.journal").exists()
+    loaded = load_state(run_dir)
+    assert loaded.tasks["t2"].status == "RUNNING"
+    assert loaded.emitted_tasks == state.emitted_tasks
+    assert loaded.journal_seq == 1
+
+
+def test_state_journal_compacts_after_failed_append(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    journal = StateJournal(run_dir, state)
+    journal.compact()
+    _start_t2(state)
+
+    def _fail(*_args: object) -> int:
+        raise OSError(errno.ENOSPC, "no space")
+
+    monkeypatch.setattr(journal_module, "append_state_journal", _fail)
+    with pytest.raises(OSError, match="no space"):
+        journal.append(["t2"])
+    monkeypatch.undo()
+
+    journal.append([])
+    assert not (run_dir / "state.journal").exists()
+    assert load_state(run_dir).tasks["t2"].status == "RUNNING"
+
+
+def test_load_state_drops_torn_journal_tail(tmp_path: Path) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    save_state_atomic(run_dir, state)
+    _start_t2(state)
+    record = {"seq": 1, "run": {}, "tasks": {"t2": state.tasks["t2"].to_dict()}}
+    _write_journal(run_dir, record, tail='{"seq": 2, "run": {}, "tas')
+
+    assert load_state(run_dir).tasks["t2"].status == "RUNNING"
+
+
+def test_load_state_skips_journal_records_already_in_snapshot(tmp_path: Path) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    _start_t2(state)
+    state.journal_seq = 1
+    save_state_atomic(run_dir, state)
+    pending = dict(state.tasks["t2"].to_dict(), status="PENDING", attempts=0, started_at=None)
+    running = state.tasks["t2"].to_dict()
+    _write_journal(
+        run_dir,
+        {"seq": 1, "run": {}, "tasks": {"t2": pending}},
+        {"seq": 2, "run": {}, "tasks": {"t2": dict(running, attempts=1)}},
+    )
+
+    loaded = load_state(run_dir)
+    assert loaded.tasks["t2"].status == "RUNNING"
+    assert loaded.journal_seq == 2
+
+
+def test_state_journal_appends_only_new_parallel_samples(tmp_path: Path) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    journal = StateJournal(run_dir, state)
+    journal.compact()
+
+    def _sample(limit: int) -> ParallelSample:
+        return ParallelSample(
+            at="2026-01-01T00:00:01+00:00",
+            limit=limit,
+            running=0,
+            cpu_some_avg10=None,
+            memory_some_avg10=None,
+            loadavg_1m=None,
+        )
+
+    state.parallel_samples.extend([_sample(1), _sample(2)])
+    journal.append([])
+    state.parallel_samples.append(_sample(3))
+    journal.append([])
+    journal.append([])
+
+    records = [
+        json.loads(line)
+        for line in (run_dir / "state.journal").read_text(encoding="utf-8").splitlines()
+    ]
+    assert [
+        [sample["limit"] for sample in record["run"]["parallel_samples_added"]]
+        for record in records
+    ] == [[1, 2], [3]]
+    assert load_state(run_dir).parallel_samples == state.parallel_samples
+
+
+def test_load_state_rejects_journal_seq_gap_that_persists(tmp_path: Path) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    save_state_atomic(run_dir, state)
+    _start_t2(state)
+    running = state.tasks["t2"].to_dict()
+    _write_journal(
+        run_dir,
+        {"seq": 1, "run": {}, "tasks": {"t2": running}},
+        {"seq": 3, "run": {}, "tasks": {"t2": dict(running, status="NOPE")}},
+    )
+
+    with pytest.raises(StateError, match="missing seq"):
+        load_state(run_dir)
+
+
+def test_state_journal_stays_broken_until_old_journal_is_removed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    journal = StateJournal(run_dir, state)
+    journal.compact()
+    _start_t2(state)
+
+    def _fail(*_args: object) -> int:
+        raise OSError(errno.ENOSPC, "no space")
+
+    monkeypatch.setattr(journal_module, "append_state_journal", _fail)
+    with pytest.raises(OSError, match="no space"):
+        journal.append(["t2"])
+    monkeypatch.undo()
+    # The failed append left a torn line behind.
+    (run_dir / "state.journal").write_text('{"seq": 1, "run": {}, "ta', encoding="utf-8")
+
+    def _cannot_remove(_run_dir: Path) -> None:
+        raise OSError(errno.EACCES, "permission denied")
+
+    monkeypatch.setattr(journal_module, "remove_state_journal", _cannot_remove)
+    with pytest.raises(OSError, match="permission denied"):
+        journal.append([])
+    monkeypatch.undo()
+
+    journal.append(["t2"])
+    assert not (run_dir / "state.journal").exists()
+    assert load_state(run_dir).tasks["t2"].status == "RUNNING"
+
+
+def test_load_state_rereads_snapshot_when_compaction_interleaves(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    journal = StateJournal(run_dir, state)
+    journal.compact()
+    _start_t2(state)
+    journal.append(["t2"])
+    read_journal = store_module._read_state_journal
+    calls = 0
+
+    def _compact_then_read(path: Path) -> list[dict[str, object]]:
+        # The writer compacts and appends again after the reader loaded the old state.json.
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            journal.compact()
+            state.cache.hits = 5
+            journal.append([])
+        return read_journal(path)
+
+    monkeypatch.setattr(store_module, "_read_state_journal", _compact_then_read)
+    loaded = load_state(run_dir)
+
+    assert calls == 2
+    assert loaded.tasks["t2"].status == "RUNNING"
+    assert loaded.cache.hits == 5
+    assert loaded.journal_seq == 2
+
+
+@pytest.mark.parametrize(
+    ("lines", "message"),
+    [
+        ('["not", "an", "object"]\n', "invalid state journal"),
+        ("{not json\n", "invalid state journal"),
+        ('{"seq": 1, "run": {"status": "SUCCESS"}, "tasks": {}}\n', "invalid state journal"),
+        ('{"seq": 1, "run": {}, "tasks": {}, "extra": 1}\n', "invalid state journal"),
+        ('{"seq": 1, "run": {}, "tasks": {"t2": {"status": "NOPE"}}}\n', "invalid state field"),
+    ],
+)
+def test_load_state_rejects_invalid_journal(tmp_path: Path, lines: str, message: str) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    save_state_atomic(run_dir, state)
+    (run_dir / "state.journal").write_text(lines, encoding="utf-8")
+
+    with pytest.raises(StateError, match=message):
+        load_state(run_dir)
+
+
+def test_load_state_rejects_symlink_journal(tmp_path: Path) -> None:
+    run_dir, state = _journal_state(tmp_path)
+    save_state_atomic(run_dir, state)
+    outside = tmp_path / "outside.journal"
+    outside.write_text("", encoding="utf-8")
+    (run_dir / "state.journal").symlink_to(outside)
+
+    with pytest.raises(StateError, match="state journal must not be symlink"):
+        load_state(run_dir)
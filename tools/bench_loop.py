@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from orch.config.schema import TaskSpec
+from orch.exec.loop import run_with_loop, uvloop_available
+from orch.exec.runner import run_task
+
+MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    loop: str
+    spawns: int
+    concurrency: int
+    spawn_wall_sec: float
+    spawns_per_sec: float
+    capture_mib: int
+    capture_wall_sec: float
+    capture_mib_per_sec: float
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    default_loops = ["asyncio", "uvloop"] if uvloop_available() else ["asyncio"]
+    parser = argparse.ArgumentParser(
+        description="Compare process spawn rate and output capture throughput per event loop"
+    )
+    parser.add_argument(
+        "--loops",
+        nargs="+",
+        choices=["asyncio", "uvloop"],
+        default=default_loops,
+        help="event loops to compare (default: asyncio, plus uvloop when installed)",
+    )
+    parser.add_argument("--spawns", type=int, default=500, help="short tasks to run")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--capture-mib", type=int, default=256, help="stdout volume of the capture task"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    return parser.parse_args(argv)
+
+
+async def _spawn_many(run_dir: Path, spawns: int, concurrency: int) -> float:
+    """Run ``spawns`` one-shot tasks through ``run_task``, ``concurrency`` at a time."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(index: int) -> None:
+        async with sem:
+            result = await run_task(
+                TaskSpec(id=f"spawn{index}", cmd=["true"]),
+                run_dir,
+                attempt=1,
+                default_cwd=run_dir,
+            )
+        if result.exit_code != 0:
+            raise RuntimeError(f"spawn{index} exited with {result.exit_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one(index) for index in range(spawns)))
+    return time.perf_counter() - started
+
+
+async def _capture(run_dir: Path, mib: int) -> float:
+    """Run one task writing ``mib`` MiB to stdout and return the wall time to capture it."""
+    task = TaskSpec(id="capture", cmd=["head", "-c", str(mib * MIB), "/dev/zero"])
+    started = time.perf_counter()
+    result = await run_task(task, run_dir, attempt=1, default_cwd=run_dir)
+    wall = time.perf_counter() - started
+    if result.exit_code != 0:
+        raise RuntimeError(f"capture exited with {result.exit_code}")
+    captured = (run_dir / "logs" / "capture.out.log").stat().st_size
+    if captured < mib * MIB:
+        raise RuntimeError(f"captured {captured} of {mib * MIB} bytes")
+    return wall
+
+
+def run_once(loop: str, *, spawns: int, concurrency: int, capture_mib: int) -> BenchResult:
+    with tempfile.TemporaryDirectory(prefix="orch-bench-loop-") as tmp:
+        spawn_dir = Path(tmp) / "spawn"
+        capture_dir = Path(tmp) / "capture"
+        spawn_dir.mkdir()
+        capture_dir.mkdir()
+        spawn_wall = run_with_loop(_spawn_many(spawn_dir, spawns, concurrency), loop)
+        capture_wall = run_with_loop(_capture(capture_dir, capture_mib), loop)
+    return BenchResult(
+        loop=loop,
+        spawns=spawns,
+        concurrency=concurrency,
+        spawn_wall_sec=round(spawn_wall, 3),
+        spawns_per_sec=round(spawns / spawn_wall, 1),
+        capture_mib=capture_mib,
+        capture_wall_sec=round(capture_wall, 3),
+        capture_mib_per_sec=round(capture_mib / capture_wall, 1),
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.spawns < 1 or args.concurrency < 1 or args.capture_mib < 1:
+        print("--spawns, --concurrency and --capture-mib must be >= 1", file=sys.stderr)
+        return 2
+    if "uvloop" in args.loops and not uvloop_available():
+        print("uvloop is not installed", file=sys.stderr)
+        return 2
+    if not args.json:
+        print(f"{'loop':>8} {'spawns/s':>9} {'capture MiB/s':>14}")
+    for loop in args.loops:
+        result = run_once(
+            loop, spawns=args.spawns, concurrency=args.concurrency, capture_mib=args.capture_mib
+        )
+        if args.json:
+            print(json.dumps(asdict(result)), flush=True)
+        else:
+            print(
+                f"{result.loop:>8} {result.spawns_per_sec:>9.1f} "
+                f"{result.capture_mib_per_sec:>14.1f}",
+                flush=True,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from orch.config.schema import PlanSpec, TaskSpec
+from orch.exec import runner
+from orch.exec.runner import TaskResult, run_plan
+from orch.util.time import now_iso
+
+DEFAULT_SIZES = (10_000, 50_000, 100_000)
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    tasks: int
+    width: int
+    max_parallel: int
+    capacity: float | None
+    wall_sec: float
+    tasks_per_sec: float
+    overhead_us_per_task: float
+    max_rss_mb: float
+    status: str
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure run_plan scheduler overhead")
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="plan sizes to run (default: 10000 50000 100000)",
+    )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=100,
+        help="task i depends on task i-width, so the plan is width independent chains",
+    )
+    parser.add_argument("--max-parallel", type=int, default=32)
+    parser.add_argument(
+        "--capacity",
+        type=float,
+        default=None,
+        help="run under --capacity cpu=N with tasks asking for 1-4 cpu each",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    return parser.parse_args(argv)
+
+
+def build_plan(tasks: int, width: int, *, resources: bool = False) -> PlanSpec:
+    specs = [
+        TaskSpec(
+            id=f"t{index}",
+            cmd=["true"],
+            depends_on=[f"t{index - width}"] if width > 0 and index >= width else [],
+            resources={"cpu": float(1 + index % 4)} if resources else {},
+        )
+        for index in range(tasks)
+    ]
+    return PlanSpec(goal=None, artifacts_dir=None, tasks=specs)
+
+
+async def _noop_task(*_args: object, **_kwargs: object) -> TaskResult:
+    """Stands in for ``run_task`` so only scheduling and state bookkeeping are measured."""
+    stamp = now_iso()
+    return TaskResult(
+        exit_code=0,
+        timed_out=False,
+        canceled=False,
+        start_failed=False,
+        started_at=stamp,
+        ended_at=stamp,
+        duration_sec=0.0,
+    )
+
+
+def run_once(
+    tasks: int, *, width: int, max_parallel: int, capacity: float | None = None
+) -> BenchResult:
+    plan = build_plan(tasks, width, resources=capacity is not None)
+    with tempfile.TemporaryDirectory(prefix="orch-bench-") as tmp:
+        workdir = Path(tmp)
+        run_dir = workdir / "home" / "runs" / f"bench_{tasks}"
+        run_dir.mkdir(parents=True)
+        original_run_task = runner.run_task
+        runner.run_task = _noop_task
+        try:
+            started = time.perf_counter()
+            state = asyncio.run(
+                run_plan(
+                    plan,
+                    run_dir,
+                    max_parallel=max_parallel,
+                    fail_fast=False,
+                    workdir=workdir,
+                    resume=False,
+                    failed_only=False,
+                    cache=False,
+                    capacity=None if capacity is None else {"cpu": capacity},
+                )
+            )
+            wall = time.perf_counter() - started
+        finally:
+            runner.run_task = original_run_task
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_unit
+    return BenchResult(
+        tasks=tasks,
+        width=width,
+        max_parallel=max_parallel,
+        capacity=capacity,
+        wall_sec=round(wall, 3),
+        tasks_per_sec=round(tasks / wall, 1),
+        overhead_us_per_task=round(wall / tasks * 1_000_000, 1),
+        max_rss_mb=round(max_rss / (1024 * 1024), 1),
+        status=state.status,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    if any(size < 1 for size in args.tasks) or args.width < 0 or args.max_parallel < 1:
+        print("--tasks and --max-parallel must be >= 1, --width >= 0", file=sys.stderr)
+        return 2
+    if args.capacity is not None and args.capacity <= 0:
+        print("--capacity must be > 0", file=sys.stderr)
+        return 2
+    if not args.json:
+        print(f"{'tasks':>8} {'wall_sec':>9} {'tasks/s':>9} {'us/task':>8} {'max_rss_mb':>10}")
+    for size in args.tasks:
+        result = run_once(
+            size, width=args.width, max_parallel=args.max_parallel, capacity=args.capacity
+        )
+        if args.json:
+            print(json.dumps(asdict(result)), flush=True)
+        else:
+            print(
+                f"{result.tasks:>8} {result.wall_sec:>9.3f} {result.tasks_per_sec:>9.1f} "
+                f"{result.overhead_us_per_task:>8.1f} {result.max_rss_mb:>10.1f}",
+                flush=True,
+            )
+        if result.status != "SUCCESS":
+            print(f"run finished with status {result.status}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,26 +2,29 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
+import os
 import random
 import sys
 import time
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fake CLI agent for orch integration tests")
-    parser.add_argument("subcommand", choices=["inspect", "build", "test"])
+    parser.add_argument("subcommand", choices=["inspect", "build", "test", "worker"])
     parser.add_argument("--sleep", type=float, default=0.0)
     parser.add_argument("--fail-rate", type=float, default=0.0)
     parser.add_argument("--fail-always", action="store_true")
     parser.add_argument("--produce", type=Path)
     parser.add_argument("--spam-bytes", type=int, default=0)
-    return parser.parse_args()
+    parser.add_argument("--crash", action="store_true", help="exit the worker mid-request")
+    return parser.parse_args(argv)
 
 
-def main() -> int:
-    args = parse_args()
+def run_once(args: argparse.Namespace) -> int:
     if args.sleep > 0:
         time.sleep(args.sleep)
 
@@ -33,7 +36,7 @@ def main() -> int:
             sys.stdout.flush()
             remaining -= len(chunk)
 
-    payload = {"subcommand": args.subcommand, "timestamp": time.time()}
+    payload = {"subcommand": args.subcommand, "timestamp": time.time(), "pid": os.getpid()}
     print(json.dumps(payload), flush=True)
 
     if args.produce:
@@ -49,5 +52,45 @@ def main() -> int:
     return 0
 
 
+def serve_worker() -> int:
+    """Answer orch worker requests (one JSON object per line) until stdin closes."""
+    replies = sys.stdout
+    for line in sys.stdin:
+        request = json.loads(line)
+        # argv[0] is the program name, as in a normal cmd.
+        args = parse_args(request["argv"][1:])
+        if args.crash:
+            os._exit(3)
+        saved_cwd = os.getcwd()
+        saved_env = os.environ.copy()
+        out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        err = io.StringIO()
+        try:
+            os.chdir(request["cwd"])
+            os.environ.update(request.get("env") or {})
+            with redirect_stdout(out), redirect_stderr(err):
+                exit_code = run_once(args)
+        finally:
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+        out.flush()
+        stdout_text = out.buffer.getvalue().decode("utf-8")  # type: ignore[attr-defined]
+        for message in (
+            {"id": request["id"], "stdout": stdout_text, "stderr": err.getvalue()},
+            {"id": request["id"], "exit_code": exit_code},
+        ):
+            replies.write(json.dumps(message) + "\n")
+        replies.flush()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.subcommand == "worker":
+        return serve_worker()
+    return run_once(args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())